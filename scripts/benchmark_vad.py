@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-of-speech detection on recorded fixtures.
+
+Replays each fixture through the same stop rules as
+``record_audio_with_silence_detection`` and compares VAD engines:
+
+- truncate: WebRTC VAD fed the first 16kHz-frame's worth of each 24kHz chunk,
+  labelled as 16kHz (the old behaviour; the VAD sees time-warped audio)
+- webrtc: WebRTC VAD on the chunk resampled to 16kHz
+- energy: the NumPy energy/zero-crossing/spectral-flatness detector
+- onnx: an ONNX model, if --onnx-model is given
+
+A fixture is a WAV file (mono 16-bit, any sample rate) with a JSON sidecar of
+the same name giving when the speaker finished, e.g. ``turn1.wav`` and
+``turn1.json`` containing ``{"speech_end": 2.35}``. Use ``"speech_end": null``
+for recordings with no speech at all.
+
+Outcomes per fixture:
+- false stop: recording stopped before speech_end (the user was cut off)
+- false continue: recording ran more than --tolerance seconds past
+  speech_end + silence threshold (the user waited for nothing)
+
+Usage:
+    python scripts/benchmark_vad.py FIXTURE_DIR [--aggressiveness 2] [--tolerance 0.5] [--onnx-model PATH]
+    python scripts/benchmark_vad.py --synthetic 50
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from voice_mode.audio_decoder import parse_wav  # noqa: E402
+from voice_mode.config import (  # noqa: E402
+    SAMPLE_RATE,
+    VAD_CHUNK_DURATION_MS,
+    SILENCE_THRESHOLD_MS,
+    MIN_RECORDING_DURATION,
+    INITIAL_SILENCE_GRACE_PERIOD,
+)
+from voice_mode.resample import resample  # noqa: E402
+from voice_mode.vad import (  # noqa: E402
+    EnergyVAD,
+    OnnxVAD,
+    VoiceActivityDetector,
+    WebRTCVAD,
+    WEBRTCVAD_AVAILABLE,
+    webrtcvad,
+)
+
+VAD_RATE = 16000
+
+
+class TruncatingWebRTCVAD(VoiceActivityDetector):
+    """The old feed: a 24kHz chunk cut to 16kHz-frame length and mislabelled."""
+
+    name = "truncate"
+
+    def __init__(self, aggressiveness: int):
+        super().__init__(SAMPLE_RATE)
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self._frame = int(VAD_RATE * VAD_CHUNK_DURATION_MS / 1000)
+
+    def _classify(self, chunk: np.ndarray) -> bool:
+        return self._vad.is_speech(chunk[:self._frame].tobytes(), VAD_RATE)
+
+
+def make_engines(aggressiveness: int, onnx_model=None):
+    """Return (name, factory) pairs for every engine that can run here."""
+    engines = []
+    if WEBRTCVAD_AVAILABLE:
+        engines.append(("truncate", lambda: TruncatingWebRTCVAD(aggressiveness)))
+        engines.append(("webrtc", lambda: WebRTCVAD(SAMPLE_RATE, aggressiveness)))
+    engines.append(("energy", lambda: EnergyVAD(SAMPLE_RATE, aggressiveness)))
+    if onnx_model:
+        engines.append(("onnx", lambda: OnnxVAD(str(onnx_model), SAMPLE_RATE)))
+    return engines
+
+
+def simulate(samples: np.ndarray, vad: VoiceActivityDetector, max_duration: float) -> float:
+    """Run the recorder's stop rules over a 24kHz recording.
+
+    Returns:
+        Time in seconds at which recording would have stopped
+    """
+    chunk_samples = int(SAMPLE_RATE * VAD_CHUNK_DURATION_MS / 1000)
+    chunk_s = VAD_CHUNK_DURATION_MS / 1000
+
+    speech_detected = False
+    silence_ms = 0
+    duration = 0.0
+
+    for start in range(0, len(samples) - chunk_samples + 1, chunk_samples):
+        is_speech = vad.is_speech(samples[start:start + chunk_samples])
+
+        if is_speech:
+            speech_detected = True
+            silence_ms = 0
+        else:
+            silence_ms += VAD_CHUNK_DURATION_MS
+        duration += chunk_s
+
+        if speech_detected and duration >= MIN_RECORDING_DURATION and silence_ms >= SILENCE_THRESHOLD_MS:
+            return duration
+        if not speech_detected and duration >= INITIAL_SILENCE_GRACE_PERIOD:
+            return duration
+        if duration >= max_duration:
+            return duration
+    return duration
+
+
+def load_fixtures(directory: Path):
+    """Yield (name, 24kHz int16 samples, speech_end) for each labelled WAV."""
+    for wav_path in sorted(directory.glob("*.wav")):
+        label_path = wav_path.with_suffix(".json")
+        if not label_path.exists():
+            print(f"Skipping {wav_path.name}: no {label_path.name}", file=sys.stderr)
+            continue
+        samples, rate, channels = parse_wav(wav_path.read_bytes())
+        if channels > 1:
+            samples = samples.mean(axis=1).astype(np.int16)
+        yield wav_path.stem, resample(samples, rate, SAMPLE_RATE), json.loads(label_path.read_text())["speech_end"]
+
+
+def synthetic_fixtures(count: int, seed: int = 0):
+    """Generate voiced-speech-like bursts followed by trailing room noise.
+
+    Each utterance is a sequence of syllables (glottal pulse trains with a
+    few formant-like harmonics and a syllable envelope) separated by short
+    intra-utterance pauses, then 3 seconds of low-level noise.
+    """
+    rng = np.random.default_rng(seed)
+    for index in range(count):
+        parts = [rng.normal(0, 60, int(SAMPLE_RATE * rng.uniform(0.2, 1.0)))]
+        for _ in range(rng.integers(4, 14)):
+            length = int(SAMPLE_RATE * rng.uniform(0.12, 0.35))
+            t = np.arange(length) / SAMPLE_RATE
+            f0 = rng.uniform(90, 250)
+            voiced = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 12))
+            envelope = np.sin(np.pi * np.arange(length) / length) ** 0.5
+            parts.append(voiced * envelope * rng.uniform(2000, 6000) + rng.normal(0, 60, length))
+            parts.append(rng.normal(0, 60, int(SAMPLE_RATE * rng.uniform(0.03, 0.25))))
+        speech_end = sum(len(p) for p in parts[:-1]) / SAMPLE_RATE
+        parts.append(rng.normal(0, 60, SAMPLE_RATE * 3))
+        samples = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+        yield f"synthetic-{index:03d}", samples, speech_end
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="?", type=Path, help="Directory of WAV fixtures with JSON labels")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Use N generated fixtures instead")
+    parser.add_argument("--aggressiveness", type=int, default=2, help="WebRTC VAD aggressiveness 0-3 (default: 2)")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Seconds past speech_end + silence threshold before counting a false continue")
+    parser.add_argument("--max-duration", type=float, default=120.0, help="Maximum recording length")
+    parser.add_argument("--onnx-model", type=Path, help="Also benchmark this ONNX VAD model")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        fixtures = list(synthetic_fixtures(args.synthetic))
+    elif args.fixtures:
+        fixtures = list(load_fixtures(args.fixtures))
+    else:
+        parser.error("give a fixture directory or --synthetic N")
+    if not fixtures:
+        print("No fixtures found", file=sys.stderr)
+        return 1
+
+    print(f"{len(fixtures)} fixtures, aggressiveness {args.aggressiveness}, "
+          f"silence threshold {SILENCE_THRESHOLD_MS}ms\n")
+    print(f"{'engine':<10} {'false stop':>11} {'false cont.':>12} {'mean overrun':>13} {'time/chunk':>11}")
+
+    for method, make_vad in make_engines(args.aggressiveness, args.onnx_model):
+        false_stop = false_continue = 0
+        overruns = []
+        elapsed = 0.0
+        chunks = 0
+        for name, samples, speech_end in fixtures:
+            vad = make_vad()
+            stop = simulate(samples, vad, args.max_duration)
+            elapsed += vad.stats.total_time
+            chunks += vad.stats.frames
+
+            expected = (speech_end or 0.0) + SILENCE_THRESHOLD_MS / 1000
+            if speech_end is not None and stop < speech_end:
+                false_stop += 1
+            elif stop > expected + args.tolerance:
+                false_continue += 1
+            if speech_end is not None:
+                overruns.append(stop - speech_end)
+
+        mean_overrun = f"{np.mean(overruns):.2f}s" if overruns else "-"
+        print(f"{method:<10} {false_stop / len(fixtures):>11.1%} {false_continue / len(fixtures):>12.1%} "
+              f"{mean_overrun:>13} {elapsed / max(chunks, 1) * 1e6:>9.0f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
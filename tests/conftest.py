@@ -0,0 +1,18 @@
+"""Shared fixtures."""
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def conversation(monkeypatch):
+    """The conversation tools module, imported without an audio device."""
+    loaded = set(sys.modules)
+    monkeypatch.setitem(sys.modules, 'sounddevice', MagicMock())
+    from voice_mode.tools import conversation
+    yield conversation
+    for name in set(sys.modules) - loaded:
+        if name.startswith('voice_mode'):
+            del sys.modules[name]
@@ -0,0 +1,143 @@
+"""Tests for the preallocated audio buffers."""
+
+import numpy as np
+import pytest
+
+from voice_mode.audio_buffer import AudioRingBuffer, PrerollBuffer, RecordingBuffer
+
+
+class TestAudioRingBuffer:
+    """Test the single-producer/single-consumer ring buffer."""
+
+    def test_write_then_read_preserves_order(self):
+        """Blocks come out in the order they were written."""
+        buf = AudioRingBuffer(16)
+        buf.write(np.arange(5, dtype=np.float32))
+        buf.write(np.arange(5, 10, dtype=np.float32))
+
+        assert buf.available == 10
+        np.testing.assert_array_equal(buf.read(10), np.arange(10, dtype=np.float32))
+        assert buf.available == 0
+
+    def test_wraparound(self):
+        """Reads and writes that straddle the end of storage are stitched together."""
+        buf = AudioRingBuffer(8)
+        buf.write(np.arange(6, dtype=np.float32))
+        buf.read(5)
+        buf.write(np.arange(6, 12, dtype=np.float32))
+
+        out = np.empty(7, dtype=np.float32)
+        assert buf.read_into(out) == 7
+        np.testing.assert_array_equal(out, np.arange(5, 12, dtype=np.float32))
+
+    def test_overrun_writes_only_what_fits(self):
+        """A block larger than the free space is truncated, not overwritten."""
+        buf = AudioRingBuffer(4)
+        assert buf.write(np.ones(6, dtype=np.float32)) == 4
+        assert buf.free == 0
+        assert buf.write(np.ones(1, dtype=np.float32)) == 0
+
+    def test_underrun_zero_fills(self):
+        """Missing frames are zero-filled in the output block."""
+        buf = AudioRingBuffer(8)
+        buf.write(np.full(3, 0.5, dtype=np.float32))
+
+        out = np.full((6, 1), 9.0, dtype=np.float32)
+        assert buf.read_into(out[:, 0]) == 3
+        np.testing.assert_array_equal(out[:, 0], [0.5, 0.5, 0.5, 0, 0, 0])
+
+    def test_clear(self):
+        """Clearing drops everything that was buffered."""
+        buf = AudioRingBuffer(8)
+        buf.write(np.ones(5, dtype=np.float32))
+        buf.clear()
+        assert buf.available == 0
+        assert buf.free == 8
+
+    def test_invalid_capacity(self):
+        """Zero capacity is rejected."""
+        with pytest.raises(ValueError):
+            AudioRingBuffer(0)
+
+
+class TestRecordingBuffer:
+    """Test the growable append-only recording buffer."""
+
+    def test_growth_preserves_data(self):
+        buf = RecordingBuffer(4)
+        for start in range(0, 20, 3):
+            buf.write(np.arange(start, start + 3, dtype=np.int16))
+
+        assert buf.frames == 21
+        assert buf.capacity >= 21
+        np.testing.assert_array_equal(buf.view(), np.arange(21, dtype=np.int16))
+
+    def test_views_survive_growth(self):
+        buf = RecordingBuffer(4)
+        buf.write(np.arange(4, dtype=np.int16))
+        early = buf.view(0, 4)
+        buf.write(np.arange(4, 12, dtype=np.int16))
+
+        np.testing.assert_array_equal(early, np.arange(4, dtype=np.int16))
+        np.testing.assert_array_equal(buf.view(2, 6), np.arange(2, 6, dtype=np.int16))
+
+    def test_multichannel_blocks_are_flattened(self):
+        buf = RecordingBuffer(8)
+        buf.write(np.arange(6, dtype=np.int16).reshape(3, 2))
+        np.testing.assert_array_equal(buf.view(), np.arange(6, dtype=np.int16))
+
+    def test_max_frames_drops_overflow(self):
+        buf = RecordingBuffer(4, max_frames=10)
+        assert buf.write(np.ones(8, dtype=np.int16)) == 8
+        assert buf.write(np.ones(8, dtype=np.int16)) == 2
+
+        assert buf.frames == 10
+        assert buf.dropped == 6
+
+    def test_full_buffer_does_not_reallocate(self):
+        buf = RecordingBuffer(4, max_frames=10)
+        buf.write(np.ones(10, dtype=np.int16))
+        storage = buf._data
+        for _ in range(3):
+            assert buf.write(np.ones(8, dtype=np.int16)) == 0
+        assert buf._data is storage
+        assert buf.dropped == 24
+
+    def test_view_is_read_only(self):
+        buf = RecordingBuffer(4)
+        buf.write(np.ones(4, dtype=np.int16))
+        with pytest.raises(ValueError):
+            buf.view()[0] = 5
+
+
+class TestPrerollBuffer:
+    """Test the keep-the-newest pre-roll ring."""
+
+    def test_read_since_position(self):
+        buf = PrerollBuffer(8)
+        buf.write(np.arange(3, dtype=np.int16))
+        mark = buf.position
+        buf.write(np.arange(3, 6, dtype=np.int16))
+
+        np.testing.assert_array_equal(buf.read_since(mark), np.arange(3, 6, dtype=np.int16))
+        np.testing.assert_array_equal(buf.read_since(0), np.arange(6, dtype=np.int16))
+
+    def test_wraps_and_keeps_newest(self):
+        buf = PrerollBuffer(5)
+        for start in range(0, 12, 3):
+            buf.write(np.arange(start, start + 3, dtype=np.int16))
+
+        assert buf.position == 12
+        np.testing.assert_array_equal(buf.read_since(0), np.arange(7, 12, dtype=np.int16))
+        np.testing.assert_array_equal(buf.read_since(9), np.arange(9, 12, dtype=np.int16))
+
+    def test_block_larger_than_capacity(self):
+        buf = PrerollBuffer(4)
+        buf.write(np.arange(10, dtype=np.int16))
+        assert buf.position == 10
+        np.testing.assert_array_equal(buf.read_since(0), np.arange(6, 10, dtype=np.int16))
+
+    def test_nothing_new(self):
+        buf = PrerollBuffer(4)
+        buf.write(np.ones(2, dtype=np.int16))
+        assert len(buf.read_since(buf.position)) == 0
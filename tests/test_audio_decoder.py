@@ -0,0 +1,149 @@
+"""Tests for the incremental ffmpeg stream decoder."""
+
+import asyncio
+import io
+import shutil
+import sys
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from voice_mode.audio_decoder import (
+    FFmpegStreamDecoder,
+    StreamDecoderError,
+    decode_audio_bytes,
+    parse_wav,
+)
+
+
+def make_wav(samples: np.ndarray, sample_rate: int = 24000) -> bytes:
+    """Build an in-memory mono 16-bit WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+async def _collect(decoder):
+    return [block async for block in decoder.iter_blocks()]
+
+
+class TestFFmpegStreamDecoder:
+    """Test incremental decoding through a persistent ffmpeg pipe."""
+
+    def test_command_uses_demuxer_for_format(self):
+        """Opus responses are demuxed as Ogg and output is raw s16le."""
+        cmd = FFmpegStreamDecoder("opus", sample_rate=16000)._build_command()
+        assert cmd[cmd.index("-f") + 1] == "ogg"
+        assert cmd[cmd.index("-ar") + 1] == "16000"
+        assert cmd[-1] == "pipe:1"
+
+    @pytest.mark.asyncio
+    async def test_missing_ffmpeg(self, monkeypatch):
+        """A clear error is raised when ffmpeg is not installed."""
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        with pytest.raises(StreamDecoderError):
+            await FFmpegStreamDecoder("mp3").start()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg not installed")
+    async def test_decodes_fed_chunks(self):
+        """Chunks fed in small pieces decode back to the original samples."""
+        original = (np.sin(np.linspace(0, 200, 24000)) * 10000).astype(np.int16)
+        data = make_wav(original)
+
+        decoder = FFmpegStreamDecoder("wav")
+        await decoder.start()
+        try:
+            for i in range(0, len(data), 1000):
+                await decoder.feed(data[i:i + 1000])
+            await decoder.end_input()
+            blocks = [block async for block in decoder.iter_blocks()]
+        finally:
+            await decoder.aclose()
+
+        decoded = np.concatenate(blocks)
+        np.testing.assert_array_equal(decoded, original)
+
+    @pytest.mark.asyncio
+    async def test_verbose_stderr_does_not_stall_output(self, monkeypatch):
+        """stderr is drained, so a chatty decoder cannot fill the pipe and block."""
+        script = "import sys; sys.stderr.write('x' * 1000000 + 'last'); sys.stdout.buffer.write(b'\\0\\1')"
+        monkeypatch.setattr(shutil, "which", lambda name: sys.executable)
+        monkeypatch.setattr(FFmpegStreamDecoder, "_build_command", lambda self: [sys.executable, "-c", script])
+
+        decoder = FFmpegStreamDecoder("mp3")
+        await decoder.start()
+        try:
+            await decoder.end_input()
+            blocks = await asyncio.wait_for(_collect(decoder), timeout=10)
+        finally:
+            await decoder.aclose()
+
+        assert np.concatenate(blocks).tolist() == [256]
+        assert len(decoder.stderr_output) <= 4096
+        assert decoder.stderr_output.endswith("last")
+
+    @pytest.mark.asyncio
+    async def test_abort_kills_decoder_without_waiting(self, monkeypatch):
+        """After barge-in the unread decoder is killed instead of waited on."""
+        script = "import sys; sys.stdout.buffer.write(bytes(1000000))"
+        monkeypatch.setattr(shutil, "which", lambda name: sys.executable)
+        monkeypatch.setattr(FFmpegStreamDecoder, "_build_command", lambda self: [sys.executable, "-c", script])
+
+        decoder = FFmpegStreamDecoder("mp3")
+        await decoder.start()
+        assert len(await decoder.read_block()) > 0  # Playback started, then stopped reading
+        await asyncio.sleep(0.2)  # ffmpeg fills the pipe
+
+        started = time.monotonic()
+        await asyncio.wait_for(decoder.aclose(abort=True), timeout=5)
+        assert time.monotonic() - started < 0.5
+        assert decoder.process.returncode is not None
+
+
+class TestDecodeAudioBytes:
+    """Test whole-response in-memory decoding."""
+
+    def test_parse_wav_is_zero_copy(self):
+        """WAV samples are a view over the response bytes."""
+        original = np.arange(-500, 500, dtype=np.int16)
+        data = make_wav(original, sample_rate=16000)
+
+        samples, rate, channels = parse_wav(data)
+        assert (rate, channels) == (16000, 1)
+        np.testing.assert_array_equal(samples, original)
+        assert not samples.flags.owndata
+
+    def test_parse_wav_clamps_placeholder_size(self):
+        """A streaming placeholder data size is clamped to the received bytes."""
+        data = bytearray(make_wav(np.ones(100, dtype=np.int16)))
+        data[40:44] = b'\xff\xff\xff\xff'
+
+        samples, _, _ = parse_wav(bytes(data))
+        assert len(samples) == 100
+
+    def test_parse_wav_rejects_non_wav(self):
+        """Non-RIFF data is rejected."""
+        with pytest.raises(ValueError):
+            parse_wav(b'ID3' + b'\x00' * 64)
+
+    @pytest.mark.asyncio
+    async def test_pcm_passthrough(self):
+        """Raw PCM is returned at the requested rate without ffmpeg."""
+        original = np.arange(100, dtype=np.int16)
+        samples, rate, channels = await decode_audio_bytes(original.tobytes(), "pcm", sample_rate=24000)
+        assert (rate, channels) == (24000, 1)
+        np.testing.assert_array_equal(samples, original)
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg not installed")
+    async def test_undecodable_bytes_report_ffmpeg_error(self):
+        """ffmpeg's own error message is included when decoding fails."""
+        with pytest.raises(StreamDecoderError, match="could not decode mp3 audio: .+"):
+            await decode_audio_bytes(b'not audio' * 100, "mp3")
@@ -0,0 +1,52 @@
+"""Tests for in-memory STT upload encoding."""
+
+import io
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from voice_mode.audio_decoder import decode_audio_bytes
+from voice_mode.audio_encoder import AudioEncoderError, encode_audio_bytes, encode_wav
+
+
+class TestAudioEncoder:
+    """Test encoding int16 recordings without temp files."""
+
+    def test_encode_wav_readable_by_wave_module(self):
+        """The generated header describes the buffer correctly."""
+        samples = (np.sin(np.linspace(0, 50, 1600)) * 8000).astype(np.int16)
+        data = encode_wav(samples, 16000)
+
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getsampwidth() == 2
+            assert wav_file.getframerate() == 16000
+            frames = wav_file.readframes(wav_file.getnframes())
+        np.testing.assert_array_equal(np.frombuffer(frames, dtype=np.int16), samples)
+
+    @pytest.mark.asyncio
+    async def test_wav_needs_no_ffmpeg(self, monkeypatch):
+        """WAV uploads are built without spawning ffmpeg."""
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        data = await encode_audio_bytes(np.zeros(10, dtype=np.int16), 24000, "wav")
+        assert data[:4] == b'RIFF'
+
+    @pytest.mark.asyncio
+    async def test_unsupported_format(self):
+        """Unknown formats are rejected."""
+        with pytest.raises(AudioEncoderError):
+            await encode_audio_bytes(np.zeros(10, dtype=np.int16), 24000, "wma")
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg not installed")
+    async def test_flac_round_trip(self):
+        """Compressed output piped through ffmpeg decodes back losslessly."""
+        samples = (np.sin(np.linspace(0, 200, 24000)) * 10000).astype(np.int16)
+        data = await encode_audio_bytes(samples, 24000, "flac")
+        assert data[:4] == b'fLaC'
+
+        decoded, rate, _ = await decode_audio_bytes(data, "flac", sample_rate=24000)
+        assert rate == 24000
+        np.testing.assert_array_equal(decoded, samples)
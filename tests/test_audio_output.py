@@ -0,0 +1,216 @@
+"""Tests for the shared audio output service."""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from voice_mode import audio_output
+from voice_mode.audio_output import AudioOutputService, get_output_rate
+
+
+class FakeOutputStream:
+    """Stands in for sd.OutputStream; the test pulls blocks from the callback."""
+
+    instances = []
+
+    def __init__(self, callback, channels, latency=0.05, **kwargs):
+        self.callback = callback
+        self.channels = channels
+        self.latency = latency
+        self.kwargs = kwargs
+        self.closed = False
+        FakeOutputStream.instances.append(self)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, frames, dac_delay=0.02):
+        outdata = np.full((frames, self.channels), 12345, dtype=np.int16)
+        time_info = SimpleNamespace(currentTime=100.0, outputBufferDacTime=100.0 + dac_delay)
+        self.callback(outdata, frames, time_info, None)
+        return outdata
+
+
+@pytest.fixture
+def fake_sd():
+    FakeOutputStream.instances = []
+    mock_sd = MagicMock()
+    mock_sd.OutputStream.side_effect = lambda **kwargs: FakeOutputStream(**kwargs)
+    with patch.dict(sys.modules, {'sounddevice': mock_sd}):
+        yield mock_sd
+
+
+class TestAudioOutputService:
+    """Test mixing, scheduling and stream lifetime."""
+
+    def test_sessions_are_mixed_and_clipped(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        first = service.open_session(start_at=0)
+        second = service.open_session(start_at=0)
+        first.write(np.full(10, 20000))
+        second.write(np.full(5, 20000))
+        second.write(np.full(5, -1000))
+
+        out = FakeOutputStream.instances[0].pull(12)[:, 0]
+        np.testing.assert_array_equal(out[:5], 32767)
+        np.testing.assert_array_equal(out[5:10], 19000)
+        np.testing.assert_array_equal(out[10:], 0)  # Silence, not stale buffer contents
+
+    def test_scheduled_start_and_dac_times(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        stream_start = time.perf_counter()
+        session = service.open_session(start_at=stream_start + 0.5)
+        session.write(np.full(10, 100))
+        stream = FakeOutputStream.instances[0]
+
+        assert not stream.pull(100, dac_delay=0.0).any()  # Not due yet
+        before = time.perf_counter()
+        out = stream.pull(1000, dac_delay=0.0)[:, 0]
+        offset = int(np.argmax(out != 0))
+        assert 400 < offset <= 500
+        assert np.count_nonzero(out) == 10
+        assert session.started_at == pytest.approx(stream_start + 0.5, abs=0.01)
+        assert session.finished_at == pytest.approx(session.started_at + 0.01, abs=0.002)
+        assert session.started_at >= before
+
+    def test_falls_back_to_stream_latency_without_dac_time(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        session = service.open_session(start_at=0)
+        session.write(np.full(10, 100))
+        before = time.perf_counter()
+        FakeOutputStream.instances[0].pull(10, dac_delay=-100.0)
+        assert session.started_at - before == pytest.approx(0.05, abs=0.01)
+
+    def test_drain_waits_for_playback(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        session = service.open_session(start_at=0)
+        session.write(np.full(300, 100))
+        stream = FakeOutputStream.instances[0]
+
+        def device():
+            for _ in range(5):
+                time.sleep(0.02)
+                stream.pull(100, dac_delay=0.0)
+
+        thread = threading.Thread(target=device)
+        thread.start()
+        assert session.drain(timeout=2)
+        assert session.frames_played == 300
+        assert session.underrun_frames == 0
+        thread.join()
+
+    def test_abort_drops_queued_audio(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        session = service.open_session(start_at=0)
+        session.write(np.full(100, 100))
+        session.abort()
+        assert not FakeOutputStream.instances[0].pull(100).any()
+        assert session.drain(timeout=0.1)
+
+    def test_stream_is_reused_and_closed_when_idle(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=60)
+        for _ in range(3):
+            with service.open_session() as session:
+                session.write(np.zeros(10))
+        assert len(FakeOutputStream.instances) == 1
+        assert service.active
+        service.close()
+        assert FakeOutputStream.instances[0].closed
+
+        # Without an idle timeout the stream closes with the last session
+        service = AudioOutputService(1000, idle_timeout=0)
+        with service.open_session():
+            assert service.active
+        assert not service.active
+
+    def test_first_session_gets_lead_in(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        first = service.open_session()
+        assert first.start_at is not None and first.start_at > time.perf_counter()
+        second = service.open_session()
+        assert second.start_at is None
+
+
+class TestPlaybackTiming:
+    """Test DAC-based timing reported to metrics and the event logger."""
+
+    def test_output_latency_and_metrics(self, fake_sd):
+        from voice_mode.streaming import StreamMetrics, record_output_timing
+
+        service = AudioOutputService(1000, idle_timeout=0)
+        request_start = time.perf_counter()
+        session = service.open_session(start_at=0)
+        session.write(np.full(100, 100))
+        FakeOutputStream.instances[0].pull(100, dac_delay=0.03)
+        assert session.output_latency == pytest.approx(0.03, abs=0.01)
+
+        metrics = StreamMetrics()
+        with patch('voice_mode.streaming.log_tts_audio_timing') as log_timing:
+            record_output_timing(metrics, session, request_start)
+        assert metrics.audio_start == session.started_at
+        assert metrics.audio_end - metrics.audio_start == pytest.approx(0.1)
+        assert metrics.ttfa == pytest.approx(session.started_at - request_start)
+        log_timing.assert_called_once_with(session.started_at, session.finished_at)
+
+    def test_abort_is_recorded(self, fake_sd):
+        service = AudioOutputService(1000, idle_timeout=0)
+        session = service.open_session()
+        assert not session.aborted
+        session.abort()
+        assert session.aborted
+
+    def test_event_logger_backdates_dac_events(self, tmp_path):
+        from voice_mode.utils.event_logger import EventLogger
+
+        event_logger = EventLogger(log_dir=tmp_path)
+        event_logger.start_session("timing")
+        now = time.perf_counter()
+        event_logger.log_event(EventLogger.TTS_START, perf_time=now - 1.0)
+        event_logger.log_event(EventLogger.TTS_AUDIO_START, perf_time=now - 0.6)
+        event_logger.log_event(EventLogger.TTS_AUDIO_END, perf_time=now - 0.1)
+        metrics = event_logger.end_session()
+
+        assert metrics["ttfa_audio"] == pytest.approx(0.4, abs=0.01)
+        assert metrics["tts_playback"] == pytest.approx(0.5, abs=0.01)
+
+
+class TestOutputRate:
+    """Test the output rate and rate negotiation with TTS servers."""
+
+    def test_device_native_rate_is_used_and_cached(self, fake_sd):
+        fake_sd.query_devices.return_value = {'default_samplerate': 48000.0}
+        with patch.dict(audio_output._device_rates, clear=True), \
+             patch('voice_mode.audio_output.OUTPUT_SAMPLE_RATE', 'auto'):
+            assert get_output_rate() == 48000
+            assert get_output_rate() == 48000
+        fake_sd.query_devices.assert_called_once_with(None, 'output')
+
+    def test_configured_rate_and_fallback(self, fake_sd):
+        with patch('voice_mode.audio_output.OUTPUT_SAMPLE_RATE', '44100'):
+            assert get_output_rate() == 44100
+        fake_sd.query_devices.side_effect = RuntimeError("no device")
+        with patch.dict(audio_output._device_rates, clear=True), \
+             patch('voice_mode.audio_output.OUTPUT_SAMPLE_RATE', 'auto'):
+            assert get_output_rate() == audio_output.SAMPLE_RATE
+
+    @pytest.mark.parametrize("headers,rate", [
+        ({"content-type": "audio/pcm;rate=22050"}, 22050),
+        ({"content-type": "audio/L16; rate=16000; channels=1"}, 16000),
+        ({"x-sample-rate": "48000", "content-type": "audio/pcm"}, 48000),
+        ({"content-type": "audio/pcm"}, None),
+        ({}, None),
+    ])
+    def test_parse_announced_pcm_rate(self, fake_sd, headers, rate):
+        from voice_mode.streaming import parse_pcm_sample_rate
+        assert parse_pcm_sample_rate(headers) == rate
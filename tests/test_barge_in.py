@@ -0,0 +1,294 @@
+"""Tests for barge-in detection during TTS playback."""
+
+import asyncio
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from voice_mode import barge_in
+from voice_mode.barge_in import BargeInMonitor, write_output
+
+RATE = 24000
+CHUNK = 720  # 30ms at 24kHz
+
+
+class FakeCapture:
+    """Minimal capture stream: the test pushes blocks into the attached sink."""
+
+    samplerate = RATE
+    channels = 1
+
+    def __init__(self):
+        self.position = 0
+        self.sink = None
+
+    @contextmanager
+    def recording(self, sink, since=None):
+        self.sink = sink
+        try:
+            yield self.position
+        finally:
+            self.sink = None
+
+    def push(self, samples):
+        samples = np.asarray(samples, dtype=np.int16)
+        self.position += len(samples)
+        if self.sink:
+            self.sink(samples)
+
+
+class LevelVAD:
+    """Calls anything above a fixed level speech."""
+
+    def is_speech(self, chunk):
+        return np.abs(chunk).mean() > 200
+
+
+class FakeOutput:
+    samplerate = RATE
+
+    def __init__(self, on_write=None):
+        self.writes = []
+        self.on_write = on_write
+
+    def write(self, samples):
+        self.writes.append(len(samples))
+        if self.on_write:
+            self.on_write()
+
+
+class FakeDevice:
+    """Stands in for sd.OutputStream; the test pulls blocks from the callback."""
+
+    def __init__(self, callback, channels, **kwargs):
+        self.callback = callback
+        self.channels = channels
+        self.latency = 0.02
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+    def pull(self, frames):
+        outdata = np.zeros((frames, self.channels), dtype=np.int16)
+        self.callback(outdata, frames, SimpleNamespace(currentTime=0.0, outputBufferDacTime=0.02), None)
+        return outdata
+
+
+@pytest.fixture
+def output_session():
+    from voice_mode.audio_output import AudioOutputService
+    devices = []
+    mock_sd = MagicMock()
+    mock_sd.OutputStream.side_effect = lambda **kwargs: devices.append(FakeDevice(**kwargs)) or devices[-1]
+    with patch.dict(sys.modules, {'sounddevice': mock_sd}):
+        service = AudioOutputService(RATE, idle_timeout=0)
+        session = service.open_session(start_at=0)
+        yield session, devices[0]
+        session.close()
+
+
+def tone(seconds, amplitude):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude).astype(np.int16)
+
+
+@pytest.fixture
+def capture():
+    capture = FakeCapture()
+    yield capture
+    barge_in._active = None
+
+
+class TestBargeInMonitor:
+    """Test speech-over-echo detection."""
+
+    def test_triggers_on_sustained_speech_with_onset(self, capture):
+        monitor = BargeInMonitor(capture, min_speech_ms=300, vad=LevelVAD())
+        monitor.start()
+        capture.push(np.zeros(CHUNK * 5, dtype=np.int16))
+        for _ in range(12):
+            capture.push(tone(0.03, 8000))
+        monitor.stop()
+
+        assert monitor.triggered
+        assert monitor.wait(0)
+        assert monitor.onset_position == CHUNK * 5
+
+    def test_short_speech_does_not_trigger(self, capture):
+        monitor = BargeInMonitor(capture, min_speech_ms=300, vad=LevelVAD())
+        monitor.start()
+        capture.push(tone(0.15, 8000))
+        capture.push(np.zeros(CHUNK * 10, dtype=np.int16))
+        monitor.stop()
+        assert not monitor.triggered
+
+    def test_echo_of_playback_does_not_trigger(self, capture):
+        monitor = BargeInMonitor(capture, min_speech_ms=300, vad=LevelVAD())
+        monitor.start()
+        for _ in range(40):
+            # Playing at full level, echo arrives ~15dB quieter
+            monitor.reference(tone(0.03, 16000))
+            capture.push(tone(0.03, 3000))
+        monitor.stop()
+        assert not monitor.triggered
+
+    def test_speech_louder_than_echo_triggers(self, capture):
+        monitor = BargeInMonitor(capture, min_speech_ms=300, vad=LevelVAD())
+        monitor.start()
+        for _ in range(40):
+            monitor.reference(tone(0.03, 16000))
+            capture.push(tone(0.03, 3000))
+        for _ in range(15):
+            monitor.reference(tone(0.03, 16000))
+            capture.push(tone(0.03, 20000))
+        monitor.stop()
+        assert monitor.triggered
+
+
+class TestWriteOutput:
+    """Test block-wise playback that stops on barge-in."""
+
+    def test_single_write_without_monitor(self):
+        barge_in._active = None
+        stream = FakeOutput()
+        assert write_output(stream, np.zeros(RATE, dtype=np.int16))
+        assert stream.writes == [RATE]
+
+    def test_stops_after_trigger(self, capture):
+        monitor = BargeInMonitor(capture, vad=LevelVAD())
+        monitor.start()
+
+        def user_talks():
+            if len(stream.writes) == 3:
+                monitor.triggered = True
+
+        stream = FakeOutput(on_write=user_talks)
+        assert not write_output(stream, np.zeros(RATE, dtype=np.int16))
+        assert len(stream.writes) == 3
+        assert len(monitor._reference) == 3
+        monitor.stop()
+        assert barge_in._active is None
+
+
+class TestBargeInWithOutputSession:
+    """Test barge-in against the shared output stream."""
+
+    def play_in_background(self, session, samples):
+        result = {}
+
+        def play():
+            result["written"] = write_output(session, samples)
+            result["drained"] = session.drain(timeout=5)
+
+        thread = threading.Thread(target=play)
+        thread.start()
+        return thread, result
+
+    def test_reference_is_recorded_when_rendered_and_queue_is_short(self, capture, output_session):
+        session, device = output_session
+        monitor = BargeInMonitor(capture, vad=LevelVAD())
+        monitor.start()
+        block = int(RATE * barge_in.OUTPUT_BLOCK_S)
+        thread, result = self.play_in_background(session, tone(0.5, 16000))
+
+        time.sleep(0.05)
+        assert not monitor._reference  # Nothing played yet, so nothing to echo
+        assert session.queued_frames <= 2 * block  # Not seconds of audio ahead of the device
+        before = time.perf_counter()
+        device.pull(block)
+        assert len(monitor._reference) == 1
+        played_at, level = monitor._reference[0]
+        assert played_at == pytest.approx(before + 0.02, abs=0.01)  # Its DAC time
+        assert level > -20
+
+        while thread.is_alive():
+            device.pull(block)
+            time.sleep(0.001)
+        assert result == {"written": True, "drained": True}
+        monitor.stop()
+
+    def test_short_utterance_can_be_interrupted(self, capture, output_session):
+        session, device = output_session
+        monitor = BargeInMonitor(capture, vad=LevelVAD())
+        monitor.start()
+        samples = tone(0.5, 16000)  # Shorter than the default queue limit
+        thread, result = self.play_in_background(session, samples)
+
+        block = int(RATE * barge_in.OUTPUT_BLOCK_S)
+        for _ in range(3):
+            time.sleep(0.01)
+            device.pull(block)
+        monitor.triggered = True
+        while thread.is_alive():
+            device.pull(block)
+            time.sleep(0.001)
+
+        assert not result["drained"]
+        assert session.aborted
+        assert session.frames_played < len(samples) // 2
+        monitor.stop()
+
+
+class SlowSession:
+    """Output session whose writes block like a full device queue."""
+    samplerate = RATE
+    aborted = False
+    started_at = finished_at = None
+    output_latency = 0.0
+    underrun_frames = 0
+
+    def write(self, samples, max_queued_s=None):
+        time.sleep(0.1)
+
+    def drain(self, timeout=None):
+        return True
+
+    def abort(self):
+        self.aborted = True
+
+    def close(self):
+        pass
+
+
+class TestStreamingWrites:
+    """Test that blocking output writes stay off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_pcm_streaming_keeps_event_loop_running(self):
+        async def chunks():
+            for _ in range(3):
+                yield bytes(4800)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with patch.dict(sys.modules, {'sounddevice': MagicMock()}):
+            from voice_mode import streaming
+            with patch.object(streaming, 'get_output_rate', return_value=RATE), \
+                 patch.object(streaming, 'get_output_service') as service, \
+                 patch.object(streaming, 'get_event_logger', return_value=None):
+                service.return_value.open_session.return_value = SlowSession()
+                task = asyncio.create_task(ticker())
+                success, metrics = await streaming.stream_pcm_audio(
+                    "hello", None, {}, audio_chunks=chunks(), source_rate=RATE)
+                task.cancel()
+
+        assert success and metrics.chunks_played == 3
+        assert ticks >= 10  # Three 100ms writes; a blocked loop would barely tick
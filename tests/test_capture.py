@@ -0,0 +1,105 @@
+"""Tests for the persistent capture stream."""
+
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+# Avoid needing PortAudio to import the capture module
+sys.modules.setdefault('sounddevice', MagicMock())
+
+from voice_mode.capture import CaptureStream  # noqa: E402
+
+
+class FakeInputStream:
+    """Stands in for sd.InputStream; blocks are pushed by the test."""
+
+    instances = []
+
+    def __init__(self, callback, **kwargs):
+        self.callback = callback
+        self.kwargs = kwargs
+        self.started = False
+        self.closed = False
+        FakeInputStream.instances.append(self)
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def push(self, samples):
+        self.callback(np.asarray(samples, dtype=np.int16).reshape(-1, 1), len(samples), None, None)
+
+
+@pytest.fixture
+def fake_sd():
+    FakeInputStream.instances = []
+    with patch('voice_mode.capture.sd') as mock_sd:
+        mock_sd.InputStream.side_effect = lambda **kwargs: FakeInputStream(**kwargs)
+        yield mock_sd
+
+
+class TestCaptureStream:
+    """Test pre-roll handover and stream lifetime."""
+
+    def test_recording_gets_preroll_then_live_audio(self, fake_sd):
+        capture = CaptureStream(samplerate=1000, channels=1, blocksize=10, preroll_ms=50, idle_timeout=0)
+        capture.start()
+        stream = FakeInputStream.instances[0]
+
+        stream.push(np.arange(0, 10))
+        mark = capture.position
+        stream.push(np.arange(10, 20))
+
+        received = []
+        with capture.recording(lambda s: received.append(np.array(s)), since=mark) as first_position:
+            assert first_position == mark
+            stream.push(np.arange(20, 30))
+        stream.push(np.arange(30, 40))
+
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(10, 30))
+        assert capture.active
+
+    def test_preroll_is_bounded(self, fake_sd):
+        capture = CaptureStream(samplerate=1000, channels=1, blocksize=10, preroll_ms=15, idle_timeout=0)
+        capture.start()
+        stream = FakeInputStream.instances[0]
+        stream.push(np.arange(0, 40))
+
+        received = []
+        with capture.recording(received.append, since=0) as first_position:
+            pass
+
+        assert first_position == 25
+        np.testing.assert_array_equal(received[0], np.arange(25, 40))
+
+    def test_stream_is_reused_across_recordings(self, fake_sd):
+        capture = CaptureStream(samplerate=1000, channels=1, idle_timeout=0)
+        for _ in range(3):
+            with capture.recording(lambda s: None):
+                pass
+        assert len(FakeInputStream.instances) == 1
+
+    def test_idle_timeout_closes_stream(self, fake_sd):
+        capture = CaptureStream(samplerate=1000, channels=1, idle_timeout=0.05)
+        with capture.recording(lambda s: None):
+            time.sleep(0.1)
+            assert capture.active  # Never closed while recording
+
+        deadline = time.monotonic() + 2
+        while capture.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not capture.active
+        assert FakeInputStream.instances[0].closed
+
+        # Reopened on the next recording
+        with capture.recording(lambda s: None):
+            assert capture.active
+        capture.close()
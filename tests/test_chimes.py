@@ -0,0 +1,94 @@
+"""Tests for cached chimes and non-blocking chime playback."""
+
+import asyncio
+import threading
+import time
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from voice_mode import core
+from voice_mode.core import chime_duration, get_chime, load_chime_file, play_chime_start
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    core._chime_cache.clear()
+    yield
+    core._chime_cache.clear()
+
+
+def write_wav(path, samples, rate, channels=1):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+
+
+class TestChimeCache:
+    """Test chime synthesis, caching and custom files."""
+
+    def test_built_in_chime_is_cached_per_rate(self):
+        with patch('voice_mode.core.generate_chime', wraps=core.generate_chime) as generate:
+            first = get_chime("start", 24000)
+            assert get_chime("start", 24000) is first
+            get_chime("start", 16000)
+        assert generate.call_count == 2
+        assert len(first) == 4800
+        assert not first.flags.writeable
+
+    def test_duration_includes_lead_in(self):
+        assert chime_duration("end", 24000) == pytest.approx(core.PLAYBACK_LEAD_IN_S + 0.2)
+
+    def test_stereo_wav_is_downmixed_and_resampled(self, tmp_path):
+        path = tmp_path / "start.wav"
+        stereo = np.column_stack((np.full(4800, 8000), np.full(4800, 4000))).reshape(-1)
+        write_wav(path, stereo, 48000, channels=2)
+
+        samples = load_chime_file(str(path), 24000)
+        assert samples.dtype == np.int16
+        assert abs(len(samples) - 2400) <= 2
+        assert abs(int(np.median(samples)) - 6000) < 10
+
+    def test_custom_file_replaces_tones(self, tmp_path):
+        path = tmp_path / "end.wav"
+        write_wav(path, np.full(2400, 1000), 24000)
+        with patch.dict(core.CHIME_FILES, {"end": str(path)}):
+            assert len(get_chime("end", 24000)) == 2400
+
+    def test_unreadable_file_falls_back_to_tones(self, tmp_path):
+        path = tmp_path / "broken.wav"
+        path.write_bytes(b"not a wav file")
+        with patch.dict(core.CHIME_FILES, {"start": str(path)}):
+            assert len(get_chime("start", 24000)) == 4800
+
+
+class TestChimePlayback:
+    """Test that chimes play off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_background_chime_does_not_block(self):
+        done = threading.Event()
+
+        def slow_play(samples, rate, channels=1):
+            time.sleep(0.2)
+            done.set()
+            return True
+
+        with patch('voice_mode.core._play_pcm_blocking', side_effect=slow_play):
+            start = time.perf_counter()
+            assert await play_chime_start(wait=False)
+            assert time.perf_counter() - start < 0.1
+            assert not done.is_set()
+            await asyncio.gather(*core._chime_tasks)
+        assert done.is_set()
+
+    @pytest.mark.asyncio
+    async def test_waited_chime_plays_cached_waveform(self):
+        with patch('voice_mode.core._play_pcm_blocking') as play:
+            assert await play_chime_start(24000)
+        play.assert_called_once()
+        assert play.call_args[0][0] is get_chime("start", 24000)
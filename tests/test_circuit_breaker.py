@@ -0,0 +1,160 @@
+"""Tests for per-endpoint circuit breakers and recovery probes."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from voice_mode.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from voice_mode.provider_discovery import ProviderRegistry, EndpointInfo
+
+
+KOKORO = "http://127.0.0.1:8880/v1"
+OPENAI = "https://api.openai.com/v1"
+
+
+def make_breaker(**kwargs):
+    defaults = dict(consecutive_threshold=2, failure_rate=0.5, min_requests=5,
+                    base_backoff=5.0, max_backoff=60.0)
+    defaults.update(kwargs)
+    return CircuitBreaker(**defaults)
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = make_breaker()
+        assert breaker.record_failure(now=0) is False
+        assert breaker.state == CLOSED
+        assert breaker.record_failure(now=0) is True
+        assert breaker.state == OPEN
+        assert not breaker.available
+        assert breaker.retry_at == 5.0
+
+    def test_success_resets_consecutive_count(self):
+        breaker = make_breaker()
+        breaker.record_failure(now=0)
+        breaker.record_success()
+        breaker.record_failure(now=0)
+        assert breaker.state == CLOSED
+
+    def test_opens_on_failure_rate(self):
+        breaker = make_breaker(consecutive_threshold=10)
+        for outcome in [True, False, True, False, True, False]:
+            if outcome:
+                breaker.record_success()
+            else:
+                breaker.record_failure(now=0)
+        assert breaker.state == OPEN
+
+    def test_failure_rate_needs_min_requests(self):
+        breaker = make_breaker(consecutive_threshold=10)
+        breaker.record_success()
+        breaker.record_failure(now=0)
+        assert breaker.state == CLOSED
+
+    def test_backoff_doubles_until_closed(self):
+        breaker = make_breaker()
+        backoffs = []
+        for _ in range(6):
+            breaker.trip(now=0)
+            backoffs.append(breaker.retry_at)
+        assert backoffs == [5.0, 10.0, 20.0, 40.0, 60.0, 60.0]
+
+        breaker.half_open()
+        assert breaker.record_success() is True
+        assert breaker.state == CLOSED
+        breaker.trip(now=0)
+        assert breaker.retry_at == 5.0
+
+    def test_half_open_failure_reopens(self):
+        breaker = make_breaker()
+        breaker.trip(now=0)
+        assert not breaker.probe_due(now=4.9)
+        assert breaker.probe_due(now=5.0)
+
+        breaker.half_open()
+        assert breaker.available
+        assert breaker.record_failure(now=10) is True
+        assert breaker.state == OPEN
+        assert breaker.retry_at == 20.0
+
+
+class TestRegistryCircuitBreaking:
+    """Test how the registry applies breakers to endpoint health."""
+
+    @pytest.fixture
+    def registry(self):
+        registry = ProviderRegistry()
+        registry._initialized = True
+        registry.registry["tts"][KOKORO] = EndpointInfo(
+            base_url=KOKORO,
+            healthy=True,
+            models=["tts-1"],
+            voices=["af_sky"],
+            last_health_check=datetime.now(timezone.utc).isoformat(),
+            provider_type="kokoro"
+        )
+        return registry
+
+    @pytest.mark.asyncio
+    async def test_single_failure_keeps_endpoint_in_rotation(self, registry):
+        await registry.mark_unhealthy("tts", KOKORO, "connection refused")
+        assert registry.registry["tts"][KOKORO].healthy is True
+        assert registry._probe_task is None
+
+    @pytest.mark.asyncio
+    async def test_probe_restores_endpoint(self, registry):
+        registry.breakers["tts"][KOKORO] = make_breaker(base_backoff=0.01)
+
+        with patch.object(registry, "_probe", AsyncMock(side_effect=[False, True])) as probe:
+            await registry.mark_unhealthy("tts", KOKORO, "connection refused")
+            await registry.mark_unhealthy("tts", KOKORO, "connection refused")
+            assert registry.registry["tts"][KOKORO].healthy is False
+            assert registry.get_healthy_endpoints("tts") == []
+
+            await asyncio.wait_for(registry._probe_task, timeout=1.0)
+
+        assert probe.await_count == 2
+        assert registry.registry["tts"][KOKORO].healthy is True
+        assert registry.get_breaker("tts", KOKORO).state == HALF_OPEN
+
+        registry.record_success("tts", KOKORO)
+        assert registry.get_breaker("tts", KOKORO).state == CLOSED
+        assert registry.registry["tts"][KOKORO].error is None
+
+    @pytest.mark.asyncio
+    async def test_breaker_tripping_during_long_sleep_is_probed_on_time(self, registry):
+        """A short backoff is not stuck behind the probe task's long sleep."""
+        registry.breakers["tts"][KOKORO] = make_breaker(base_backoff=60)
+        registry.breakers["tts"][OPENAI] = make_breaker(base_backoff=0.01)
+
+        with patch.object(registry, "_probe", AsyncMock(return_value=True)) as probe:
+            await registry.mark_unhealthy("tts", KOKORO, "timeout")
+            await registry.mark_unhealthy("tts", KOKORO, "timeout")
+            await asyncio.sleep(0.01)  # The probe task is now sleeping for ~60s
+            await registry.mark_unhealthy("tts", OPENAI, "timeout")
+            await registry.mark_unhealthy("tts", OPENAI, "timeout")
+
+            for _ in range(100):
+                if registry.get_breaker("tts", OPENAI).state == HALF_OPEN:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert registry.get_breaker("tts", OPENAI).state == HALF_OPEN
+        assert registry.get_breaker("tts", KOKORO).state == OPEN
+        probe.assert_awaited_once_with(OPENAI)
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_stops_probing(self, registry):
+        registry.breakers["tts"][KOKORO] = make_breaker(base_backoff=60)
+        await registry.mark_unhealthy("tts", KOKORO, "timeout")
+        await registry.mark_unhealthy("tts", KOKORO, "timeout")
+        task = registry._probe_task
+        assert task is not None and not task.done()
+
+        await registry.aclose()
+        assert task.cancelled()
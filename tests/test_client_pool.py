@@ -0,0 +1,81 @@
+"""Tests for the persistent OpenAI client pool."""
+
+import httpx
+import pytest
+
+from voice_mode.client_pool import ClientPool
+
+
+class StreamedBody(httpx.AsyncByteStream):
+    """Response body that stays open until it is read, like a real transport's."""
+
+    async def __aiter__(self):
+        yield b"audio"
+
+
+def make_pool(idle_timeout: float = 600.0) -> ClientPool:
+    """Create a pool with small, explicit settings."""
+    return ClientPool({
+        'timeout': {'total': 30.0, 'connect': 5.0},
+        'limits': {'max_keepalive_connections': 2, 'max_connections': 4, 'keepalive_expiry': 60.0},
+        'http2': True,
+        'idle_timeout': idle_timeout,
+    })
+
+
+class TestClientPool:
+    """Test client reuse, eviction and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_per_endpoint_and_key(self):
+        """The same (base_url, api_key) returns the same client."""
+        pool = make_pool()
+        first = await pool.get("http://127.0.0.1:8880/v1", "key-a")
+        again = await pool.get("http://127.0.0.1:8880/v1", "key-a")
+        other_key = await pool.get("http://127.0.0.1:8880/v1", "key-b")
+        other_url = await pool.get("http://127.0.0.1:2022/v1", "key-a")
+
+        assert first is again
+        assert first is not other_key
+        assert first is not other_url
+        assert len(pool) == 3
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_idle_clients_evicted(self):
+        """Clients unused past the idle timeout are closed on the next lookup."""
+        pool = make_pool(idle_timeout=0.0)
+        stale = await pool.get("http://127.0.0.1:8880/v1", "key")
+        await pool.get("http://127.0.0.1:2022/v1", "key")
+
+        assert len(pool) == 1
+        assert stale._client.is_closed
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_with_open_response_is_not_evicted(self, monkeypatch):
+        """A client still streaming a response is kept until the response closes."""
+        pool = make_pool(idle_timeout=0.0)
+        monkeypatch.setattr(pool, "_create_transport",
+                            lambda: httpx.MockTransport(lambda request: httpx.Response(200, stream=StreamedBody())))
+        busy = await pool.get("http://127.0.0.1:8880/v1", "key")
+
+        async with busy._client.stream("POST", "http://127.0.0.1:8880/v1/audio/speech") as response:
+            await pool.get("http://127.0.0.1:2022/v1", "key")
+            assert len(pool) == 2
+            assert await response.aread() == b"audio"
+
+        await pool.get("http://127.0.0.1:2022/v1", "key")
+        assert len(pool) == 1
+        assert busy._client.is_closed
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_everything(self):
+        """Shutdown closes every pooled HTTP client."""
+        pool = make_pool()
+        client = await pool.get("http://127.0.0.1:8880/v1", "key")
+        await pool.aclose()
+
+        assert len(pool) == 0
+        assert client._client.is_closed
@@ -0,0 +1,142 @@
+"""Tests for following exchange logs across appends, rollover and restarts."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.exchanges.follower import ExchangeFollower, FollowPosition, InotifyWatch, create_watch
+
+
+def record(text):
+    return json.dumps({
+        "version": 2,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "conversation_id": "conv_test",
+        "type": "stt",
+        "text": text,
+    }) + "\n"
+
+
+def log_file(logs_dir, day):
+    return logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+
+
+def append(path, *texts):
+    with open(path, "a") as f:
+        f.write("".join(record(text) for text in texts))
+
+
+def drain(follower):
+    """Everything currently available, advancing the position like the iterators do."""
+    found, end = follower._read_available()
+    follower.position = end
+    return [exchange.text for exchange, _ in found]
+
+
+@pytest.fixture
+def today():
+    return datetime.now().date()
+
+
+class TestExchangeFollower:
+    """Test reading new lines and moving between files."""
+
+    def test_reads_only_new_complete_lines(self, tmp_path, today):
+        path = log_file(tmp_path, today)
+        append(path, "a", "b")
+        follower = ExchangeFollower(tmp_path)
+        assert drain(follower) == ["a", "b"]
+        assert drain(follower) == []
+
+        line = record("c")
+        with open(path, "a") as f:
+            f.write(line[:10])
+        assert drain(follower) == []
+        with open(path, "a") as f:
+            f.write(line[10:])
+        assert drain(follower) == ["c"]
+
+    def test_starts_with_last_lines(self, tmp_path, today):
+        append(log_file(tmp_path, today), *"abcde")
+        assert drain(ExchangeFollower(tmp_path, lines=2)) == ["d", "e"]
+        assert drain(ExchangeFollower(tmp_path, lines=10)) == list("abcde")
+
+    def test_follows_rollover_and_skips_missing_days(self, tmp_path, today):
+        append(log_file(tmp_path, today - timedelta(days=3)), "old")
+        append(log_file(tmp_path, today - timedelta(days=1)), "yesterday")
+        follower = ExchangeFollower(tmp_path, position=FollowPosition(today - timedelta(days=3)))
+        assert drain(follower) == ["old", "yesterday"]
+        assert follower.position == FollowPosition(today, 0)
+
+        append(log_file(tmp_path, today), "today")
+        assert drain(follower) == ["today"]
+
+    def test_resume_from_saved_position(self, tmp_path, today):
+        append(log_file(tmp_path, today), *"abcd")
+        follower = ExchangeFollower(tmp_path, use_inotify=False, poll_interval=0.01)
+        for exchange in follower:
+            if exchange.text == "b":
+                break
+        saved = FollowPosition.from_dict(json.loads(json.dumps(follower.position.to_dict())))
+        assert drain(ExchangeFollower(tmp_path, position=saved)) == ["c", "d"]
+
+    def test_truncated_file_is_read_from_start(self, tmp_path, today):
+        path = log_file(tmp_path, today)
+        append(path, "a", "b")
+        follower = ExchangeFollower(tmp_path)
+        drain(follower)
+        path.write_text(record("new"))
+        assert drain(follower) == ["new"]
+
+
+class TestFollowing:
+    """Test waiting for new exchanges."""
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_iterator_wakes_up_on_append(self, tmp_path, today, use_inotify):
+        follower = ExchangeFollower(tmp_path, use_inotify=use_inotify, poll_interval=0.05)
+        received = []
+
+        def consume():
+            for exchange in follower:
+                received.append((exchange.text, time.perf_counter()))
+                if len(received) == 2:
+                    break
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        time.sleep(0.1)
+        written = time.perf_counter()
+        append(log_file(tmp_path, today), "a", "b")
+        thread.join(timeout=2)
+        assert [text for text, _ in received] == ["a", "b"]
+        assert received[0][1] - written < 0.5
+
+    def test_inotify_used_on_linux(self, tmp_path):
+        import sys
+        watch = create_watch(tmp_path)
+        try:
+            if sys.platform.startswith("linux"):
+                assert isinstance(watch, InotifyWatch)
+        finally:
+            watch.close()
+
+    @pytest.mark.asyncio
+    async def test_async_iterator(self, tmp_path, today):
+        follower = ExchangeFollower(tmp_path, poll_interval=0.05)
+
+        async def first_two():
+            texts = []
+            async for exchange in follower:
+                texts.append(exchange.text)
+                if len(texts) == 2:
+                    return texts
+
+        task = asyncio.create_task(first_two())
+        await asyncio.sleep(0.1)
+        append(log_file(tmp_path, today), "x", "y")
+        assert await asyncio.wait_for(task, timeout=2) == ["x", "y"]
@@ -0,0 +1,139 @@
+"""Tests for the sidecar offset index of exchange logs."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from voice_mode.conversation_logger import ConversationLogger
+from voice_mode.exchanges.index import ExchangeIndex, index_path
+from voice_mode.exchanges.reader import ExchangeReader
+
+
+def record(conversation_id, timestamp, text):
+    return json.dumps({
+        "version": 2,
+        "timestamp": timestamp.isoformat(),
+        "conversation_id": conversation_id,
+        "type": "stt",
+        "text": text,
+    }) + "\n"
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ExchangeReader(base_dir=tmp_path)
+
+
+@pytest.fixture
+def log_file(reader):
+    """A log written before the index existed: three conversations interleaved."""
+    start = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+    path = reader.logs_dir / "exchanges_2025-03-01.jsonl"
+    with open(path, "w") as f:
+        for i in range(30):
+            f.write(record(f"conv_20250301_120000_{'abc'[i % 3]}", start + timedelta(minutes=i), f"line {i}"))
+    return path
+
+
+class TestExchangeIndex:
+    """Test index building, catching up and staleness."""
+
+    def test_builds_sidecar_for_unindexed_log(self, log_file):
+        index = ExchangeIndex(log_file)
+        entries = index.lookup_conversation("conv_20250301_120000_b")
+        assert [entry.offset for entry in entries] == sorted(entry.offset for entry in entries)
+        assert [exchange.text for exchange in index.read(entries)] == [f"line {i}" for i in range(1, 30, 3)]
+        assert len(index_path(log_file).read_text().splitlines()) == 31  # Header and one line per exchange
+
+    def test_catches_up_with_appended_lines(self, log_file):
+        index = ExchangeIndex(log_file)
+        assert len(index.lookup_conversation("conv_new")) == 0
+        with open(log_file, "a") as f:
+            f.write(record("conv_new", datetime.now(timezone.utc), "late"))
+            f.write('{"partial": ')  # Still being written
+        assert [exchange.text for exchange in index.read(index.lookup_conversation("conv_new"))] == ["late"]
+        assert len(ExchangeIndex(log_file).lookup_conversation("conv_new")) == 1
+
+    def test_partial_sidecar_does_not_hide_older_lines(self, log_file):
+        # The logger appends to a log that predates the index
+        from voice_mode.exchanges.index import IndexEntry, append_index_entries
+        line = record("conv_new", datetime.now(timezone.utc), "new")
+        offset = log_file.stat().st_size
+        with open(log_file, "a") as f:
+            f.write(line)
+        append_index_entries(log_file, [IndexEntry(offset, len(line), 0.0, "conv_new")])
+
+        assert len(ExchangeIndex(log_file).lookup_conversation("conv_20250301_120000_a")) == 10
+        # Once complete, a sidecar without the conversation is enough to skip the file
+        with patch.object(ExchangeIndex, "refresh", side_effect=AssertionError("should not load")):
+            assert ExchangeIndex(log_file).lookup_conversation("conv_missing") == []
+
+    def test_rewritten_log_is_reindexed(self, log_file):
+        ExchangeIndex(log_file).refresh()
+        log_file.write_text(record("conv_other", datetime.now(timezone.utc), "only"))
+        index = ExchangeIndex(log_file)
+        index.refresh()
+        assert len(index.entries) == 1
+        assert index.lookup_conversation("conv_20250301_120000_a") == []
+
+
+class TestIndexedReader:
+    """Test reader lookups through the index."""
+
+    def test_read_conversation_parses_only_matching_lines(self, reader, log_file):
+        from voice_mode.exchanges.models import Exchange
+        with patch.object(Exchange, "from_jsonl", wraps=Exchange.from_jsonl) as parse:
+            exchanges = reader.read_conversation("conv_20250301_120000_c")
+        assert [exchange.text for exchange in exchanges] == [f"line {i}" for i in range(2, 30, 3)]
+        assert parse.call_count == 10
+
+    def test_conversation_id_date_skips_older_logs(self, reader, log_file):
+        earlier = reader.logs_dir / "exchanges_2025-02-28.jsonl"
+        earlier.write_text(record("conv_20250301_120000_a", datetime(2025, 2, 28, tzinfo=timezone.utc), "x"))
+        assert len(reader.read_conversation("conv_20250301_120000_a")) == 10
+        assert not index_path(earlier).exists()
+
+    def test_read_range(self, reader, log_file):
+        start = datetime(2025, 3, 1, 12, 10, tzinfo=timezone.utc)
+        exchanges = list(reader.read_range(start, start + timedelta(minutes=4)))
+        assert [exchange.text for exchange in exchanges] == [f"line {i}" for i in range(10, 15)]
+
+    def test_stale_index_falls_back_to_scan(self, reader, log_file):
+        reader.read_conversation("conv_20250301_120000_a")
+        # Same size, different contents: the index now points at other conversations
+        lines = log_file.read_text().splitlines(keepends=True)
+        log_file.write_text("".join(lines[1:] + lines[:1]))
+        exchanges = reader.read_conversation("conv_20250301_120000_a")
+        assert sorted(exchange.text for exchange in exchanges) == sorted(f"line {i}" for i in range(0, 30, 3))
+
+    def test_invalid_exchange_is_skipped_without_reindexing(self, reader, log_file):
+        no_type = json.loads(record("conv_20250301_120000_a", datetime(2025, 3, 1, 13, tzinfo=timezone.utc), "x"))
+        del no_type["type"]
+        bad_metadata = json.loads(record("conv_20250301_120000_a", datetime(2025, 3, 1, 13, tzinfo=timezone.utc), "y"))
+        bad_metadata["metadata"] = {"provider": "kokoro"}  # No voice_mode_version
+        with open(log_file, "a") as f:
+            f.write(json.dumps(no_type) + "\n" + json.dumps(bad_metadata) + "\n")
+        reader.read_conversation("conv_20250301_120000_a")
+
+        with patch.object(ExchangeIndex, "rebuild") as rebuild:
+            exchanges = reader.read_conversation("conv_20250301_120000_a")
+            day = list(reader.read_range(datetime(2025, 3, 1, tzinfo=timezone.utc),
+                                         datetime(2025, 3, 2, tzinfo=timezone.utc)))
+        assert len(exchanges) == 10
+        assert len(day) == 30
+        rebuild.assert_not_called()
+
+    def test_logger_keeps_index_in_step(self, tmp_path):
+        conversation_logger = ConversationLogger(base_dir=tmp_path / "logs")
+        for i in range(3):
+            conversation_logger.log_stt(f"hello {i}")
+        log_file = conversation_logger._get_log_file_path(datetime.now().date())
+        index_lines = index_path(log_file).read_text().splitlines()[1:]
+        assert len(index_lines) == 3
+
+        reader = ExchangeReader(base_dir=tmp_path)
+        with patch.object(ExchangeIndex, "_scan", side_effect=AssertionError("should not scan")):
+            exchanges = reader.read_conversation(conversation_logger.conversation_id)
+        assert [exchange.text for exchange in exchanges] == ["hello 0", "hello 1", "hello 2"]
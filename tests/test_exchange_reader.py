@@ -0,0 +1,95 @@
+"""Tests for reading exchange logs from the end."""
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from voice_mode.exchanges.reader import ExchangeReader, read_lines_reversed
+
+
+def record(text, timestamp=None):
+    return json.dumps({
+        "version": 2,
+        "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
+        "conversation_id": "conv_test",
+        "type": "tts",
+        "text": text,
+    }) + "\n"
+
+
+class TestReadLinesReversed:
+    """Test the backward block reader."""
+
+    @pytest.mark.parametrize("block_size", [1, 3, 7, 64, 4096])
+    def test_lines_newest_first(self, tmp_path, block_size):
+        path = tmp_path / "lines.jsonl"
+        lines = [f"line {i} " + "x" * (i * 5) for i in range(20)]
+        path.write_bytes(("\n".join(lines) + "\n").encode())
+        assert [line.decode() for line in read_lines_reversed(path, block_size)] == lines[::-1]
+
+    def test_skips_partial_last_line_and_blank_lines(self, tmp_path):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"first\n\n  \nsecond\n{\"partial\": ")
+        assert list(read_lines_reversed(path, block_size=4)) == [b"second", b"first"]
+
+    def test_empty_and_unterminated_files(self, tmp_path):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"")
+        assert list(read_lines_reversed(path)) == []
+        path.write_bytes(b"no newline yet")
+        assert list(read_lines_reversed(path)) == []
+
+    def test_reads_only_the_end(self, tmp_path):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"".join(b"%05d\n" % i for i in range(100000)))
+
+        class CountingFile(io.BytesIO):
+            bytes_read = 0
+
+            def read(self, size=-1):
+                data = super().read(size)
+                CountingFile.bytes_read += len(data)
+                return data
+
+        with patch("builtins.open", lambda *args: CountingFile(path.read_bytes())):
+            lines = read_lines_reversed(path, block_size=1024)
+            assert [next(lines) for _ in range(3)] == [b"99999", b"99998", b"99997"]
+        assert CountingFile.bytes_read == 1024
+
+
+class TestLatestExchanges:
+    """Test newest-first reads in the reader."""
+
+    @pytest.fixture
+    def reader(self, tmp_path):
+        reader = ExchangeReader(base_dir=tmp_path)
+        today = datetime.now().date()
+        with open(reader._get_log_file_path(today), "w") as f:
+            for i in range(5):
+                f.write(record(f"today {i}"))
+        with open(reader._get_log_file_path(today - timedelta(days=2)), "w") as f:
+            for i in range(5):
+                f.write(record(f"earlier {i}"))
+        return reader
+
+    def test_latest_within_today(self, reader):
+        assert [e.text for e in reader.get_latest_exchanges(3)] == ["today 2", "today 3", "today 4"]
+
+    def test_latest_spans_days_in_order(self, reader):
+        texts = [e.text for e in reader.get_latest_exchanges(7)]
+        assert texts == ["earlier 3", "earlier 4", "today 0", "today 1", "today 2", "today 3", "today 4"]
+
+    def test_latest_stops_when_logs_run_out(self, reader):
+        assert len(reader.get_latest_exchanges(100)) == 10
+
+    def test_tail_without_follow(self, reader):
+        assert [e.text for e in reader.tail(follow=False, lines=2)] == ["today 3", "today 4"]
+        assert len(list(reader.tail(follow=False))) == 5
+
+    def test_bad_lines_are_skipped(self, reader):
+        with open(reader._get_log_file_path(datetime.now().date()), "a") as f:
+            f.write("not json\n")
+        assert [e.text for e in reader.get_latest_exchanges(2)] == ["today 3", "today 4"]
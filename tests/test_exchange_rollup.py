@@ -0,0 +1,107 @@
+"""Tests for daily rollups of exchange statistics."""
+
+import json
+import random
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.rollups import RollupStore, rollup_path
+from voice_mode.exchanges.stats import ExchangeAggregate, ExchangeStats
+
+
+def write_day(reader, day, count=30, seed=0):
+    """Log ``count`` exchanges spread over a local day."""
+    rng = random.Random(seed)
+    start = datetime.combine(day, time.min).astimezone()
+    lines = []
+    for i in range(count):
+        timestamp = start + timedelta(seconds=(i + 1) * 86000 // (count + 1))
+        kind = "stt" if i % 2 == 0 else "tts"
+        timing = (f"record {rng.uniform(1, 5):.2f}s, stt {rng.uniform(0.2, 1):.2f}s" if kind == "stt"
+                  else f"ttfa {rng.uniform(0.1, 1):.2f}s, gen {rng.uniform(0.5, 3):.2f}s")
+        metadata = ExchangeMetadata(voice_mode_version="1", provider=rng.choice(["openai", "kokoro"]),
+                                    voice=rng.choice(["af_sky", "nova"]), timing=timing)
+        exchange = Exchange(2, timestamp, f"conv_{day}_{i // 4}", kind, "some words", metadata=metadata)
+        lines.append(exchange.to_jsonl() + "\n")
+    with open(reader._get_log_file_path(day), "a") as f:
+        f.writelines(lines)
+
+
+@pytest.fixture
+def reader(tmp_path):
+    reader = ExchangeReader(base_dir=tmp_path)
+    today = datetime.now().date()
+    for back in range(5):
+        write_day(reader, today - timedelta(days=back), seed=back)
+    return reader
+
+
+class TestRollups:
+    """Test building, reusing and invalidating rollups."""
+
+    def test_aggregate_round_trip(self, reader):
+        day = datetime.now().date() - timedelta(days=1)
+        aggregate = ExchangeAggregate().update(reader.read_date(day))
+        restored = ExchangeAggregate.from_dict(json.loads(json.dumps(aggregate.to_dict())))
+        assert restored.to_dict() == aggregate.to_dict()
+        assert ExchangeStats.from_aggregate(restored).timing_stats() == \
+            ExchangeStats.from_aggregate(aggregate).timing_stats()
+
+    def test_range_matches_full_scan(self, reader):
+        now = datetime.now().astimezone()
+        start = now - timedelta(days=3, hours=5)
+        expected = ExchangeStats(reader.read_range(start, now))
+        for _ in range(2):  # Building the rollups, then using them
+            stats = ExchangeStats.from_range(start, now, reader)
+            assert stats.aggregate.total == expected.aggregate.total
+            assert stats.provider_breakdown() == expected.provider_breakdown()
+            assert stats.voice_breakdown() == expected.voice_breakdown()
+            assert stats.daily_distribution() == expected.daily_distribution()
+            timing, expected_timing = stats.timing_stats(), expected.timing_stats()
+            for kind in ("stt", "tts"):
+                for metric, values in expected_timing[kind].items():
+                    # Per-day sums add up in a different order
+                    assert timing[kind][metric] == pytest.approx(values)
+            assert stats.conversation_stats() == expected.conversation_stats()
+
+    def test_only_whole_closed_days_are_rolled_up(self, reader):
+        today = datetime.now().date()
+        start = datetime.combine(today - timedelta(days=3), time(12)).astimezone()
+        RollupStore(reader).range_aggregate(start, datetime.now().astimezone())
+        rolled = {back for back in range(5)
+                  if rollup_path(reader._get_log_file_path(today - timedelta(days=back))).exists()}
+        assert rolled == {1, 2}
+
+    def test_rollup_is_reused(self, reader):
+        day = datetime.now().date() - timedelta(days=2)
+        store = RollupStore(reader)
+        path = store.build(day)
+        data = json.loads(path.read_text())
+        data["aggregate"]["total"] = 12345
+        path.write_text(json.dumps(data))
+        assert store.day_aggregate(day).total == 12345
+
+    def test_stale_rollup_is_rebuilt(self, reader):
+        day = datetime.now().date() - timedelta(days=2)
+        store = RollupStore(reader)
+        assert store.day_aggregate(day).total == 30
+        write_day(reader, day, count=3, seed=9)  # Late writes into a closed day
+        assert store.day_aggregate(day).total == 33
+        assert json.loads(rollup_path(reader._get_log_file_path(day)).read_text())["aggregate"]["total"] == 33
+
+    def test_open_day_is_not_persisted(self, reader):
+        today = datetime.now().date()
+        store = RollupStore(reader)
+        assert store.day_aggregate(today).total == 30
+        assert store.build(today) is None
+        assert not rollup_path(reader._get_log_file_path(today)).exists()
+
+    def test_corrupt_rollup_and_missing_day(self, reader):
+        day = datetime.now().date() - timedelta(days=1)
+        rollup_path(reader._get_log_file_path(day)).write_text("{not json")
+        store = RollupStore(reader)
+        assert store.day_aggregate(day).total == 30
+        assert store.day_aggregate(day - timedelta(days=30)).total == 0
@@ -0,0 +1,129 @@
+"""Tests for single-pass, mergeable exchange statistics."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from voice_mode.exchanges.models import Exchange, ExchangeMetadata
+from voice_mode.exchanges.sketch import QuantileSketch, RunningStats
+from voice_mode.exchanges.stats import ExchangeAggregate, ExchangeStats
+
+
+def make_exchanges(count=200, seed=0):
+    rng = random.Random(seed)
+    timestamp = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+    exchanges = []
+    for i in range(count):
+        timestamp += timedelta(seconds=rng.randint(1, 3000))
+        kind = "stt" if i % 2 == 0 else "tts"
+        timing = (f"record {rng.uniform(1, 5):.2f}s, stt {rng.uniform(0.2, 1):.2f}s" if kind == "stt"
+                  else f"ttfa {rng.uniform(0.1, 1):.2f}s, gen {rng.uniform(0.5, 3):.2f}s, play {rng.uniform(1, 9):.2f}s")
+        metadata = ExchangeMetadata(
+            voice_mode_version="1", provider=rng.choice(["openai", "kokoro"]), timing=timing,
+            silence_detection={"enabled": rng.random() < 0.7} if kind == "stt" else None,
+            error="Connection refused" if rng.random() < 0.1 else None,
+        )
+        exchanges.append(Exchange(2, timestamp, f"conv_{i // 6}", kind, "a few words here", metadata=metadata))
+    return exchanges
+
+
+class TestQuantileSketch:
+    """Test accuracy and merging of the log-bucket sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        values = np.random.default_rng(0).lognormal(0, 1, 20000)
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.95, 0.99):
+            exact = np.quantile(values, q, method="lower")
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+    def test_merge_equals_combined(self):
+        a, b, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(np.linspace(-2, 50, 1001)):
+            (a if i % 3 else b).add(value)
+            combined.add(value)
+        a.merge(b)
+        assert a.to_dict() == combined.to_dict()
+        assert a.quantile(0.0) < 0 and a.quantile(1.0) == pytest.approx(50, rel=0.01)
+
+    def test_serialization_and_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        for value in (0.0, 1.0, 2.0, 3.0):
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+        assert restored.count == 4
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+    def test_mismatched_accuracy_rejected(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+    def test_running_stats_round_trip(self):
+        stats = RunningStats()
+        for value in (3.0, 1.0, 2.0):
+            stats.add(value)
+        restored = RunningStats.from_dict(stats.to_dict())
+        assert restored.summary() == stats.summary()
+        assert restored.summary()["avg"] == 2.0
+
+    def test_quantiles_stay_within_min_and_max(self):
+        stats = RunningStats()
+        for _ in range(5):
+            stats.add(1.2)
+        summary = stats.summary()
+        assert summary["p50"] == summary["p95"] == summary["p99"] == 1.2
+
+
+class TestExchangeAggregate:
+    """Test single-pass statistics and merging partial aggregates."""
+
+    def test_consumes_a_generator_once(self):
+        exchanges = make_exchanges()
+        stats = ExchangeStats(exchange for exchange in exchanges)
+        assert stats.aggregate.total == 200
+        timing = stats.timing_stats()
+        record = [float(e.metadata.timing.split()[1][:-2]) for e in exchanges if e.is_stt]
+        assert timing["stt"]["record"]["avg"] == pytest.approx(sum(record) / len(record))
+        assert timing["stt"]["record"]["max"] == max(record)
+        assert timing["overall"]["turnaround_count"] == 199
+        assert set(timing["tts"]) == {"ttfa", "generation", "playback"}
+
+    def test_merged_daily_partials_match_single_pass(self):
+        exchanges = make_exchanges(400)
+        single = ExchangeStats(exchanges)
+
+        partials = {}
+        for exchange in exchanges:
+            partials.setdefault(exchange.timestamp.date(), ExchangeAggregate()).add(exchange)
+        assert len(partials) > 2
+        merged = ExchangeAggregate()
+        for day in sorted(partials):
+            merged.merge(partials[day])
+        merged_stats = ExchangeStats.from_aggregate(merged)
+
+        for method in ("timing_stats", "conversation_stats", "error_stats", "silence_detection_stats",
+                       "provider_breakdown", "hourly_distribution", "daily_distribution"):
+            assert _close(getattr(merged_stats, method)(), getattr(single, method)()), method
+        assert merged_stats.get_summary_report() == single.get_summary_report()
+
+    def test_conversation_and_error_stats(self):
+        stats = ExchangeStats(make_exchanges(12))
+        conversations = stats.conversation_stats()
+        assert conversations["total_conversations"] == 2
+        assert conversations["exchanges_per_conversation"]["avg"] == 6
+        assert conversations["word_count"]["max"] == 24
+        errors = stats.error_stats()
+        assert errors["total_errors"] == errors["error_types"].get("network", 0)
+
+
+def _close(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_close(a[key], b[key]) for key in a)
+    if isinstance(a, float):
+        return a == pytest.approx(b)
+    return a == b
@@ -0,0 +1,174 @@
+"""Tests for hedged TTS requests."""
+
+import asyncio
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from voice_mode.hedging import HedgeError, HedgeOutcome, get_hedge_delay, race_first_chunk
+
+
+def make_source(chunks, first_delay=0.0, fail=None, closed=None):
+    """Build an attempt factory yielding ``chunks`` after ``first_delay``."""
+    async def source():
+        try:
+            await asyncio.sleep(first_delay)
+            if fail:
+                raise fail
+            for chunk in chunks:
+                yield chunk
+                await asyncio.sleep(0)
+        finally:
+            if closed is not None:
+                closed.append(True)
+    return source
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestRaceFirstChunk:
+    """Test racing endpoints for first audio."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_hedges(self):
+        """A primary that answers within the delay is used alone."""
+        started = []
+
+        def secondary():
+            started.append(True)
+            return make_source([b"b"])()
+
+        index, chunks = await race_first_chunk([make_source([b"a1", b"a2"]), secondary], hedge_delay=0.5)
+        assert index == 0
+        assert await collect(chunks) == [b"a1", b"a2"]
+        assert not started
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_and_is_cancelled(self):
+        """A slow primary is raced and cancelled when the hedge delivers first."""
+        closed = []
+        index, chunks = await race_first_chunk(
+            [make_source([b"slow"], first_delay=1.0, closed=closed), make_source([b"b1", b"b2"])],
+            hedge_delay=0.05
+        )
+        assert index == 1
+        assert await collect(chunks) == [b"b1", b"b2"]
+        await asyncio.sleep(0)
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_moves_on_immediately(self):
+        """A primary failure starts the next attempt without waiting for the delay."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        index, chunks = await race_first_chunk(
+            [make_source([], fail=RuntimeError("down")), make_source([b"ok"])],
+            hedge_delay=5.0
+        )
+        assert index == 1
+        assert await collect(chunks) == [b"ok"]
+        assert loop.time() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_all_fail(self):
+        """HedgeError is raised when no attempt produces audio."""
+        with pytest.raises(HedgeError):
+            await race_first_chunk(
+                [make_source([], fail=RuntimeError("down")), make_source([])],
+                hedge_delay=0.01
+            )
+
+
+    @pytest.mark.asyncio
+    async def test_outcome_reports_started_and_failed(self):
+        """The outcome lists only attempts that were started, and their errors."""
+        outcome = HedgeOutcome()
+        index, chunks = await race_first_chunk(
+            [make_source([], fail=RuntimeError("down")), make_source([b"ok"]), make_source([b"unused"])],
+            hedge_delay=5.0, outcome=outcome
+        )
+        assert index == 1
+        assert outcome.started == [0, 1]
+        assert list(outcome.failed) == [0]
+
+        outcome = HedgeOutcome()
+        index, chunks = await race_first_chunk(
+            [make_source([b"slow"], first_delay=1.0), make_source([b"fast"])], hedge_delay=0.05, outcome=outcome
+        )
+        assert index == 1
+        assert list(outcome.cancelled) == [0]
+        assert 0.04 < outcome.cancelled[0] < 0.5  # Ran without audio for about the hedge delay
+
+        outcome = HedgeOutcome()
+        with pytest.raises(HedgeError):
+            await race_first_chunk([make_source([], fail=RuntimeError("a")), make_source([], fail=RuntimeError("b"))],
+                                   hedge_delay=0.01, outcome=outcome)
+        assert outcome.started == [0, 1]
+        assert set(outcome.failed) == {0, 1}
+
+
+class TestHedgedTextToSpeech:
+    """Test which endpoints text_to_speech reports as attempted."""
+
+    PRIMARY = "http://127.0.0.1:8880/v1"
+    HEDGE = "https://api.openai.com/v1"
+
+    def failing_client(self):
+        client = MagicMock()
+        client.audio.speech.with_streaming_response.create.side_effect = RuntimeError("down")
+        return client
+
+    async def speak(self, streaming):
+        from voice_mode.core import text_to_speech
+
+        hedge = {'client': self.failing_client(), 'base_url': self.HEDGE, 'model': 'tts-1', 'voice': 'nova'}
+        with patch.dict(sys.modules, {'sounddevice': MagicMock()}), \
+             patch('voice_mode.config.STREAMING_ENABLED', streaming), \
+             patch('voice_mode.config.TTS_PIPELINE_ENABLED', False), \
+             patch('voice_mode.tts_cache.get_tts_cache', return_value=None):
+            return await text_to_speech(
+                "Hello there", {'tts': self.failing_client()}, 'tts-1', 'af_sky', self.PRIMARY,
+                audio_format='pcm', hedge_configs=[hedge]
+            )
+
+    @pytest.mark.asyncio
+    async def test_hedges_not_attempted_without_race(self):
+        success, metrics = await self.speak(streaming=False)
+        assert not success
+        assert metrics['attempted_urls'] == [self.PRIMARY]
+        assert 'hedge_failures' not in metrics
+
+    @pytest.mark.asyncio
+    async def test_failed_race_reports_every_endpoint(self):
+        success, metrics = await self.speak(streaming=True)
+        assert not success
+        assert metrics['attempted_urls'] == [self.PRIMARY, self.HEDGE]
+        assert set(metrics['hedge_failures']) == {self.PRIMARY, self.HEDGE}
+
+
+class TestHedgeDelay:
+    """Test choosing the hedge delay from measured latency."""
+
+    def test_uses_configured_delay_until_enough_samples(self):
+        from voice_mode.provider_discovery import LatencyStats
+
+        stats = LatencyStats()
+        for _ in range(5):
+            stats.record(200)
+        assert get_hedge_delay(0.8, None) == 0.8
+        assert get_hedge_delay(0.8, stats) == 0.8
+
+        for _ in range(20):
+            stats.record(300)
+        assert get_hedge_delay(0.8, stats) == pytest.approx(0.3)
+
+    def test_configured_delay_is_upper_bound(self):
+        from voice_mode.provider_discovery import LatencyStats
+
+        stats = LatencyStats()
+        for _ in range(30):
+            stats.record(2000)
+        assert get_hedge_delay(0.8, stats) == 0.8
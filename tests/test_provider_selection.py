@@ -1,10 +1,14 @@
 """Tests for voice-first provider selection logic."""
 
+import time
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timezone
 
-from voice_mode.provider_discovery import ProviderRegistry, EndpointInfo, detect_provider_type
+from voice_mode.provider_discovery import (
+    ProviderRegistry, EndpointInfo, LatencyStats, LATENCY_HALF_LIFE_S, detect_provider_type
+)
 from voice_mode.providers import get_tts_client_and_voice, _select_model_for_endpoint
 
 
@@ -207,4 +211,126 @@ class TestModelSelection:
         )
         
         # No models at all, fallback to tts-1
-        assert _select_model_for_endpoint(endpoint) == "tts-1"
\ No newline at end of file
+        assert _select_model_for_endpoint(endpoint) == "tts-1"
+
+class TestLatencyRanking:
+    """Test latency statistics and the 'fastest' selection policy."""
+    
+    URLS = ["http://replica-a:8880/v1", "http://replica-b:8880/v1", "http://replica-c:8880/v1"]
+    
+    def test_latency_stats(self):
+        registry = ProviderRegistry()
+        for latency in [100, 200, 300, 400, 1000]:
+            registry.record_latency("tts", self.URLS[0], latency)
+        
+        stats = registry.get_latency("tts", self.URLS[0])
+        assert stats.count == 5
+        assert stats.percentile(50) == 300
+        assert stats.percentile(95) == 1000
+        # EWMA weights recent samples more heavily than the mean
+        assert stats.ewma_ms > 400
+        assert registry.get_latency("tts", self.URLS[1]) is None
+    
+    def test_ordered_policy_keeps_configured_order(self):
+        registry = ProviderRegistry()
+        registry.record_latency("tts", self.URLS[0], 900)
+        registry.record_latency("tts", self.URLS[1], 100)
+        
+        with patch('voice_mode.provider_discovery.ENDPOINT_SELECTION', 'ordered'):
+            assert registry.rank_endpoints("tts", self.URLS) == self.URLS
+    
+    def test_fastest_policy(self):
+        registry = ProviderRegistry()
+        registry.record_latency("tts", self.URLS[0], 900)
+        registry.record_latency("tts", self.URLS[1], 100)
+        
+        with patch('voice_mode.provider_discovery.ENDPOINT_SELECTION', 'fastest'):
+            # Unmeasured replica-c is tried first so it gets measured, then fastest first
+            assert registry.rank_endpoints("tts", self.URLS) == [self.URLS[2], self.URLS[1], self.URLS[0]]
+            
+            registry.record_latency("tts", self.URLS[2], 500)
+            assert registry.rank_endpoints("tts", self.URLS) == [self.URLS[1], self.URLS[2], self.URLS[0]]
+    
+    def test_censored_samples_only_raise_the_estimate(self):
+        stats = LatencyStats()
+        stats.record(300)
+        stats.record_censored(100)  # Cancelled sooner than it usually answers: no news
+        assert stats.ewma_ms == 300
+        stats.record_censored(2000)  # Still silent after 2s: slower than thought
+        assert stats.ewma_ms > 300
+        assert list(stats.samples) == [300]
+        
+        unmeasured = LatencyStats()
+        unmeasured.record_censored(800)
+        assert unmeasured.ewma_ms == 800 and unmeasured.count == 0
+    
+    def test_stale_slow_endpoint_is_retried(self):
+        registry = ProviderRegistry()
+        now = time.monotonic()
+        registry.latency["tts"][self.URLS[0]] = LatencyStats()
+        registry.latency["tts"][self.URLS[0]].record(2000, now=now - 3 * LATENCY_HALF_LIFE_S)
+        registry.record_latency("tts", self.URLS[1], 300)
+        
+        with patch('voice_mode.provider_discovery.ENDPOINT_SELECTION', 'fastest'):
+            # 2000ms three half-lives ago scores 250ms: worth measuring again
+            assert registry.rank_endpoints("tts", self.URLS[:2]) == [self.URLS[0], self.URLS[1]]
+            registry.record_latency("tts", self.URLS[0], 2000)
+            assert registry.rank_endpoints("tts", self.URLS[:2]) == [self.URLS[1], self.URLS[0]]
+    
+    @pytest.mark.asyncio
+    async def test_voice_selection_prefers_fastest_endpoint(self):
+        registry = ProviderRegistry()
+        for url in self.URLS[:2]:
+            registry.registry["tts"][url] = EndpointInfo(
+                base_url=url,
+                healthy=True,
+                models=["tts-1"],
+                voices=["af_sky"],
+                last_health_check=datetime.now(timezone.utc).isoformat(),
+                provider_type="kokoro"
+            )
+        registry._initialized = True
+        registry.record_latency("tts", self.URLS[0], 800)
+        registry.record_latency("tts", self.URLS[1], 150)
+        
+        with patch('voice_mode.providers.provider_registry', registry), \
+             patch('voice_mode.provider_discovery.provider_registry', registry), \
+             patch('voice_mode.providers.get_preferred_voices', return_value=[]), \
+             patch('voice_mode.providers.TTS_VOICES', ['af_sky']), \
+             patch('voice_mode.providers.TTS_BASE_URLS', self.URLS[:2]), \
+             patch('voice_mode.provider_discovery.ENDPOINT_SELECTION', 'fastest'):
+            client, voice, model, endpoint = await get_tts_client_and_voice()
+        
+        assert endpoint.base_url == self.URLS[1]
+
+
+    def test_registry_shows_endpoint_with_only_censored_latency(self, conversation):
+        """An endpoint that only lost hedged races has an EWMA but no percentiles."""
+        stats = LatencyStats()
+        stats.record_censored(5000.0)
+        assert conversation._format_latency(stats.to_dict()) == "EWMA 5000ms (no completed samples)"
+
+        stats.record(200.0)
+        assert conversation._format_latency(stats.to_dict()) == "EWMA 3560ms, p50 200ms, p95 200ms (1 samples)"
+
+
+class TestPcmSampleRates:
+    """Test how the sample rate of raw PCM from a TTS endpoint is resolved."""
+    
+    def test_known_provider_rates(self):
+        registry = ProviderRegistry()
+        assert registry.get_pcm_sample_rate("https://api.openai.com/v1") == 24000
+        assert registry.get_pcm_sample_rate("http://127.0.0.1:8880/v1") == 24000
+        with patch('voice_mode.provider_discovery.SAMPLE_RATE', 16000):
+            assert registry.get_pcm_sample_rate("http://127.0.0.1:9999/v1") == 16000
+    
+    def test_announced_rate_overrides_known(self):
+        registry = ProviderRegistry()
+        registry.set_pcm_sample_rate("http://127.0.0.1:8880/v1", 22050)
+        assert registry.get_pcm_sample_rate("http://127.0.0.1:8880/v1") == 22050
+    
+    def test_configured_rate_wins(self):
+        registry = ProviderRegistry()
+        registry.set_pcm_sample_rate("http://127.0.0.1:8880/v1", 22050)
+        with patch.dict('voice_mode.provider_discovery.TTS_PCM_SAMPLE_RATES', {"http://127.0.0.1:8880/v1": 44100}):
+            assert registry.get_pcm_sample_rate("http://127.0.0.1:8880/v1") == 44100
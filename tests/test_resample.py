@@ -0,0 +1,91 @@
+"""Tests for the streaming polyphase resampler."""
+
+import numpy as np
+import pytest
+
+from voice_mode.resample import PolyphaseResampler, resample
+
+
+def sine(freq, rate, seconds=1.0, amplitude=10000):
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def rms(x):
+    return float(np.sqrt(np.mean(np.asarray(x, dtype=np.float64) ** 2)))
+
+
+class TestPolyphaseResampler:
+    """Test rational-factor resampling."""
+
+    @pytest.mark.parametrize("in_rate,out_rate", [(24000, 16000), (16000, 24000), (44100, 16000), (48000, 24000)])
+    def test_output_length(self, in_rate, out_rate):
+        x = sine(440, in_rate)
+        assert len(resample(x, in_rate, out_rate)) == out_rate
+        assert len(resample(x[:1001], in_rate, out_rate)) == -(-1001 * out_rate // in_rate)
+
+    def test_chunked_matches_one_shot(self):
+        x = sine(1000, 24000)
+        one_shot = resample(x, 24000, 16000)
+
+        resampler = PolyphaseResampler(24000, 16000)
+        resampler.skip_group_delay()
+        chunked = np.concatenate([resampler.process_int16(x[i:i + 700]) for i in range(0, len(x), 700)])
+        np.testing.assert_array_equal(chunked, one_shot[:len(chunked)])
+
+    @pytest.mark.parametrize("in_rate,out_rate", [(24000, 16000), (16000, 48000), (44100, 48000)])
+    def test_one_shot_is_aligned_and_complete(self, in_rate, out_rate):
+        for position in (in_rate // 2, in_rate - 1):
+            x = np.zeros(in_rate, dtype=np.float64)
+            x[position] = 1.0
+            y = resample(x, in_rate, out_rate)
+            # The impulse stays where it was, including one at the very last sample
+            assert abs(np.argmax(y) - position * out_rate / in_rate) <= 1
+            assert y.max() > 0.5 * min(1.0, out_rate / in_rate)
+
+    def test_vad_frames_are_exact(self):
+        # 30ms at 24kHz becomes exactly one 30ms WebRTC VAD frame at 16kHz
+        resampler = PolyphaseResampler(24000, 16000)
+        x = sine(300, 24000)
+        assert {len(resampler.process_int16(x[i:i + 720])) for i in range(0, 23040, 720)} == {480}
+
+    def test_passband_preserved(self):
+        y = resample(sine(1000, 24000), 24000, 16000)
+        steady = y[200:-200]
+        assert rms(steady) == pytest.approx(10000 / np.sqrt(2), rel=0.01)
+
+        # Dominant frequency is still 1kHz
+        spectrum = np.abs(np.fft.rfft(steady))
+        freqs = np.fft.rfftfreq(len(steady), 1 / 16000)
+        assert freqs[np.argmax(spectrum)] == pytest.approx(1000, abs=2)
+
+    def test_aliasing_rejected(self):
+        # 10kHz is above the 8kHz Nyquist limit of the output and must not fold back to 6kHz
+        y = resample(sine(10000, 24000), 24000, 16000)
+        assert rms(y[200:]) < 10
+
+    def test_int16_clipping(self):
+        x = np.tile(np.array([32767, -32768], dtype=np.int16), 1000)
+        y = PolyphaseResampler(24000, 16000).process_int16(x)
+        assert y.dtype == np.int16
+
+    def test_same_rate_is_passthrough(self):
+        x = sine(440, 16000)
+        assert resample(x, 16000, 16000) is x
+
+    def test_flush_returns_filter_tail(self):
+        x = sine(440, 24000, seconds=0.5)
+        resampler = PolyphaseResampler(24000, 48000)
+        body = resampler.process_int16(x)
+        tail = resampler.flush_int16()
+        # The filter delays its output by half its length; flushing plays that out
+        assert len(tail) == 2 * (resampler.taps_per_phase // 2)
+        assert rms(tail[:len(tail) // 2]) > 1000
+        # The resampler is ready for the next stream
+        np.testing.assert_array_equal(resampler.process_int16(x), body)
+
+    def test_multichannel(self):
+        stereo = np.column_stack((sine(440, 48000), sine(440, 48000, amplitude=5000)))
+        y = resample(stereo, 48000, 24000)
+        assert y.shape == (24000, 2)
+        assert rms(y[:, 0]) == pytest.approx(2 * rms(y[:, 1]), rel=0.01)
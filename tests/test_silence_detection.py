@@ -140,17 +140,27 @@ class TestSilenceDetection:
             assert np.array_equal(result, np.array([1, 2, 3]))
     
     @patch('voice_mode.tools.conversation.DISABLE_SILENCE_DETECTION', False)
-    @patch('voice_mode.tools.conversation.VAD_AVAILABLE', False)
+    @patch('voice_mode.tools.conversation.RECORDING_STALL_TIMEOUT_S', 0.2)
+    @patch('voice_mode.vad.WEBRTCVAD_AVAILABLE', False)
     def test_vad_not_available(self):
-        """Test fallback when webrtcvad is not available."""
-        with patch('voice_mode.tools.conversation.record_audio') as mock_record:
-            mock_record.return_value = np.array([1, 2, 3])
-            
-            result = record_audio_with_silence_detection(max_duration=5.0)
-            
-            # Should fall back to regular recording
-            mock_record.assert_called_once_with(5.0)
-            assert np.array_equal(result, np.array([1, 2, 3]))
+        """Without webrtcvad, silence detection uses the energy VAD instead of fixed duration recording."""
+        from voice_mode.vad import EnergyVAD, create_vad
+        
+        created = []
+        
+        def track_create_vad(*args, **kwargs):
+            created.append(create_vad(*args, **kwargs))
+            return created[-1]
+        
+        with patch('voice_mode.tools.conversation.record_audio') as mock_record, \
+             patch('voice_mode.tools.conversation.sd'), \
+             patch('voice_mode.tools.conversation.PERSISTENT_CAPTURE', False), \
+             patch('voice_mode.tools.conversation.create_vad', side_effect=track_create_vad):
+            record_audio_with_silence_detection(max_duration=5.0)
+        
+        mock_record.assert_not_called()
+        assert len(created) == 1
+        assert isinstance(created[0], EnergyVAD)
     
     @pytest.mark.skip(reason="Mock sounddevice.rec() causing test to hang")
     @patch('voice_mode.tools.conversation.DISABLE_SILENCE_DETECTION', False)
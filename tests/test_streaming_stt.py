@@ -0,0 +1,113 @@
+"""Tests for streaming (segmented) speech-to-text."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from voice_mode.streaming_stt import SegmentedTranscriber, SegmentTranscriptionError
+
+
+class TestSegmentedTranscriber:
+    """Test concurrent transcription of recorded segments."""
+
+    @pytest.mark.asyncio
+    async def test_segments_from_thread_joined_in_order(self):
+        """Segments submitted from the recording thread are joined in recording order."""
+        async def transcribe(segment):
+            # Later segments finish first
+            await asyncio.sleep(0.01 * (3 - segment[0]))
+            return f"part{segment[0]}"
+
+        transcriber = SegmentedTranscriber(transcribe)
+
+        def record():
+            for i in range(3):
+                transcriber.submit(np.full(10, i, dtype=np.int16))
+
+        thread = threading.Thread(target=record)
+        thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+        assert transcriber.segment_count == 3
+        assert await transcriber.finish() == "part0 part1 part2"
+
+    @pytest.mark.asyncio
+    async def test_empty_segments_skipped(self):
+        """An empty segment does not discard the others."""
+        results = iter([" hello ", None, "world"])
+
+        async def transcribe(segment):
+            return next(results)
+
+        transcriber = SegmentedTranscriber(transcribe)
+        for _ in range(3):
+            transcriber.submit(np.zeros(10, dtype=np.int16))
+
+        assert await transcriber.finish() == "hello world"
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_requires_fallback(self):
+        """A failed segment is reported rather than silently dropped from the text."""
+        results = iter([" hello ", RuntimeError("endpoint down"), "world"])
+
+        async def transcribe(segment):
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        transcriber = SegmentedTranscriber(transcribe)
+        for _ in range(3):
+            transcriber.submit(np.zeros(10, dtype=np.int16))
+
+        with pytest.raises(SegmentTranscriptionError, match="2 of 3"):
+            await transcriber.finish()
+
+    @pytest.mark.asyncio
+    async def test_no_text(self):
+        """None is returned when nothing was transcribed."""
+        async def transcribe(segment):
+            return None
+
+        transcriber = SegmentedTranscriber(transcribe)
+        transcriber.submit(np.zeros(10, dtype=np.int16))
+        assert await transcriber.finish() is None
+
+
+class TestSegmentFailover:
+    """Test the STT failover path used for partial segments."""
+
+    @pytest.fixture
+    def registry(self):
+        registry = MagicMock()
+        registry.rank_endpoints.return_value = ["http://127.0.0.1:2022/v1"]
+        registry.mark_unhealthy = AsyncMock()
+        with patch('voice_mode.provider_discovery.provider_registry', registry):
+            yield registry
+
+    async def transcribe_segment(self, conversation, internal_result):
+        """Run one segment through the failover loop with a single endpoint."""
+        with patch.object(conversation, 'get_stt_client',
+                          AsyncMock(return_value=(MagicMock(), "whisper-1", None))), \
+             patch.object(conversation, '_speech_to_text_internal', AsyncMock(return_value=internal_result)):
+            transcriber = SegmentedTranscriber(
+                lambda segment: conversation.speech_to_text(segment, log_result=False, raise_on_failure=True)
+            )
+            transcriber.submit(np.ones(10, dtype=np.int16))
+            return await transcriber.finish()
+
+    @pytest.mark.asyncio
+    async def test_segment_without_speech_is_not_a_failure(self, conversation, registry):
+        """A breath or cough segment leaves the endpoint healthy."""
+        assert await self.transcribe_segment(conversation, "") is None
+        registry.mark_unhealthy.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_endpoint_failure_reaches_finish(self, conversation, registry):
+        """A segment no endpoint could transcribe makes ``finish`` raise."""
+        with pytest.raises(SegmentTranscriptionError, match="1 of 1"):
+            await self.transcribe_segment(conversation, None)
+        registry.mark_unhealthy.assert_called_once()
@@ -0,0 +1,93 @@
+"""Tests for the content-addressed TTS audio cache."""
+
+import os
+
+import numpy as np
+import pytest
+
+from voice_mode.tts_cache import TTSCache, make_cache_key
+
+
+def tone(n, value=1000):
+    return np.full(n, value, dtype=np.int16)
+
+
+class TestCacheKey:
+    """Test cache key construction."""
+
+    def test_same_request_same_key(self):
+        a = make_cache_key("Done.", "af_sky", "tts-1", None, "pcm", "kokoro")
+        b = make_cache_key("Done.", "af_sky", "tts-1", "", "pcm", "kokoro")
+        assert a == b
+
+    @pytest.mark.parametrize("change", [
+        ("Done!", "af_sky", "tts-1", None, "pcm", "kokoro"),
+        ("Done.", "nova", "tts-1", None, "pcm", "kokoro"),
+        ("Done.", "af_sky", "tts-1-hd", None, "pcm", "kokoro"),
+        ("Done.", "af_sky", "tts-1", "cheerful", "pcm", "kokoro"),
+        ("Done.", "af_sky", "tts-1", None, "mp3", "kokoro"),
+        ("Done.", "af_sky", "tts-1", None, "pcm", "openai"),
+    ])
+    def test_any_difference_changes_key(self, change):
+        assert make_cache_key(*change) != make_cache_key("Done.", "af_sky", "tts-1", None, "pcm", "kokoro")
+
+
+class TestTTSCache:
+    """Test memory and disk tiers."""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache = TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=10**6)
+        assert cache.get("k") is None
+
+        cache.put("k", tone(2400), 24000)
+        samples, rate = cache.get("k")
+        assert rate == 24000
+        np.testing.assert_array_equal(samples, tone(2400))
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=10**6).put("k", tone(100, -7), 16000)
+
+        cache = TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=10**6)
+        samples, rate = cache.get("k")
+        assert rate == 16000
+        np.testing.assert_array_equal(samples, tone(100, -7))
+        assert "k" in cache._memory  # Promoted to memory
+
+    def test_memory_lru_eviction(self, tmp_path):
+        cache = TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=2 * 200)
+        cache.put("a", tone(100), 24000)
+        cache.put("b", tone(100), 24000)
+        cache.get("a")  # "a" becomes most recently used
+        cache.put("c", tone(100), 24000)
+
+        assert list(cache._memory) == ["a", "c"]
+        assert cache._memory_bytes == 400
+
+    def test_disk_size_eviction(self, tmp_path):
+        entry_size = 44 + 200
+        cache = TTSCache(tmp_path, max_bytes=2 * entry_size, memory_max_bytes=0)
+        for i, key in enumerate(["a", "b"]):
+            cache.put(key, tone(100), 24000)
+            os.utime(tmp_path / f"{key}.wav", (1000 + i, 1000 + i))
+
+        cache.get("a")  # Touches "a", so "b" is now least recently used
+        cache.put("c", tone(100), 24000)
+
+        assert sorted(p.stem for p in tmp_path.glob("*.wav")) == ["a", "c"]
+        assert cache._disk_bytes == 2 * entry_size
+
+    def test_overwrite_is_not_counted_twice(self, tmp_path):
+        cache = TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=0)
+        for _ in range(3):
+            cache.put("a", tone(100), 24000)
+
+        assert cache._disk_bytes == 44 + 200
+        assert [p.name for p in tmp_path.iterdir()] == ["a.wav"]
+
+    def test_clear(self, tmp_path):
+        cache = TTSCache(tmp_path, max_bytes=10**6, memory_max_bytes=10**6)
+        cache.put("k", tone(10), 24000)
+        cache.clear()
+        assert cache.get("k") is None
+        assert not list(tmp_path.glob("*.wav"))
@@ -0,0 +1,180 @@
+"""Tests for sentence-pipelined TTS."""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from voice_mode.tts_pipeline import split_sentences, play_pipelined
+
+
+class TestSplitSentences:
+    """Test splitting text into synthesis segments."""
+
+    def test_splits_on_sentence_boundaries(self):
+        text = "The build finished without errors. All 42 tests passed! Shall I open a pull request?"
+        assert split_sentences(text) == [
+            "The build finished without errors.",
+            "All 42 tests passed!",
+            "Shall I open a pull request?",
+        ]
+
+    def test_splits_on_line_breaks(self):
+        assert split_sentences("First paragraph here\n\nSecond paragraph here") == [
+            "First paragraph here",
+            "Second paragraph here",
+        ]
+
+    def test_short_fragments_are_merged(self):
+        assert split_sentences("Yes. I fixed the flaky test in the parser.") == [
+            "Yes. I fixed the flaky test in the parser.",
+        ]
+        assert split_sentences("I fixed the flaky test in the parser. Done.") == [
+            "I fixed the flaky test in the parser. Done.",
+        ]
+
+    def test_decimals_and_closing_quotes(self):
+        text = 'Version 2.5 is out. He said "ship it." Then we did.'
+        assert split_sentences(text, min_chars=1) == [
+            "Version 2.5 is out.",
+            'He said "ship it."',
+            "Then we did.",
+        ]
+
+    def test_long_sentences_split_on_clauses(self):
+        text = "When the cache is cold, the first request is slow, but later requests are fast"
+        assert split_sentences(text, max_chars=40, min_chars=1) == [
+            "When the cache is cold,",
+            "the first request is slow,",
+            "but later requests are fast",
+        ]
+
+    def test_long_clauses_split_on_words(self):
+        text = "one two three four five six seven eight nine ten eleven twelve"
+        segments = split_sentences(text, max_chars=20, min_chars=1)
+        assert all(len(segment) <= 20 for segment in segments)
+        assert " ".join(segments) == text
+
+    def test_empty_text(self):
+        assert split_sentences("   ") == []
+
+
+class TestPlayPipelined:
+    """Test concurrent synthesis with in-order playback."""
+
+    @pytest.mark.asyncio
+    async def test_plays_in_order_despite_completion_order(self):
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+
+        async def synthesize(segment):
+            await asyncio.sleep(delays[segment])
+            return np.array([ord(segment)], dtype=np.int16)
+
+        written = []
+        metrics = await play_pipelined(["a", "b", "c"], synthesize, written.append, concurrency=3)
+
+        assert [int(w[0]) for w in written] == [ord("a"), ord("b"), ord("c")]
+        assert metrics.segments == 3
+        assert metrics.ttfa >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        in_flight = 0
+        peak = 0
+
+        async def synthesize(segment):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return np.zeros(1, dtype=np.int16)
+
+        await play_pipelined(list("abcdef"), synthesize, lambda s: None, concurrency=2)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_outstanding_requests(self):
+        cancelled = []
+
+        async def synthesize(segment):
+            if segment == "b":
+                raise RuntimeError("endpoint down")
+            try:
+                await asyncio.sleep(1.0 if segment != "a" else 0)
+            except asyncio.CancelledError:
+                cancelled.append(segment)
+                raise
+            return np.zeros(1, dtype=np.int16)
+
+        written = []
+        with pytest.raises(RuntimeError):
+            await play_pipelined(["a", "b", "c"], synthesize, written.append, concurrency=3)
+        assert len(written) == 1
+        assert cancelled == ["c"]
+
+
+class FakeSession:
+    def __init__(self):
+        self.written = []
+        self.drained = False
+        self.aborted = False
+        self.started_at = self.finished_at = self.output_latency = None
+
+    def write(self, samples, **kwargs):
+        self.written.append(samples)
+
+    def drain(self, timeout=None):
+        self.drained = True
+        return True
+
+    def abort(self):
+        self.aborted = True
+
+    def close(self):
+        pass
+
+
+class TestPipelinedTextToSpeech:
+    """Test how pipelined TTS reports a failure part-way through."""
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_hands_remainder_to_failover(self):
+        from voice_mode.core import _pipelined_text_to_speech
+
+        segments = ["First sentence here.", "Second one follows.", "Third never arrives.", "Nor the fourth."]
+
+        @asynccontextmanager
+        async def create(input, **kwargs):
+            if input == segments[2]:
+                raise RuntimeError("endpoint down")
+            response = MagicMock()
+
+            async def read():
+                return np.full(240, len(input), dtype=np.int16).tobytes()
+            response.read = read
+            yield response
+
+        client = MagicMock()
+        client.audio.speech.with_streaming_response.create = create
+        session = FakeSession()
+        service = MagicMock()
+        service.open_session.return_value = session
+        metrics = {}
+
+        with patch.dict(sys.modules, {'sounddevice': MagicMock()}), \
+             patch('voice_mode.audio_output.get_output_service', return_value=service), \
+             patch('voice_mode.audio_output.get_output_rate', return_value=24000), \
+             patch('voice_mode.tts_cache.get_tts_cache', return_value=None), \
+             patch('voice_mode.config.TTS_PIPELINE_CONCURRENCY', 1):
+            success, metrics = await _pipelined_text_to_speech(
+                segments, client, "tts-1", "af_sky", "http://127.0.0.1:8880/v1", "pcm", None, metrics
+            )
+
+        assert not success
+        assert len(session.written) == 2
+        assert session.drained  # The first two sentences are played out, not dropped
+        assert metrics['unplayed_text'] == "Third never arrives. Nor the fourth."
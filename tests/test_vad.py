@@ -0,0 +1,124 @@
+"""Tests for the pluggable VAD engines."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from voice_mode.vad import EnergyVAD, VoiceActivityDetector, _ResamplingDetector, create_vad
+
+RATE = 24000
+CHUNK = 720  # 30ms at 24kHz
+
+
+def voiced(seconds, f0=140, amplitude=6000, seed=0):
+    """Harmonic-rich signal resembling a sustained vowel."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    signal = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 12))
+    noise = np.random.default_rng(seed).normal(0, 60, len(t))
+    return np.clip(signal * amplitude + noise, -32768, 32767).astype(np.int16)
+
+
+def noise(seconds, level=60, seed=1):
+    return np.clip(np.random.default_rng(seed).normal(0, level, int(RATE * seconds)), -32768, 32767).astype(np.int16)
+
+
+def classify(vad, samples):
+    return [vad.is_speech(samples[i:i + CHUNK]) for i in range(0, len(samples) - CHUNK + 1, CHUNK)]
+
+
+class TestEnergyVAD:
+    """Test the NumPy energy/zero-crossing/flatness detector."""
+
+    def test_speech_between_silence(self):
+        vad = EnergyVAD(RATE, aggressiveness=2)
+        decisions = classify(vad, np.concatenate((noise(0.5), voiced(0.6), noise(1.0))))
+
+        lead, speech, tail = decisions[:16], decisions[17:36], decisions[-20:]
+        assert not any(lead)
+        assert all(speech)
+        assert not any(tail)
+
+    def test_loud_broadband_noise_is_not_speech(self):
+        # Noise 30dB louder than the calibration period is flat and crosses zero often
+        vad = EnergyVAD(RATE, aggressiveness=2)
+        decisions = classify(vad, np.concatenate((noise(0.3), noise(1.0, level=2000, seed=2))))
+        assert not any(decisions)
+
+    def test_noise_floor_adapts(self):
+        vad = EnergyVAD(RATE)
+        classify(vad, noise(1.0, level=30))
+        quiet_floor = vad.noise_floor_db
+        classify(vad, noise(3.0, level=600, seed=3))
+        assert vad.noise_floor_db > quiet_floor + 20
+
+    def test_hangover_bridges_short_gaps(self):
+        vad = EnergyVAD(RATE)
+        decisions = classify(vad, np.concatenate((noise(0.3), voiced(0.3), noise(0.06), voiced(0.3))))
+        assert all(decisions[11:])
+
+    def test_features_are_per_subframe(self):
+        vad = EnergyVAD(RATE)
+        energy, zcr, flatness = vad.features(voiced(0.03))
+        assert len(energy) == len(zcr) == len(flatness) == 3
+
+    def test_stats(self):
+        vad = EnergyVAD(RATE)
+        decisions = classify(vad, np.concatenate((noise(0.3), voiced(0.3))))
+        assert vad.stats.frames == len(decisions)
+        assert vad.stats.speech_frames == sum(decisions)
+        assert vad.stats.max_frame_time >= vad.stats.mean_frame_time > 0
+        assert "energy VAD" in vad.describe()
+
+        vad.reset()
+        assert vad.stats.frames == 0
+        assert vad.noise_floor_db is None
+
+
+class TestResamplingDetector:
+    """Test window carry-over for detectors running at their own rate."""
+
+    def test_windows_are_exact_and_decisions_carry_over(self):
+        windows = []
+
+        class Recorder(_ResamplingDetector):
+            model_rate = 16000
+            window = 512
+
+            def _classify_window(self, window):
+                windows.append(len(window))
+                return True
+
+        vad = Recorder(RATE)
+        # The first 30ms chunk resamples to ~480 samples: no complete window yet
+        assert vad.is_speech(np.zeros(CHUNK, dtype=np.int16)) is False
+        for _ in range(10):
+            vad.is_speech(np.zeros(CHUNK, dtype=np.int16))
+        assert set(windows) == {512}
+        assert len(windows) == (11 * 480) // 512
+
+
+    def test_incomplete_engine_fails_at_construction(self):
+        class Incomplete(_ResamplingDetector):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete(RATE)
+
+
+class TestCreateVad:
+    """Test engine selection and fallback."""
+
+    def test_energy(self):
+        assert isinstance(create_vad("energy", RATE), EnergyVAD)
+
+    @patch('voice_mode.vad.WEBRTCVAD_AVAILABLE', False)
+    @pytest.mark.parametrize("engine", ["auto", "webrtc", "bogus"])
+    def test_falls_back_to_energy_without_webrtcvad(self, engine):
+        assert isinstance(create_vad(engine, RATE), EnergyVAD)
+
+    @patch('voice_mode.vad.WEBRTCVAD_AVAILABLE', False)
+    def test_onnx_without_model_falls_back(self):
+        vad = create_vad("onnx", RATE, model_path="")
+        assert isinstance(vad, VoiceActivityDetector)
+        assert vad.name == "energy"
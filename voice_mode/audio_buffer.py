@@ -0,0 +1,260 @@
+"""
+Preallocated audio buffers for voice-mode.
+
+These buffers avoid per-sample Python overhead on the audio paths by moving
+whole blocks of samples with NumPy slice copies.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Single-producer/single-consumer ring buffer backed by a NumPy array.
+
+    One thread (typically the decoder/network side) calls ``write`` and one
+    thread (typically the PortAudio callback) calls ``read_into``. Each side
+    only ever advances its own position counter, so no lock is taken on the
+    hot path. The counters grow monotonically and are reduced modulo the
+    capacity when indexing, which keeps the full/empty distinction trivial.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32, channels: int = 1):
+        """Create a ring buffer.
+
+        Args:
+            capacity: Maximum number of frames the buffer can hold
+            dtype: NumPy dtype of the stored samples
+            channels: Number of interleaved channels per frame
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = int(capacity)
+        self.channels = channels
+        shape = (self.capacity,) if channels == 1 else (self.capacity, channels)
+        self._data = np.zeros(shape, dtype=dtype)
+
+        # Written only by the producer / consumer respectively
+        self._write_pos = 0
+        self._read_pos = 0
+
+    @property
+    def available(self) -> int:
+        """Number of frames ready to be read."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Number of frames that can be written without overrunning."""
+        return self.capacity - self.available
+
+    def write(self, samples: np.ndarray) -> int:
+        """Copy as many frames as fit into the buffer (producer side).
+
+        Args:
+            samples: Block of frames to append
+
+        Returns:
+            Number of frames actually written. Anything beyond that did not
+            fit and is left to the caller to retry or account as an overrun.
+        """
+        count = min(len(samples), self.free)
+        if count <= 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        if count > first:
+            self._data[:count - first] = samples[first:count]
+
+        # Publish only after the data is in place
+        self._write_pos += count
+        return count
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Fill ``out`` from the buffer (consumer side).
+
+        Frames that cannot be satisfied are zero-filled so the output device
+        plays silence instead of stale data.
+
+        Args:
+            out: Destination array, e.g. the ``outdata`` of a sounddevice callback
+
+        Returns:
+            Number of frames copied from the buffer
+        """
+        frames = len(out)
+        count = min(frames, self.available)
+
+        if count > 0:
+            start = self._read_pos % self.capacity
+            first = min(count, self.capacity - start)
+            out[:first] = self._data[start:start + first].reshape(out[:first].shape)
+            if count > first:
+                out[first:count] = self._data[:count - first].reshape(out[first:count].shape)
+            self._read_pos += count
+
+        if count < frames:
+            out[count:] = 0
+
+        return count
+
+    def read(self, frames: int) -> np.ndarray:
+        """Read up to ``frames`` frames into a new array (consumer side)."""
+        count = min(frames, self.available)
+        shape = (count,) if self.channels == 1 else (count, self.channels)
+        out = np.empty(shape, dtype=self._data.dtype)
+        self.read_into(out)
+        return out
+
+    def clear(self) -> None:
+        """Drop all buffered frames (consumer side)."""
+        self._read_pos = self._write_pos
+
+
+class RecordingBuffer:
+    """Append-only, growable sample buffer for microphone recordings.
+
+    The PortAudio callback appends blocks in place with ``write`` and the
+    recording loop reads read-only views of what has been written so far.
+    Storage is preallocated and doubled when full (up to ``max_frames``), so
+    a turn allocates a handful of times instead of once per callback block.
+    Frames are never overwritten, so views stay valid after the buffer grows
+    (they keep referencing the old storage, which holds the same data).
+    """
+
+    def __init__(self, initial_frames: int, max_frames: Optional[int] = None, dtype=np.int16):
+        """Create a recording buffer.
+
+        Args:
+            initial_frames: Frames to preallocate
+            max_frames: Hard limit; frames beyond it are dropped and counted
+            dtype: NumPy dtype of the stored samples
+        """
+        if initial_frames <= 0:
+            raise ValueError("initial_frames must be positive")
+
+        self.max_frames = max_frames
+        self._data = np.empty(int(initial_frames), dtype=dtype)
+        self._write_pos = 0
+        self.dropped = 0
+
+    @property
+    def frames(self) -> int:
+        """Number of frames written so far."""
+        return self._write_pos
+
+    @property
+    def capacity(self) -> int:
+        """Frames that fit without growing."""
+        return len(self._data)
+
+    def _grow(self, needed: int) -> None:
+        """Reallocate storage to hold at least ``needed`` frames (producer side)."""
+        capacity = len(self._data)
+        while capacity < needed:
+            capacity *= 2
+        if self.max_frames is not None:
+            capacity = min(capacity, self.max_frames)
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._write_pos] = self._data[:self._write_pos]
+        # Swap storage before publishing new frames so readers never see
+        # a position beyond the array they read from
+        self._data = data
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append a block of frames (producer side).
+
+        Args:
+            samples: Block of samples; multi-dimensional blocks are flattened
+
+        Returns:
+            Number of frames stored (fewer than given only at ``max_frames``)
+        """
+        samples = samples.reshape(-1)
+        at_limit = self.max_frames is not None and len(self._data) >= self.max_frames
+        if at_limit and self._write_pos >= len(self._data):
+            # Full for good: drop the block without touching storage
+            self.dropped += len(samples)
+            return 0
+        end = self._write_pos + len(samples)
+        if end > len(self._data) and not at_limit:
+            self._grow(end)
+        count = min(len(samples), len(self._data) - self._write_pos)
+        self._data[self._write_pos:self._write_pos + count] = samples[:count]
+        self.dropped += len(samples) - count
+
+        self._write_pos += count
+        return count
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Read-only view of frames ``start`` to ``end`` (defaults to everything written)."""
+        end = self._write_pos if end is None else min(end, self._write_pos)
+        view = self._data[start:end]
+        view.flags.writeable = False
+        return view
+
+
+class PrerollBuffer:
+    """Fixed-size ring that always holds the most recent frames.
+
+    Unlike ``AudioRingBuffer`` nothing is consumed: the producer overwrites
+    the oldest frames, and readers copy out everything written since a given
+    ``position`` that is still held. Positions count frames written since
+    creation, so a reader can take a position now and read from it later.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """Create a pre-roll buffer.
+
+        Args:
+            capacity: Number of most recent frames to keep
+            dtype: NumPy dtype of the stored samples
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0
+
+    @property
+    def position(self) -> int:
+        """Total frames written so far."""
+        return self._write_pos
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append frames, overwriting the oldest ones (producer side)."""
+        samples = samples.reshape(-1)
+        if len(samples) >= self.capacity:
+            # Only the newest frames survive; lay them out as if written in order
+            self._write_pos += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+
+        start = self._write_pos % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self._write_pos += len(samples)
+
+    def read_since(self, position: int) -> np.ndarray:
+        """Copy out the frames written since ``position``.
+
+        Args:
+            position: A value previously taken from ``position``
+
+        Returns:
+            The frames from ``position`` to now, or only the newest
+            ``capacity`` of them if older ones were already overwritten
+        """
+        start = max(position, self._write_pos - self.capacity, 0)
+        count = self._write_pos - start
+        if count <= 0:
+            return np.zeros(0, dtype=self._data.dtype)
+
+        offset = start % self.capacity
+        first = min(count, self.capacity - offset)
+        return np.concatenate((self._data[offset:offset + first], self._data[:count - first]))
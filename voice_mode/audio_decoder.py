@@ -0,0 +1,277 @@
+"""
+Incremental audio decoding for voice-mode.
+
+Compressed TTS responses (MP3, Opus, AAC, FLAC, WAV) are piped through one
+long-lived ffmpeg process per utterance. Encoded bytes are written to its
+stdin as they arrive from the network and 16-bit PCM blocks are read back
+from stdout as soon as ffmpeg has complete frames, so playback can begin
+after the first few frames instead of after the whole file. Complete
+responses are decoded in memory by ``decode_audio_bytes``.
+"""
+
+import asyncio
+import logging
+import shutil
+import struct
+from typing import AsyncIterator, Optional, Tuple
+
+import numpy as np
+
+from .config import SAMPLE_RATE
+
+logger = logging.getLogger("voicemode")
+
+# Map our response format names to ffmpeg demuxer names
+FFMPEG_INPUT_FORMATS = {
+    "mp3": "mp3",
+    "opus": "ogg",  # Opus is delivered in an Ogg container
+    "ogg": "ogg",
+    "aac": "aac",
+    "flac": "flac",
+    "wav": "wav",
+}
+
+# Bytes of PCM requested from ffmpeg per read (~85ms of 24kHz mono int16)
+PCM_READ_SIZE = 4096
+
+# Most recent ffmpeg stderr bytes kept for error messages; the rest is discarded
+STDERR_TAIL_BYTES = 4096
+
+
+class StreamDecoderError(RuntimeError):
+    """Raised when the ffmpeg decoder cannot be started or fails mid-stream."""
+
+
+class FFmpegStreamDecoder:
+    """Decode a compressed audio byte stream to int16 PCM incrementally."""
+
+    def __init__(self, input_format: str, sample_rate: int = SAMPLE_RATE, channels: int = 1):
+        """Create a decoder.
+
+        Args:
+            input_format: Response format of the encoded stream (e.g. 'mp3', 'opus')
+            sample_rate: Output sample rate ffmpeg should resample to
+            channels: Output channel count
+        """
+        self.input_format = input_format
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_tail = bytearray()
+        self._remainder = b''
+        self._frame_bytes = 2 * channels
+
+    def _build_command(self) -> list:
+        """Build the ffmpeg command line."""
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin"]
+        demuxer = FFMPEG_INPUT_FORMATS.get(self.input_format)
+        if demuxer:
+            cmd += ["-f", demuxer]
+        cmd += [
+            "-i", "pipe:0",
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ac", str(self.channels),
+            "-ar", str(self.sample_rate),
+            "pipe:1",
+        ]
+        return cmd
+
+    async def start(self) -> None:
+        """Spawn the ffmpeg process."""
+        if not shutil.which("ffmpeg"):
+            raise StreamDecoderError("FFmpeg is required for streaming compressed audio but was not found")
+
+        self.process = await asyncio.create_subprocess_exec(
+            *self._build_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        # ffmpeg blocks once the stderr pipe buffer is full, so always keep it drained
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        logger.debug(f"Started ffmpeg stream decoder for {self.input_format} (PID: {self.process.pid})")
+
+    async def _drain_stderr(self) -> None:
+        """Read ffmpeg's stderr until EOF, keeping only the last ``STDERR_TAIL_BYTES``."""
+        while True:
+            data = await self.process.stderr.read(STDERR_TAIL_BYTES)
+            if not data:
+                break
+            self._stderr_tail += data
+            del self._stderr_tail[:-STDERR_TAIL_BYTES]
+
+    @property
+    def stderr_output(self) -> str:
+        """The tail of ffmpeg's stderr read so far."""
+        return self._stderr_tail.decode(errors='replace').strip()
+
+    async def feed(self, data: bytes) -> None:
+        """Write encoded bytes to the decoder."""
+        if not self.process or self.process.stdin.is_closing():
+            raise StreamDecoderError("Decoder is not accepting input")
+        self.process.stdin.write(data)
+        await self.process.stdin.drain()
+
+    async def end_input(self) -> None:
+        """Signal that no more encoded bytes will be written."""
+        if self.process and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+            try:
+                await self.process.stdin.wait_closed()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    async def read_block(self) -> Optional[np.ndarray]:
+        """Read the next block of decoded samples.
+
+        Returns:
+            int16 samples (shape ``(n,)`` for mono, ``(n, channels)`` otherwise),
+            an empty array if only a partial frame was read, or None at end of stream
+        """
+        data = await self.process.stdout.read(PCM_READ_SIZE)
+        if not data:
+            return None
+
+        data = self._remainder + data
+        usable = len(data) - (len(data) % self._frame_bytes)
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels)
+        return samples
+
+    async def iter_blocks(self) -> AsyncIterator[np.ndarray]:
+        """Yield decoded sample blocks until ffmpeg reaches end of stream."""
+        while True:
+            block = await self.read_block()
+            if block is None:
+                break
+            if len(block):
+                yield block
+
+    async def aclose(self, abort: bool = False) -> None:
+        """Stop the decoder and reap the process.
+
+        Args:
+            abort: Kill ffmpeg at once, e.g. after barge-in or an error. Its
+                output is no longer being read, so it would block on the full
+                stdout pipe rather than exit by itself
+        """
+        if not self.process:
+            return
+
+        await self.end_input()
+        if self.process.returncode is None and not abort:
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+        killed = self.process.returncode is None
+        if killed:
+            self.process.kill()
+            # wait() also waits for the pipes to close, so discard unread output
+            await self.process.stdout.read()
+            await self.process.wait()
+        if self._stderr_task:
+            await self._stderr_task
+
+        if self.process.returncode not in (0, None) and not (killed and abort):
+            logger.warning(f"ffmpeg decoder exited with {self.process.returncode}: {self.stderr_output}")
+
+
+def parse_wav(data: bytes) -> Tuple[np.ndarray, int, int]:
+    """Parse a 16-bit PCM WAV file held in memory without copying the samples.
+
+    Streaming TTS servers often write a placeholder data chunk size, so a
+    size running past the end of the buffer is clamped to what was received.
+
+    Args:
+        data: Complete WAV file bytes
+
+    Returns:
+        Tuple of (int16 samples viewing ``data``, sample_rate, channels)
+
+    Raises:
+        ValueError: If the data is not 16-bit PCM WAV
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    offset = 12
+    sample_rate = channels = bits = None
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack('<I', data[offset + 4:offset + 8])[0]
+        body = offset + 8
+
+        if chunk_id == b'fmt ':
+            audio_format, channels, sample_rate = struct.unpack('<HHI', data[body:body + 8])
+            bits = struct.unpack('<H', data[body + 14:body + 16])[0]
+            if audio_format not in (1, 0xFFFE) or bits != 16:
+                raise ValueError(f"Unsupported WAV encoding (format {audio_format}, {bits}-bit)")
+        elif chunk_id == b'data':
+            if sample_rate is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            end = min(body + chunk_size, len(data))
+            end -= (end - body) % (2 * channels)
+            samples = np.frombuffer(data, dtype='<i2', count=(end - body) // 2, offset=body)
+            if channels > 1:
+                samples = samples.reshape(-1, channels)
+            return samples, sample_rate, channels
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("WAV file has no data chunk")
+
+
+async def decode_audio_bytes(
+    data: bytes,
+    input_format: str,
+    sample_rate: int = SAMPLE_RATE
+) -> Tuple[np.ndarray, int, int]:
+    """Decode a complete in-memory audio response to int16 samples.
+
+    PCM and WAV are viewed directly with ``np.frombuffer``; other formats are
+    piped through ffmpeg (stdin to stdout) without touching the filesystem.
+
+    Args:
+        data: Encoded audio bytes
+        input_format: Response format (e.g. 'pcm', 'wav', 'mp3', 'opus')
+        sample_rate: Rate assumed for raw PCM and requested from ffmpeg
+
+    Returns:
+        Tuple of (int16 samples, sample_rate, channels)
+    """
+    if input_format == "pcm":
+        usable = len(data) - (len(data) % 2)
+        return np.frombuffer(data, dtype='<i2', count=usable // 2), sample_rate, 1
+
+    if input_format == "wav":
+        try:
+            return parse_wav(data)
+        except ValueError as e:
+            logger.debug(f"Falling back to ffmpeg for WAV data: {e}")
+
+    async def write_input() -> None:
+        try:
+            await decoder.feed(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early; reported through its return code
+        await decoder.end_input()
+
+    decoder = FFmpegStreamDecoder(input_format, sample_rate=sample_rate)
+    await decoder.start()
+    try:
+        _, pcm = await asyncio.gather(write_input(), decoder.process.stdout.read())
+    finally:
+        await decoder.aclose()
+
+    if decoder.process.returncode != 0:
+        raise StreamDecoderError(f"ffmpeg could not decode {input_format} audio: {decoder.stderr_output}")
+
+    usable = len(pcm) - (len(pcm) % 2)
+    return np.frombuffer(pcm, dtype=np.int16, count=usable // 2), sample_rate, 1
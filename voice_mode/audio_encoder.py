@@ -0,0 +1,127 @@
+"""
+In-memory audio encoding for voice-mode.
+
+Recordings are held as int16 NumPy buffers. WAV uploads are built by
+prefixing the buffer with a RIFF header, and compressed formats are produced
+by piping raw PCM through ffmpeg (stdin to stdout), so speech-to-text never
+needs to touch the filesystem before upload.
+"""
+
+import asyncio
+import logging
+import shutil
+import struct
+
+import numpy as np
+
+from .config import MP3_BITRATE, OPUS_BITRATE, AAC_BITRATE
+
+logger = logging.getLogger("voicemode")
+
+# Map our upload format names to ffmpeg muxer names and codec arguments
+FFMPEG_OUTPUT_FORMATS = {
+    "mp3": ("mp3", ["-c:a", "libmp3lame", "-b:a", MP3_BITRATE]),
+    "opus": ("ogg", ["-c:a", "libopus", "-b:a", str(OPUS_BITRATE)]),
+    "aac": ("adts", ["-c:a", "aac", "-b:a", AAC_BITRATE]),
+    "flac": ("flac", ["-c:a", "flac"]),
+}
+
+
+class AudioEncoderError(RuntimeError):
+    """Raised when audio cannot be encoded for upload."""
+
+
+def wav_header(num_frames: int, sample_rate: int, channels: int = 1) -> bytes:
+    """Build a 44-byte header for 16-bit PCM WAV data.
+
+    Args:
+        num_frames: Number of sample frames that follow the header
+        sample_rate: Sample rate in Hz
+        channels: Number of interleaved channels
+
+    Returns:
+        RIFF/WAVE header bytes
+    """
+    block_align = 2 * channels
+    data_size = num_frames * block_align
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 16,
+        b'data', data_size,
+    )
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Wrap an int16 buffer in a WAV header.
+
+    Args:
+        samples: int16 samples, shape ``(n,)`` or ``(n, channels)``
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Complete WAV file bytes
+    """
+    samples = np.ascontiguousarray(samples, dtype='<i2')
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    header = wav_header(samples.shape[0], sample_rate, channels)
+    return b''.join((header, memoryview(samples).cast('B')))
+
+
+def _build_command(output_format: str, sample_rate: int, channels: int) -> list:
+    """Build the ffmpeg command line for encoding raw PCM from stdin."""
+    muxer, codec_args = FFMPEG_OUTPUT_FORMATS[output_format]
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+        *codec_args,
+        "-f", muxer, "pipe:1",
+    ]
+
+
+async def encode_audio_bytes(samples: np.ndarray, sample_rate: int, output_format: str) -> bytes:
+    """Encode an int16 buffer to an in-memory upload body.
+
+    Args:
+        samples: int16 samples, shape ``(n,)`` or ``(n, channels)``
+        sample_rate: Sample rate in Hz
+        output_format: Target format ('wav', 'mp3', 'opus', 'aac' or 'flac')
+
+    Returns:
+        Encoded audio bytes
+
+    Raises:
+        AudioEncoderError: If ffmpeg is missing or fails
+    """
+    if output_format == "wav":
+        return encode_wav(samples, sample_rate)
+
+    if output_format not in FFMPEG_OUTPUT_FORMATS:
+        raise AudioEncoderError(f"Unsupported upload format: {output_format}")
+
+    if not shutil.which("ffmpeg"):
+        raise AudioEncoderError("FFmpeg is required but not found. Please install FFmpeg and try again.")
+
+    samples = np.ascontiguousarray(samples, dtype='<i2')
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+
+    process = await asyncio.create_subprocess_exec(
+        *_build_command(output_format, sample_rate, channels),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        encoded, stderr = await process.communicate(input=memoryview(samples).cast('B'))
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise AudioEncoderError(f"ffmpeg could not encode {output_format} audio: "
+                                f"{stderr.decode(errors='replace').strip()}")
+
+    logger.debug(f"Encoded {len(samples)} frames to {len(encoded)} bytes of {output_format.upper()}")
+    return encoded
@@ -0,0 +1,452 @@
+"""
+Shared audio output for voice-mode.
+
+Opening a PortAudio output stream costs tens to hundreds of milliseconds on
+PulseAudio/PipeWire, which used to be paid by every utterance and chime.
+``AudioOutputService`` owns one long-lived callback stream per device, sample
+rate and channel count. Producers (streaming TTS, pipelined TTS, buffered
+playback, chimes) open an ``OutputSession`` and write int16 audio to it;
+the callback mixes all sessions, so a chime can overlap speech. Sessions can
+be scheduled to start at a given time, and report when their first and last
+samples reach the DAC, estimated from PortAudio's ``outputBufferDacTime``.
+An ``echo_listener`` on a session is told about each block of its audio as
+it is rendered, with the block's DAC time (the barge-in echo reference).
+The stream is closed after ``OUTPUT_IDLE_TIMEOUT`` seconds without a session
+and on shutdown.
+
+Playback runs at ``get_output_rate()``, the device's native rate unless
+``OUTPUT_SAMPLE_RATE`` is set, so audio at other rates is resampled by the
+producers rather than by PortAudio or the sound server.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .barge_in import playback_interrupted
+from .config import SAMPLE_RATE, OUTPUT_DEVICE, OUTPUT_IDLE_TIMEOUT, OUTPUT_SAMPLE_RATE
+
+logger = logging.getLogger("voicemode")
+
+# Silence ahead of the first audio after the device opens, so it is not clipped
+PLAYBACK_LEAD_IN_S = 0.1
+# A session's write() blocks while more than this much audio is queued
+MAX_QUEUED_S = 2.0
+
+
+class OutputSession:
+    """One producer's audio on a shared output stream.
+
+    Offers the subset of ``sd.OutputStream`` used by the playback paths
+    (``samplerate``, ``write``, ``abort``, ``close``) plus ``drain``.
+    Times (``start_at``, ``started_at``, ``finished_at``) are
+    ``time.perf_counter()`` values.
+    """
+
+    def __init__(self, service: "AudioOutputService", start_at: Optional[float] = None):
+        self.service = service
+        self.samplerate = service.samplerate
+        self.channels = service.channels
+        self.start_at = start_at
+
+        self.frames_written = 0
+        self.frames_played = 0
+        self.aborted = False  # abort() dropped unplayed audio
+        self.first_write_at: Optional[float] = None  # When audio was first written
+        self.underrun_frames = 0  # Silence output while waiting for this session's audio
+        self.started_at: Optional[float] = None  # When the first frame reached the DAC
+        self.finished_at: Optional[float] = None  # When the last played frame will have left the DAC
+        # Called (callback thread, lock held) with each rendered block and its DAC time
+        self.echo_listener: Optional[Callable[[np.ndarray, float], None]] = None
+
+        self._chunks = deque()  # Flat interleaved int16 arrays
+        self._offset = 0  # Frames of _chunks[0] already played
+        self._queued = 0  # Frames waiting to be played
+        self._max_queued = int(self.samplerate * MAX_QUEUED_S)
+        self._closed = False
+        self._draining = False  # No more writes expected; a dry queue is not an underrun
+        self._cond = threading.Condition(service._lock)
+
+    @property
+    def output_latency(self) -> Optional[float]:
+        """Seconds from the first write until that audio reached the DAC."""
+        if self.started_at is None or self.first_write_at is None:
+            return None
+        return max(0.0, self.started_at - self.first_write_at)
+
+    @property
+    def queued_frames(self) -> int:
+        """Frames written but not yet handed to the device."""
+        return self._queued
+
+    def write(self, samples: np.ndarray, block: bool = True, max_queued_s: Optional[float] = None) -> None:
+        """Queue int16 samples (frames first) for playback.
+
+        Args:
+            samples: Audio to play, mono or ``(frames, channels)``
+            block: Wait while more than ``max_queued_s`` of audio is queued
+            max_queued_s: Queue limit for this write (default ``MAX_QUEUED_S``)
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.int16).reshape(-1)
+        frames = len(samples) // self.channels
+        if not frames:
+            return
+        max_queued = self._max_queued if max_queued_s is None else int(self.samplerate * max_queued_s)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Output session is closed")
+            while block and self._queued >= max_queued:
+                if not self.service.active:
+                    raise RuntimeError("Output stream stopped")
+                self._cond.wait(0.1)
+            if self.first_write_at is None:
+                self.first_write_at = time.perf_counter()
+            self._chunks.append(samples[:frames * self.channels])
+            self._queued += frames
+            self.frames_written += frames
+
+    def abort(self) -> None:
+        """Drop everything not yet played."""
+        with self._cond:
+            self._abort_locked()
+
+    def _abort_locked(self) -> None:
+        self.aborted = True
+        self._chunks.clear()
+        self._offset = 0
+        self._queued = 0
+        self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all written audio has been played out of the DAC.
+
+        If the user barges in meanwhile, the rest is dropped (``aborted``).
+
+        Returns:
+            True if drained, False on timeout, barge-in or if the stream stopped
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            self._draining = True
+            while self._queued:
+                if not self.service.active:
+                    return False
+                if playback_interrupted():
+                    self._abort_locked()
+                    return False
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(0.1 if remaining is None else min(0.1, remaining))
+            finished_at = self.finished_at
+        if finished_at is not None:
+            delay = finished_at - time.perf_counter()
+            if deadline is not None:
+                delay = min(delay, deadline - time.perf_counter())
+            if delay > 0:
+                time.sleep(delay)
+        return deadline is None or time.perf_counter() <= deadline
+
+    def close(self) -> None:
+        """Detach from the output stream (unplayed audio is dropped)."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._chunks.clear()
+            self._queued = 0
+        self.service._release(self)
+
+    def __enter__(self) -> "OutputSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _render_locked(self, mix: np.ndarray, dac_time: float) -> None:
+        """Add this session's next frames into ``mix`` (callback thread, lock held)."""
+        frames = len(mix)
+        position = 0
+        if self.frames_played == 0 and self.start_at is not None:
+            # Not due yet: start part-way into the block, or not at all
+            position = int(round((self.start_at - dac_time) * self.samplerate))
+            if position >= frames:
+                return
+            position = max(0, position)
+        start = position
+        rendered = [] if self.echo_listener else None
+
+        while position < frames and self._chunks:
+            chunk = self._chunks[0]
+            available = len(chunk) // self.channels - self._offset
+            n = min(frames - position, available)
+            offset = self._offset * self.channels
+            part = chunk[offset:offset + n * self.channels]
+            mix[position:position + n] += part.reshape(n, self.channels)
+            if rendered is not None:
+                rendered.append(part)
+            position += n
+            self._offset += n
+            if self._offset * self.channels >= len(chunk):
+                self._chunks.popleft()
+                self._offset = 0
+
+        played = position - start
+        if played:
+            if self.started_at is None:
+                self.started_at = dac_time + start / self.samplerate
+            self.frames_played += played
+            self._queued -= played
+            self.finished_at = dac_time + position / self.samplerate
+            if rendered:
+                self.echo_listener(np.concatenate(rendered), dac_time + start / self.samplerate)
+            self._cond.notify_all()
+        if self.frames_played and position < frames and not self._draining:
+            self.underrun_frames += frames - position
+
+
+class AudioOutputService:
+    """A long-lived output stream shared by all playback."""
+
+    def __init__(
+        self,
+        samplerate: int,
+        channels: int = 1,
+        device=None,
+        idle_timeout: float = OUTPUT_IDLE_TIMEOUT
+    ):
+        """Create the service (the device is opened by the first session).
+
+        Args:
+            samplerate: Output sample rate in Hz
+            channels: Number of output channels
+            device: sounddevice device index or name (None for the default)
+            idle_timeout: Seconds without a session before the stream closes
+                (0 closes it as soon as the last session ends)
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self.device = device
+        self.idle_timeout = idle_timeout
+
+        self._stream = None
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._idle_generation = 0  # Bumped whenever the idle timer is cancelled or replaced
+
+    @property
+    def active(self) -> bool:
+        """Whether the output stream is open."""
+        return self._stream is not None
+
+    @property
+    def latency(self) -> float:
+        """Output latency of the open stream in seconds (0 if closed)."""
+        stream = self._stream
+        try:
+            return float(stream.latency) if stream is not None else 0.0
+        except Exception:
+            return 0.0
+
+    def _callback(self, outdata, frames, time_info, status):
+        """PortAudio callback: mix every session into the output block."""
+        if status:
+            logger.debug(f"Audio output status: {status}")
+        now = time.perf_counter()
+        try:
+            dac_delay = time_info.outputBufferDacTime - time_info.currentTime
+            if not 0 <= dac_delay < 1:
+                raise ValueError("no usable DAC time")
+        except Exception:
+            # Some host APIs report zero stream times; fall back to the nominal latency
+            dac_delay = self.latency
+        dac_time = now + dac_delay
+
+        mix = np.zeros((frames, self.channels), dtype=np.int32)
+        with self._lock:
+            for session in self._sessions:
+                session._render_locked(mix, dac_time)
+        np.clip(mix, -32768, 32767, out=mix)
+        outdata[:] = mix
+
+    def _open_locked(self) -> bool:
+        """Open the stream if needed; the caller holds the lock.
+
+        Returns:
+            True if the stream was opened by this call
+        """
+        self._cancel_idle_timer()
+        if self._stream is not None:
+            return False
+        import sounddevice as sd
+        stream = sd.OutputStream(
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype='int16',
+            device=self.device,
+            callback=self._callback
+        )
+        stream.start()
+        self._stream = stream
+        logger.debug(f"Output stream opened ({self.samplerate}Hz, {self.channels}ch, "
+                     f"latency {self.latency * 1000:.0f}ms)")
+        return True
+
+    def open_session(self, start_at: Optional[float] = None) -> OutputSession:
+        """Attach a new producer, opening the device if needed.
+
+        Args:
+            start_at: ``time.perf_counter()`` time at which to start playing
+                (default: as soon as audio is written)
+
+        Returns:
+            The session to write to; close it when done
+        """
+        with self._lock:
+            opened = self._open_locked()
+            if opened and start_at is None:
+                start_at = time.perf_counter() + PLAYBACK_LEAD_IN_S
+            session = OutputSession(self, start_at)
+            self._sessions.append(session)
+        return session
+
+    def play(self, samples: np.ndarray, start_at: Optional[float] = None) -> OutputSession:
+        """Queue a complete buffer in its own session without blocking.
+
+        The caller closes the returned session (after ``drain`` to wait for it).
+        """
+        session = self.open_session(start_at)
+        session.write(samples, block=False)
+        return session
+
+    def _release(self, session: OutputSession) -> None:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            if self._sessions:
+                return
+            if self.idle_timeout > 0:
+                self._arm_idle_timer_locked()
+                return
+            stream, self._stream = self._stream, None
+        self._shutdown(stream)
+
+    def close(self) -> None:
+        """Close the stream; a later session reopens it."""
+        with self._lock:
+            self._cancel_idle_timer()
+            stream, self._stream = self._stream, None
+            sessions, self._sessions = self._sessions, []
+            for session in sessions:
+                session._closed = True
+                session._chunks.clear()
+                session._queued = 0
+                session._cond.notify_all()
+        self._shutdown(stream)
+
+    @staticmethod
+    def _shutdown(stream) -> None:
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing output stream: {e}")
+        logger.debug("Output stream closed")
+
+    def _arm_idle_timer_locked(self) -> None:
+        """(Re)start the idle timer; the caller holds the lock."""
+        self._cancel_idle_timer()
+        if self._stream is not None:
+            self._idle_timer = threading.Timer(self.idle_timeout, self._close_if_idle,
+                                               args=(self._idle_generation,))
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        self._idle_generation += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _close_if_idle(self, generation: int) -> None:
+        with self._lock:
+            # The timer may have fired just as it was cancelled or replaced
+            if generation != self._idle_generation or self._sessions:
+                return
+            self._idle_timer = None
+            stream, self._stream = self._stream, None
+        logger.debug(f"Output stream idle for {self.idle_timeout}s")
+        self._shutdown(stream)
+
+
+# Shared across turns, one per (device, sample rate, channels)
+_services: Dict[Tuple[object, int, int], AudioOutputService] = {}
+_services_lock = threading.Lock()
+# Native output rate by device, queried once
+_device_rates: Dict[object, int] = {}
+
+
+def _configured_device():
+    """OUTPUT_DEVICE as a sounddevice device (index, name or None)."""
+    if not OUTPUT_DEVICE:
+        return None
+    return int(OUTPUT_DEVICE) if OUTPUT_DEVICE.isdigit() else OUTPUT_DEVICE
+
+
+def get_output_rate(device=None) -> int:
+    """Sample rate to play at: OUTPUT_SAMPLE_RATE, or the device's native rate.
+
+    Falls back to SAMPLE_RATE if the device cannot be queried.
+    """
+    if OUTPUT_SAMPLE_RATE != "auto":
+        return int(OUTPUT_SAMPLE_RATE)
+    if device is None:
+        device = _configured_device()
+    rate = _device_rates.get(device)
+    if rate is None:
+        try:
+            import sounddevice as sd
+            rate = int(sd.query_devices(device, 'output')['default_samplerate'])
+            if not 8000 <= rate <= 384000:
+                raise ValueError(f"implausible rate {rate}")
+            logger.debug(f"Output device native rate: {rate}Hz")
+        except Exception as e:
+            logger.debug(f"Could not query the output device rate, using {SAMPLE_RATE}Hz: {e}")
+            rate = SAMPLE_RATE
+        _device_rates[device] = rate
+    return rate
+
+
+def get_output_service(samplerate: Optional[int] = None, channels: int = 1, device=None) -> AudioOutputService:
+    """Return the process-wide output service for a stream format.
+
+    Args:
+        samplerate: Output sample rate in Hz (defaults to ``get_output_rate()``)
+        channels: Number of output channels
+        device: Device index or name (defaults to VOICEMODE_OUTPUT_DEVICE)
+    """
+    if device is None:
+        device = _configured_device()
+    if samplerate is None:
+        samplerate = get_output_rate(device)
+    key = (device, samplerate, channels)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = AudioOutputService(samplerate, channels, device)
+        return service
+
+
+def close_output_services() -> None:
+    """Close every output stream that was opened."""
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        service.close()
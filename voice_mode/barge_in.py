@@ -0,0 +1,230 @@
+"""
+Barge-in for voice-mode: stop TTS playback when the user talks over it.
+
+While TTS plays, a ``BargeInMonitor`` is attached to the persistent capture
+stream and runs a VAD on the microphone. The speakers leak into the
+microphone, so every block the output renders is also recorded, with the time
+it reaches the DAC, as an echo reference: a microphone frame only counts as
+user speech if the VAD says
+speech *and* it is louder than the expected echo (recent playback level plus
+the measured speaker-to-microphone coupling) by ``BARGE_IN_ECHO_MARGIN_DB``.
+After ``BARGE_IN_MIN_SPEECH_MS`` of such speech the monitor triggers; the
+playback paths, which write through ``write_output``, then stop, and the
+recording starts from the speech onset out of the capture pre-roll. While a
+monitor is active only about ``OUTPUT_BLOCK_S`` of audio is queued ahead of
+the device, so playback stops promptly and the reference stays current.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from .config import (
+    VAD_AGGRESSIVENESS,
+    VAD_CHUNK_DURATION_MS,
+    VAD_ENGINE,
+    BARGE_IN_MIN_SPEECH_MS,
+    BARGE_IN_ECHO_MARGIN_DB,
+)
+from .vad import create_vad
+
+logger = logging.getLogger("voicemode")
+
+# Playback reference blocks this recent are considered audible as echo
+ECHO_WINDOW_S = 0.5
+# Initial speaker-to-microphone coupling in dB, refined while playing
+DEFAULT_COUPLING_DB = -10.0
+# Output is written in blocks of this many seconds so playback can stop promptly
+OUTPUT_BLOCK_S = 0.05
+
+# Monitor attached during the current playback, if any
+_active: Optional["BargeInMonitor"] = None
+
+
+class PlaybackInterrupted(Exception):
+    """Raised by playback writers when the user barged in."""
+
+
+def _level_db(samples: np.ndarray) -> float:
+    """RMS level of int16 samples in dBFS."""
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1) / 32768.0
+    if not len(samples):
+        return -100.0
+    return float(10 * np.log10(np.mean(samples ** 2) + 1e-10))
+
+
+class BargeInMonitor:
+    """Detects sustained user speech on the capture stream during playback."""
+
+    def __init__(
+        self,
+        capture,
+        min_speech_ms: int = BARGE_IN_MIN_SPEECH_MS,
+        echo_margin_db: float = BARGE_IN_ECHO_MARGIN_DB,
+        vad=None
+    ):
+        """Create a monitor (``start`` attaches it).
+
+        Args:
+            capture: The ``CaptureStream`` to listen on
+            min_speech_ms: Sustained user speech needed to trigger
+            echo_margin_db: How far above the expected echo user speech must be
+            vad: Detector to use (defaults to the configured engine)
+        """
+        self.capture = capture
+        self.vad = vad or create_vad(VAD_ENGINE, capture.samplerate, VAD_AGGRESSIVENESS)
+        self.chunk_samples = int(capture.samplerate * VAD_CHUNK_DURATION_MS / 1000) * capture.channels
+        self.min_speech_chunks = max(1, -(-min_speech_ms // VAD_CHUNK_DURATION_MS))
+        self.echo_margin_db = echo_margin_db
+        self.coupling_db = DEFAULT_COUPLING_DB
+
+        self.triggered = False
+        self.onset_position: Optional[int] = None  # Capture position where the user started talking
+        self._event = threading.Event()
+
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pending_start = 0
+        self._run_start: Optional[int] = None
+        self._run_chunks = 0
+        self._gap_chunks = 0
+        self._reference = deque(maxlen=256)  # (perf_counter DAC time, level dB) of played output blocks
+        self._context = None
+
+    def start(self) -> None:
+        """Attach to the capture stream and become the active monitor."""
+        global _active
+        self._context = self.capture.recording(self._feed)
+        self._context.__enter__()
+        _active = self
+
+    def stop(self) -> None:
+        """Detach from the capture stream."""
+        global _active
+        if _active is self:
+            _active = None
+        if self._context is not None:
+            context, self._context = self._context, None
+            context.__exit__(None, None, None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the monitor triggers or the timeout expires."""
+        return self._event.wait(timeout)
+
+    def reference(self, samples: np.ndarray, at: Optional[float] = None) -> None:
+        """Record the level of a played block (echo reference).
+
+        Args:
+            samples: The block's int16 samples
+            at: ``time.perf_counter()`` time it reaches the DAC (default: now)
+        """
+        self._reference.append((time.perf_counter() if at is None else at, _level_db(samples)))
+
+    def _reference_db(self) -> Optional[float]:
+        """Loudest playback level that could be echoing now, or None if silent."""
+        horizon = time.perf_counter() - ECHO_WINDOW_S
+        levels = [level for t, level in list(self._reference) if t >= horizon]
+        return max(levels) if levels else None
+
+    def _feed(self, samples: np.ndarray) -> None:
+        """Capture sink (PortAudio callback thread)."""
+        if self.triggered:
+            return
+        if not len(self._pending):
+            self._pending_start = self.capture.position - len(samples)
+        self._pending = np.concatenate((self._pending, samples))
+
+        while len(self._pending) >= self.chunk_samples and not self.triggered:
+            chunk = self._pending[:self.chunk_samples]
+            self._classify(chunk, self._pending_start)
+            self._pending = self._pending[self.chunk_samples:]
+            self._pending_start += self.chunk_samples
+
+    def is_user_speech(self, chunk: np.ndarray) -> bool:
+        """Classify one chunk as user speech, net of expected echo."""
+        try:
+            speech = self.vad.is_speech(chunk)
+        except Exception as e:
+            logger.debug(f"Barge-in VAD error: {e}")
+            return False
+
+        reference_db = self._reference_db()
+        if reference_db is None:
+            # Nothing playing: plain VAD
+            return speech
+
+        mic_db = _level_db(chunk)
+        expected_echo_db = reference_db + self.coupling_db
+        user = speech and mic_db > expected_echo_db + self.echo_margin_db
+        if not user:
+            # Learn the coupling slowly from frames that are (mostly) echo
+            self.coupling_db += 0.02 * ((mic_db - reference_db) - self.coupling_db)
+            self.coupling_db = min(max(self.coupling_db, -60.0), 0.0)
+        return user
+
+    def _classify(self, chunk: np.ndarray, position: int) -> None:
+        if self.is_user_speech(chunk):
+            if self._run_start is None:
+                self._run_start = position
+            self._run_chunks += 1
+            self._gap_chunks = 0
+        elif self._run_start is not None:
+            # Allow a single-chunk dropout inside a run of speech
+            self._gap_chunks += 1
+            if self._gap_chunks > 1:
+                self._run_start = None
+                self._run_chunks = 0
+                self._gap_chunks = 0
+
+        if self._run_chunks >= self.min_speech_chunks:
+            self.triggered = True
+            self.onset_position = self._run_start
+            self._event.set()
+            logger.info(f"Barge-in: user speech detected during playback "
+                        f"(coupling {self.coupling_db:.1f}dB)")
+
+
+def playback_interrupted() -> bool:
+    """Whether the user has barged in on the current playback."""
+    monitor = _active
+    return monitor is not None and monitor.triggered
+
+
+def write_output(stream, samples: np.ndarray) -> bool:
+    """Write samples to an output stream, stopping early on barge-in.
+
+    Without an active monitor this is a single ``stream.write``. Otherwise the
+    audio is written in short blocks. An ``OutputSession`` reports each block
+    to the monitor as it is rendered and is kept only about ``OUTPUT_BLOCK_S``
+    ahead of the device; for other streams each block is recorded as echo
+    reference when written.
+
+    Args:
+        stream: An ``OutputSession`` or open sounddevice output stream
+        samples: int16 samples (frames first)
+
+    Returns:
+        False if playback was interrupted (the caller should abort the stream)
+    """
+    monitor = _active
+    if monitor is None:
+        stream.write(samples)
+        return True
+
+    rendered_reference = hasattr(stream, "echo_listener")
+    if rendered_reference:
+        stream.echo_listener = monitor.reference
+    block = max(1, int(stream.samplerate * OUTPUT_BLOCK_S))
+    for start in range(0, len(samples), block):
+        if monitor.triggered:
+            return False
+        part = samples[start:start + block]
+        if rendered_reference:
+            stream.write(part, max_queued_s=OUTPUT_BLOCK_S)
+        else:
+            monitor.reference(part)
+            stream.write(part)
+    return not monitor.triggered
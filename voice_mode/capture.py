@@ -0,0 +1,216 @@
+"""
+Persistent microphone capture for voice-mode.
+
+Opening an input stream takes time, and anything said before it is open is
+lost. ``CaptureStream`` keeps one input stream open across turns. While no
+recording is attached, the callback keeps the most recent ``PREROLL_MS`` of
+audio in a ``PrerollBuffer``; attaching a recording first hands it the
+pre-roll written since a given position, then every new block, with no gap
+or overlap in between. The stream is closed after ``CAPTURE_IDLE_TIMEOUT``
+seconds without a recording, and on shutdown.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import sounddevice as sd
+
+from .audio_buffer import PrerollBuffer
+from .config import (
+    SAMPLE_RATE,
+    CHANNELS,
+    VAD_CHUNK_DURATION_MS,
+    PREROLL_MS,
+    CAPTURE_IDLE_TIMEOUT,
+    BARGE_IN_ENABLED,
+    BARGE_IN_MIN_SPEECH_MS,
+)
+
+logger = logging.getLogger("voicemode")
+
+
+class CaptureStream:
+    """A long-lived input stream with a rolling pre-roll buffer.
+
+    Positions (``position``, ``since``) count interleaved int16 samples
+    captured since the stream object was created.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        blocksize: Optional[int] = None,
+        preroll_ms: int = PREROLL_MS,
+        idle_timeout: float = CAPTURE_IDLE_TIMEOUT
+    ):
+        """Create a capture stream (the device is opened by ``start``).
+
+        Args:
+            samplerate: Capture sample rate in Hz
+            channels: Number of input channels
+            blocksize: Frames per callback (defaults to one VAD chunk)
+            preroll_ms: Milliseconds of audio kept while no recording is attached
+            idle_timeout: Seconds without a recording before the stream closes
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = blocksize or int(samplerate * VAD_CHUNK_DURATION_MS / 1000)
+        self.idle_timeout = idle_timeout
+
+        preroll_samples = max(1, int(samplerate * preroll_ms / 1000)) * channels
+        self._preroll = PrerollBuffer(preroll_samples)
+        self._stream = None
+        self._sink: Optional[Callable[[np.ndarray], None]] = None
+        self._lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._idle_generation = 0  # Bumped whenever the idle timer is cancelled or replaced
+
+    @property
+    def active(self) -> bool:
+        """Whether the input stream is open."""
+        return self._stream is not None
+
+    @property
+    def position(self) -> int:
+        """Samples captured so far; pass to ``recording`` to start from this point."""
+        return self._preroll.position
+
+    def _callback(self, indata, frames, time_info, status):
+        """PortAudio callback: keep the pre-roll and feed the attached recording."""
+        if status:
+            logger.warning(f"Audio stream status: {status}")
+        samples = indata.reshape(-1)
+        with self._lock:
+            self._preroll.write(samples)
+            sink = self._sink
+        if sink is not None:
+            sink(samples)
+
+    def _open_locked(self) -> None:
+        """Open the input stream if needed; the caller holds the lock."""
+        self._cancel_idle_timer()
+        if self._stream is not None:
+            return
+        stream = sd.InputStream(
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype=np.int16,
+            callback=self._callback,
+            blocksize=self.blocksize
+        )
+        stream.start()
+        self._stream = stream
+        logger.debug(f"Persistent capture stream opened ({self._preroll.capacity} samples of pre-roll)")
+
+    def start(self) -> None:
+        """Open the input stream if it is not already open.
+
+        The idle timer starts right away, so a stream opened ahead of a
+        recording that never happens is still closed.
+        """
+        with self._lock:
+            self._open_locked()
+            if self._sink is None:
+                self._arm_idle_timer_locked()
+
+    def close(self) -> None:
+        """Close the input stream; a later ``start`` reopens it."""
+        with self._lock:
+            self._cancel_idle_timer()
+            stream, self._stream = self._stream, None
+            self._sink = None
+        self._shutdown(stream)
+
+    @staticmethod
+    def _shutdown(stream) -> None:
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing capture stream: {e}")
+        logger.debug("Persistent capture stream closed")
+
+    def _arm_idle_timer_locked(self) -> None:
+        """(Re)start the idle timer; the caller holds the lock."""
+        self._cancel_idle_timer()
+        if self._stream is not None and self.idle_timeout > 0:
+            self._idle_timer = threading.Timer(self.idle_timeout, self._close_if_idle,
+                                               args=(self._idle_generation,))
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        self._idle_generation += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _close_if_idle(self, generation: int) -> None:
+        with self._lock:
+            # The timer may have fired just as it was cancelled or replaced
+            if generation != self._idle_generation or self._sink is not None:
+                return
+            self._idle_timer = None
+            stream, self._stream = self._stream, None
+        logger.debug(f"Capture stream idle for {self.idle_timeout}s")
+        self._shutdown(stream)
+
+    @contextmanager
+    def recording(self, sink: Callable[[np.ndarray], None], since: Optional[int] = None) -> Iterator[int]:
+        """Attach a recording sink for the duration of the ``with`` block.
+
+        The sink first receives the pre-roll written since ``since`` (if
+        given and still held), then every new block from the callback thread.
+
+        Args:
+            sink: Called with flat int16 samples
+            since: Position to start from, e.g. taken when TTS finished
+
+        Yields:
+            Capture position of the first sample handed to the sink
+        """
+        with self._lock:
+            self._open_locked()
+            preroll = self._preroll.read_since(since) if since is not None else np.zeros(0, dtype=np.int16)
+            if since is not None and self._preroll.position - since > len(preroll):
+                logger.debug(f"Pre-roll only covers the last {len(preroll)} of "
+                             f"{self._preroll.position - since} samples since the mark")
+            if len(preroll):
+                sink(preroll)
+            self._sink = sink
+            first_position = self._preroll.position - len(preroll)
+        try:
+            yield first_position
+        finally:
+            with self._lock:
+                self._sink = None
+                self._arm_idle_timer_locked()
+
+
+# Shared across turns
+_capture_stream: Optional[CaptureStream] = None
+
+
+def get_capture_stream() -> CaptureStream:
+    """Return the process-wide capture stream, creating it on first use."""
+    global _capture_stream
+    if _capture_stream is None:
+        preroll_ms = PREROLL_MS
+        if BARGE_IN_ENABLED:
+            # A barge-in recording starts at the speech onset, which is at least
+            # BARGE_IN_MIN_SPEECH_MS before it is detected
+            preroll_ms = max(preroll_ms, BARGE_IN_MIN_SPEECH_MS + 1000)
+        _capture_stream = CaptureStream(preroll_ms=preroll_ms)
+    return _capture_stream
+
+
+def close_capture_stream() -> None:
+    """Close the process-wide capture stream if it was ever opened."""
+    if _capture_stream is not None:
+        _capture_stream.close()
@@ -0,0 +1,130 @@
+"""
+Per-endpoint circuit breaker for voice-mode.
+
+Each TTS/STT endpoint has a breaker with three states:
+
+- closed: requests flow normally and outcomes are counted
+- open: the endpoint is out of rotation until its backoff expires
+- half-open: a background probe found the endpoint alive again; it is back in
+  rotation and the next real request decides whether it closes or re-opens
+
+The backoff doubles every time the breaker re-opens without having closed in
+between, so a dead endpoint is probed less and less often while a restarting
+one comes back within seconds.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+from .config import (
+    BREAKER_CONSECUTIVE_FAILURES,
+    BREAKER_FAILURE_RATE,
+    BREAKER_MIN_REQUESTS,
+    BREAKER_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Number of recent request outcomes used for the failure rate
+OUTCOME_WINDOW = 20
+
+
+@dataclass
+class CircuitBreaker:
+    """Failure tracking and open/half-open/closed state for one endpoint."""
+    consecutive_threshold: int = BREAKER_CONSECUTIVE_FAILURES
+    failure_rate: float = BREAKER_FAILURE_RATE
+    min_requests: int = BREAKER_MIN_REQUESTS
+    base_backoff: float = BREAKER_BACKOFF
+    max_backoff: float = BREAKER_MAX_BACKOFF
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    trips: int = 0  # Times opened since the breaker last closed
+    retry_at: float = 0.0  # time.monotonic() when the next probe is due
+    outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=OUTCOME_WINDOW))
+
+    @property
+    def available(self) -> bool:
+        """Whether the endpoint should be used for requests."""
+        return self.state != OPEN
+
+    @property
+    def backoff(self) -> float:
+        """Seconds the breaker stays open after the current trip."""
+        return min(self.max_backoff, self.base_backoff * 2 ** max(0, self.trips - 1))
+
+    def current_failure_rate(self) -> float:
+        """Fraction of failed requests within the recent window."""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def record_success(self) -> bool:
+        """Record a successful request.
+
+        Returns:
+            True if this closed a half-open breaker
+        """
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self.reset()
+            return True
+        return False
+
+    def record_failure(self, now: Optional[float] = None) -> bool:
+        """Record a failed request, opening the breaker if a threshold is crossed.
+
+        Returns:
+            True if this failure opened the breaker
+        """
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+
+        if self.state == OPEN:
+            return False
+
+        if (self.state == HALF_OPEN
+                or self.consecutive_failures >= self.consecutive_threshold
+                or (len(self.outcomes) >= self.min_requests
+                    and self.current_failure_rate() >= self.failure_rate)):
+            self.trip(now)
+            return True
+        return False
+
+    def trip(self, now: Optional[float] = None) -> None:
+        """Open the breaker, doubling the backoff if it had not closed since the last trip."""
+        self.state = OPEN
+        self.trips += 1
+        self.retry_at = (time.monotonic() if now is None else now) + self.backoff
+
+    def probe_due(self, now: Optional[float] = None) -> bool:
+        """Whether an open breaker's backoff has expired."""
+        return self.state == OPEN and (time.monotonic() if now is None else now) >= self.retry_at
+
+    def half_open(self) -> None:
+        """Let requests through again after a successful probe."""
+        self.state = HALF_OPEN
+        self.consecutive_failures = 0
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.retry_at = 0.0
+        self.outcomes.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary suitable for display."""
+        return {
+            "state": self.state,
+            "failure_rate": self.current_failure_rate(),
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_s": max(0.0, self.retry_at - time.monotonic()) if self.state == OPEN else None,
+        }
@@ -4,7 +4,7 @@ Exchanges command group for voice-mode CLI.
 
 import sys
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -15,7 +15,8 @@ from voice_mode.exchanges import (
     ExchangeFormatter, 
     ExchangeFilter,
     ConversationGrouper,
-    ExchangeStats
+    ExchangeStats,
+    FollowPosition
 )
 
 
@@ -35,13 +36,18 @@ def exchanges():
 @click.option('-F', '--full', is_flag=True, help='Show full metadata')
 @click.option('--no-color', is_flag=True, help='Disable colored output')
 @click.option('-d', '--date', type=click.DateTime(formats=['%Y-%m-%d']), 
-              help='Tail specific date (default: today)')
+              help='Start from the beginning of this date (default: today)')
 @click.option('--transport', 
               type=click.Choice(['local', 'livekit', 'speak-only', 'all']),
               help='Filter by transport type')
 @click.option('--provider', help='Filter by provider')
-def tail(format, stt, tts, full, no_color, date, transport, provider):
-    """Real-time following of exchange logs."""
+@click.option('--resume', 'resume_file', type=click.Path(dir_okay=False, path_type=Path),
+              help='Resume from the position saved in this file, and keep it updated')
+def tail(format, stt, tts, full, no_color, date, transport, provider, resume_file):
+    """Real-time following of exchange logs.
+    
+    Keeps following across midnight into the next day's log.
+    """
     reader = ExchangeReader()
     formatter = ExchangeFormatter()
     filter_obj = ExchangeFilter()
@@ -61,9 +67,26 @@ def tail(format, stt, tts, full, no_color, date, transport, provider):
     # Handle color
     use_color = not no_color and sys.stdout.isatty()
     
+    # Where to start: a saved position, the start of a given date, or today
+    position = None
+    if resume_file and resume_file.exists():
+        try:
+            position = FollowPosition.from_dict(json.loads(resume_file.read_text()))
+        except (ValueError, KeyError) as e:
+            click.echo(f"Ignoring unreadable position in {resume_file}: {e}", err=True)
+    if position is None and date:
+        position = FollowPosition(date.date(), 0)
+    follower = reader.follow(position=position)
+    
+    def save_position():
+        if resume_file:
+            tmp_file = resume_file.with_name(resume_file.name + '.tmp')
+            tmp_file.write_text(json.dumps(follower.position.to_dict()))
+            tmp_file.replace(resume_file)
+    
     try:
         # Tail the logs
-        for exchange in filter_obj.apply(reader.tail(follow=True)):
+        for exchange in filter_obj.apply(follower):
             if format == 'simple':
                 output = formatter.simple(exchange, color=use_color, show_timing=not full)
             elif format == 'pretty':
@@ -79,6 +102,7 @@ def tail(format, stt, tts, full, no_color, date, transport, provider):
                 print()  # Extra line between pretty entries
             
             sys.stdout.flush()
+            save_position()
     
     except KeyboardInterrupt:
         # Clean exit on Ctrl+C
@@ -235,19 +259,14 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
     """Show statistics about exchanges."""
     reader = ExchangeReader()
     
-    # Read exchanges
-    if days:
-        exchanges = list(reader.read_recent(days))
-    else:
-        # Default to last 7 days
-        exchanges = list(reader.read_recent(7))
+    # Merge daily rollups, reading only today's and partial days (default to last 7 days)
+    end = datetime.now(timezone.utc)
+    stats_obj = ExchangeStats.from_range(end - timedelta(days=days or 7), end, reader)
     
-    if not exchanges:
+    if not stats_obj.aggregate.total:
         click.echo("No exchanges found in the specified period.", err=True)
         return
     
-    stats_obj = ExchangeStats(exchanges)
-    
     # If no specific stats requested, show summary
     if not any([by_hour, by_provider, by_transport, timing, conversations, 
                 errors, silence]) or show_all:
@@ -283,20 +302,23 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
         if 'overall' in timing_stats and timing_stats['overall']:
             print("Overall:")
             if 'avg_turnaround' in timing_stats['overall']:
-                print(f"  Avg Turnaround: {timing_stats['overall']['avg_turnaround']:.2f}s")
+                print(f"  Avg Turnaround: {timing_stats['overall']['avg_turnaround']:.2f}s "
+                      f"(p95 {timing_stats['overall']['p95_turnaround']:.2f}s)")
         
         if 'tts' in timing_stats and timing_stats['tts']:
             print("\nTTS:")
             for metric, values in timing_stats['tts'].items():
                 if isinstance(values, dict) and 'avg' in values:
-                    print(f"  {metric}: avg={values['avg']:.2f}s, "
+                    print(f"  {metric}: avg={values['avg']:.2f}s, p50={values['p50']:.2f}s, "
+                          f"p95={values['p95']:.2f}s, p99={values['p99']:.2f}s, "
                           f"min={values['min']:.2f}s, max={values['max']:.2f}s")
         
         if 'stt' in timing_stats and timing_stats['stt']:
             print("\nSTT:")
             for metric, values in timing_stats['stt'].items():
                 if isinstance(values, dict) and 'avg' in values:
-                    print(f"  {metric}: avg={values['avg']:.2f}s, "
+                    print(f"  {metric}: avg={values['avg']:.2f}s, p50={values['p50']:.2f}s, "
+                          f"p95={values['p95']:.2f}s, p99={values['p99']:.2f}s, "
                           f"min={values['min']:.2f}s, max={values['max']:.2f}s")
     
     if conversations or show_all:
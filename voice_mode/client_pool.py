@@ -0,0 +1,199 @@
+"""
+Persistent OpenAI client pool for voice-mode.
+
+Creating an ``AsyncOpenAI`` client creates a new httpx connection pool, so
+every request made through a fresh client pays for DNS, TCP and TLS setup
+again. The pool keeps one client per (base_url, api_key) with keep-alive
+connections (and HTTP/2 when available), closes clients that have been idle
+for a while and closes everything on shutdown.
+
+Callers keep the returned client for as long as they need it, so a client is
+only idle when none of its requests are in flight: each request holds a lease
+on its client until the response body has been read or closed.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+from .config import HTTP_CLIENT_CONFIG
+
+# Optional h2 for HTTP/2 support
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger("voicemode")
+
+
+class _LeaseStream(httpx.AsyncByteStream):
+    """Response body that returns its request's lease once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, transport: "LeaseTrackingTransport"):
+        self._stream = stream
+        self._transport = transport
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._transport.release()
+
+
+class LeaseTrackingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper counting requests whose responses are still open."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self.leases = 0
+        self.released_at = time.monotonic()
+
+    def release(self) -> None:
+        self.leases -= 1
+        self.released_at = time.monotonic()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.leases += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.release()
+            raise
+        if response.is_closed:  # Body was already read in full
+            self.release()
+        else:
+            response.stream = _LeaseStream(response.stream, self)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+@dataclass
+class PooledClient:
+    """A pooled client and when it was last handed out."""
+    client: AsyncOpenAI
+    http_client: httpx.AsyncClient
+    transport: LeaseTrackingTransport
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def in_use(self) -> bool:
+        """Whether any request made through the client is still open."""
+        return self.transport.leases > 0
+
+    @property
+    def idle_since(self) -> float:
+        """When the client was last handed out or finished a request."""
+        return max(self.last_used, self.transport.released_at)
+
+
+class ClientPool:
+    """Pool of long-lived ``AsyncOpenAI`` clients keyed by (base_url, api_key)."""
+
+    def __init__(self, config: dict = HTTP_CLIENT_CONFIG):
+        """Create a pool.
+
+        Args:
+            config: HTTP client settings (see ``HTTP_CLIENT_CONFIG``)
+        """
+        self.config = config
+        self.idle_timeout = config.get('idle_timeout', 600.0)
+        self._clients: Dict[Tuple[str, str], PooledClient] = {}
+
+    def _create_transport(self) -> httpx.AsyncBaseTransport:
+        """Create the connection pool with the configured limits."""
+        limits = self.config['limits']
+        return httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_keepalive_connections=limits['max_keepalive_connections'],
+                max_connections=limits['max_connections'],
+                keepalive_expiry=limits.get('keepalive_expiry', 5.0),
+            ),
+            http2=self.config.get('http2', True) and HTTP2_AVAILABLE,
+        )
+
+    def _create_http_client(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+        """Create an httpx client with the configured timeouts over ``transport``."""
+        timeout = self.config['timeout']
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout['total'], connect=timeout['connect']),
+            transport=transport,
+        )
+
+    async def get(self, base_url: str, api_key: str) -> AsyncOpenAI:
+        """Get the pooled client for an endpoint, creating it on first use.
+
+        Args:
+            base_url: OpenAI-compatible API base URL
+            api_key: API key to authenticate with
+
+        Returns:
+            Shared ``AsyncOpenAI`` client
+        """
+        key = (base_url, api_key)
+        entry = self._clients.get(key)
+        if entry is None:
+            transport = LeaseTrackingTransport(self._create_transport())
+            http_client = self._create_http_client(transport)
+            entry = PooledClient(
+                client=AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client),
+                http_client=http_client,
+                transport=transport,
+            )
+            self._clients[key] = entry
+            logger.debug(f"Created pooled client for {base_url}")
+
+        entry.last_used = time.monotonic()
+        await self._evict_idle(keep=key)
+        return entry.client
+
+    async def _evict_idle(self, keep: Tuple[str, str]) -> None:
+        """Close clients, other than ``keep``, with no open requests within the idle timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [key for key, entry in self._clients.items()
+                if key != keep and not entry.in_use and entry.idle_since < cutoff]
+        for key in idle:
+            logger.debug(f"Closing idle client for {key[0]}")
+            await self._close(self._clients.pop(key))
+
+    async def _close(self, entry: PooledClient) -> None:
+        """Close one pooled client."""
+        try:
+            await entry.http_client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing HTTP client: {e}")
+
+    async def aclose(self) -> None:
+        """Close all pooled clients."""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        for entry in entries:
+            await self._close(entry)
+        if entries:
+            logger.debug(f"Closed {len(entries)} pooled HTTP clients")
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# Global pool instance
+client_pool = ClientPool()
+
+
+async def get_client(base_url: str, api_key: str) -> AsyncOpenAI:
+    """Get a pooled ``AsyncOpenAI`` client for an endpoint."""
+    return await client_pool.get(base_url, api_key)
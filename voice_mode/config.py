@@ -39,6 +39,9 @@ SAVE_TRANSCRIPTIONS = SAVE_ALL or DEBUG or os.getenv("VOICEMODE_SAVE_TRANSCRIPTI
 
 # Audio feedback configuration
 AUDIO_FEEDBACK_ENABLED = os.getenv("VOICEMODE_AUDIO_FEEDBACK", "true").lower() in ("true", "1", "yes", "on")
+# Optional WAV files replacing the built-in start/end chimes
+CHIME_START_FILE = os.getenv("VOICEMODE_CHIME_START_FILE", "")
+CHIME_END_FILE = os.getenv("VOICEMODE_CHIME_END_FILE", "")
 
 # Local provider preference configuration
 PREFER_LOCAL = os.getenv("VOICEMODE_PREFER_LOCAL", "true").lower() in ("true", "1", "yes", "on")
@@ -60,6 +63,22 @@ def parse_comma_list(env_var: str, fallback: str) -> list:
 # New provider endpoint lists configuration
 TTS_BASE_URLS = parse_comma_list("VOICEMODE_TTS_BASE_URLS", "http://127.0.0.1:8880/v1,https://api.openai.com/v1")
 STT_BASE_URLS = parse_comma_list("VOICEMODE_STT_BASE_URLS", "http://127.0.0.1:2022/v1,https://api.openai.com/v1")
+# Raw PCM sample rate of TTS endpoints that do not produce 24kHz, as url=rate pairs.
+# A rate in the response's Content-Type (e.g. audio/pcm;rate=22050) takes precedence
+TTS_PCM_SAMPLE_RATES = {
+    url.strip(): int(rate)
+    for url, _, rate in (item.rpartition("=") for item in parse_comma_list("VOICEMODE_TTS_PCM_SAMPLE_RATES", ""))
+    if url and rate.strip().isdigit()
+}
+# Endpoint selection policy: 'ordered' (configured order) or 'fastest' (lowest measured latency)
+ENDPOINT_SELECTION = os.getenv("VOICEMODE_ENDPOINT_SELECTION", "ordered").lower()
+# Circuit breaker: an endpoint is taken out of rotation after consecutive failures
+# or a high failure rate, and probed in the background with exponential backoff
+BREAKER_CONSECUTIVE_FAILURES = int(os.getenv("VOICEMODE_BREAKER_CONSECUTIVE_FAILURES", "2"))
+BREAKER_FAILURE_RATE = float(os.getenv("VOICEMODE_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_MIN_REQUESTS = int(os.getenv("VOICEMODE_BREAKER_MIN_REQUESTS", "5"))
+BREAKER_BACKOFF = float(os.getenv("VOICEMODE_BREAKER_BACKOFF", "5"))
+BREAKER_MAX_BACKOFF = float(os.getenv("VOICEMODE_BREAKER_MAX_BACKOFF", "300"))
 TTS_VOICES = parse_comma_list("VOICEMODE_TTS_VOICES", "af_sky,alloy")
 TTS_MODELS = parse_comma_list("VOICEMODE_TTS_MODELS", "tts-1,tts-1-hd,gpt-4o-mini-tts")
 
@@ -88,11 +107,37 @@ DISABLE_SILENCE_DETECTION = os.getenv("VOICEMODE_DISABLE_SILENCE_DETECTION", "fa
 
 # VAD (Voice Activity Detection) configuration
 VAD_AGGRESSIVENESS = int(os.getenv("VOICEMODE_VAD_AGGRESSIVENESS", "2"))  # 0-3, higher = more aggressive
+# VAD engine: auto (webrtc if installed, else energy), webrtc, energy, or onnx
+VAD_ENGINE = os.getenv("VOICEMODE_VAD_ENGINE", "auto").lower()
+# Silero-compatible ONNX model for the onnx engine, and its speech probability threshold
+VAD_ONNX_MODEL = os.getenv("VOICEMODE_VAD_ONNX_MODEL", "")
+VAD_ONNX_THRESHOLD = float(os.getenv("VOICEMODE_VAD_ONNX_THRESHOLD", "0.5"))
 SILENCE_THRESHOLD_MS = int(os.getenv("VOICEMODE_SILENCE_THRESHOLD_MS", "1000"))  # Stop after 1000ms (1 second) of silence
 MIN_RECORDING_DURATION = float(os.getenv("VOICEMODE_MIN_RECORDING_DURATION", "0.5"))  # Minimum 0.5s recording
 VAD_CHUNK_DURATION_MS = 30  # VAD frame size (must be 10, 20, or 30ms)
 INITIAL_SILENCE_GRACE_PERIOD = float(os.getenv("VOICEMODE_INITIAL_SILENCE_GRACE_PERIOD", "4.0"))  # Give users 4s to start speaking
 
+# Persistent microphone capture (opt-in): keep the input stream open across turns
+# with a rolling pre-roll, so listening starts the moment TTS ends. The microphone
+# stays open until CAPTURE_IDLE_TIMEOUT passes without a recording
+PERSISTENT_CAPTURE = os.getenv("VOICEMODE_PERSISTENT_CAPTURE", "false").lower() in ("true", "1", "yes", "on")
+PREROLL_MS = int(os.getenv("VOICEMODE_PREROLL_MS", "500"))  # Most recent audio kept while not recording
+CAPTURE_IDLE_TIMEOUT = float(os.getenv("VOICEMODE_CAPTURE_IDLE_TIMEOUT", "60"))  # Close the stream after this many idle seconds
+
+# Shared output stream: all playback goes through one long-lived stream per
+# device and sample rate instead of opening the device for every utterance
+OUTPUT_DEVICE = os.getenv("VOICEMODE_OUTPUT_DEVICE", "")  # Device index or name, empty for the system default
+OUTPUT_IDLE_TIMEOUT = float(os.getenv("VOICEMODE_OUTPUT_IDLE_TIMEOUT", "60"))  # 0 closes the stream after each playback
+# Output stream sample rate; 'auto' uses the device's native rate. TTS audio at
+# other rates is resampled in blocks before it reaches the device
+OUTPUT_SAMPLE_RATE = os.getenv("VOICEMODE_OUTPUT_SAMPLE_RATE", "auto").lower()
+
+# Barge-in: while TTS plays, listen on the persistent capture stream and stop
+# playback when the user talks over it (requires PERSISTENT_CAPTURE)
+BARGE_IN_ENABLED = os.getenv("VOICEMODE_BARGE_IN", "false").lower() in ("true", "1", "yes", "on")
+BARGE_IN_MIN_SPEECH_MS = int(os.getenv("VOICEMODE_BARGE_IN_MIN_SPEECH_MS", "300"))  # Sustained speech needed to interrupt
+BARGE_IN_ECHO_MARGIN_DB = float(os.getenv("VOICEMODE_BARGE_IN_ECHO_MARGIN_DB", "6"))  # How far above the expected echo speech must be
+
 # Default listen duration for converse tool
 DEFAULT_LISTEN_DURATION = float(os.getenv("VOICEMODE_DEFAULT_LISTEN_DURATION", "120.0"))  # Default 120s listening time
 
@@ -131,6 +176,29 @@ STREAM_CHUNK_SIZE = int(os.getenv("VOICEMODE_STREAM_CHUNK_SIZE", "4096"))  # Dow
 STREAM_BUFFER_MS = int(os.getenv("VOICEMODE_STREAM_BUFFER_MS", "150"))  # Initial buffer before playback
 STREAM_MAX_BUFFER = float(os.getenv("VOICEMODE_STREAM_MAX_BUFFER", "2.0"))  # Max buffer in seconds
 
+# Streaming STT: transcribe completed speech segments while the user is still talking
+STREAMING_STT_ENABLED = os.getenv("VOICEMODE_STREAMING_STT", "false").lower() in ("true", "1", "yes", "on")
+STREAMING_STT_SEGMENT_PAUSE_MS = int(os.getenv("VOICEMODE_STREAMING_STT_SEGMENT_PAUSE_MS", "300"))  # Pause that ends a segment
+STREAMING_STT_MIN_SEGMENT_S = float(os.getenv("VOICEMODE_STREAMING_STT_MIN_SEGMENT", "3.0"))  # Shortest segment sent early
+
+# Hedged TTS: race the next endpoint when the preferred one is slow to produce audio
+TTS_HEDGE_ENABLED = os.getenv("VOICEMODE_TTS_HEDGE", "false").lower() in ("true", "1", "yes", "on")
+TTS_HEDGE_DELAY_MS = int(os.getenv("VOICEMODE_TTS_HEDGE_DELAY_MS", "800"))  # Wait for first audio before hedging
+TTS_HEDGE_MAX_ENDPOINTS = int(os.getenv("VOICEMODE_TTS_HEDGE_MAX_ENDPOINTS", "2"))  # Including the preferred one
+
+# TTS cache: replay decoded audio for exact repeats of recent utterances
+TTS_CACHE_ENABLED = os.getenv("VOICEMODE_TTS_CACHE", "false").lower() in ("true", "1", "yes", "on")
+TTS_CACHE_DIR = Path(os.getenv("VOICEMODE_TTS_CACHE_DIR", str(BASE_DIR / "cache" / "tts")))
+TTS_CACHE_MAX_MB = float(os.getenv("VOICEMODE_TTS_CACHE_MAX_MB", "200"))  # On-disk size limit
+TTS_CACHE_MEMORY_MB = float(os.getenv("VOICEMODE_TTS_CACHE_MEMORY_MB", "32"))  # In-memory size limit
+TTS_CACHE_MAX_CHARS = int(os.getenv("VOICEMODE_TTS_CACHE_MAX_CHARS", "300"))  # Longer texts are not cached
+
+# Pipelined TTS: synthesize the next sentence while the current one plays
+TTS_PIPELINE_ENABLED = os.getenv("VOICEMODE_TTS_PIPELINE", "false").lower() in ("true", "1", "yes", "on")
+TTS_PIPELINE_CONCURRENCY = int(os.getenv("VOICEMODE_TTS_PIPELINE_CONCURRENCY", "2"))  # Synthesis requests in flight
+TTS_PIPELINE_MAX_CHARS = int(os.getenv("VOICEMODE_TTS_PIPELINE_MAX_CHARS", "250"))  # Longest segment
+TTS_PIPELINE_MIN_CHARS = int(os.getenv("VOICEMODE_TTS_PIPELINE_MIN_CHARS", "20"))  # Shorter fragments are merged
+
 # ==================== EVENT LOGGING CONFIGURATION ====================
 
 # Event logging configuration
@@ -385,9 +453,14 @@ HTTP_CLIENT_CONFIG = {
         'connect': 5.0
     },
     'limits': {
-        'max_keepalive_connections': 5,
-        'max_connections': 10
-    }
+        'max_keepalive_connections': int(os.getenv("VOICEMODE_HTTP_MAX_KEEPALIVE", "5")),
+        'max_connections': int(os.getenv("VOICEMODE_HTTP_MAX_CONNECTIONS", "10")),
+        'keepalive_expiry': float(os.getenv("VOICEMODE_HTTP_KEEPALIVE_EXPIRY", "120.0"))
+    },
+    # HTTP/2 is used for TLS endpoints when the optional h2 package is installed
+    'http2': os.getenv("VOICEMODE_HTTP2", "true").lower() in ("true", "1", "yes", "on"),
+    # Pooled clients unused for this long are closed
+    'idle_timeout': float(os.getenv("VOICEMODE_CLIENT_IDLE_TIMEOUT", "600.0"))
 }
 
 # ==================== INITIALIZATION ====================
@@ -6,6 +6,7 @@ for real-time conversation tracking and analysis.
 """
 
 import json
+import logging
 import os
 import random
 import string
@@ -15,6 +16,10 @@ from typing import Dict, Any, Optional
 
 from voice_mode.__version__ import __version__
 from voice_mode.config import BASE_DIR
+from voice_mode.exchanges.index import IndexEntry, append_index_entries
+from voice_mode.exchanges.reader import read_lines_reversed
+
+logger = logging.getLogger(__name__)
 
 
 class ConversationLogger:
@@ -82,19 +87,10 @@ class ConversationLogger:
             return None
         
         try:
-            # Read file backwards to get last line efficiently
-            with open(file_path, 'rb') as f:
-                # Go to end of file
-                f.seek(0, 2)
-                file_size = f.tell()
-                
-                # Read backwards until we find a newline
-                buffer_size = min(file_size, 1024)
-                f.seek(max(0, file_size - buffer_size))
-                
-                lines = f.read().decode('utf-8').strip().split('\n')
-                if lines:
-                    return json.loads(lines[-1])
+            # Read file backwards to get last line efficiently, however long it is
+            last_line = next(read_lines_reversed(file_path, block_size=4096), None)
+            if last_line:
+                return json.loads(last_line)
         except Exception:
             return None
         
@@ -130,9 +126,10 @@ class ConversationLogger:
         self._check_conversation_continuity()
         
         # Build the log entry
+        now = datetime.now().astimezone()
         entry = {
             "version": self.SCHEMA_VERSION,
-            "timestamp": datetime.now().astimezone().isoformat(),
+            "timestamp": now.isoformat(),
             "conversation_id": self.conversation_id,
             "type": utterance_type,
             "text": text,
@@ -152,8 +149,20 @@ class ConversationLogger:
         
         # Write to today's log file
         log_file = self._get_log_file_path(datetime.now().date())
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+        with open(log_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            # In append mode this is the end of our own write, even if another
+            # process appended in the meantime
+            end = f.tell()
+        
+        # Keep the sidecar index in step so lookups can seek to this line
+        try:
+            append_index_entries(log_file, [IndexEntry(end - len(line), len(line),
+                                                       now.timestamp(), self.conversation_id)])
+        except OSError as e:
+            logger.debug(f"Could not update exchange index for {log_file}: {e}")
     
     def _check_conversation_continuity(self):
         """Check if we need to start a new conversation based on time gap."""
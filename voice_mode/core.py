@@ -7,24 +7,26 @@ extracted to allow for easier testing and reuse.
 
 import asyncio
 import logging
-import os
-import tempfile
 import gc
 import time
+import wave
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 from pydub import AudioSegment
 from openai import AsyncOpenAI
 import httpx
 
-from .config import SAMPLE_RATE
+from .config import SAMPLE_RATE, CHIME_START_FILE, CHIME_END_FILE
+from .audio_output import PLAYBACK_LEAD_IN_S
+from .audio_decoder import decode_audio_bytes, StreamDecoderError
 from .utils import (
     get_event_logger,
     log_tts_start,
-    log_tts_first_audio
+    log_tts_first_audio,
+    log_tts_audio_timing
 )
 
 logger = logging.getLogger("voicemode")
@@ -106,6 +108,236 @@ def get_openai_clients(api_key: str, stt_base_url: Optional[str] = None, tts_bas
     }
 
 
+def _detect_tts_provider(base_url: str) -> str:
+    """Determine provider from base URL (simple heuristic)."""
+    return "openai" if "openai" in base_url else "kokoro"
+
+
+def _build_speech_request(
+    text: str,
+    model: str,
+    voice: str,
+    base_url: str,
+    audio_format: Optional[str] = None,
+    instructions: Optional[str] = None
+) -> dict:
+    """Build TTS request parameters using a response format the provider supports."""
+    from .config import TTS_AUDIO_FORMAT, validate_audio_format
+    
+    # Use provided format or fall back to configured default
+    format_to_use = audio_format if audio_format else TTS_AUDIO_FORMAT
+    request_params = {
+        "model": model,
+        "input": text,
+        "voice": voice,
+        "response_format": validate_audio_format(format_to_use, _detect_tts_provider(base_url), "tts")
+    }
+    
+    # Add instructions if provided and model supports it
+    if instructions and model == "gpt-4o-mini-tts":
+        request_params["instructions"] = instructions
+    
+    return request_params
+
+
+def _speech_cache_key(request_params: dict, base_url: str) -> str:
+    """TTS cache key for a speech request."""
+    from .tts_cache import make_cache_key
+    return make_cache_key(
+        request_params["input"],
+        request_params["voice"],
+        request_params["model"],
+        request_params.get("instructions"),
+        request_params["response_format"],
+        _detect_tts_provider(base_url)
+    )
+
+
+def _decode_rate(response_format: str, base_url: str, headers=None) -> int:
+    """Sample rate to decode a TTS response at.
+    
+    Raw PCM carries no header, so its rate comes from the response headers
+    (remembered for the endpoint) or the provider registry. Other formats are
+    decoded by ffmpeg straight to the output rate.
+    """
+    from .audio_output import get_output_rate
+    from .provider_discovery import provider_registry
+    
+    if response_format != "pcm":
+        return get_output_rate()
+    if headers is not None:
+        from .streaming import parse_pcm_sample_rate
+        announced = parse_pcm_sample_rate(headers)
+        if announced:
+            provider_registry.set_pcm_sample_rate(base_url, announced)
+    return provider_registry.get_pcm_sample_rate(base_url)
+
+
+def _play_pcm_blocking(samples: np.ndarray, frame_rate: int, channels: int = 1):
+    """Play int16 samples on the shared output stream and wait until done.
+    
+    Audio at another rate than the output is resampled first.
+    
+    Returns:
+        The finished ``OutputSession``: its DAC timing, and ``aborted`` if
+        playback was stopped by barge-in
+    """
+    from .audio_output import get_output_service, get_output_rate
+    from .barge_in import write_output
+    from .resample import resample
+    
+    output_rate = get_output_rate()
+    if frame_rate != output_rate:
+        if channels > 1:
+            samples = np.asarray(samples).reshape(-1, channels)
+        samples = resample(samples, frame_rate, output_rate)
+    
+    with get_output_service(output_rate, channels).open_session() as stream:
+        if not write_output(stream, samples):
+            stream.abort()  # Drop whatever is still queued
+        else:
+            stream.drain()
+    return stream
+
+
+def _record_playback_timing(metrics: dict, session, start_time: float) -> None:
+    """Set TTFA and playback time from when audio reached and left the DAC.
+    
+    Args:
+        metrics: TTS metrics dict to update
+        session: The finished ``OutputSession``
+        start_time: ``time.perf_counter()`` when the TTS request started
+    """
+    if session.started_at is not None:
+        metrics['ttfa'] = session.started_at - start_time
+        if session.finished_at is not None:
+            metrics['playback'] = session.finished_at - session.started_at
+    if session.output_latency is not None:
+        metrics['output_latency'] = session.output_latency
+    log_tts_audio_timing(session.started_at, session.finished_at)
+
+
+async def _pipelined_text_to_speech(
+    segments: list,
+    client,
+    tts_model: str,
+    tts_voice: str,
+    tts_base_url: str,
+    audio_format: Optional[str],
+    instructions: Optional[str],
+    metrics: dict,
+    save_audio: bool = False,
+    audio_dir: Optional[Path] = None,
+    conversation_id: Optional[str] = None
+) -> Optional[tuple]:
+    """Speak text segment by segment, synthesizing ahead while earlier segments play.
+    
+    Segments are cached individually when the TTS cache is enabled.
+    
+    Returns:
+        (success, metrics), or None if synthesis failed before anything was played.
+        If it failed part-way, what was written is played out and
+        ``metrics['unplayed_text']`` holds the remaining segments for failover.
+    """
+    from .config import TTS_PIPELINE_CONCURRENCY
+    from .tts_cache import get_tts_cache, is_cacheable
+    from .tts_pipeline import play_pipelined
+    from .audio_output import get_output_service, get_output_rate
+    from .barge_in import PlaybackInterrupted, write_output
+    from .resample import resample
+    
+    tts_cache = get_tts_cache()
+    event_logger = get_event_logger()
+    output_rate = get_output_rate()
+    played = []
+    
+    async def synthesize(segment: str) -> np.ndarray:
+        params = _build_speech_request(segment, tts_model, tts_voice, tts_base_url, audio_format, instructions)
+        cache_key = _speech_cache_key(params, tts_base_url) if tts_cache and is_cacheable(segment) else None
+        cached = await asyncio.to_thread(tts_cache.get, cache_key) if cache_key else None
+        if cached is not None:
+            samples, frame_rate = cached
+        else:
+            async with client.audio.speech.with_streaming_response.create(**params) as response:
+                data = await response.read()
+                headers = getattr(response, "headers", None)
+            samples, frame_rate, channels = await decode_audio_bytes(
+                data, params["response_format"], sample_rate=_decode_rate(params["response_format"], tts_base_url, headers)
+            )
+            if channels != 1:
+                raise StreamDecoderError(f"Pipelined playback needs mono audio, got {channels}ch")
+            if cache_key:
+                tts_cache.put_in_background(cache_key, samples, frame_rate)
+        # Resampling a whole sentence is far quicker than playing it
+        return resample(samples, frame_rate, output_rate)
+    
+    try:
+        stream = get_output_service(output_rate).open_session()
+    except Exception as e:
+        logger.error(f"Could not open output stream for pipelined TTS: {e}")
+        return None
+    
+    def write(samples: np.ndarray) -> None:
+        if not played:
+            if event_logger:
+                event_logger.log_event(event_logger.TTS_FIRST_AUDIO)
+                event_logger.log_event(event_logger.TTS_PLAYBACK_START)
+        played.append(samples)
+        if not write_output(stream, samples):
+            raise PlaybackInterrupted()
+    
+    pipeline_start = time.perf_counter()
+    try:
+        pipeline_metrics = await play_pipelined(segments, synthesize, write, TTS_PIPELINE_CONCURRENCY)
+        await asyncio.to_thread(stream.drain)  # Returns once queued audio has played
+        if stream.aborted:
+            raise PlaybackInterrupted()  # The user barged in during the tail
+    except PlaybackInterrupted:
+        stream.abort()
+        logger.info(f"Pipelined TTS interrupted by the user after {len(played)}/{len(segments)} segments")
+        if event_logger:
+            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+        metrics['interrupted'] = True
+        _record_playback_timing(metrics, stream, pipeline_start)
+        return True, metrics
+    except Exception as e:
+        logger.error(f"Pipelined TTS failed after {len(played)}/{len(segments)} segments: {e}")
+        if not played:
+            return None
+        # Finish the sentences already written, then hand only the rest to
+        # failover so the user does not hear them twice
+        await asyncio.to_thread(stream.drain)
+        if event_logger:
+            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+        _record_playback_timing(metrics, stream, pipeline_start)
+        if stream.aborted:
+            metrics['interrupted'] = True
+            return True, metrics
+        metrics['unplayed_text'] = " ".join(segments[len(played):])
+        return False, metrics
+    finally:
+        stream.close()
+    
+    if event_logger:
+        event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+    
+    metrics['ttfa'] = pipeline_metrics.ttfa
+    metrics['generation'] = pipeline_metrics.generation_time
+    metrics['playback'] = pipeline_metrics.playback_time - pipeline_metrics.ttfa
+    metrics['segments'] = pipeline_metrics.segments
+    _record_playback_timing(metrics, stream, pipeline_start)
+    
+    if save_audio and audio_dir:
+        from .audio_encoder import encode_wav
+        audio_path = save_debug_file(encode_wav(np.concatenate(played), output_rate), "tts", "wav",
+                                     audio_dir, True, conversation_id)
+        if audio_path:
+            metrics['audio_path'] = audio_path
+    
+    logger.info(f"✓ TTS pipelined {pipeline_metrics.segments} segments - TTFA: {metrics['ttfa']:.3f}s")
+    return True, metrics
+
+
 async def text_to_speech(
     text: str,
     openai_clients: dict,
@@ -119,12 +351,20 @@ async def text_to_speech(
     client_key: str = 'tts',
     instructions: Optional[str] = None,
     audio_format: Optional[str] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    hedge_configs: Optional[list] = None
 ) -> tuple[bool, Optional[dict]]:
     """Convert text to speech and play it.
     
+    Args:
+        hedge_configs: Alternative endpoints (dicts with client, base_url, model, voice)
+            raced against the primary when its first audio is slow. Streaming only.
+    
     Returns:
-        tuple: (success: bool, metrics: dict) where metrics contains 'generation' and 'playback' times
+        tuple: (success: bool, metrics: dict) where metrics contains 'generation' and 'playback' times,
+        'attempted_urls' (endpoints actually requested) and, after a hedged race,
+        'hedge_failures' (base URL -> error of endpoints that failed) and
+        'hedge_cancelled_ms' (base URL -> how long a cancelled loser ran)
     """
     import time
     
@@ -158,42 +398,80 @@ async def text_to_speech(
     try:
         # Import config for audio format
         from .config import (
-            TTS_AUDIO_FORMAT, validate_audio_format, get_audio_loader_for_format,
-            STREAMING_ENABLED, STREAM_CHUNK_SIZE, SAMPLE_RATE
+            STREAMING_ENABLED, TTS_HEDGE_DELAY_MS, STREAM_CHUNK_SIZE, SAMPLE_RATE,
+            TTS_PIPELINE_ENABLED, TTS_PIPELINE_MAX_CHARS, TTS_PIPELINE_MIN_CHARS
         )
         
-        # Determine provider from base URL (simple heuristic)
-        if "openai" in tts_base_url:
-            provider = "openai"
-        else:
-            provider = "kokoro"
-        
+        provider = _detect_tts_provider(tts_base_url)
         logger.info(f"  • Detected Provider: {provider} (based on URL: {tts_base_url})")
         
-        # Validate format for provider
-        # Use provided format or fall back to configured default
-        format_to_use = audio_format if audio_format else TTS_AUDIO_FORMAT
-        validated_format = validate_audio_format(format_to_use, provider, "tts")
-        
         logger.debug("Making TTS API request...")
-        # Build request parameters
-        request_params = {
-            "model": tts_model,
-            "input": text,
-            "voice": tts_voice,
-            "response_format": validated_format
-        }
-        
-        # Add instructions if provided and model supports it
-        if instructions and tts_model == "gpt-4o-mini-tts":
-            request_params["instructions"] = instructions
+        # Build request parameters with a format the provider supports
+        request_params = _build_speech_request(text, tts_model, tts_voice, tts_base_url, audio_format, instructions)
+        validated_format = request_params["response_format"]
+        if "instructions" in request_params:
             logger.debug(f"TTS instructions: {instructions}")
         
         # Track generation time
         generation_start = time.perf_counter()
         
+        # Replay exact repeats from the TTS cache without a network request
+        from .tts_cache import get_tts_cache, is_cacheable
+        tts_cache = get_tts_cache() if is_cacheable(text) else None
+        if tts_cache:
+            cached = await asyncio.to_thread(tts_cache.get, _speech_cache_key(request_params, tts_base_url))
+            if cached is not None:
+                cached_samples, cached_rate = cached
+                logger.info(f"TTS cache hit ({len(cached_samples) / cached_rate:.1f}s of audio)")
+                try:
+                    if event_logger:
+                        event_logger.log_event(event_logger.TTS_PLAYBACK_START)
+                    playback_start = time.perf_counter()
+                    metrics['generation'] = 0.0
+                    metrics['ttfa'] = playback_start - generation_start
+                    metrics['cache_hit'] = True
+                    session = await asyncio.to_thread(_play_pcm_blocking, cached_samples, cached_rate)
+                    if session.aborted:
+                        metrics['interrupted'] = True
+                    metrics['playback'] = time.perf_counter() - playback_start
+                    _record_playback_timing(metrics, session, generation_start)
+                    if event_logger:
+                        event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+                    
+                    if save_audio and audio_dir:
+                        from .audio_encoder import encode_wav
+                        audio_path = save_debug_file(encode_wav(cached_samples, cached_rate), "tts", "wav",
+                                                     audio_dir, True, conversation_id)
+                        if audio_path:
+                            metrics['audio_path'] = audio_path
+                    
+                    logger.info("✓ TTS played from cache")
+                    return True, metrics
+                except Exception as e:
+                    logger.warning(f"Cached audio playback failed, synthesizing instead: {e}")
+                    metrics.pop('cache_hit', None)
+        
+        # Only the primary is contacted unless a hedged race starts the others
+        metrics['attempted_urls'] = [tts_base_url]
+        
+        # Multi-sentence text: synthesize sentence N+1 while sentence N plays
+        if TTS_PIPELINE_ENABLED:
+            from .tts_pipeline import split_sentences
+            segments = split_sentences(text, TTS_PIPELINE_MAX_CHARS, TTS_PIPELINE_MIN_CHARS)
+            if len(segments) > 1:
+                logger.info(f"Using pipelined playback for {len(segments)} segments")
+                result = await _pipelined_text_to_speech(
+                    segments, openai_clients[client_key], tts_model, tts_voice, tts_base_url,
+                    audio_format, instructions, metrics,
+                    save_audio=save_audio, audio_dir=audio_dir, conversation_id=conversation_id
+                )
+                if result is not None:
+                    return result
+                logger.warning("Pipelined TTS failed before playback, falling back to single request")
+        
         # Check if streaming is enabled and format is supported
-        use_streaming = STREAMING_ENABLED and validated_format in ["opus", "mp3", "pcm", "wav"]
+        streamable_formats = ["opus", "mp3", "pcm", "wav"]
+        use_streaming = STREAMING_ENABLED and validated_format in streamable_formats
         
         # Allow streaming with the requested format
         # PCM has lowest latency but highest bandwidth
@@ -204,23 +482,83 @@ async def text_to_speech(
         if use_streaming:
             # Use streaming playback
             logger.info(f"Using streaming playback for {validated_format}")
-            from .streaming import stream_tts_audio
+            from .streaming import stream_tts_audio, iter_speech_chunks
+            
+            from .provider_discovery import provider_registry
+            
+            tts_client = openai_clients[client_key]
+            audio_chunks = None
+            stream_info = {}  # Filled with the sample rate if the response announces it
+            
+            # Race alternative endpoints if the primary is slow to produce audio
+            if hedge_configs:
+                from .hedging import HedgeError, HedgeOutcome, race_first_chunk, get_hedge_delay
+                
+                candidates = [(tts_client, request_params, {'base_url': tts_base_url, 'model': tts_model, 'voice': tts_voice})]
+                for config in hedge_configs:
+                    params = _build_speech_request(text, config['model'], config['voice'], config['base_url'],
+                                                   audio_format, config.get('instructions', instructions))
+                    if params["response_format"] in streamable_formats:
+                        candidates.append((config['client'], params, config))
+                infos = [{} for _ in candidates]
+                outcome = HedgeOutcome()
+                
+                try:
+                    winner, audio_chunks = await race_first_chunk(
+                        [lambda c=client, p=params, i=info: iter_speech_chunks(c, p, i)
+                         for (client, params, _), info in zip(candidates, infos)],
+                        get_hedge_delay(TTS_HEDGE_DELAY_MS / 1000, provider_registry.get_latency('tts', tts_base_url)),
+                        labels=[config['base_url'] for _, _, config in candidates],
+                        outcome=outcome
+                    )
+                except HedgeError as e:
+                    logger.warning(f"Hedged TTS failed: {e}")
+                    return False, metrics
+                finally:
+                    metrics['attempted_urls'] = [candidates[i][2]['base_url'] for i in outcome.started]
+                    metrics['hedge_failures'] = {candidates[i][2]['base_url']: str(error)
+                                                 for i, error in outcome.failed.items()}
+                    metrics['hedge_cancelled_ms'] = {candidates[i][2]['base_url']: elapsed * 1000
+                                                     for i, elapsed in outcome.cancelled.items()}
+                tts_client, request_params, winner_config = candidates[winner]
+                stream_info = infos[winner]
+                if winner > 0:
+                    metrics['hedge_winner'] = winner_config['base_url']
+            winner_url = metrics.get('hedge_winner', tts_base_url)
             
             # Pass the client directly
+            stream_start = time.perf_counter()
             success, stream_metrics = await stream_tts_audio(
                 text=text,
-                openai_client=openai_clients[client_key],
+                openai_client=tts_client,
                 request_params=request_params,
                 debug=debug,
                 save_audio=save_audio,
                 audio_dir=audio_dir,
-                conversation_id=conversation_id
+                conversation_id=conversation_id,
+                audio_chunks=audio_chunks,
+                capture_pcm=tts_cache is not None,
+                source_rate=provider_registry.get_pcm_sample_rate(winner_url),
+                stream_info=stream_info
             )
+            if stream_info.get('sample_rate'):
+                provider_registry.set_pcm_sample_rate(winner_url, stream_info['sample_rate'])
             
             if success:
-                metrics['ttfa'] = stream_metrics.ttfa
+                if stream_metrics.interrupted:
+                    metrics['interrupted'] = True
+                elif tts_cache and stream_metrics.pcm is not None:
+                    tts_cache.put_in_background(_speech_cache_key(request_params, winner_url),
+                                                stream_metrics.pcm, stream_metrics.sample_rate)
+                
+                # Include any time spent waiting on hedged requests before playback started
+                metrics['ttfa'] = (stream_start - generation_start) + stream_metrics.ttfa
                 metrics['generation'] = stream_metrics.generation_time
-                metrics['playback'] = stream_metrics.playback_time - stream_metrics.generation_time
+                if stream_metrics.audio_start is not None and stream_metrics.audio_end is not None:
+                    metrics['playback'] = stream_metrics.audio_end - stream_metrics.audio_start
+                    metrics['output_latency'] = stream_metrics.output_latency
+                else:
+                    metrics['playback'] = stream_metrics.playback_time - stream_metrics.generation_time
                 
                 # Pass through audio path if it exists
                 if stream_metrics.audio_path:
@@ -232,6 +570,10 @@ async def text_to_speech(
                 # For now, skip debug saving in streaming mode
                 
                 return True, metrics
+            elif audio_chunks is not None:
+                # The hedged response has been consumed; let failover try another endpoint
+                logger.warning("Hedged streaming failed")
+                return False, metrics
             else:
                 logger.warning("Streaming failed, falling back to buffered playback")
                 # Continue with regular buffered playback
@@ -243,6 +585,7 @@ async def text_to_speech(
         ) as response:
             # Read the entire response content
             response_content = await response.read()
+            decode_rate = _decode_rate(validated_format, tts_base_url, getattr(response, "headers", None))
             
         metrics['generation'] = time.perf_counter() - generation_start
         logger.debug(f"TTS API response received, content length: {len(response_content)} bytes")
@@ -268,171 +611,134 @@ async def text_to_speech(
         
         # Play audio
         playback_start = time.perf_counter()
-        # For buffered playback, TTFA includes both API response time and audio initialization
-        # This is the time from API call to when audio actually starts playing
+        # For buffered playback, TTFA includes API response time, decoding and output latency.
+        # This estimate is replaced by the time the first sample reached the DAC once played
         # Note: In voice-chat flows, there's additional latency from LLM processing that's not captured here
         metrics['ttfa'] = playback_start - generation_start
         
-        with tempfile.NamedTemporaryFile(suffix=f'.{validated_format}', delete=False) as tmp_file:
-            tmp_file.write(response_content)
-            tmp_file.flush()
+        try:
+            # Decode in memory - PCM/WAV are viewed in place, other formats are piped through ffmpeg
+            logger.debug(f"Decoding {validated_format.upper()} audio in memory...")
+            try:
+                samples, frame_rate, channels = await decode_audio_bytes(
+                    response_content, validated_format, sample_rate=decode_rate
+                )
+            except StreamDecoderError as e:
+                if "not found" in str(e):
+                    from .utils.ffmpeg_check import get_install_instructions
+                    logger.error(f"\n{get_install_instructions()}")
+                raise
             
-            logger.debug(f"Audio written to temp file: {tmp_file.name}")
+            logger.debug(f"Audio decoded - Duration: {len(samples) * 1000 // frame_rate}ms, Channels: {channels}, Frame rate: {frame_rate}")
             
+            if tts_cache and channels == 1:
+                tts_cache.put_in_background(_speech_cache_key(request_params, tts_base_url), samples, frame_rate)
+            
+            # Check audio devices
+            if debug:
+                try:
+                    import sounddevice as sd
+                    devices = sd.query_devices()
+                    default_output = sd.default.device[1]
+                    logger.debug(f"Default output device: {default_output} - {devices[default_output]['name'] if default_output is not None else 'None'}")
+                except Exception as dev_e:
+                    logger.error(f"Error querying audio devices: {dev_e}")
+            
+            logger.debug(f"Playing audio with sounddevice at {frame_rate}Hz...")
+            
+            # Try to ensure sounddevice doesn't interfere with stdout/stderr
             try:
-                # Load audio file based on format
-                logger.debug(f"Loading {validated_format.upper()} audio...")
-                
-                # Get appropriate loader for format
-                loader = get_audio_loader_for_format(validated_format)
-                if not loader:
-                    logger.error(f"No loader available for format: {validated_format}")
-                    # Fallback to generic loader
-                    audio = AudioSegment.from_file(tmp_file.name, format=validated_format)
-                else:
-                    # Special handling for PCM which needs parameters
-                    if validated_format == "pcm":
-                        # Assume 16-bit PCM at standard rate
-                        audio = loader(
-                            tmp_file.name,
-                            sample_width=2,  # 16-bit
-                            frame_rate=SAMPLE_RATE,
-                            channels=1
-                        )
-                    else:
-                        audio = loader(tmp_file.name)
+                import sounddevice as sd
+                import sys
                 
-                logger.debug(f"Audio loaded - Duration: {len(audio)}ms, Channels: {audio.channels}, Frame rate: {audio.frame_rate}")
+                # Save current stdio state
+                original_stdin = sys.stdin
+                original_stdout = sys.stdout
+                original_stderr = sys.stderr
                 
-                # Convert to numpy array
-                logger.debug("Converting to numpy array...")
-                samples = np.array(audio.get_array_of_samples())
-                if audio.channels == 2:
-                    samples = samples.reshape((-1, 2))
-                    logger.debug("Reshaped for stereo")
-                
-                # Convert to float32 for sounddevice
-                samples = samples.astype(np.float32) / 32767.0
-                logger.debug(f"Audio converted to float32, shape: {samples.shape}")
-                
-                # Check audio devices
-                if debug:
-                    try:
-                        import sounddevice as sd
-                        devices = sd.query_devices()
-                        default_output = sd.default.device[1]
-                        logger.debug(f"Default output device: {default_output} - {devices[default_output]['name'] if default_output is not None else 'None'}")
-                    except Exception as dev_e:
-                        logger.error(f"Error querying audio devices: {dev_e}")
-                
-                logger.debug(f"Playing audio with sounddevice at {audio.frame_rate}Hz...")
-                
-                # Try to ensure sounddevice doesn't interfere with stdout/stderr
                 try:
-                    import sounddevice as sd
-                    import sys
+                    # Log TTS playback start event
+                    if event_logger:
+                        event_logger.log_event(event_logger.TTS_PLAYBACK_START)
                     
-                    # Save current stdio state
-                    original_stdin = sys.stdin
-                    original_stdout = sys.stdout
-                    original_stderr = sys.stderr
+                    session = await asyncio.to_thread(_play_pcm_blocking, samples, frame_rate, channels)
+                    if session.aborted:
+                        metrics['interrupted'] = True
                     
-                    try:
-                        # Force initialization before playing
-                        sd.default.samplerate = audio.frame_rate
-                        sd.default.channels = audio.channels
-                        
-                        # Log TTS playback start event
-                        if event_logger:
-                            event_logger.log_event(event_logger.TTS_PLAYBACK_START)
-                        
-                        # Add 100ms of silence at the beginning to prevent clipping
-                        silence_duration = 0.1  # seconds
-                        silence_samples = int(audio.frame_rate * silence_duration)
-                        # Match the shape of the samples array exactly
-                        if samples.ndim == 1:
-                            silence = np.zeros(silence_samples, dtype=np.float32)
-                            samples_with_buffer = np.concatenate([silence, samples])
-                        else:
-                            silence = np.zeros((silence_samples, samples.shape[1]), dtype=np.float32)
-                            samples_with_buffer = np.vstack([silence, samples])
-                        
-                        sd.play(samples_with_buffer, audio.frame_rate)
-                        sd.wait()
-                        
-                        # Log TTS playback end event
-                        if event_logger:
-                            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
-                        
-                        logger.info("✓ TTS played successfully")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return True, metrics
-                    finally:
-                        # Restore stdio if it was changed
-                        if sys.stdin != original_stdin:
-                            sys.stdin = original_stdin
-                        if sys.stdout != original_stdout:
-                            sys.stdout = original_stdout
-                        if sys.stderr != original_stderr:
-                            sys.stderr = original_stderr
-                except Exception as sd_error:
-                    logger.error(f"Sounddevice playback failed: {sd_error}")
-                    
-                    # Fallback to file-based playback methods
-                    logger.info("Attempting alternative playback methods...")
-                    
-                    # Try using PyDub's playback (requires simpleaudio or pyaudio)
-                    try:
-                        from pydub.playback import play as pydub_play
-                        logger.debug("Using PyDub playback...")
-                        pydub_play(audio)
-                        logger.info("✓ TTS played successfully with PyDub")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return True, metrics
-                    except Exception as pydub_error:
-                        logger.error(f"PyDub playback failed: {pydub_error}")
+                    # Log TTS playback end event
+                    if event_logger:
+                        event_logger.log_event(event_logger.TTS_PLAYBACK_END)
                     
-                    # Last resort: save to user's home directory for manual playback
-                    try:
-                        fallback_path = Path.home() / f"voice-mode-audio-{datetime.now().strftime('%Y%m%d_%H%M%S')}.{validated_format}"
-                        import shutil
-                        shutil.copy(tmp_file.name, fallback_path)
-                        logger.warning(f"Audio saved to {fallback_path} for manual playback")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return False, metrics
-                    except Exception as save_error:
-                        logger.error(f"Failed to save audio file: {save_error}")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return False, metrics
+                    logger.info("✓ TTS played successfully")
+                    metrics['playback'] = time.perf_counter() - playback_start
+                    _record_playback_timing(metrics, session, generation_start)
+                    return True, metrics
+                finally:
+                    # Restore stdio if it was changed
+                    if sys.stdin != original_stdin:
+                        sys.stdin = original_stdin
+                    if sys.stdout != original_stdout:
+                        sys.stdout = original_stdout
+                    if sys.stderr != original_stderr:
+                        sys.stderr = original_stderr
+            except Exception as sd_error:
+                logger.error(f"Sounddevice playback failed: {sd_error}")
                 
-            except Exception as e:
-                logger.error(f"Error playing audio: {e}")
-                logger.error(f"Audio format - Channels: {audio.channels if 'audio' in locals() else 'unknown'}, Frame rate: {audio.frame_rate if 'audio' in locals() else 'unknown'}")
-                logger.error(f"Samples shape: {samples.shape if 'samples' in locals() else 'unknown'}")
+                # Fallback to alternative playback methods
+                logger.info("Attempting alternative playback methods...")
                 
-                # Try alternative playback method in debug mode
-                if debug:
-                    try:
-                        logger.debug("Attempting alternative playback with system command...")
-                        import subprocess
-                        result = subprocess.run(['paplay', tmp_file.name], capture_output=True, timeout=10)
-                        if result.returncode == 0:
-                            logger.info("✓ Alternative playback successful")
-                            os.unlink(tmp_file.name)
-                            metrics['playback'] = time.perf_counter() - playback_start
-                            return True, metrics
-                        else:
-                            logger.error(f"Alternative playback failed: {result.stderr.decode()}")
-                    except Exception as alt_e:
-                        logger.error(f"Alternative playback error: {alt_e}")
+                # Try using PyDub's playback (requires simpleaudio or pyaudio)
+                try:
+                    from pydub.playback import play as pydub_play
+                    logger.debug("Using PyDub playback...")
+                    audio = AudioSegment(
+                        data=samples.tobytes(),
+                        sample_width=2,
+                        frame_rate=frame_rate,
+                        channels=channels
+                    )
+                    pydub_play(audio)
+                    logger.info("✓ TTS played successfully with PyDub")
+                    metrics['playback'] = time.perf_counter() - playback_start
+                    return True, metrics
+                except Exception as pydub_error:
+                    logger.error(f"PyDub playback failed: {pydub_error}")
                 
-                os.unlink(tmp_file.name)
+                # Last resort: save to user's home directory for manual playback
+                try:
+                    fallback_path = Path.home() / f"voice-mode-audio-{datetime.now().strftime('%Y%m%d_%H%M%S')}.{validated_format}"
+                    fallback_path.write_bytes(response_content)
+                    logger.warning(f"Audio saved to {fallback_path} for manual playback")
+                except Exception as save_error:
+                    logger.error(f"Failed to save audio file: {save_error}")
                 metrics['playback'] = time.perf_counter() - playback_start
                 return False, metrics
+            
+        except Exception as e:
+            logger.error(f"Error playing audio: {e}")
+            logger.error(f"Audio format - Channels: {channels if 'channels' in locals() else 'unknown'}, Frame rate: {frame_rate if 'frame_rate' in locals() else 'unknown'}")
+            logger.error(f"Samples shape: {samples.shape if 'samples' in locals() else 'unknown'}")
+            
+            # Try alternative playback method in debug mode
+            if debug and 'samples' in locals():
+                try:
+                    logger.debug("Attempting alternative playback with system command...")
+                    import subprocess
+                    result = subprocess.run(
+                        ['paplay', '--raw', '--format=s16le', f'--rate={frame_rate}', f'--channels={channels}'],
+                        input=samples.tobytes(), capture_output=True, timeout=10
+                    )
+                    if result.returncode == 0:
+                        logger.info("✓ Alternative playback successful")
+                        metrics['playback'] = time.perf_counter() - playback_start
+                        return True, metrics
+                    else:
+                        logger.error(f"Alternative playback failed: {result.stderr.decode()}")
+                except Exception as alt_e:
+                    logger.error(f"Alternative playback error: {alt_e}")
+            
+            metrics['playback'] = time.perf_counter() - playback_start
+            return False, metrics
                         
     except Exception as e:
         logger.error(f"TTS failed: {e}")
@@ -497,38 +803,136 @@ def generate_chime(frequencies: list, duration: float = 0.1, sample_rate: int =
     return chime_int16
 
 
-async def play_chime_start(sample_rate: int = SAMPLE_RATE) -> bool:
-    """Play the recording start chime (ascending tones).
+# Tone sequences (Hz) of the built-in chimes, and optional WAV replacements
+CHIME_TONES = {"start": [800, 1000], "end": [1000, 800]}
+CHIME_FILES = {"start": CHIME_START_FILE, "end": CHIME_END_FILE}
+
+# Chime waveforms by (kind, sample rate), built on first use
+_chime_cache: Dict[Tuple[str, int], np.ndarray] = {}
+# Chimes playing in the background (referenced so they are not garbage collected)
+_chime_tasks: set = set()
+
+
+def load_chime_file(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Load a PCM WAV file as mono int16 at the given sample rate.
     
+    Args:
+        path: WAV file (8, 16 or 32-bit integer PCM)
+        sample_rate: Sample rate to resample to
+        
     Returns:
-        True if chime played successfully, False otherwise
+        Mono int16 samples
     """
+    from .resample import resample
+    
+    with wave.open(str(Path(path).expanduser()), 'rb') as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        file_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+    
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    samples = resample(samples, file_rate, sample_rate)
+    return np.clip(np.rint(samples * 32767), -32768, 32767).astype(np.int16)
+
+
+def get_chime(kind: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Return the cached waveform for a chime, building it on first use.
+    
+    The user's WAV file (VOICEMODE_CHIME_START_FILE / VOICEMODE_CHIME_END_FILE)
+    is used if configured and readable, otherwise the built-in tones.
+    
+    Args:
+        kind: "start" or "end"
+        sample_rate: Sample rate of the output stream
+        
+    Returns:
+        Mono int16 samples (shared; do not modify)
+    """
+    key = (kind, sample_rate)
+    chime = _chime_cache.get(key)
+    if chime is None:
+        path = CHIME_FILES.get(kind)
+        if path:
+            try:
+                chime = load_chime_file(path, sample_rate)
+                logger.debug(f"Loaded {kind} chime from {path}")
+            except Exception as e:
+                logger.warning(f"Could not load {kind} chime from {path}, using the default: {e}")
+        if chime is None:
+            chime = generate_chime(CHIME_TONES[kind], duration=0.1, sample_rate=sample_rate)
+        chime.setflags(write=False)
+        _chime_cache[key] = chime
+    return chime
+
+
+def chime_duration(kind: str, sample_rate: Optional[int] = None) -> float:
+    """Seconds from starting a chime until it has finished playing (at most)."""
+    if sample_rate is None:
+        from .audio_output import get_output_rate
+        sample_rate = get_output_rate()
+    return PLAYBACK_LEAD_IN_S + len(get_chime(kind, sample_rate)) / sample_rate
+
+
+def _log_chime_result(task: asyncio.Task) -> None:
+    _chime_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Could not play chime: {task.exception()}")
+
+
+async def _play_chime(kind: str, sample_rate: Optional[int], wait: bool) -> bool:
+    """Play a cached chime off the event loop."""
     try:
-        import sounddevice as sd
-        chime = generate_chime([800, 1000], duration=0.1, sample_rate=sample_rate)
-        sd.play(chime, sample_rate)
-        sd.wait()
+        if sample_rate is None:
+            from .audio_output import get_output_rate
+            sample_rate = get_output_rate()
+        chime = get_chime(kind, sample_rate)
+        if wait:
+            await asyncio.to_thread(_play_pcm_blocking, chime, sample_rate)
+        else:
+            task = asyncio.create_task(asyncio.to_thread(_play_pcm_blocking, chime, sample_rate))
+            _chime_tasks.add(task)
+            task.add_done_callback(_log_chime_result)
         return True
     except Exception as e:
-        logger.debug(f"Could not play start chime: {e}")
+        logger.debug(f"Could not play {kind} chime: {e}")
         return False
 
 
-async def play_chime_end(sample_rate: int = SAMPLE_RATE) -> bool:
+async def play_chime_start(sample_rate: Optional[int] = None, wait: bool = True) -> bool:
+    """Play the recording start chime (ascending tones).
+    
+    Args:
+        sample_rate: Output sample rate (defaults to the output device rate)
+        wait: Wait until the chime has played; otherwise it plays in the background
+    
+    Returns:
+        True if chime played (or started) successfully, False otherwise
+    """
+    return await _play_chime("start", sample_rate, wait)
+
+
+async def play_chime_end(sample_rate: Optional[int] = None, wait: bool = True) -> bool:
     """Play the recording end chime (descending tones).
     
+    Args:
+        sample_rate: Output sample rate (defaults to the output device rate)
+        wait: Wait until the chime has played; otherwise it plays in the background
+    
     Returns:
-        True if chime played successfully, False otherwise
+        True if chime played (or started) successfully, False otherwise
     """
-    try:
-        import sounddevice as sd
-        chime = generate_chime([1000, 800], duration=0.1, sample_rate=sample_rate)
-        sd.play(chime, sample_rate)
-        sd.wait()
-        return True
-    except Exception as e:
-        logger.debug(f"Could not play end chime: {e}")
-        return False
+    return await _play_chime("end", sample_rate, wait)
 
 
 async def cleanup(openai_clients: dict):
@@ -545,6 +949,23 @@ async def cleanup(openai_clients: dict):
     except Exception as e:
         logger.error(f"Error closing HTTP clients: {e}")
     
+    # Close pooled provider clients
+    from .client_pool import client_pool
+    await client_pool.aclose()
+    
+    # Stop background endpoint recovery probes
+    from .provider_discovery import provider_registry
+    await provider_registry.aclose()
+    
+    # Release the microphone
+    try:
+        from .capture import close_capture_stream
+        close_capture_stream()
+        from .audio_output import close_output_services
+        close_output_services()
+    except Exception as e:
+        logger.debug(f"Error closing capture stream: {e}")
+    
     # Final garbage collection
     gc.collect()
     logger.info("Cleanup completed")
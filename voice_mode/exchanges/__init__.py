@@ -7,18 +7,28 @@ Used by CLI commands, web browser, and MCP tools.
 
 from voice_mode.exchanges.models import Exchange, ExchangeMetadata, Conversation
 from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.index import ExchangeIndex
+from voice_mode.exchanges.follower import ExchangeFollower, FollowPosition
 from voice_mode.exchanges.formatters import ExchangeFormatter
 from voice_mode.exchanges.filters import ExchangeFilter
 from voice_mode.exchanges.conversations import ConversationGrouper
-from voice_mode.exchanges.stats import ExchangeStats
+from voice_mode.exchanges.stats import ExchangeStats, ExchangeAggregate
+from voice_mode.exchanges.sketch import QuantileSketch
+from voice_mode.exchanges.rollups import RollupStore
 
 __all__ = [
     'Exchange',
     'ExchangeMetadata',
     'Conversation',
     'ExchangeReader',
+    'ExchangeIndex',
+    'ExchangeFollower',
+    'FollowPosition',
     'ExchangeFormatter',
     'ExchangeFilter',
     'ConversationGrouper',
     'ExchangeStats',
+    'ExchangeAggregate',
+    'QuantileSketch',
+    'RollupStore',
 ]
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+Follow exchange logs as they are written.
+
+``ExchangeFollower`` replaces ``tail -f``: it reads new lines of the daily
+``exchanges_YYYY-MM-DD.jsonl`` in-process, moves on to the next day's file
+when the date rolls over, and keeps a ``FollowPosition`` (file date and byte
+offset) that a consumer can save and resume from. On Linux it sleeps on
+inotify events for the logs directory; elsewhere, or if inotify is not
+available, it polls. It can be iterated with ``for`` or ``async for``.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from voice_mode.exchanges.models import Exchange
+from voice_mode.exchanges.reader import last_lines_offset
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks without inotify, and the longest sleep with it
+POLL_INTERVAL = 1.0
+
+# A write that picked its file just before midnight may land a moment later,
+# so the previous day's file is followed this much longer
+ROLLOVER_GRACE_S = 5.0
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+
+class InotifyWatch:
+    """Wakes up on changes to the files in a directory, using Linux inotify."""
+
+    def __init__(self, directory: Path):
+        """Start watching a directory.
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def fileno(self) -> Optional[int]:
+        """Descriptor that becomes readable on changes."""
+        return self.fd
+
+    def wait(self, timeout: float) -> None:
+        """Block until something changed or ``timeout`` seconds passed."""
+        select.select([self.fd], [], [], timeout)
+        self.drain()
+
+    def drain(self) -> None:
+        """Discard pending events; only the fact that something changed matters."""
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatch:
+    """Fallback that just waits out the poll interval."""
+
+    def fileno(self) -> Optional[int]:
+        return None
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(timeout)
+
+    def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def create_watch(directory: Path, use_inotify: bool = True):
+    """Watch a directory with inotify where possible, polling otherwise."""
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatch(directory)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify unavailable, polling {directory}: {e}")
+    return PollingWatch()
+
+
+@dataclass
+class FollowPosition:
+    """Where a follower is: the log file's date and the offset of the next line."""
+    date: date
+    offset: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {"date": self.date.isoformat(), "offset": self.offset}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FollowPosition':
+        """Create from a dictionary made by ``to_dict``."""
+        return cls(date.fromisoformat(data["date"]), int(data["offset"]))
+
+
+class ExchangeFollower:
+    """Yield exchanges from the daily logs as they are appended.
+
+    ``position`` always points just past the last exchange handed out, so
+    saving it after processing an exchange and passing it back in later
+    neither skips nor repeats anything.
+    """
+
+    def __init__(self, logs_dir: Path, position: Optional[FollowPosition] = None,
+                 lines: int = 0, poll_interval: float = POLL_INTERVAL, use_inotify: bool = True):
+        """Create a follower.
+
+        Args:
+            logs_dir: Directory with the exchanges_*.jsonl files
+            position: Where to resume; defaults to today's file
+            lines: Without a position, start with the last N exchanges of
+                today's file (0 for all of it)
+            poll_interval: Seconds between checks (the longest wait with inotify)
+            use_inotify: Use inotify where available instead of polling
+        """
+        self.logs_dir = Path(logs_dir)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._closed = False
+
+        if position is None:
+            today = datetime.now().date()
+            offset = 0
+            if lines > 0 and self._log_file(today).exists():
+                offset = last_lines_offset(self._log_file(today), lines)
+            position = FollowPosition(today, offset)
+        self.position = position
+
+    def _log_file(self, day: date) -> Path:
+        return self.logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+
+    def close(self) -> None:
+        """Stop iterating after the current wait."""
+        self._closed = True
+
+    def _read_available(self) -> Tuple[List[Tuple[Exchange, FollowPosition]], FollowPosition]:
+        """Read everything appended since ``position``, following date rollover.
+
+        Does not move ``position``; the iterators advance it as they hand
+        out exchanges.
+
+        Returns:
+            The new exchanges, each with the position just past it, and the
+            position after everything that was read
+        """
+        found, position = self._read_from(self.position)
+        while True:
+            next_position = self._next_log(position)
+            if next_position is None:
+                return found, position
+            logger.debug(f"Following {self._log_file(next_position.date).name}")
+            more, position = self._read_from(next_position)
+            found.extend(more)
+
+    def _read_from(self, position: FollowPosition) -> Tuple[List[Tuple[Exchange, FollowPosition]], FollowPosition]:
+        """Read the complete lines of one log file from a position."""
+        path = self._log_file(position.date)
+        offset = position.offset
+        try:
+            with open(path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size < offset:
+                    logger.warning(f"{path} was truncated, following it from the start")
+                    offset = 0
+                f.seek(offset)
+                data = f.read(size - offset)
+        except FileNotFoundError:
+            return [], position
+
+        found = []
+        # Only complete lines; anything after the last newline is still being written
+        for line in data[:data.rfind(b'\n') + 1].split(b'\n')[:-1]:
+            offset += len(line) + 1
+            if not line.strip():
+                continue
+            try:
+                exchange = Exchange.from_jsonl(line.decode('utf-8'))
+            except Exception as e:
+                logger.warning(f"Failed to parse line in {path}: {e}")
+                continue
+            found.append((exchange, FollowPosition(position.date, offset)))
+        return found, FollowPosition(position.date, offset)
+
+    def _next_log(self, position: FollowPosition) -> Optional[FollowPosition]:
+        """The start of the next day's log once the current day is over."""
+        today = (datetime.now() - timedelta(seconds=ROLLOVER_GRACE_S)).date()
+        if position.date >= today:
+            return None
+        # Days without any exchanges have no file; never skip past today
+        current = self._log_file(position.date).name
+        last = self._log_file(today).name
+        later = sorted(path.name for path in self.logs_dir.glob("exchanges_*.jsonl")
+                       if current < path.name <= last)
+        next_date = date.fromisoformat(later[0][len("exchanges_"):-len(".jsonl")]) if later else today
+        return FollowPosition(next_date, 0)
+
+    def __iter__(self) -> Iterator[Exchange]:
+        """Yield exchanges as they are written, blocking in between."""
+        watch = create_watch(self.logs_dir, self.use_inotify)
+        try:
+            while not self._closed:
+                found, end = self._read_available()
+                for exchange, position in found:
+                    self.position = position
+                    yield exchange
+                self.position = end
+                watch.wait(self.poll_interval)
+        finally:
+            watch.close()
+
+    async def __aiter__(self) -> AsyncIterator[Exchange]:
+        """Yield exchanges as they are written, without blocking the event loop."""
+        watch = create_watch(self.logs_dir, self.use_inotify)
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        fd = watch.fileno()
+        if fd is not None:
+            loop.add_reader(fd, changed.set)
+        try:
+            while not self._closed:
+                changed.clear()
+                watch.drain()
+                found, end = await asyncio.to_thread(self._read_available)
+                for exchange, position in found:
+                    self.position = position
+                    yield exchange
+                self.position = end
+                try:
+                    await asyncio.wait_for(changed.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+            watch.close()
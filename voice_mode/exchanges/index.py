@@ -0,0 +1,295 @@
+"""
+Sidecar offset index for exchange JSONL files.
+
+Each ``exchanges_YYYY-MM-DD.jsonl`` log gets an ``exchanges_YYYY-MM-DD.jsonl.idx``
+file next to it with one line per exchange::
+
+    <byte offset>\\t<line length>\\t<unix timestamp>\\t<conversation id>
+
+``ConversationLogger`` appends to the index as it appends to the log, so
+lookups by conversation or time can seek straight to the matching lines
+instead of parsing the whole file. The index is only a cache: parts of the
+log it does not cover (entries written by older versions, or a missing or
+stale sidecar) are scanned and added the next time the index is loaded.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from voice_mode.exchanges.models import Exchange
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_HEADER = "#voicemode-exchange-index 1\n"
+
+_LENGTH_PATTERN = re.compile(r'^\d+\t(\d+)\t', re.MULTILINE)
+
+
+@dataclass
+class IndexEntry:
+    """Location and lookup keys of one exchange in a log file."""
+    offset: int
+    length: int
+    timestamp: float
+    conversation_id: str
+
+    @property
+    def end(self) -> int:
+        """Byte offset just past this entry's line."""
+        return self.offset + self.length
+
+    def to_line(self) -> str:
+        """Format as a sidecar index line."""
+        return f"{self.offset}\t{self.length}\t{self.timestamp:.6f}\t{self.conversation_id}\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> 'IndexEntry':
+        """Parse a sidecar index line."""
+        offset, length, timestamp, conversation_id = line.rstrip('\n').split('\t')
+        return cls(int(offset), int(length), float(timestamp), conversation_id)
+
+
+class StaleIndexError(Exception):
+    """The index points at bytes that are not the exchange it describes."""
+
+
+def index_path(log_file: Path) -> Path:
+    """Get the sidecar index path for a log file."""
+    return log_file.with_name(log_file.name + INDEX_SUFFIX)
+
+
+def append_index_entries(log_file: Path, entries: Iterable[IndexEntry]) -> None:
+    """Append entries to a log file's sidecar index, creating it if needed.
+
+    Each line is written with a single append, so concurrent writers do not
+    interleave partial lines.
+    """
+    path = index_path(log_file)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size == 0:
+            os.write(fd, INDEX_HEADER.encode())
+        for entry in entries:
+            os.write(fd, entry.to_line().encode())
+    finally:
+        os.close(fd)
+
+
+def _timestamp(value: str) -> float:
+    """Unix timestamp of an ISO timestamp from the log (naive means local time)."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class ExchangeIndex:
+    """Offsets of the exchanges in one log file, keyed by time and conversation."""
+
+    def __init__(self, log_file: Path):
+        """Create an index for a log file (loaded on first use).
+
+        Args:
+            log_file: Path to the exchanges JSONL file
+        """
+        self.log_file = Path(log_file)
+        self.path = index_path(self.log_file)
+        self.entries: List[IndexEntry] = []  # Sorted by offset
+        self._by_conversation: Dict[str, List[IndexEntry]] = {}
+        self._covered = -1  # Log size the entries were checked against; -1 when not loaded
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the log file.
+
+        Only a ``stat`` when nothing was appended since the last call.
+        Otherwise the sidecar is (re)read and any uncovered parts of the log
+        are scanned and appended to it.
+        """
+        try:
+            size = self.log_file.stat().st_size
+        except OSError:
+            self._set_entries([])
+            self._covered = 0
+            return
+        if size == self._covered:
+            return
+
+        entries = self._load_sidecar()
+        if entries and entries[-1].end > size:
+            # The log was truncated or rewritten: start over
+            logger.debug(f"Index {self.path} is stale, rebuilding")
+            entries = []
+            self._remove_sidecar()
+
+        missing = self._scan_gaps(entries, size)
+        if missing:
+            try:
+                append_index_entries(self.log_file, missing)
+            except OSError as e:
+                logger.debug(f"Could not update index {self.path}: {e}")
+            entries = sorted(entries + missing, key=lambda entry: entry.offset)
+
+        self._set_entries(entries)
+        self._covered = size
+
+    def rebuild(self) -> None:
+        """Discard the sidecar and index the whole log file again."""
+        self._remove_sidecar()
+        self._covered = -1
+        self.refresh()
+
+    def lookup_conversation(self, conversation_id: str) -> List[IndexEntry]:
+        """Entries of one conversation, in file order."""
+        if self._covered < 0 and self._lacks_conversation(conversation_id):
+            return []
+        self.refresh()
+        return list(self._by_conversation.get(conversation_id, ()))
+
+    def _lacks_conversation(self, conversation_id: str) -> bool:
+        """Whether a complete sidecar shows the conversation is not in the log.
+
+        Lets a search across many log files skip parsing the sidecars that
+        cannot contain the conversation: a substring test, plus checking
+        that the indexed lines cover the whole file.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                text = f.read()
+            size = self.log_file.stat().st_size
+        except OSError:
+            return False
+        if not text.startswith(INDEX_HEADER) or conversation_id in text:
+            return False
+        # Exchange lines are never empty, so if their lengths add up to the
+        # file size every line of it is indexed
+        return sum(map(int, _LENGTH_PATTERN.findall(text))) == size
+
+    def lookup_range(self, start: float, end: float) -> List[IndexEntry]:
+        """Entries with ``start <= timestamp <= end`` (unix seconds), in file order."""
+        self.refresh()
+        return [entry for entry in self.entries if start <= entry.timestamp <= end]
+
+    def read(self, entries: List[IndexEntry]) -> Iterator[Exchange]:
+        """Read and parse the exchanges at the given entries.
+
+        Adjacent entries are read with a single ``read``. Lines that are
+        JSON but not a valid exchange are logged and skipped, like
+        ``ExchangeReader._read_file`` does.
+
+        Raises:
+            StaleIndexError: If an entry does not point at a complete JSON
+                line of its conversation
+        """
+        entries = sorted(entries, key=lambda entry: entry.offset)
+        with open(self.log_file, 'rb') as f:
+            i = 0
+            while i < len(entries):
+                # Extend the run while entries follow each other (blank lines allowed)
+                j = i + 1
+                while j < len(entries) and entries[j].offset - entries[j - 1].end < 64:
+                    j += 1
+                run_start = entries[i].offset
+                f.seek(run_start)
+                data = f.read(entries[j - 1].end - run_start)
+
+                for entry in entries[i:j]:
+                    line = data[entry.offset - run_start:entry.end - run_start]
+                    if len(line) != entry.length or not line.endswith(b'\n'):
+                        raise StaleIndexError(f"{self.log_file} changed at offset {entry.offset}")
+                    try:
+                        exchange = Exchange.from_jsonl(line.decode('utf-8'))
+                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        # Only JSON lines are indexed, so the line has moved
+                        raise StaleIndexError(f"No exchange at offset {entry.offset} in {self.log_file}: {e}")
+                    except Exception as e:
+                        logger.error(f"Error processing line at offset {entry.offset} in {self.log_file}: {e}")
+                        continue
+                    if exchange.conversation_id != entry.conversation_id:
+                        raise StaleIndexError(f"{self.log_file} changed at offset {entry.offset}")
+                    yield exchange
+                i = j
+
+    def _set_entries(self, entries: List[IndexEntry]) -> None:
+        self.entries = entries
+        self._by_conversation = {}
+        for entry in entries:
+            self._by_conversation.setdefault(entry.conversation_id, []).append(entry)
+
+    def _load_sidecar(self) -> List[IndexEntry]:
+        """Read the sidecar, dropping duplicates and unparsable lines."""
+        try:
+            with open(self.path, 'r') as f:
+                header = f.readline()
+                if header != INDEX_HEADER:
+                    if header:
+                        logger.debug(f"Ignoring index {self.path} with unknown format")
+                        self._remove_sidecar()
+                    return []
+                by_offset = {}
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # Being written right now
+                    try:
+                        entry = IndexEntry.from_line(line)
+                    except ValueError:
+                        continue
+                    by_offset[entry.offset] = entry
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.debug(f"Could not read index {self.path}: {e}")
+            return []
+        return sorted(by_offset.values(), key=lambda entry: entry.offset)
+
+    def _remove_sidecar(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not remove index {self.path}: {e}")
+
+    def _scan_gaps(self, entries: List[IndexEntry], size: int) -> List[IndexEntry]:
+        """Index the parts of the log between (and after) the known entries."""
+        gaps = []
+        position = 0
+        for entry in entries:
+            if entry.offset > position:
+                gaps.append((position, entry.offset))
+            position = max(position, entry.end)
+        if size > position:
+            gaps.append((position, size))
+
+        missing = []
+        if not gaps:
+            return missing
+        try:
+            with open(self.log_file, 'rb') as f:
+                for gap_start, gap_end in gaps:
+                    missing.extend(self._scan(f, gap_start, gap_end))
+        except OSError as e:
+            logger.debug(f"Could not scan {self.log_file}: {e}")
+        return missing
+
+    def _scan(self, f, start: int, end: int) -> List[IndexEntry]:
+        """Index the complete lines in ``[start, end)`` of an open log file."""
+        f.seek(start)
+        data = f.read(end - start)
+        found = []
+        offset = start
+        for line in data.split(b'\n')[:-1]:  # The last piece is a partial line, or empty
+            line += b'\n'
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                    found.append(IndexEntry(offset, len(line), _timestamp(record['timestamp']),
+                                            record['conversation_id']))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Failed to index line at offset {offset} in {self.log_file}: {e}")
+            offset += len(line)
+        return found
@@ -2,20 +2,95 @@
 Exchange reader for voice mode conversation logs.
 """
 
+import itertools
 import json
 import logging
 import os
+import re
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Iterator, List, Optional, Union, Dict
-import subprocess
+from typing import Callable, Iterator, List, Optional, Tuple, Union, Dict
 
+from voice_mode.exchanges.index import ExchangeIndex, IndexEntry, StaleIndexError
 from voice_mode.exchanges.models import Exchange
 from voice_mode.config import BASE_DIR
 
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per seek when reading a log file from the end
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+
+def _lines_reversed(f, end: int, block_size: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for the complete lines before ``end`` of an open binary file, last first."""
+    position = end
+    remainder = None  # Start of the line that continues into later blocks; None before the last newline
+    
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        f.seek(position)
+        block = f.read(size)
+        
+        if remainder is None:
+            cut = block.rfind(b'\n')
+            if cut < 0:
+                continue  # Still inside the unterminated last line
+            block, remainder = block[:cut], b''
+        
+        lines = (block + remainder).split(b'\n')
+        remainder = lines[0]
+        cursor = position + len(lines[0])
+        starts = []
+        for line in lines[1:]:
+            cursor += 1  # The newline before this line
+            starts.append(cursor)
+            cursor += len(line)
+        for line_start, line in zip(reversed(starts), reversed(lines[1:])):
+            if line.strip():
+                yield line_start, line
+    
+    if remainder and remainder.strip():
+        yield 0, remainder
+
+
+def read_lines_reversed(file_path: Path, block_size: int = REVERSE_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a file from last to first.
+    
+    The file is read backwards in ``block_size`` blocks, so taking the last
+    few lines of a large file only reads its end. A final line without a
+    newline (still being written) and blank lines are skipped.
+    
+    Args:
+        file_path: Path to the file
+        block_size: Bytes to read per block
+        
+    Yields:
+        Complete lines without their trailing newline, newest first
+    """
+    with open(file_path, 'rb') as f:
+        for _, line in _lines_reversed(f, f.seek(0, os.SEEK_END), block_size):
+            yield line
+
+
+def last_lines_offset(file_path: Path, count: int) -> int:
+    """Byte offset where the last ``count`` lines of a file start.
+    
+    Args:
+        file_path: Path to the file
+        count: Number of (non-blank, complete) lines, at least 1
+        
+    Returns:
+        Offset of the ``count``-th line from the end, or 0 if there are fewer lines
+    """
+    with open(file_path, 'rb') as f:
+        lines = _lines_reversed(f, f.seek(0, os.SEEK_END), REVERSE_BLOCK_SIZE)
+        for found, (offset, _) in enumerate(lines, 1):
+            if found == count:
+                return offset
+    return 0
+
 
 class ExchangeReader:
     """Read and parse exchange JSONL files."""
@@ -31,6 +106,9 @@ class ExchangeReader:
         
         # Ensure logs directory exists
         self.logs_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Sidecar indexes, kept up to date with a stat per lookup
+        self._indexes: Dict[Path, ExchangeIndex] = {}
     
     def _get_log_file_path(self, date: Union[date, datetime]) -> Path:
         """Get the log file path for a given date."""
@@ -69,20 +147,27 @@ class ExchangeReader:
         """
         current_date = start.date()
         end_date = end.date()
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
         
         while current_date <= end_date:
-            for exchange in self.read_date(current_date):
-                # Filter by exact timestamp
-                if start <= exchange.timestamp <= end:
-                    yield exchange
+            log_file = self._get_log_file_path(current_date)
+            if log_file.exists():
+                # Seek to the exchanges within the exact time range
+                yield from self._read_indexed(
+                    log_file,
+                    lambda index: index.lookup_range(start_ts, end_ts),
+                    lambda exchange: start <= exchange.timestamp <= end
+                )
             
             current_date += timedelta(days=1)
     
     def read_conversation(self, conversation_id: str) -> List[Exchange]:
         """Read all exchanges for a conversation.
         
-        This searches through all log files to find exchanges with the
-        matching conversation ID.
+        Uses the sidecar index of each log file to find the conversation's
+        lines. Generated conversation IDs carry their start date, so earlier
+        log files are skipped.
         
         Args:
             conversation_id: Conversation ID to search for
@@ -92,14 +177,75 @@ class ExchangeReader:
         """
         exchanges = []
         
-        # Search all log files
-        for log_file in sorted(self.logs_dir.glob("exchanges_*.jsonl")):
-            for exchange in self._read_file(log_file):
-                if exchange.conversation_id == conversation_id:
-                    exchanges.append(exchange)
+        for log_file in self._conversation_log_files(conversation_id):
+            exchanges.extend(self._read_indexed(
+                log_file,
+                lambda index: index.lookup_conversation(conversation_id),
+                lambda exchange: exchange.conversation_id == conversation_id
+            ))
         
         return exchanges
     
+    def _conversation_log_files(self, conversation_id: str) -> List[Path]:
+        """Log files that can contain a conversation, in date order."""
+        log_files = sorted(self.logs_dir.glob("exchanges_*.jsonl"))
+        
+        # IDs look like conv_20250101_120000_abc123; the conversation cannot
+        # have been logged before that (local) date
+        match = re.match(r"conv_(\d{4})(\d{2})(\d{2})_", conversation_id)
+        if match:
+            first = f"exchanges_{'-'.join(match.groups())}.jsonl"
+            log_files = [log_file for log_file in log_files if log_file.name >= first]
+        
+        return log_files
+    
+    def _get_index(self, log_file: Path) -> ExchangeIndex:
+        """Get the (cached) sidecar index for a log file."""
+        index = self._indexes.get(log_file)
+        if index is None:
+            index = self._indexes[log_file] = ExchangeIndex(log_file)
+        return index
+    
+    def _read_indexed(self, log_file: Path,
+                      select: Callable[[ExchangeIndex], List[IndexEntry]],
+                      match: Callable[[Exchange], bool]) -> List[Exchange]:
+        """Read the exchanges the index selects from a log file.
+        
+        Falls back to scanning the whole file with ``match`` if the index
+        turns out not to match the file (it is rebuilt for next time).
+        
+        Args:
+            log_file: Path to the JSONL file
+            select: Picks the index entries to read
+            match: Equivalent filter on parsed exchanges, for the fallback
+            
+        Returns:
+            Matching exchanges in file order
+        """
+        index = self._get_index(log_file)
+        try:
+            return list(index.read(select(index)))
+        except (StaleIndexError, OSError) as e:
+            logger.debug(f"Index lookup failed, scanning {log_file}: {e}")
+            index.rebuild()
+            return [exchange for exchange in self._read_file(log_file) if match(exchange)]
+    
+    def follow(self, lines: int = 0, position: Optional['FollowPosition'] = None) -> 'ExchangeFollower':
+        """Create a follower for new exchanges, across date rollover.
+        
+        The follower can be iterated with ``for`` or ``async for``, and its
+        ``position`` saved to resume later.
+        
+        Args:
+            lines: Start with the last N exchanges of today (0 for all of today)
+            position: Resume from a saved position instead
+            
+        Returns:
+            An ExchangeFollower on this reader's logs directory
+        """
+        from voice_mode.exchanges.follower import ExchangeFollower
+        return ExchangeFollower(self.logs_dir, position=position, lines=lines)
+    
     def tail(self, follow: bool = True, lines: int = 0) -> Iterator[Exchange]:
         """Tail exchanges in real-time.
         
@@ -113,37 +259,16 @@ class ExchangeReader:
         today_file = self._get_log_file_path(datetime.now())
         
         if follow:
-            # Use tail -f for real-time following
-            cmd = ["tail", "-n", str(lines) if lines > 0 else "+1", "-f", str(today_file)]
-            
-            try:
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                
-                for line in process.stdout:
-                    line = line.strip()
-                    if line:
-                        try:
-                            yield Exchange.from_jsonl(line)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse line: {e}")
-                        except Exception as e:
-                            logger.error(f"Error processing line: {e}")
-            
-            except KeyboardInterrupt:
-                process.terminate()
-                process.wait()
-            except Exception as e:
-                logger.error(f"Error tailing file: {e}")
+            yield from self.follow(lines=lines)
         else:
             # Just read the file once
             if today_file.exists():
-                exchanges = list(self._read_file(today_file))
-                
-                # Return last N lines if specified
-                if lines > 0 and len(exchanges) > lines:
-                    exchanges = exchanges[-lines:]
-                
-                yield from exchanges
+                if lines > 0:
+                    # Only read as much of the end of the file as needed
+                    latest = list(itertools.islice(self._read_file_reversed(today_file), lines))
+                    yield from reversed(latest)
+                else:
+                    yield from self._read_file(today_file)
     
     def read_recent(self, days: int = 7) -> Iterator[Exchange]:
         """Read exchanges from recent days.
@@ -212,6 +337,30 @@ class ExchangeReader:
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
     
+    def _read_file_reversed(self, file_path: Path) -> Iterator[Exchange]:
+        """Read exchanges from a single file, newest first.
+        
+        Args:
+            file_path: Path to the JSONL file
+            
+        Yields:
+            Exchange objects from the end of the file backwards
+        """
+        if not file_path.exists():
+            return
+        
+        try:
+            for line in read_lines_reversed(file_path):
+                try:
+                    yield Exchange.from_jsonl(line.decode('utf-8'))
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.warning(f"Failed to parse line in {file_path}: {e}")
+                except Exception as e:
+                    logger.error(f"Error processing line in {file_path}: {e}")
+        
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+    
     def _read_all(self) -> Iterator[Exchange]:
         """Read all exchanges from all log files.
         
@@ -233,21 +382,16 @@ class ExchangeReader:
         Returns:
             List of the most recent exchanges
         """
-        # Read from today and work backwards if needed
-        exchanges = []
+        # Read today's file from the end and work backwards if needed
+        latest = []
         current_date = datetime.now().date()
         
-        while len(exchanges) < count:
-            # Try to read from current date
-            daily_exchanges = list(self.read_date(current_date))
-            
-            if daily_exchanges:
-                # Add to beginning since we're going backwards
-                exchanges = daily_exchanges + exchanges
-                
-                # Trim to requested count
-                if len(exchanges) > count:
-                    exchanges = exchanges[-count:]
+        while len(latest) < count:
+            log_file = self._get_log_file_path(current_date)
+            for exchange in self._read_file_reversed(log_file):
+                latest.append(exchange)
+                if len(latest) == count:
+                    break
             
             # Go to previous day
             current_date -= timedelta(days=1)
@@ -256,4 +400,5 @@ class ExchangeReader:
             if (datetime.now().date() - current_date).days > 30:
                 break
         
-        return exchanges
\ No newline at end of file
+        latest.reverse()
+        return latest
\ No newline at end of file
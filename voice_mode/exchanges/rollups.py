@@ -0,0 +1,138 @@
+"""
+Precomputed daily rollups of exchange statistics.
+
+Once a day is over, the ``ExchangeAggregate`` of its log (counts, provider,
+voice and transport breakdowns, timing sketches, conversations) is stored
+next to it as ``exchanges_YYYY-MM-DD.rollup.json``. Statistics over a range
+then merge one small rollup per whole past day and only read exchange lines
+for the current day and for days the range cuts through.
+
+A rollup records the size of the log it was built from and is rebuilt when
+the log has changed since, e.g. an exchange written just after midnight into
+the previous day's file.
+"""
+
+import json
+import logging
+import os
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Optional
+
+from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.stats import ExchangeAggregate
+
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_SUFFIX = ".rollup.json"
+ROLLUP_VERSION = 1
+
+
+def rollup_path(log_file: Path) -> Path:
+    """Get the rollup path for a log file."""
+    return log_file.with_name(log_file.stem + ROLLUP_SUFFIX)
+
+
+class RollupStore:
+    """Daily rollups for the logs of an ``ExchangeReader``."""
+
+    def __init__(self, reader: Optional[ExchangeReader] = None):
+        """Create a store.
+
+        Args:
+            reader: Reader for the logs (defaults to ~/.voicemode)
+        """
+        self.reader = reader or ExchangeReader()
+
+    def day_aggregate(self, day: date) -> ExchangeAggregate:
+        """Aggregate of all exchanges logged on a day.
+
+        Closed days are loaded from their rollup, which is written on first
+        use; the current day is always read from its log.
+        """
+        log_file = self.reader._get_log_file_path(day)
+        try:
+            size = log_file.stat().st_size
+        except FileNotFoundError:
+            return ExchangeAggregate()
+
+        if day >= datetime.now().date():
+            return ExchangeAggregate().update(self.reader._read_file(log_file))
+
+        aggregate = self._load(log_file, size)
+        if aggregate is None:
+            aggregate = ExchangeAggregate().update(self.reader._read_file(log_file))
+            self._save(log_file, size, aggregate)
+        return aggregate
+
+    def range_aggregate(self, start: datetime, end: datetime) -> ExchangeAggregate:
+        """Aggregate of the exchanges with ``start <= timestamp <= end``.
+
+        Days are the local dates of the log files. Whole closed days come
+        from rollups; the first and last day, if the range only covers part
+        of them, and the current day are read through the offset index.
+        """
+        def local(value: datetime) -> datetime:
+            return value.astimezone() if value.tzinfo else value
+
+        aggregate = ExchangeAggregate()
+        day = local(start).date()
+        today = datetime.now().date()
+        while day <= local(end).date():
+            day_start = datetime.combine(day, time.min)
+            day_end = datetime.combine(day + timedelta(days=1), time.min) - timedelta(microseconds=1)
+            if start.tzinfo:
+                day_start, day_end = day_start.astimezone(), day_end.astimezone()
+
+            if day < today and start <= day_start and day_end <= end:
+                aggregate.merge(self.day_aggregate(day))
+            else:
+                aggregate.update(self.reader.read_range(max(start, day_start), min(end, day_end)))
+            day += timedelta(days=1)
+        return aggregate
+
+    def build(self, day: date) -> Optional[Path]:
+        """(Re)write the rollup of a closed day.
+
+        Returns:
+            Path of the rollup, or None if the day is not closed or has no log
+        """
+        log_file = self.reader._get_log_file_path(day)
+        if day >= datetime.now().date() or not log_file.exists():
+            return None
+        size = log_file.stat().st_size
+        self._save(log_file, size, ExchangeAggregate().update(self.reader._read_file(log_file)))
+        return rollup_path(log_file)
+
+    def _load(self, log_file: Path, size: int) -> Optional[ExchangeAggregate]:
+        """Load a rollup if it matches the log's current size."""
+        path = rollup_path(log_file)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read rollup {path}: {e}")
+            return None
+        if data.get('version') != ROLLUP_VERSION or data.get('log_size') != size:
+            logger.debug(f"Rollup {path} is stale, rebuilding")
+            return None
+        try:
+            return ExchangeAggregate.from_dict(data['aggregate'])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable rollup {path}: {e}")
+            return None
+
+    def _save(self, log_file: Path, size: int, aggregate: ExchangeAggregate) -> None:
+        """Write a rollup atomically; failing to write is not an error."""
+        path = rollup_path(log_file)
+        tmp_path = path.with_name(path.name + '.tmp')
+        data = {'version': ROLLUP_VERSION, 'log_size': size, 'aggregate': aggregate.to_dict()}
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write rollup {path}: {e}")
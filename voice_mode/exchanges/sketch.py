@@ -0,0 +1,180 @@
+"""
+Mergeable summaries of timing values for exchange statistics.
+
+``QuantileSketch`` keeps counts in logarithmically sized buckets, so any
+quantile is known to within a fixed relative error using a few hundred
+counters however many values were added. Two sketches with the same
+accuracy merge by adding their bucket counts, which gives exactly the sketch
+of the combined values. ``RunningStats`` adds exact count, sum, min and max.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+
+# Quantiles are accurate to within this fraction of the true value
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Magnitudes below this are counted as zero
+SKETCH_MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with a bounded relative error."""
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        """Create an empty sketch.
+
+        Args:
+            relative_accuracy: Relative error of reported quantiles (0-1)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of the bucket (gamma^(key-1), gamma^key]
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        if value > SKETCH_MIN_VALUE:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif value < -SKETCH_MIN_VALUE:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Add another sketch's values to this one.
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(f"Cannot merge sketches with accuracy {other.relative_accuracy} "
+                             f"and {self.relative_accuracy}")
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile ``q`` (0-1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(key): count for key, count in self.positive.items()},
+            'negative': {str(key): count for key, count in self.negative.items()},
+            'zero_count': self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        """Create from a dictionary made by ``to_dict``."""
+        sketch = cls(data['relative_accuracy'])
+        sketch.positive = {int(key): count for key, count in data['positive'].items()}
+        sketch.negative = {int(key): count for key, count in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = sketch.zero_count + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
+
+
+class RunningStats:
+    """Exact count, sum, min and max of a series, with a quantile sketch."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Add another series' values to this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def avg(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Sketch quantile, clamped to the exact min and max."""
+        value = self.sketch.quantile(q)
+        if value is None:
+            return None
+        # A bucket's midpoint can lie just outside the values it holds
+        return min(max(value, self.min), self.max)
+
+    def summary(self) -> Dict[str, Any]:
+        """avg/min/max/count plus p50/p95/p99, as reported by ExchangeStats."""
+        return {
+            'avg': self.avg,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+                'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        """Create from a dictionary made by ``to_dict``."""
+        stats = cls()
+        stats.count = data['count']
+        stats.total = data['total']
+        stats.min = data['min']
+        stats.max = data['max']
+        stats.sketch = QuantileSketch.from_dict(data['sketch'])
+        return stats
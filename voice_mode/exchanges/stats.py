@@ -1,33 +1,334 @@
 """
 Statistics calculation for exchanges.
+
+``ExchangeAggregate`` consumes exchanges one at a time and keeps only running
+totals, counters, per-conversation summaries and quantile sketches, so
+statistics over months of logs need no more memory than over a day. Partial
+aggregates (e.g. one per day) can be built independently and merged.
+``ExchangeStats`` reports from an aggregate.
 """
 
-from collections import defaultdict, Counter
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import re
 
 from voice_mode.exchanges.models import Exchange
+from voice_mode.exchanges.sketch import RunningStats
+
+
+# "record 3.2s, stt 1.4s" / "ttfa 1.2s, gen 2.3s, play 5.6s"
+TIMING_PATTERN = re.compile(r'(\w+)\s+([\d.]+)s')
+
+# Timing string metric -> reported name, per exchange type
+STT_TIMING_METRICS = {'record': 'record', 'stt': 'processing'}
+TTS_TIMING_METRICS = {'ttfa': 'ttfa', 'gen': 'generation', 'play': 'playback'}
+
+
+def parse_timing(timing: Optional[str]) -> List[Tuple[str, float]]:
+    """Parse a timing string into (metric, seconds) pairs."""
+    if not timing:
+        return []
+    return [(metric, float(value)) for metric, value in TIMING_PATTERN.findall(timing)]
+
+
+def categorize_error(error: str) -> str:
+    """Map an error message to a coarse category."""
+    error_msg = error.lower()
+    if 'timeout' in error_msg:
+        return 'timeout'
+    elif 'auth' in error_msg or 'unauthorized' in error_msg:
+        return 'authentication'
+    elif 'rate' in error_msg:
+        return 'rate_limit'
+    elif 'network' in error_msg or 'connection' in error_msg:
+        return 'network'
+    return 'other'
+
+
+@dataclass
+class ConversationSummary:
+    """What the statistics need to know about one conversation."""
+    exchanges: int
+    words: int
+    first: datetime
+    last: datetime
+
+    def merge(self, other: 'ConversationSummary') -> None:
+        self.exchanges += other.exchanges
+        self.words += other.words
+        self.first = min(self.first, other.first)
+        self.last = max(self.last, other.last)
+
+
+class ExchangeAggregate:
+    """Single-pass, mergeable statistics over a stream of exchanges."""
+
+    def __init__(self):
+        self.total = 0
+        self.stt_count = 0
+        self.tts_count = 0
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+
+        self.providers = Counter()
+        self.transports = Counter()
+        self.stt_models = Counter()
+        self.tts_models = Counter()
+        self.voices = Counter()
+        self.hours = Counter()
+        self.days = Counter()
+
+        self.stt_timing: Dict[str, RunningStats] = {}
+        self.tts_timing: Dict[str, RunningStats] = {}
+        self.turnaround = RunningStats()
+        self.conversations: Dict[str, ConversationSummary] = {}
+
+        self.error_types = Counter()
+        self.stt_errors = 0
+        self.tts_errors = 0
+
+        self.vad_enabled = 0
+        self.vad_disabled = 0
+        self.record_with_vad = RunningStats()
+        self.record_without_vad = RunningStats()
+
+        # Type and timestamp of the first and last exchange in stream order,
+        # to count the turnaround where two partial aggregates meet
+        self.head: Optional[Tuple[str, datetime]] = None
+        self.tail: Optional[Tuple[str, datetime]] = None
+
+    def update(self, exchanges: Iterable[Exchange]) -> 'ExchangeAggregate':
+        """Add exchanges in log order; returns self."""
+        for exchange in exchanges:
+            self.add(exchange)
+        return self
+
+    def add(self, exchange: Exchange) -> None:
+        """Add the next exchange of the stream."""
+        timestamp = exchange.timestamp
+        metadata = exchange.metadata
+        self.total += 1
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        # Turnaround: time between consecutive exchanges of different types
+        if self.tail is not None and self.tail[0] != exchange.type:
+            self.turnaround.add((timestamp - self.tail[1]).total_seconds())
+        self.tail = (exchange.type, timestamp)
+        if self.head is None:
+            self.head = self.tail
+
+        self.providers[metadata.provider if metadata and metadata.provider else 'unknown'] += 1
+        self.transports[metadata.transport if metadata and metadata.transport else 'unknown'] += 1
+        model = metadata.model if metadata and metadata.model else 'unknown'
+        self.hours[timestamp.hour] += 1
+        self.days[timestamp.date().isoformat()] += 1
+
+        conversation = self.conversations.get(exchange.conversation_id)
+        words = len(exchange.text.split())
+        if conversation is None:
+            self.conversations[exchange.conversation_id] = ConversationSummary(1, words, timestamp, timestamp)
+        else:
+            conversation.merge(ConversationSummary(1, words, timestamp, timestamp))
+
+        timings = parse_timing(metadata.timing if metadata else None)
+        if exchange.is_stt:
+            self.stt_count += 1
+            self.stt_models[model] += 1
+            self._add_timings(self.stt_timing, STT_TIMING_METRICS, timings)
+            if metadata and metadata.silence_detection:
+                record = next((value for metric, value in timings if metric == 'record'), None)
+                if metadata.silence_detection.get('enabled'):
+                    self.vad_enabled += 1
+                    if record is not None:
+                        self.record_with_vad.add(record)
+                else:
+                    self.vad_disabled += 1
+                    if record is not None:
+                        self.record_without_vad.add(record)
+        else:
+            self.tts_models[model] += 1
+            if exchange.is_tts:
+                self.tts_count += 1
+                self.voices[metadata.voice if metadata and metadata.voice else 'unknown'] += 1
+                self._add_timings(self.tts_timing, TTS_TIMING_METRICS, timings)
+
+        if metadata and metadata.error:
+            self.error_types[categorize_error(metadata.error)] += 1
+            if exchange.is_stt:
+                self.stt_errors += 1
+            elif exchange.is_tts:
+                self.tts_errors += 1
+
+    @staticmethod
+    def _add_timings(series: Dict[str, RunningStats], names: Dict[str, str],
+                     timings: List[Tuple[str, float]]) -> None:
+        for metric, value in timings:
+            name = names.get(metric)
+            if name:
+                series.setdefault(name, RunningStats()).add(value)
+
+    def merge(self, other: 'ExchangeAggregate') -> 'ExchangeAggregate':
+        """Add a partial aggregate of the exchanges that follow this one's.
+
+        Everything but the turnaround between the two parts is independent of
+        order; for that, ``other`` must cover the exchanges right after
+        these (e.g. the next day). Returns self.
+        """
+        if not other.total:
+            return self
+        self.total += other.total
+        self.stt_count += other.stt_count
+        self.tts_count += other.tts_count
+        if self.first_timestamp is None or other.first_timestamp < self.first_timestamp:
+            self.first_timestamp = other.first_timestamp
+        if self.last_timestamp is None or other.last_timestamp > self.last_timestamp:
+            self.last_timestamp = other.last_timestamp
+
+        if self.tail is not None and self.tail[0] != other.head[0]:
+            self.turnaround.add((other.head[1] - self.tail[1]).total_seconds())
+        self.turnaround.merge(other.turnaround)
+        self.head = self.head or other.head
+        self.tail = other.tail
+
+        for mine, theirs in ((self.providers, other.providers), (self.transports, other.transports),
+                             (self.stt_models, other.stt_models), (self.tts_models, other.tts_models),
+                             (self.voices, other.voices), (self.hours, other.hours),
+                             (self.days, other.days), (self.error_types, other.error_types)):
+            mine.update(theirs)
+        for mine, theirs in ((self.stt_timing, other.stt_timing), (self.tts_timing, other.tts_timing)):
+            for name, series in theirs.items():
+                mine.setdefault(name, RunningStats()).merge(series)
+
+        for conversation_id, summary in other.conversations.items():
+            existing = self.conversations.get(conversation_id)
+            if existing is None:
+                self.conversations[conversation_id] = ConversationSummary(
+                    summary.exchanges, summary.words, summary.first, summary.last)
+            else:
+                existing.merge(summary)
+
+        self.stt_errors += other.stt_errors
+        self.tts_errors += other.tts_errors
+        self.vad_enabled += other.vad_enabled
+        self.vad_disabled += other.vad_disabled
+        self.record_with_vad.merge(other.record_with_vad)
+        self.record_without_vad.merge(other.record_without_vad)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        def when(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        return {
+            'total': self.total,
+            'stt_count': self.stt_count,
+            'tts_count': self.tts_count,
+            'first_timestamp': when(self.first_timestamp),
+            'last_timestamp': when(self.last_timestamp),
+            'providers': dict(self.providers),
+            'transports': dict(self.transports),
+            'stt_models': dict(self.stt_models),
+            'tts_models': dict(self.tts_models),
+            'voices': dict(self.voices),
+            'hours': {str(hour): count for hour, count in self.hours.items()},
+            'days': dict(self.days),
+            'stt_timing': {name: series.to_dict() for name, series in self.stt_timing.items()},
+            'tts_timing': {name: series.to_dict() for name, series in self.tts_timing.items()},
+            'turnaround': self.turnaround.to_dict(),
+            'conversations': {
+                conversation_id: [c.exchanges, c.words, c.first.isoformat(), c.last.isoformat()]
+                for conversation_id, c in self.conversations.items()
+            },
+            'error_types': dict(self.error_types),
+            'stt_errors': self.stt_errors,
+            'tts_errors': self.tts_errors,
+            'vad_enabled': self.vad_enabled,
+            'vad_disabled': self.vad_disabled,
+            'record_with_vad': self.record_with_vad.to_dict(),
+            'record_without_vad': self.record_without_vad.to_dict(),
+            'head': [self.head[0], self.head[1].isoformat()] if self.head else None,
+            'tail': [self.tail[0], self.tail[1].isoformat()] if self.tail else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExchangeAggregate':
+        """Create from a dictionary made by ``to_dict``."""
+        def when(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        aggregate = cls()
+        aggregate.total = data['total']
+        aggregate.stt_count = data['stt_count']
+        aggregate.tts_count = data['tts_count']
+        aggregate.first_timestamp = when(data['first_timestamp'])
+        aggregate.last_timestamp = when(data['last_timestamp'])
+        for name in ('providers', 'transports', 'stt_models', 'tts_models', 'voices', 'days', 'error_types'):
+            setattr(aggregate, name, Counter(data[name]))
+        aggregate.hours = Counter({int(hour): count for hour, count in data['hours'].items()})
+        aggregate.stt_timing = {name: RunningStats.from_dict(series) for name, series in data['stt_timing'].items()}
+        aggregate.tts_timing = {name: RunningStats.from_dict(series) for name, series in data['tts_timing'].items()}
+        aggregate.turnaround = RunningStats.from_dict(data['turnaround'])
+        aggregate.conversations = {
+            conversation_id: ConversationSummary(exchanges, words, when(first), when(last))
+            for conversation_id, (exchanges, words, first, last) in data['conversations'].items()
+        }
+        aggregate.stt_errors = data['stt_errors']
+        aggregate.tts_errors = data['tts_errors']
+        aggregate.vad_enabled = data['vad_enabled']
+        aggregate.vad_disabled = data['vad_disabled']
+        aggregate.record_with_vad = RunningStats.from_dict(data['record_with_vad'])
+        aggregate.record_without_vad = RunningStats.from_dict(data['record_without_vad'])
+        aggregate.head = (data['head'][0], when(data['head'][1])) if data['head'] else None
+        aggregate.tail = (data['tail'][0], when(data['tail'][1])) if data['tail'] else None
+        return aggregate
 
 
 class ExchangeStats:
     """Calculate statistics from exchanges."""
     
-    def __init__(self, exchanges: List[Exchange]):
-        """Initialize with list of exchanges.
+    def __init__(self, exchanges: Iterable[Exchange] = ()):
+        """Initialize with exchanges, which are consumed in a single pass.
+        
+        Args:
+            exchanges: Exchanges to analyze in log order; any iterable, e.g.
+                a reader generator, so they need not fit in memory
+        """
+        self.aggregate = ExchangeAggregate().update(exchanges)
+    
+    @classmethod
+    def from_aggregate(cls, aggregate: ExchangeAggregate) -> 'ExchangeStats':
+        """Report on an already built (e.g. merged) aggregate."""
+        stats = cls()
+        stats.aggregate = aggregate
+        return stats
+    
+    @classmethod
+    def from_range(cls, start: datetime, end: datetime, reader=None) -> 'ExchangeStats':
+        """Statistics for a time range, from daily rollups where possible.
+        
+        Whole past days come from their persisted rollups (built on first
+        use); only the current day and days cut by the range are read.
         
         Args:
-            exchanges: List of exchanges to analyze
+            start: Start datetime (inclusive)
+            end: End datetime (inclusive)
+            reader: ExchangeReader for the logs (defaults to ~/.voicemode)
         """
-        self.exchanges = exchanges
+        from voice_mode.exchanges.rollups import RollupStore
         
-        # Separate by type for convenience
-        self.stt_exchanges = [e for e in exchanges if e.is_stt]
-        self.tts_exchanges = [e for e in exchanges if e.is_tts]
+        return cls.from_aggregate(RollupStore(reader).range_aggregate(start, end))
     
     def timing_stats(self) -> Dict[str, Any]:
         """Calculate timing statistics.
         
+        Each metric has avg/min/max/count and approximate p50/p95/p99.
+        
         Returns:
             Dictionary with timing metrics
         """
@@ -37,106 +338,30 @@ class ExchangeStats:
             'overall': {}
         }
         
-        # Calculate overall turnaround times
-        turnaround_times = []
-        
-        for i in range(len(self.exchanges) - 1):
-            current = self.exchanges[i]
-            next_ex = self.exchanges[i + 1]
-            
-            # Only count when switching between STT and TTS
-            if current.type != next_ex.type:
-                turnaround = (next_ex.timestamp - current.timestamp).total_seconds()
-                turnaround_times.append(turnaround)
-        
-        if turnaround_times:
-            stats['overall']['avg_turnaround'] = sum(turnaround_times) / len(turnaround_times)
-            stats['overall']['min_turnaround'] = min(turnaround_times)
-            stats['overall']['max_turnaround'] = max(turnaround_times)
-            stats['overall']['turnaround_count'] = len(turnaround_times)
+        # Overall turnaround: time between consecutive STT and TTS exchanges
+        turnaround = self.aggregate.turnaround
+        if turnaround.count:
+            stats['overall']['avg_turnaround'] = turnaround.avg
+            stats['overall']['min_turnaround'] = turnaround.min
+            stats['overall']['max_turnaround'] = turnaround.max
+            stats['overall']['turnaround_count'] = turnaround.count
+            for pct in (50, 95, 99):
+                stats['overall'][f'p{pct}_turnaround'] = turnaround.quantile(pct / 100)
         
         return stats
     
     def _calculate_stt_timing_stats(self) -> Dict[str, Any]:
         """Calculate STT-specific timing stats."""
-        record_times = []
-        stt_times = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "record 3.2s, stt 1.4s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'record':
-                        record_times.append(float(value))
-                    elif metric == 'stt':
-                        stt_times.append(float(value))
-        
-        stats = {}
-        
-        if record_times:
-            stats['record'] = {
-                'avg': sum(record_times) / len(record_times),
-                'min': min(record_times),
-                'max': max(record_times),
-                'count': len(record_times)
-            }
-        
-        if stt_times:
-            stats['processing'] = {
-                'avg': sum(stt_times) / len(stt_times),
-                'min': min(stt_times),
-                'max': max(stt_times),
-                'count': len(stt_times)
-            }
-        
-        return stats
+        return self._timing_summaries(self.aggregate.stt_timing, STT_TIMING_METRICS)
     
     def _calculate_tts_timing_stats(self) -> Dict[str, Any]:
         """Calculate TTS-specific timing stats."""
-        ttfa_times = []
-        gen_times = []
-        play_times = []
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "ttfa 1.2s, gen 2.3s, play 5.6s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'ttfa':
-                        ttfa_times.append(float(value))
-                    elif metric == 'gen':
-                        gen_times.append(float(value))
-                    elif metric == 'play':
-                        play_times.append(float(value))
-        
-        stats = {}
-        
-        if ttfa_times:
-            stats['ttfa'] = {
-                'avg': sum(ttfa_times) / len(ttfa_times),
-                'min': min(ttfa_times),
-                'max': max(ttfa_times),
-                'count': len(ttfa_times)
-            }
-        
-        if gen_times:
-            stats['generation'] = {
-                'avg': sum(gen_times) / len(gen_times),
-                'min': min(gen_times),
-                'max': max(gen_times),
-                'count': len(gen_times)
-            }
-        
-        if play_times:
-            stats['playback'] = {
-                'avg': sum(play_times) / len(play_times),
-                'min': min(play_times),
-                'max': max(play_times),
-                'count': len(play_times)
-            }
-        
-        return stats
+        return self._timing_summaries(self.aggregate.tts_timing, TTS_TIMING_METRICS)
+    
+    @staticmethod
+    def _timing_summaries(series: Dict[str, RunningStats], names: Dict[str, str]) -> Dict[str, Any]:
+        # In the order the metrics appear in timing strings
+        return {name: series[name].summary() for name in names.values() if name in series}
     
     def provider_breakdown(self) -> Dict[str, int]:
         """Count exchanges by provider.
@@ -144,15 +369,7 @@ class ExchangeStats:
         Returns:
             Dictionary mapping provider names to counts
         """
-        provider_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.provider:
-                provider_counts[exchange.metadata.provider] += 1
-            else:
-                provider_counts['unknown'] += 1
-        
-        return dict(provider_counts)
+        return dict(self.aggregate.providers)
     
     def model_breakdown(self) -> Dict[str, Dict[str, int]]:
         """Count exchanges by model, separated by type.
@@ -160,22 +377,9 @@ class ExchangeStats:
         Returns:
             Dictionary with 'stt' and 'tts' sub-dictionaries of model counts
         """
-        stt_models = Counter()
-        tts_models = Counter()
-        
-        for exchange in self.exchanges:
-            model = 'unknown'
-            if exchange.metadata and exchange.metadata.model:
-                model = exchange.metadata.model
-            
-            if exchange.is_stt:
-                stt_models[model] += 1
-            else:
-                tts_models[model] += 1
-        
         return {
-            'stt': dict(stt_models),
-            'tts': dict(tts_models)
+            'stt': dict(self.aggregate.stt_models),
+            'tts': dict(self.aggregate.tts_models)
         }
     
     def voice_breakdown(self) -> Dict[str, int]:
@@ -184,15 +388,7 @@ class ExchangeStats:
         Returns:
             Dictionary mapping voice names to counts
         """
-        voice_counts = Counter()
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.voice:
-                voice_counts[exchange.metadata.voice] += 1
-            else:
-                voice_counts['unknown'] += 1
-        
-        return dict(voice_counts)
+        return dict(self.aggregate.voices)
     
     def transport_breakdown(self) -> Dict[str, int]:
         """Count exchanges by transport type.
@@ -200,15 +396,7 @@ class ExchangeStats:
         Returns:
             Dictionary mapping transport types to counts
         """
-        transport_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.transport:
-                transport_counts[exchange.metadata.transport] += 1
-            else:
-                transport_counts['unknown'] += 1
-        
-        return dict(transport_counts)
+        return dict(self.aggregate.transports)
     
     def hourly_distribution(self) -> Dict[int, int]:
         """Distribution of exchanges by hour of day.
@@ -216,14 +404,8 @@ class ExchangeStats:
         Returns:
             Dictionary mapping hour (0-23) to count
         """
-        hour_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            hour = exchange.timestamp.hour
-            hour_counts[hour] += 1
-        
         # Ensure all hours are represented
-        return {hour: hour_counts.get(hour, 0) for hour in range(24)}
+        return {hour: self.aggregate.hours.get(hour, 0) for hour in range(24)}
     
     def daily_distribution(self) -> Dict[str, int]:
         """Distribution of exchanges by date.
@@ -231,13 +413,7 @@ class ExchangeStats:
         Returns:
             Dictionary mapping date string (YYYY-MM-DD) to count
         """
-        daily_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            date_str = exchange.timestamp.date().isoformat()
-            daily_counts[date_str] += 1
-        
-        return dict(sorted(daily_counts.items()))
+        return dict(sorted(self.aggregate.days.items()))
     
     def conversation_stats(self) -> Dict[str, Any]:
         """Conversation-level statistics.
@@ -245,33 +421,13 @@ class ExchangeStats:
         Returns:
             Dictionary with conversation metrics
         """
-        # Group by conversation ID
-        conversations = defaultdict(list)
-        for exchange in self.exchanges:
-            conversations[exchange.conversation_id].append(exchange)
-        
-        # Calculate stats per conversation
-        conv_lengths = []
-        conv_durations = []
-        conv_exchange_counts = []
-        
-        for conv_id, conv_exchanges in conversations.items():
-            if len(conv_exchanges) > 0:
-                conv_exchange_counts.append(len(conv_exchanges))
-                
-                # Sort by timestamp
-                conv_exchanges.sort(key=lambda e: e.timestamp)
-                
-                # Calculate duration
-                duration = (conv_exchanges[-1].timestamp - conv_exchanges[0].timestamp).total_seconds()
-                conv_durations.append(duration)
-                
-                # Calculate total word count
-                total_words = sum(len(e.text.split()) for e in conv_exchanges)
-                conv_lengths.append(total_words)
+        conversations = self.aggregate.conversations.values()
+        conv_exchange_counts = [c.exchanges for c in conversations]
+        conv_durations = [(c.last - c.first).total_seconds() for c in conversations]
+        conv_lengths = [c.words for c in conversations]
         
         stats = {
-            'total_conversations': len(conversations),
+            'total_conversations': len(self.aggregate.conversations),
             'exchanges_per_conversation': {
                 'avg': sum(conv_exchange_counts) / len(conv_exchange_counts) if conv_exchange_counts else 0,
                 'min': min(conv_exchange_counts) if conv_exchange_counts else 0,
@@ -297,30 +453,14 @@ class ExchangeStats:
         Returns:
             Dictionary with error metrics
         """
-        error_exchanges = [e for e in self.exchanges if e.metadata and e.metadata.error]
-        
-        error_types = Counter()
-        for exchange in error_exchanges:
-            # Try to categorize error
-            error_msg = exchange.metadata.error.lower()
-            if 'timeout' in error_msg:
-                error_types['timeout'] += 1
-            elif 'auth' in error_msg or 'unauthorized' in error_msg:
-                error_types['authentication'] += 1
-            elif 'rate' in error_msg:
-                error_types['rate_limit'] += 1
-            elif 'network' in error_msg or 'connection' in error_msg:
-                error_types['network'] += 1
-            else:
-                error_types['other'] += 1
-        
+        total_errors = sum(self.aggregate.error_types.values())
         return {
-            'total_errors': len(error_exchanges),
-            'error_rate': len(error_exchanges) / len(self.exchanges) if self.exchanges else 0,
-            'error_types': dict(error_types),
+            'total_errors': total_errors,
+            'error_rate': total_errors / self.aggregate.total if self.aggregate.total else 0,
+            'error_types': dict(self.aggregate.error_types),
             'errors_by_type': {
-                'stt': sum(1 for e in error_exchanges if e.is_stt),
-                'tts': sum(1 for e in error_exchanges if e.is_tts),
+                'stt': self.aggregate.stt_errors,
+                'tts': self.aggregate.tts_errors,
             }
         }
     
@@ -330,43 +470,18 @@ class ExchangeStats:
         Returns:
             Dictionary with silence detection metrics
         """
-        stt_with_vad = []
-        stt_without_vad = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.silence_detection:
-                if exchange.metadata.silence_detection.get('enabled'):
-                    stt_with_vad.append(exchange)
-                else:
-                    stt_without_vad.append(exchange)
-        
-        # Calculate average recording times
-        with_vad_times = []
-        without_vad_times = []
-        
-        for exchange in stt_with_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    with_vad_times.append(float(match.group(1)))
-        
-        for exchange in stt_without_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    without_vad_times.append(float(match.group(1)))
-        
+        aggregate = self.aggregate
         stats = {
-            'vad_enabled_count': len(stt_with_vad),
-            'vad_disabled_count': len(stt_without_vad),
-            'vad_usage_rate': len(stt_with_vad) / len(self.stt_exchanges) if self.stt_exchanges else 0,
+            'vad_enabled_count': aggregate.vad_enabled,
+            'vad_disabled_count': aggregate.vad_disabled,
+            'vad_usage_rate': aggregate.vad_enabled / aggregate.stt_count if aggregate.stt_count else 0,
         }
         
-        if with_vad_times:
-            stats['avg_record_time_with_vad'] = sum(with_vad_times) / len(with_vad_times)
+        if aggregate.record_with_vad.count:
+            stats['avg_record_time_with_vad'] = aggregate.record_with_vad.avg
         
-        if without_vad_times:
-            stats['avg_record_time_without_vad'] = sum(without_vad_times) / len(without_vad_times)
+        if aggregate.record_without_vad.count:
+            stats['avg_record_time_without_vad'] = aggregate.record_without_vad.avg
         
         return stats
     
@@ -379,16 +494,15 @@ class ExchangeStats:
         lines = ["Exchange Statistics Summary", "=" * 40, ""]
         
         # Basic counts
-        lines.append(f"Total Exchanges: {len(self.exchanges)}")
-        lines.append(f"  STT: {len(self.stt_exchanges)}")
-        lines.append(f"  TTS: {len(self.tts_exchanges)}")
+        lines.append(f"Total Exchanges: {self.aggregate.total}")
+        lines.append(f"  STT: {self.aggregate.stt_count}")
+        lines.append(f"  TTS: {self.aggregate.tts_count}")
         lines.append("")
         
         # Date range
-        if self.exchanges:
-            sorted_exchanges = sorted(self.exchanges, key=lambda e: e.timestamp)
-            start = sorted_exchanges[0].timestamp
-            end = sorted_exchanges[-1].timestamp
+        if self.aggregate.total:
+            start = self.aggregate.first_timestamp
+            end = self.aggregate.last_timestamp
             lines.append(f"Date Range: {start.date()} to {end.date()}")
             lines.append(f"Duration: {end - start}")
             lines.append("")
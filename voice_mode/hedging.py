@@ -0,0 +1,185 @@
+"""
+Hedged TTS requests for voice-mode.
+
+A slow-but-alive endpoint (e.g. a saturated local GPU box) would otherwise
+stall the whole turn, because failover only moves on after a full failure.
+Hedging starts the request at the preferred endpoint and, if no audio has
+arrived within the hedge delay, starts the next endpoint as well. Whichever
+delivers its first chunk first is played and the others are cancelled.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("voicemode")
+
+# Queue sentinel marking the end of a response body
+_END = object()
+
+# Samples needed before an endpoint's measured p95 is trusted as the hedge delay
+LEARNED_DELAY_MIN_SAMPLES = 20
+
+
+class HedgeError(RuntimeError):
+    """Raised when every hedged attempt failed before producing audio."""
+
+
+@dataclass
+class HedgeOutcome:
+    """What happened to the attempts of a race, filled in while it runs."""
+    started: List[int] = field(default_factory=list)  # Indexes of attempts that were started
+    failed: Dict[int, BaseException] = field(default_factory=dict)  # Attempts that errored
+    cancelled: Dict[int, float] = field(default_factory=dict)  # Losers: seconds they ran without audio
+
+
+def get_hedge_delay(configured: float, latency_stats=None) -> float:
+    """Choose how long to wait for first audio before hedging.
+
+    Once enough requests have been measured, the endpoint's p95 time to
+    first audio is used if it is lower than the configured budget.
+
+    Args:
+        configured: Configured hedge delay in seconds (upper bound)
+        latency_stats: The primary endpoint's ``LatencyStats``, if any
+
+    Returns:
+        Hedge delay in seconds
+    """
+    if latency_stats is None or latency_stats.count < LEARNED_DELAY_MIN_SAMPLES:
+        return configured
+    p95 = latency_stats.percentile(95)
+    return min(configured, p95 / 1000) if p95 is not None else configured
+
+
+async def _produce(source: AsyncIterator[bytes], first: asyncio.Future, queue: asyncio.Queue) -> None:
+    """Pump one attempt's chunks: the first into ``first``, the rest into ``queue``."""
+    try:
+        async for chunk in source:
+            if not first.done():
+                first.set_result(chunk)
+            else:
+                queue.put_nowait(chunk)
+        if not first.done():
+            first.set_exception(HedgeError("Response contained no audio"))
+        queue.put_nowait(_END)
+    except asyncio.CancelledError:
+        if not first.done():
+            first.cancel()
+        raise
+    except Exception as e:
+        if not first.done():
+            first.set_exception(e)
+        else:
+            queue.put_nowait(e)
+
+
+async def _drain(first_chunk: bytes, queue: asyncio.Queue, task: asyncio.Task) -> AsyncIterator[bytes]:
+    """Yield the winning attempt's chunks, cancelling its producer when closed."""
+    try:
+        yield first_chunk
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def race_first_chunk(
+    attempts: List[Callable[[], AsyncIterator[bytes]]],
+    hedge_delay: float,
+    labels: Optional[List[str]] = None,
+    outcome: Optional[HedgeOutcome] = None
+) -> Tuple[int, AsyncIterator[bytes]]:
+    """Start attempts in order until one delivers its first chunk.
+
+    The next attempt is started when the current ones have produced nothing
+    within ``hedge_delay`` seconds, or immediately when all running attempts
+    have failed. Losing attempts are cancelled as soon as a winner is known.
+
+    Args:
+        attempts: Factories returning an async iterator of encoded chunks, in preference order
+        hedge_delay: Seconds to wait for first audio before starting the next attempt
+        labels: Optional names (e.g. base URLs) used in log messages
+        outcome: Filled in with the attempts started, those that failed and
+            how long the cancelled losers ran, also when HedgeError is raised
+
+    Returns:
+        Tuple of (index of the winning attempt, async iterator over its chunks)
+
+    Raises:
+        HedgeError: If every attempt failed before producing audio
+    """
+    if not attempts:
+        raise HedgeError("No endpoints to try")
+    labels = labels or [str(i) for i in range(len(attempts))]
+    if outcome is None:
+        outcome = HedgeOutcome()
+
+    loop = asyncio.get_running_loop()
+    running = {}  # first-chunk future -> (index, queue, producer task)
+    started_at = {}  # index -> loop time the attempt started
+    next_index = 0
+    last_error: Optional[BaseException] = None
+
+    def launch() -> None:
+        nonlocal next_index
+        index = next_index
+        next_index += 1
+        first = loop.create_future()
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(_produce(attempts[index](), first, queue))
+        running[first] = (index, queue, task)
+        started_at[index] = loop.time()
+        outcome.started.append(index)
+        if index > 0:
+            logger.info(f"TTS hedge: starting {labels[index]}")
+
+    def cancel_all() -> None:
+        for _, _, task in running.values():
+            task.cancel()
+        running.clear()
+
+    launch()
+    try:
+        while running:
+            timeout = hedge_delay if next_index < len(attempts) else None
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                logger.info(f"TTS hedge: no audio from {labels[next_index - 1]} after {hedge_delay:.2f}s")
+                launch()
+                continue
+
+            for first in done:
+                index, queue, task = running.pop(first)
+                if first.cancelled() or first.exception() is not None:
+                    last_error = None if first.cancelled() else first.exception()
+                    if last_error is not None:
+                        outcome.failed[index] = last_error
+                    logger.warning(f"TTS hedge: {labels[index]} failed: {last_error}")
+                    continue
+
+                # Winner - cancel everyone else, noting how long they had run
+                now = loop.time()
+                for loser, _, _ in running.values():
+                    outcome.cancelled[loser] = now - started_at[loser]
+                cancel_all()
+                if index > 0:
+                    logger.info(f"TTS hedge: {labels[index]} won the race")
+                return index, _drain(first.result(), queue, task)
+
+            # Everything running failed - move straight on to the next attempt
+            if not running and next_index < len(attempts):
+                launch()
+    except BaseException:
+        cancel_all()
+        raise
+
+    raise HedgeError(f"All hedged TTS attempts failed. Last error: {last_error}")
@@ -6,22 +6,44 @@ This module handles automatic discovery of TTS/STT endpoints, including:
 - Model discovery
 - Voice discovery
 - Dynamic registry management
+- Circuit breaking with background recovery probes
 """
 
 import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 
 import httpx
 from openai import AsyncOpenAI
 
-from .config import TTS_BASE_URLS, STT_BASE_URLS, OPENAI_API_KEY
+from .config import (
+    TTS_BASE_URLS,
+    STT_BASE_URLS,
+    OPENAI_API_KEY,
+    ENDPOINT_SELECTION,
+    SAMPLE_RATE,
+    TTS_PCM_SAMPLE_RATES
+)
+from .circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger("voice-mode")
 
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+# Number of recent samples kept per endpoint for percentiles
+LATENCY_WINDOW = 100
+# Without new samples an endpoint's ranking score halves this often, so an
+# endpoint that was slow once is eventually tried (and measured) again
+LATENCY_HALF_LIFE_S = 600.0
+# Timeout for background recovery probes
+PROBE_TIMEOUT = 3.0
+# Raw PCM sample rate of known TTS providers
+KNOWN_PCM_SAMPLE_RATES = {"openai": 24000, "kokoro": 24000}
+
 
 def detect_provider_type(base_url: str) -> str:
     """Detect provider type from base URL."""
@@ -57,6 +79,65 @@ class EndpointInfo:
     provider_type: Optional[str] = None  # e.g., "openai", "kokoro", "whisper"
 
 
+@dataclass
+class LatencyStats:
+    """Rolling latency statistics for one endpoint, fed from real requests.
+    
+    For TTS the samples are time to first audio; for STT they are the time
+    taken to transcribe a recording.
+    """
+    ewma_ms: Optional[float] = None
+    count: int = 0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    last_sample_at: Optional[float] = None  # time.monotonic() of the latest sample
+    
+    def record(self, latency_ms: float, now: Optional[float] = None) -> None:
+        """Add a latency sample."""
+        if self.ewma_ms is None:
+            self.ewma_ms = latency_ms
+        else:
+            self.ewma_ms = LATENCY_EWMA_ALPHA * latency_ms + (1 - LATENCY_EWMA_ALPHA) * self.ewma_ms
+        self.samples.append(latency_ms)
+        self.count += 1
+        self.last_sample_at = time.monotonic() if now is None else now
+    
+    def record_censored(self, elapsed_ms: float, now: Optional[float] = None) -> None:
+        """Add a lower bound: a request cancelled after ``elapsed_ms`` without an answer.
+        
+        Only moves the EWMA up, when the bound exceeds it; the percentile
+        window keeps completed requests only.
+        """
+        if self.ewma_ms is None:
+            self.ewma_ms = elapsed_ms
+        elif elapsed_ms > self.ewma_ms:
+            self.ewma_ms = LATENCY_EWMA_ALPHA * elapsed_ms + (1 - LATENCY_EWMA_ALPHA) * self.ewma_ms
+        self.last_sample_at = time.monotonic() if now is None else now
+    
+    def score(self, now: Optional[float] = None) -> Optional[float]:
+        """EWMA decayed towards zero (unmeasured) by the time since the last sample."""
+        if self.ewma_ms is None:
+            return None
+        age = (time.monotonic() if now is None else now) - (self.last_sample_at or 0.0)
+        return self.ewma_ms * 0.5 ** (max(0.0, age) / LATENCY_HALF_LIFE_S)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile (0-100) over the recent window."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary suitable for display."""
+        return {
+            "ewma_ms": self.ewma_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "samples": self.count
+        }
+
+
 class ProviderRegistry:
     """Manages discovery and selection of voice service providers."""
     
@@ -65,8 +146,22 @@ class ProviderRegistry:
             "tts": {},
             "stt": {}
         }
+        # Kept apart from EndpointInfo so it survives health refreshes
+        self.latency: Dict[str, Dict[str, LatencyStats]] = {
+            "tts": {},
+            "stt": {}
+        }
+        self.breakers: Dict[str, Dict[str, CircuitBreaker]] = {
+            "tts": {},
+            "stt": {}
+        }
+        # PCM sample rates announced by TTS endpoints in their responses
+        self.pcm_sample_rates: Dict[str, int] = {}
         self._discovery_lock = asyncio.Lock()
         self._initialized = False
+        self._probe_task: Optional[asyncio.Task] = None
+        # Set when a breaker trips while the probe task sleeps, so it re-plans
+        self._probe_wakeup: Optional[asyncio.Event] = None
     
     async def initialize(self):
         """Initialize the registry by assuming all configured endpoints are healthy."""
@@ -245,18 +340,82 @@ class ProviderRegistry:
         # Re-discover the endpoint
         await self._discover_endpoint(service_type, base_url)
         
-        # Return health status
+        # An explicit check overrides the breaker either way
         endpoint_info = self.registry[service_type].get(base_url)
-        return endpoint_info.healthy if endpoint_info else False
+        healthy = endpoint_info.healthy if endpoint_info else False
+        breaker = self.get_breaker(service_type, base_url)
+        if healthy:
+            breaker.reset()
+        else:
+            breaker.trip()
+            self._ensure_probe_task()
+        return healthy
+    
+    def record_latency(self, service_type: str, base_url: str, latency_ms: float) -> None:
+        """Record the latency of a completed request to an endpoint."""
+        stats = self.latency[service_type].setdefault(base_url, LatencyStats())
+        stats.record(latency_ms)
+        logger.debug(f"{service_type} latency for {base_url}: {latency_ms:.0f}ms (EWMA {stats.ewma_ms:.0f}ms)")
+    
+    def record_censored_latency(self, service_type: str, base_url: str, elapsed_ms: float) -> None:
+        """Record a request that was cancelled (e.g. a hedge loser) after ``elapsed_ms``."""
+        stats = self.latency[service_type].setdefault(base_url, LatencyStats())
+        stats.record_censored(elapsed_ms)
+        logger.debug(f"{service_type} request to {base_url} cancelled after {elapsed_ms:.0f}ms "
+                     f"(EWMA {stats.ewma_ms:.0f}ms)")
+    
+    def get_latency(self, service_type: str, base_url: str) -> Optional[LatencyStats]:
+        """Get the latency statistics for an endpoint, if any requests were recorded."""
+        return self.latency[service_type].get(base_url)
+    
+    def get_pcm_sample_rate(self, base_url: str) -> int:
+        """Sample rate of raw PCM from a TTS endpoint.
+        
+        Configured rates (VOICEMODE_TTS_PCM_SAMPLE_RATES) come first, then the
+        rate the endpoint announced in a response, then the known rate for the
+        provider type, then SAMPLE_RATE.
+        """
+        if base_url in TTS_PCM_SAMPLE_RATES:
+            return TTS_PCM_SAMPLE_RATES[base_url]
+        if base_url in self.pcm_sample_rates:
+            return self.pcm_sample_rates[base_url]
+        return KNOWN_PCM_SAMPLE_RATES.get(detect_provider_type(base_url), SAMPLE_RATE)
+    
+    def set_pcm_sample_rate(self, base_url: str, sample_rate: int) -> None:
+        """Remember the PCM sample rate a TTS endpoint announced."""
+        if self.pcm_sample_rates.get(base_url) != sample_rate:
+            logger.info(f"TTS endpoint {base_url} produces {sample_rate}Hz PCM")
+        self.pcm_sample_rates[base_url] = sample_rate
+    
+    def rank_endpoints(self, service_type: str, base_urls: List[str]) -> List[str]:
+        """Order endpoint URLs according to the selection policy.
+        
+        With the 'ordered' policy the configured order is kept. With 'fastest',
+        endpoints are sorted by their latency EWMA; endpoints without samples
+        come first (in configured order) so that each gets measured. The EWMA
+        of an endpoint that is not being used decays (``LATENCY_HALF_LIFE_S``),
+        so one that was slow once is eventually measured again.
+        """
+        if ENDPOINT_SELECTION != "fastest":
+            return list(base_urls)
+        
+        now = time.monotonic()
+        
+        def sort_key(url: str) -> float:
+            stats = self.latency[service_type].get(url)
+            score = stats.score(now) if stats else None
+            return score if score is not None else -1.0
+        
+        # sorted() is stable, so ties keep the configured order
+        return sorted(base_urls, key=sort_key)
     
     def get_healthy_endpoints(self, service_type: str) -> List[EndpointInfo]:
-        """Get all healthy endpoints for a service type."""
+        """Get all healthy endpoints for a service type, in selection policy order."""
         endpoints = []
         
-        # Return endpoints in the order they were configured
         base_urls = TTS_BASE_URLS if service_type == "tts" else STT_BASE_URLS
         
-        for url in base_urls:
+        for url in self.rank_endpoints(service_type, base_urls):
             info = self.registry[service_type].get(url)
             if info and info.healthy:
                 endpoints.append(info)
@@ -286,6 +445,9 @@ class ProviderRegistry:
                     "models": info.models,
                     "voices": info.voices,
                     "response_time_ms": info.response_time_ms,
+                    "latency": self.latency["tts"][url].to_dict() if url in self.latency["tts"] else None,
+                    "pcm_sample_rate": self.get_pcm_sample_rate(url),
+                    "circuit": self.get_breaker("tts", url).to_dict(),
                     "last_check": info.last_health_check,
                     "error": info.error
                 }
@@ -296,6 +458,8 @@ class ProviderRegistry:
                     "healthy": info.healthy,
                     "models": info.models,
                     "response_time_ms": info.response_time_ms,
+                    "latency": self.latency["stt"][url].to_dict() if url in self.latency["stt"] else None,
+                    "circuit": self.get_breaker("stt", url).to_dict(),
                     "last_check": info.last_health_check,
                     "error": info.error
                 }
@@ -303,14 +467,116 @@ class ProviderRegistry:
             }
         }
     
+    def get_breaker(self, service_type: str, base_url: str) -> CircuitBreaker:
+        """Get the circuit breaker for an endpoint, creating it on first use."""
+        return self.breakers[service_type].setdefault(base_url, CircuitBreaker())
+    
+    def record_success(self, service_type: str, base_url: str) -> None:
+        """Record a successful request, closing the endpoint's breaker if it was half-open."""
+        if self.get_breaker(service_type, base_url).record_success():
+            info = self.registry[service_type].get(base_url)
+            if info:
+                info.healthy = True
+                info.error = None
+            logger.info(f"Circuit closed for {service_type} endpoint {base_url}")
+    
     async def mark_unhealthy(self, service_type: str, base_url: str, error: str):
-        """Mark an endpoint as unhealthy after a failure."""
+        """Record a failed request, taking the endpoint out of rotation if its breaker opens."""
+        breaker = self.get_breaker(service_type, base_url)
+        opened = breaker.record_failure()
+        
         if base_url in self.registry[service_type]:
-            self.registry[service_type][base_url].healthy = False
-            self.registry[service_type][base_url].error = error
-            self.registry[service_type][base_url].last_health_check = datetime.now(timezone.utc).isoformat()
-            logger.warning(f"Marked {service_type} endpoint {base_url} as unhealthy: {error}")
+            info = self.registry[service_type][base_url]
+            info.error = error
+            info.last_health_check = datetime.now(timezone.utc).isoformat()
+            if not breaker.available:
+                info.healthy = False
+        
+        if opened:
+            logger.warning(f"Circuit opened for {service_type} endpoint {base_url}: {error} "
+                           f"(retry in {breaker.backoff:.0f}s)")
+            self._ensure_probe_task()
+        else:
+            logger.warning(f"{service_type} endpoint {base_url} failed "
+                           f"({breaker.consecutive_failures} consecutive): {error}")
+    
+    async def _probe(self, base_url: str) -> bool:
+        """Cheaply check whether an endpoint is accepting requests again.
+        
+        Any HTTP response below 500 (including 401/404 from endpoints that need
+        auth or don't implement /models) means the server is up.
+        """
+        headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"} if OPENAI_API_KEY else {}
+        try:
+            async with httpx.AsyncClient(timeout=PROBE_TIMEOUT) as http_client:
+                response = await http_client.get(f"{base_url.rstrip('/')}/models", headers=headers)
+            return response.status_code < 500
+        except Exception as e:
+            logger.debug(f"Probe of {base_url} failed: {e}")
+            return False
+    
+    async def _probe_open_endpoints(self) -> None:
+        """Probe open endpoints as their backoff expires until none remain open."""
+        while True:
+            open_breakers = [
+                (service_type, url, breaker)
+                for service_type, breakers in self.breakers.items()
+                for url, breaker in breakers.items()
+                if not breaker.available
+            ]
+            if not open_breakers:
+                return
+            
+            now = time.monotonic()
+            due = [entry for entry in open_breakers if entry[2].probe_due(now)]
+            if not due:
+                # Sleep until the first backoff expires, or until another breaker trips
+                self._probe_wakeup.clear()
+                delay = min(breaker.retry_at for _, _, breaker in open_breakers) - now
+                try:
+                    await asyncio.wait_for(self._probe_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            results = await asyncio.gather(*(self._probe(url) for _, url, _ in due))
+            for (service_type, url, breaker), alive in zip(due, results):
+                if breaker.available:
+                    continue  # Reset by a manual health check while probing
+                if alive:
+                    breaker.half_open()
+                    info = self.registry[service_type].get(url)
+                    if info:
+                        info.healthy = True
+                        info.last_health_check = datetime.now(timezone.utc).isoformat()
+                    logger.info(f"Probe succeeded, {service_type} endpoint {url} is back in rotation (half-open)")
+                else:
+                    breaker.trip()
+                    logger.debug(f"Probe of {service_type} endpoint {url} failed, retry in {breaker.backoff:.0f}s")
+    
+    def _ensure_probe_task(self) -> None:
+        """Start the background probe task, or wake it to pick up a newly opened breaker."""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_wakeup = asyncio.Event()
+            self._probe_task = asyncio.create_task(self._probe_open_endpoints())
+        else:
+            self._probe_wakeup.set()
+    
+    async def aclose(self) -> None:
+        """Stop background probing."""
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
 
 
 # Global registry instance
 provider_registry = ProviderRegistry()
+
+
+def rank_endpoints(service_type: str, base_urls: List[str]) -> List[str]:
+    """Order endpoint URLs according to the selection policy using the global registry."""
+    return provider_registry.rank_endpoints(service_type, base_urls)
@@ -10,7 +10,8 @@ from typing import Dict, Optional, List, Any, Tuple
 from openai import AsyncOpenAI
 
 from .config import TTS_VOICES, TTS_MODELS, TTS_BASE_URLS, OPENAI_API_KEY
-from .provider_discovery import provider_registry, EndpointInfo
+from .provider_discovery import provider_registry, rank_endpoints, EndpointInfo
+from .client_pool import get_client
 from .voice_preferences import get_preferred_voices
 
 logger = logging.getLogger("voice-mode")
@@ -56,10 +57,7 @@ async def get_tts_client_and_voice(
         selected_voice = voice or _select_voice_for_endpoint(endpoint_info)
         selected_model = model or _select_model_for_endpoint(endpoint_info)
         
-        client = AsyncOpenAI(
-            api_key=OPENAI_API_KEY or "dummy-key-for-local",
-            base_url=base_url
-        )
+        client = await get_client(base_url, OPENAI_API_KEY or "dummy-key-for-local")
         
         logger.info(f"  • Selected endpoint: {base_url}")
         logger.info(f"  • Selected voice: {selected_voice}")
@@ -82,7 +80,7 @@ async def get_tts_client_and_voice(
     # If specific voice is requested, find an endpoint that supports it
     if voice:
         logger.info(f"  Specific voice requested: {voice}")
-        for url in TTS_BASE_URLS:
+        for url in rank_endpoints("tts", TTS_BASE_URLS):
             endpoint_info = provider_registry.registry["tts"].get(url)
             if not endpoint_info or not endpoint_info.healthy:
                 continue
@@ -92,7 +90,7 @@ async def get_tts_client_and_voice(
                 selected_model = _select_model_for_endpoint(endpoint_info, model)
                 
                 api_key = OPENAI_API_KEY if endpoint_info.provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
-                client = AsyncOpenAI(api_key=api_key, base_url=url)
+                client = await get_client(url, api_key)
                 
                 logger.info(f"  ✓ Selected endpoint: {url} ({endpoint_info.provider_type})")
                 logger.info(f"  ✓ Selected voice: {selected_voice}")
@@ -106,7 +104,7 @@ async def get_tts_client_and_voice(
         logger.debug(f"  Looking for voice: {preferred_voice}")
         
         # Check each endpoint for this voice
-        for url in TTS_BASE_URLS:
+        for url in rank_endpoints("tts", TTS_BASE_URLS):
             endpoint_info = provider_registry.registry["tts"].get(url)
             if not endpoint_info or not endpoint_info.healthy:
                 continue
@@ -117,7 +115,7 @@ async def get_tts_client_and_voice(
                 selected_model = _select_model_for_endpoint(endpoint_info, model)
                 
                 api_key = OPENAI_API_KEY if endpoint_info.provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
-                client = AsyncOpenAI(api_key=api_key, base_url=url)
+                client = await get_client(url, api_key)
                 
                 logger.info(f"  ✓ Selected endpoint: {url} ({endpoint_info.provider_type})")
                 logger.info(f"  ✓ Selected voice: {selected_voice}")
@@ -127,7 +125,7 @@ async def get_tts_client_and_voice(
     
     # No preferred voices found - fall back to any available endpoint
     logger.warning("  No preferred voices available, using any available endpoint...")
-    for url in TTS_BASE_URLS:
+    for url in rank_endpoints("tts", TTS_BASE_URLS):
         endpoint_info = provider_registry.registry["tts"].get(url)
         if not endpoint_info or not endpoint_info.healthy:
             continue
@@ -137,7 +135,7 @@ async def get_tts_client_and_voice(
             selected_model = _select_model_for_endpoint(endpoint_info, model)
             
             api_key = OPENAI_API_KEY if endpoint_info.provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
-            client = AsyncOpenAI(api_key=api_key, base_url=url)
+            client = await get_client(url, api_key)
             
             logger.info(f"  ✓ Selected endpoint: {url} ({endpoint_info.provider_type})")
             logger.info(f"  ✓ Selected voice: {selected_voice}")
@@ -177,10 +175,7 @@ async def get_stt_client(
         
         selected_model = model or "whisper-1"  # Default STT model
         
-        client = AsyncOpenAI(
-            api_key=OPENAI_API_KEY or "dummy-key-for-local",
-            base_url=base_url
-        )
+        client = await get_client(base_url, OPENAI_API_KEY or "dummy-key-for-local")
         
         return client, selected_model, endpoint_info
     
@@ -193,10 +188,7 @@ async def get_stt_client(
     selected_model = model or "whisper-1"
     
     api_key = OPENAI_API_KEY if endpoint_info.provider_type == "openai" else (OPENAI_API_KEY or "dummy-key-for-local")
-    client = AsyncOpenAI(
-        api_key=api_key,
-        base_url=endpoint_info.base_url
-    )
+    client = await get_client(endpoint_info.base_url, api_key)
     
     return client, selected_model, endpoint_info
 
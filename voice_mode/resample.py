@@ -0,0 +1,145 @@
+"""
+Streaming polyphase resampling for voice-mode.
+
+Converts between sample rates by a rational factor ``up / down`` with a
+windowed-sinc low-pass filter split into ``up`` phases. Each output sample
+only touches the filter taps of its own phase, and whole blocks are computed
+with a single vectorized gather and multiply. The resampler keeps the tail of
+the previous block as history, so audio can be processed chunk by chunk (as
+it arrives from the microphone) without discontinuities at chunk edges.
+"""
+
+from math import gcd
+
+import numpy as np
+
+# Filter taps per polyphase branch; higher is sharper but slower
+DEFAULT_TAPS_PER_PHASE = 32
+
+
+def design_lowpass(up: int, down: int, taps_per_phase: int = DEFAULT_TAPS_PER_PHASE) -> np.ndarray:
+    """Design the anti-aliasing/anti-imaging filter for an ``up / down`` resampler.
+
+    Args:
+        up: Interpolation factor
+        down: Decimation factor
+        taps_per_phase: Filter length per polyphase branch
+
+    Returns:
+        float64 filter of length ``up * taps_per_phase``, with gain ``up``
+    """
+    length = up * taps_per_phase
+    # Cut off at the lower of the two Nyquist frequencies, relative to the upsampled rate
+    cutoff = 0.5 / max(up, down)
+    n = np.arange(length) - (length - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, 8.0)
+    return taps * (up / taps.sum())
+
+
+class PolyphaseResampler:
+    """Stateful rational-factor resampler for mono audio blocks."""
+
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = DEFAULT_TAPS_PER_PHASE):
+        """Create a resampler.
+
+        Args:
+            in_rate: Input sample rate in Hz
+            out_rate: Output sample rate in Hz
+            taps_per_phase: Filter length per polyphase branch
+        """
+        divisor = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+
+        taps = design_lowpass(self.up, self.down, taps_per_phase)
+        # phases[p, q] multiplies input sample (m0 - q) for outputs in phase p
+        self.phases = taps.reshape(taps_per_phase, self.up).T.copy()
+        self.taps_per_phase = taps_per_phase
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all history, as if starting a new stream."""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float64)
+        self._consumed = 0  # Input samples seen so far
+        self._next_t = 0  # Next output position, in upsampled samples
+
+    def skip_group_delay(self) -> None:
+        """Start the output at the filter's group delay (call before the first block).
+
+        Output sample ``k`` then lines up with input time ``k * in_rate / out_rate``
+        instead of lagging it by half the filter length; the last outputs need
+        ``taps_per_phase`` samples of padding after the input to be produced.
+        """
+        self._next_t = (self.up * self.taps_per_phase - 1) // 2
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample the next block of a stream.
+
+        Args:
+            samples: Mono samples (any numeric dtype; int16 is treated as PCM)
+
+        Returns:
+            float32 resampled block, in the input's units. Its length varies by
+            at most one sample from ``len(samples) * out_rate / in_rate``.
+        """
+        samples = np.asarray(samples, dtype=np.float64).reshape(-1)
+        history_len = len(self._history)
+        buffer = np.concatenate((self._history, samples))
+        total = self._consumed + len(samples)
+
+        # Outputs whose newest input sample (t // up) is already available
+        t_end = total * self.up
+        count = max(0, -(-(t_end - self._next_t) // self.down))
+        t = self._next_t + self.down * np.arange(count)
+        newest = t // self.up
+        phase = t % self.up
+
+        # Gather the taps_per_phase most recent inputs for each output
+        base = newest - self._consumed + history_len
+        window = buffer[base[:, None] - np.arange(self.taps_per_phase)[None, :]]
+        out = np.einsum('kq,kq->k', window, self.phases[phase])
+
+        self._next_t += count * self.down
+        self._consumed = total
+        self._history = buffer[-history_len:] if history_len else buffer[:0]
+        return out.astype(np.float32)
+
+    def process_int16(self, samples: np.ndarray) -> np.ndarray:
+        """Resample an int16 block, returning int16 with clipping."""
+        return np.clip(np.rint(self.process(samples)), -32768, 32767).astype(np.int16)
+
+    def flush_int16(self) -> np.ndarray:
+        """End the stream: return the output still held back by the filter delay."""
+        tail = self.process_int16(np.zeros(self.taps_per_phase // 2, dtype=np.int16))
+        self.reset()
+        return tail
+
+
+def resample(samples: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """Resample a complete signal.
+
+    Args:
+        samples: Mono samples, or ``(frames, channels)``
+        in_rate: Input sample rate in Hz
+        out_rate: Output sample rate in Hz
+
+    Returns:
+        Resampled samples with the input's dtype (int16 is clipped), aligned
+        with the input and ``ceil(len * out_rate / in_rate)`` frames long
+    """
+    if in_rate == out_rate:
+        return samples
+    if np.ndim(samples) > 1:
+        return np.column_stack([resample(channel, in_rate, out_rate) for channel in np.asarray(samples).T])
+    samples = np.asarray(samples).reshape(-1)
+    resampler = PolyphaseResampler(in_rate, out_rate)
+    resampler.skip_group_delay()
+    length = -(-len(samples) * out_rate // in_rate)
+    # Zeros after the end flush the filter, so the last input samples are not lost
+    padded = np.concatenate((samples, np.zeros(resampler.taps_per_phase, dtype=samples.dtype)))
+    if samples.dtype == np.int16:
+        return resampler.process_int16(padded)[:length]
+    return resampler.process(padded)[:length].astype(samples.dtype, copy=False)
@@ -6,10 +6,11 @@ by playing audio chunks as they arrive from the TTS service.
 """
 
 import asyncio
+import contextlib
 import io
 import logging
+import re
 import time
-import queue
 import threading
 from typing import Optional, Tuple, AsyncIterator
 from dataclasses import dataclass
@@ -26,7 +27,12 @@ from .config import (
     SAMPLE_RATE,
     logger
 )
-from .utils import get_event_logger
+from .audio_buffer import AudioRingBuffer
+from .audio_decoder import FFmpegStreamDecoder, StreamDecoderError
+from .audio_output import get_output_service, get_output_rate
+from .resample import PolyphaseResampler
+from .barge_in import write_output
+from .utils import get_event_logger, log_tts_audio_timing
 
 # Opus decoder support (optional)
 try:
@@ -39,14 +45,89 @@ except ImportError:
 
 @dataclass
 class StreamMetrics:
-    """Metrics for streaming playback performance."""
-    ttfa: float = 0.0  # Time to first audio
-    generation_time: float = 0.0
-    playback_time: float = 0.0
-    buffer_underruns: int = 0
+    """Metrics for streaming playback performance.
+    
+    Durations are seconds from the start of the request. ``audio_start`` and
+    ``audio_end`` are ``time.perf_counter()`` values taken from the output
+    stream's DAC timestamps.
+    """
+    ttfa: float = 0.0  # Time to first audio (audible, when DAC timing is available)
+    first_chunk: float = 0.0  # Time to the first chunk from the server
+    generation_time: float = 0.0  # Time until the whole response was received
+    playback_time: float = 0.0  # Time until the last sample was played
+    audio_start: Optional[float] = None  # First sample reached the DAC
+    audio_end: Optional[float] = None  # Last sample left the DAC
+    output_latency: float = 0.0  # From the first write until it reached the DAC
+    sample_rate: int = SAMPLE_RATE  # Rate of the received PCM (and of ``pcm``)
+    buffer_underruns: int = 0  # Silent frames inserted while playing
+    buffer_overruns: int = 0  # Times a decoded block had to wait for buffer space
     chunks_received: int = 0
     chunks_played: int = 0
     audio_path: Optional[str] = None  # Path to saved audio file
+    pcm: Optional[np.ndarray] = None  # Decoded int16 audio, when capture was requested
+    interrupted: bool = False  # Playback was stopped early by barge-in
+
+
+def record_output_timing(metrics: StreamMetrics, session, start_time: float) -> None:
+    """Fill in DAC-based timing from a drained output session and log it.
+    
+    Args:
+        metrics: Metrics to update
+        session: The ``OutputSession`` the audio was played on
+        start_time: ``time.perf_counter()`` when the request started
+    """
+    metrics.audio_start = session.started_at
+    metrics.audio_end = session.finished_at
+    metrics.output_latency = session.output_latency or 0.0
+    metrics.buffer_underruns = session.underrun_frames
+    if session.started_at is not None:
+        metrics.ttfa = session.started_at - start_time
+    if session.finished_at is not None:
+        metrics.playback_time = session.finished_at - start_time
+    log_tts_audio_timing(session.started_at, session.finished_at)
+
+
+def parse_pcm_sample_rate(headers) -> Optional[int]:
+    """Sample rate announced by a TTS response, if any.
+    
+    Looks for a ``rate``/``samplerate`` parameter in the Content-Type (e.g.
+    ``audio/pcm;rate=22050`` or ``audio/L16; rate=16000``) and for an
+    ``X-Sample-Rate`` header.
+    """
+    try:
+        explicit = headers.get("x-sample-rate")
+        if explicit and str(explicit).strip().isdigit():
+            return int(explicit)
+        match = re.search(r"(?:^|;)\s*(?:rate|samplerate|sample_rate)\s*=\s*(\d+)",
+                          str(headers.get("content-type") or ""), re.IGNORECASE)
+        return int(match.group(1)) if match else None
+    except Exception:
+        return None
+
+
+async def iter_speech_chunks(openai_client, request_params: dict,
+                             stream_info: Optional[dict] = None) -> AsyncIterator[bytes]:
+    """Request speech and yield the encoded response body as it arrives.
+    
+    Args:
+        openai_client: OpenAI client instance
+        request_params: Parameters for the TTS request
+        stream_info: Filled with ``sample_rate`` if the response announces one
+        
+    Yields:
+        Non-empty chunks of encoded audio
+    """
+    # Don't add stream parameter - Kokoro defaults to true, OpenAI doesn't support it
+    async with openai_client.audio.speech.with_streaming_response.create(
+        **request_params
+    ) as response:
+        if stream_info is not None:
+            sample_rate = parse_pcm_sample_rate(getattr(response, "headers", None) or {})
+            if sample_rate:
+                stream_info["sample_rate"] = sample_rate
+        async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+            if chunk:
+                yield chunk
 
 
 class AudioStreamPlayer:
@@ -59,7 +140,7 @@ class AudioStreamPlayer:
         self.metrics = StreamMetrics()
         
         # Buffering
-        self.audio_queue = queue.Queue(maxsize=int(STREAM_MAX_BUFFER * sample_rate))
+        self.ring_buffer = AudioRingBuffer(int(STREAM_MAX_BUFFER * sample_rate), dtype=np.float32)
         self.min_buffer_samples = int((STREAM_BUFFER_MS / 1000.0) * sample_rate)
         
         # State
@@ -96,19 +177,16 @@ class AudioStreamPlayer:
             logger.debug(f"Sounddevice status: {status}")
             
         try:
-            # Fill output buffer from queue
-            for i in range(frames):
-                try:
-                    sample = self.audio_queue.get_nowait()
-                    outdata[i] = sample
-                except queue.Empty:
-                    # Buffer underrun
-                    outdata[i] = 0
-                    if self.playing:
-                        self.metrics.buffer_underruns += 1
-                        
+            # Slice-copy a whole block from the ring buffer
+            copied = self.ring_buffer.read_into(outdata[:, 0] if outdata.ndim > 1 else outdata)
+            if outdata.ndim > 1 and self.channels > 1:
+                outdata[:, 1:] = outdata[:, :1]
+            
             # Track playback progress
             if self.playing:
+                if copied < frames:
+                    # Buffer underrun
+                    self.metrics.buffer_underruns += frames - copied
                 self.metrics.chunks_played += 1
                 
         except Exception as e:
@@ -150,7 +228,7 @@ class AudioStreamPlayer:
                 await self._queue_samples(samples)
                 
                 # Check if we should start playback
-                if not self.playback_started and self.audio_queue.qsize() >= self.min_buffer_samples:
+                if not self.playback_started and self.ring_buffer.available >= self.min_buffer_samples:
                     self.playback_started = True
                     self.playing = True
                     self.metrics.ttfa = time.perf_counter() - self.start_time
@@ -203,17 +281,21 @@ class AudioStreamPlayer:
         return None
     
     async def _queue_samples(self, samples: np.ndarray):
-        """Add samples to the playback queue."""
-        for sample in samples:
-            try:
-                self.audio_queue.put_nowait(sample)
-            except queue.Full:
-                # Buffer overflow - drop oldest samples
-                try:
-                    self.audio_queue.get_nowait()
-                    self.audio_queue.put_nowait(sample)
-                except queue.Empty:
-                    pass
+        """Add a decoded block of samples to the ring buffer."""
+        samples = np.asarray(samples, dtype=np.float32)
+        written = self.ring_buffer.write(samples)
+        if written == len(samples):
+            return
+        
+        # Buffer full - record the overrun and wait for the callback to drain
+        # rather than dropping audio, as long as the stream is consuming
+        self.metrics.buffer_overruns += 1
+        while written < len(samples):
+            if not (self.stream and self.stream.active):
+                logger.debug(f"Playback buffer full, dropping {len(samples) - written} samples")
+                return
+            await asyncio.sleep(self.ring_buffer.capacity / self.sample_rate / 8)
+            written += self.ring_buffer.write(samples[written:])
     
     async def finish(self):
         """Signal that downloading is complete."""
@@ -228,7 +310,7 @@ class AudioStreamPlayer:
                 await self._queue_samples(samples)
         
         # Wait for playback to complete
-        while not self.audio_queue.empty() or self.playing:
+        while self.ring_buffer.available > 0 and self.stream and self.stream.active:
             await asyncio.sleep(0.1)
             
         self.metrics.playback_time = time.perf_counter() - self.start_time
@@ -249,57 +331,54 @@ async def stream_pcm_audio(
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    audio_chunks: Optional[AsyncIterator[bytes]] = None,
+    capture_pcm: bool = False,
+    source_rate: int = SAMPLE_RATE,
+    stream_info: Optional[dict] = None
 ) -> Tuple[bool, StreamMetrics]:
     """Stream PCM audio with true HTTP streaming for minimal latency.
     
     Uses the OpenAI SDK's streaming response with iter_bytes() for real-time playback.
+    If ``audio_chunks`` is given (e.g. an already-started hedged request), it is
+    played instead of making a new request. With ``capture_pcm`` the received
+    samples are returned in ``metrics.pcm``.
+    
+    The PCM is assumed to be at ``source_rate`` unless the response announces
+    its rate (recorded in ``stream_info``); it is resampled block by block if
+    that differs from the output rate.
     """
     metrics = StreamMetrics()
     start_time = time.perf_counter()
     stream = None
     first_chunk_time = None
     save_buffer = io.BytesIO() if save_audio else None
+    pcm_buffer = bytearray() if capture_pcm else None
+    stream_info = {} if stream_info is None else stream_info
+    resampler = None
+    odd_byte = b''
     
     try:
-        # Setup sounddevice stream for PCM playback
-        # PCM parameters: 16-bit, mono, 24kHz (standard for TTS)
-        audio_started = False
-        audio_start_time = None
-        
-        def audio_callback(outdata, frames, time_info, status):
-            """Callback to track when audio actually starts playing."""
-            nonlocal audio_started, audio_start_time
-            if not audio_started and frames > 0:
-                audio_started = True
-                audio_start_time = time.perf_counter()
-        
-        stream = sd.OutputStream(
-            samplerate=SAMPLE_RATE,  # Standard TTS sample rate (24kHz)
-            channels=1,
-            dtype='int16'  # PCM is 16-bit integers
-            # Note: Can't use callback and write() together
-        )
-        stream.start()
+        # PCM is 16-bit mono; the output runs at the device's rate
+        output_rate = get_output_rate()
+        stream = get_output_service(output_rate).open_session()
         
         # Log TTS playback start when we start the stream
         event_logger = get_event_logger()
         if event_logger:
             event_logger.log_event(event_logger.TTS_PLAYBACK_START)
         
-        # Don't add stream parameter - Kokoro defaults to true, OpenAI doesn't support it
-        
         logger.info("Starting true HTTP streaming with iter_bytes()")
         
         # Use the streaming response API
-        async with openai_client.audio.speech.with_streaming_response.create(
-            **request_params
-        ) as response:
+        if audio_chunks is None:
+            audio_chunks = iter_speech_chunks(openai_client, request_params, stream_info)
+        async with contextlib.aclosing(audio_chunks):
             chunk_count = 0
             bytes_received = 0
             
             # Stream chunks as they arrive
-            async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+            async for chunk in audio_chunks:
                 if chunk:
                     # Track first chunk received
                     if first_chunk_time is None:
@@ -311,17 +390,34 @@ async def stream_pcm_audio(
                         event_logger = get_event_logger()
                         if event_logger:
                             event_logger.log_event(event_logger.TTS_FIRST_AUDIO)
+                        
+                        # The response headers are in by now
+                        metrics.sample_rate = stream_info.get("sample_rate") or source_rate
+                        if metrics.sample_rate != output_rate:
+                            logger.info(f"Resampling {metrics.sample_rate}Hz PCM to {output_rate}Hz")
+                            resampler = PolyphaseResampler(metrics.sample_rate, output_rate)
                     
-                    # Convert bytes to numpy array for sounddevice
-                    # PCM data is already in the right format
-                    audio_array = np.frombuffer(chunk, dtype=np.int16)
+                    # Convert bytes to samples, carrying an odd trailing byte to the next chunk
+                    data = odd_byte + chunk
+                    usable = len(data) - (len(data) % 2)
+                    odd_byte = data[usable:]
+                    audio_array = np.frombuffer(data, dtype='<i2', count=usable // 2)
+                    if resampler:
+                        audio_array = resampler.process_int16(audio_array)
                     
-                    # Play the chunk immediately
-                    stream.write(audio_array)
+                    # Play the chunk immediately, unless the user has started talking;
+                    # the write blocks while audio is queued, so keep it off the event loop
+                    if not await asyncio.to_thread(write_output, stream, audio_array):
+                        logger.info("PCM streaming interrupted by the user")
+                        metrics.interrupted = True
+                        stream.abort()
+                        break
                     
                     # Save chunk if enabled
                     if save_buffer:
                         save_buffer.write(chunk)
+                    if pcm_buffer is not None:
+                        pcm_buffer += chunk
                     
                     chunk_count += 1
                     bytes_received += len(chunk)
@@ -331,31 +427,36 @@ async def stream_pcm_audio(
                     if debug and chunk_count % 10 == 0:
                         logger.debug(f"Streamed {chunk_count} chunks, {bytes_received} bytes")
         
-        # Wait for playback to finish
-        stream.stop()
+        metrics.generation_time = time.perf_counter() - start_time
+        if first_chunk_time:
+            metrics.first_chunk = first_chunk_time - start_time
+        
+        # Wait for playback to finish (drain stops early on barge-in)
+        if not metrics.interrupted:
+            if resampler:
+                await asyncio.to_thread(write_output, stream, resampler.flush_int16())
+            await asyncio.to_thread(stream.drain)
+            if stream.aborted:
+                logger.info("PCM streaming interrupted by the user")
+                metrics.interrupted = True
         
         # Log TTS playback end
         if event_logger:
             event_logger.log_event(event_logger.TTS_PLAYBACK_END)
         
-        end_time = time.perf_counter()
-        metrics.generation_time = first_chunk_time - start_time if first_chunk_time else 0
-        metrics.playback_time = end_time - start_time
-        
-        # Calculate true TTFA based on actual audio playback or chunk receipt
-        if debug and audio_start_time:
-            # Use actual playback start time when available
-            metrics.ttfa = audio_start_time - start_time
-            logger.info(f"True TTFA (audio started): {metrics.ttfa:.3f}s")
-        elif first_chunk_time:
-            # Fall back to first chunk time
-            metrics.ttfa = first_chunk_time - start_time
-            logger.info(f"TTFA (first chunk): {metrics.ttfa:.3f}s")
-        
-        logger.info(f"Streaming complete - TTFA: {metrics.ttfa:.3f}s, "
+        # TTFA from when the first sample reached the DAC, else from chunk receipt
+        metrics.ttfa = metrics.first_chunk
+        metrics.playback_time = time.perf_counter() - start_time
+        record_output_timing(metrics, stream, start_time)
+        
+        logger.info(f"Streaming complete - TTFA: {metrics.ttfa:.3f}s "
+                   f"(first chunk {metrics.first_chunk:.3f}s, output latency {metrics.output_latency * 1000:.0f}ms), "
                    f"Total: {metrics.playback_time:.3f}s, "
                    f"Chunks: {metrics.chunks_received}")
         
+        if pcm_buffer is not None:
+            metrics.pcm = np.frombuffer(pcm_buffer, dtype=np.int16, count=len(pcm_buffer) // 2)
+        
         # Save audio if enabled
         if save_audio and save_buffer and audio_dir:
             try:
@@ -371,7 +472,7 @@ async def stream_pcm_audio(
                         with wave.open(tmp_wav.name, 'wb') as wav_file:
                             wav_file.setnchannels(1)
                             wav_file.setsampwidth(2)  # 16-bit
-                            wav_file.setframerate(SAMPLE_RATE)
+                            wav_file.setframerate(metrics.sample_rate)
                             wav_file.writeframes(audio_data)
                         # Read back the WAV file
                         with open(tmp_wav.name, 'rb') as f:
@@ -404,7 +505,11 @@ async def stream_tts_audio(
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    audio_chunks: Optional[AsyncIterator[bytes]] = None,
+    capture_pcm: bool = False,
+    source_rate: int = SAMPLE_RATE,
+    stream_info: Optional[dict] = None
 ) -> Tuple[bool, StreamMetrics]:
     """Stream TTS audio with progressive playback.
     
@@ -413,6 +518,10 @@ async def stream_tts_audio(
         openai_client: OpenAI client instance
         request_params: Parameters for TTS request
         debug: Enable debug logging
+        audio_chunks: Already-started response body to play instead of making a request
+        capture_pcm: Return the decoded samples in ``metrics.pcm`` (e.g. for caching)
+        source_rate: Expected sample rate of raw PCM from this endpoint
+        stream_info: Response details (``sample_rate``) filled in by the request
         
     Returns:
         Tuple of (success, metrics)
@@ -430,7 +539,11 @@ async def stream_tts_audio(
             debug=debug,
             save_audio=save_audio,
             audio_dir=audio_dir,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            audio_chunks=audio_chunks,
+            capture_pcm=capture_pcm,
+            source_rate=source_rate,
+            stream_info=stream_info
         )
     else:
         # Use buffered streaming for formats that need decoding
@@ -441,114 +554,129 @@ async def stream_tts_audio(
             debug=debug,
             save_audio=save_audio,
             audio_dir=audio_dir,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            audio_chunks=audio_chunks,
+            capture_pcm=capture_pcm
         )
 
 
-# Fallback for complex formats - buffer and decode complete file
+# Compressed formats - decode incrementally through a persistent ffmpeg pipe
 async def stream_with_buffering(
     text: str,
     openai_client,
     request_params: dict,
-    sample_rate: int = 24000,  # TTS standard sample rate
+    sample_rate: Optional[int] = None,  # Decode straight to the output rate by default
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    audio_chunks: Optional[AsyncIterator[bytes]] = None,
+    capture_pcm: bool = False
 ) -> Tuple[bool, StreamMetrics]:
-    """Fallback streaming that buffers enough data to decode reliably.
+    """Progressive playback for formats that need decoding (MP3, Opus, etc).
     
-    This is used for formats like MP3, Opus, etc where frame boundaries are critical.
-    For Opus, we download the complete audio before playing.
+    Encoded chunks are fed to a single long-lived ffmpeg process as they arrive
+    and PCM blocks are written to the output stream as soon as ffmpeg emits
+    them, so playback starts after the first complete frames. ffmpeg also
+    resamples to the output rate. If
+    ``audio_chunks`` is given it is played instead of making a new request.
+    With ``capture_pcm`` the decoded samples are returned in ``metrics.pcm``.
     """
     format = request_params.get('response_format', 'pcm')
-    logger.info(f"Using buffered streaming for format: {format}")
+    logger.info(f"Using incremental decoding for format: {format}")
     
     metrics = StreamMetrics()
     start_time = time.perf_counter()
+    if sample_rate is None:
+        sample_rate = get_output_rate()
+    metrics.sample_rate = sample_rate
     
-    # Buffer for accumulating chunks
-    buffer = io.BytesIO()
-    # Separate buffer for saving complete audio
+    # Buffer for saving complete audio
     save_buffer = io.BytesIO() if save_audio else None
-    audio_started = False
     stream = None
+    decoder = FFmpegStreamDecoder(format, sample_rate=sample_rate)
+    feeder = None
+    decoded = False  # ffmpeg's output was read to the end
+    pcm_blocks = [] if capture_pcm else None
     
-    try:
-        # Setup sounddevice stream
-        stream = sd.OutputStream(
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32'
-        )
-        stream.start()
-        
-        # Don't add stream parameter - Kokoro defaults to true, OpenAI doesn't support it
-        
-        # Use the streaming response API for true HTTP streaming
-        async with openai_client.audio.speech.with_streaming_response.create(
-            **request_params
-        ) as response:
-            first_chunk_time = None
-            
-            # Stream chunks as they arrive
-            async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
-                if chunk:
-                    # Track first chunk for TTFA
-                    if first_chunk_time is None:
-                        first_chunk_time = time.perf_counter()
-                        metrics.ttfa = first_chunk_time - start_time
-                        logger.info(f"First chunk received - TTFA: {metrics.ttfa:.3f}s")
+    async def feed_decoder(chunks):
+        """Pump encoded bytes from the HTTP response into ffmpeg."""
+        try:
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    if metrics.chunks_received == 0:
+                        metrics.first_chunk = time.perf_counter() - start_time
+                        logger.info(f"First chunk received after {metrics.first_chunk:.3f}s")
                     
-                    buffer.write(chunk)
                     metrics.chunks_received += 1
-                    
-                    # Also accumulate in save buffer if saving is enabled
                     if save_buffer:
                         save_buffer.write(chunk)
                     
-                    # Try to decode when we have enough data (e.g., 32KB)
-                    if buffer.tell() > 32768 and not audio_started:
-                        buffer.seek(0)
-                        try:
-                            # Attempt to decode what we have
-                            audio = AudioSegment.from_file(buffer, format=format)
-                            samples = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
-                            
-                            # Start playback
-                            metrics.ttfa = time.perf_counter() - start_time
-                            audio_started = True
-                            logger.info(f"Buffered streaming started - TTFA: {metrics.ttfa:.3f}s")
-                            
-                            # Play audio
-                            stream.write(samples)
-                            metrics.chunks_played += len(samples) // 1024
-                            
-                            # Reset buffer for next batch
-                            buffer = io.BytesIO()
-                            
-                        except Exception as e:
-                            # Not enough valid data yet
-                            buffer.seek(0, io.SEEK_END)
-        
-        # Process any remaining data
-        if buffer.tell() > 0:
-            buffer.seek(0)
-            try:
-                audio = AudioSegment.from_file(buffer, format=format)
-                samples = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
-                
-                if not audio_started:
-                    metrics.ttfa = time.perf_counter() - start_time
-                    
-                stream.write(samples)
-                metrics.chunks_played += len(samples) // 1024
-                
-            except Exception as e:
-                logger.error(f"Failed to decode final buffer: {e}")
+                    await decoder.feed(chunk)
+        finally:
+            await decoder.end_input()
+            metrics.generation_time = time.perf_counter() - start_time
+    
+    try:
+        await decoder.start()
         
-        metrics.generation_time = time.perf_counter() - start_time
-        metrics.playback_time = metrics.generation_time  # Approximate
+        # ffmpeg emits 16-bit PCM at the target rate
+        stream = get_output_service(sample_rate).open_session()
+        
+        # Use the streaming response API for true HTTP streaming.
+        # The feeder owns the response and closes it when done or cancelled.
+        if audio_chunks is None:
+            audio_chunks = iter_speech_chunks(openai_client, request_params)
+        feeder = asyncio.create_task(feed_decoder(audio_chunks))
+        event_logger = get_event_logger()
+        
+        async for samples in decoder.iter_blocks():
+            if metrics.chunks_played == 0:
+                # Replaced by the DAC time once playback has drained
+                metrics.ttfa = time.perf_counter() - start_time
+                logger.info(f"Incremental playback started after {metrics.ttfa:.3f}s")
+                if event_logger:
+                    event_logger.log_event(event_logger.TTS_PLAYBACK_START)
+            
+            # Blocking write runs off the event loop so the feeder keeps pace
+            if not await asyncio.to_thread(write_output, stream, samples):
+                logger.info("Incremental playback interrupted by the user")
+                metrics.interrupted = True
+                stream.abort()
+                break
+            metrics.chunks_played += 1
+            if pcm_blocks is not None:
+                pcm_blocks.append(samples)
+            
+            if debug and metrics.chunks_played % 10 == 0:
+                logger.debug(f"Decoded {metrics.chunks_played} blocks from {metrics.chunks_received} chunks")
+        decoded = not metrics.interrupted
+        
+        # Surface any download error (an interrupted download is cancelled in finally)
+        if not metrics.interrupted:
+            await feeder
+        
+        if metrics.chunks_played == 0 and not metrics.interrupted:
+            raise StreamDecoderError(f"No audio could be decoded from {format} stream")
+        
+        # Let the tail play out before the session is closed (stops early on barge-in)
+        if not metrics.interrupted:
+            await asyncio.to_thread(stream.drain)
+            if stream.aborted:
+                logger.info("Incremental playback interrupted by the user")
+                metrics.interrupted = True
+        
+        if event_logger:
+            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+        
+        metrics.playback_time = time.perf_counter() - start_time
+        record_output_timing(metrics, stream, start_time)
+        logger.info(f"Incremental playback complete - TTFA: {metrics.ttfa:.3f}s "
+                    f"(first chunk {metrics.first_chunk:.3f}s, output latency {metrics.output_latency * 1000:.0f}ms), "
+                    f"Total: {metrics.playback_time:.3f}s")
+        
+        if pcm_blocks is not None:
+            metrics.pcm = np.concatenate(pcm_blocks)
         
         # Save audio if enabled
         if save_audio and save_buffer and audio_dir:
@@ -559,6 +687,7 @@ async def stream_with_buffering(
                 audio_path = save_debug_file(audio_data, "tts", format, audio_dir, True, conversation_id)
                 if audio_path:
                     logger.info(f"TTS audio saved to: {audio_path}")
+                    metrics.audio_path = audio_path
             except Exception as e:
                 logger.error(f"Failed to save TTS audio: {e}")
         
@@ -569,6 +698,9 @@ async def stream_with_buffering(
         return False, metrics
         
     finally:
+        if feeder and not feeder.done():
+            feeder.cancel()
+        # After barge-in or an error nothing reads ffmpeg's output any more
+        await decoder.aclose(abort=not decoded)
         if stream:
-            stream.stop()
-            stream.close()
\ No newline at end of file
+            stream.close()
@@ -0,0 +1,98 @@
+"""
+Streaming speech-to-text for voice-mode.
+
+While the recorder is still capturing, each completed speech segment (speech
+followed by a short pause) is handed to a ``SegmentedTranscriber``, which
+starts transcribing it on the event loop immediately. When the user stops
+speaking only the final segment is still in flight, so STT latency no longer
+grows with the length of the utterance. If any segment fails to transcribe,
+``finish`` raises ``SegmentTranscriptionError`` so the caller can transcribe
+the whole recording instead of losing those words.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("voicemode")
+
+
+class SegmentTranscriptionError(RuntimeError):
+    """Raised by ``finish`` when a segment's transcription failed."""
+
+
+class SegmentedTranscriber:
+    """Transcribe speech segments concurrently with recording.
+
+    ``submit`` is called from the recording thread; transcription tasks run on
+    the event loop the transcriber was created on. Results are joined in the
+    order the segments were recorded.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], Awaitable[Optional[str]]],
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """Create a transcriber.
+
+        Args:
+            transcribe: Coroutine function converting one segment to text
+            loop: Event loop to run transcriptions on (defaults to the running loop)
+        """
+        self._transcribe = transcribe
+        self._loop = loop or asyncio.get_running_loop()
+        self._tasks: List[asyncio.Task] = []
+        self.segment_count = 0
+
+    def submit(self, segment: np.ndarray) -> None:
+        """Queue a completed segment for transcription (thread-safe).
+
+        Args:
+            segment: int16 samples of one speech segment
+        """
+        self.segment_count += 1
+        logger.debug(f"Streaming STT: submitting segment {self.segment_count} ({len(segment)} samples)")
+        self._loop.call_soon_threadsafe(self._start, segment)
+
+    def _start(self, segment: np.ndarray) -> None:
+        """Start transcribing a segment (event loop side)."""
+        self._tasks.append(self._loop.create_task(self._transcribe(segment)))
+
+    async def finish(self) -> Optional[str]:
+        """Wait for all submitted segments and join their transcriptions.
+
+        Returns:
+            Combined text, or None if no segment produced any text
+
+        Raises:
+            SegmentTranscriptionError: If any segment failed; the partial
+                text would be missing that segment's words
+        """
+        # Segments submitted just before recording ended are started by
+        # callbacks that were queued ahead of this coroutine resuming
+        await asyncio.sleep(0)
+
+        results = await asyncio.gather(*self._tasks, return_exceptions=True)
+        texts = []
+        failed = []
+        for index, result in enumerate(results, 1):
+            if isinstance(result, BaseException):
+                logger.warning(f"Streaming STT: segment {index} failed: {result}")
+                failed.append(index)
+            elif result:
+                texts.append(result.strip())
+            else:
+                logger.debug(f"Streaming STT: segment {index} returned no text")
+
+        if failed:
+            raise SegmentTranscriptionError(
+                f"Segment(s) {', '.join(map(str, failed))} of {len(results)} failed to transcribe")
+        return " ".join(texts) if texts else None
+
+    def cancel(self) -> None:
+        """Cancel any transcriptions still in flight."""
+        for task in self._tasks:
+            task.cancel()
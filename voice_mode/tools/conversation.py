@@ -5,27 +5,26 @@ import logging
 import os
 import time
 import traceback
-from typing import Optional, Literal, Tuple, Dict
+from contextlib import contextmanager
+from typing import Optional, Literal, Tuple, Dict, Callable
 from pathlib import Path
 from datetime import datetime
 
 import numpy as np
 import sounddevice as sd
-from scipy.io.wavfile import write
-from pydub import AudioSegment
 from openai import AsyncOpenAI
 import httpx
 
-# Optional webrtcvad for silence detection
-try:
-    import webrtcvad
-    VAD_AVAILABLE = True
-except ImportError as e:
-    webrtcvad = None
-    VAD_AVAILABLE = False
+# Silence detection engines (webrtcvad is optional; the energy VAD always works)
+from voice_mode.vad import create_vad, webrtcvad, WEBRTCVAD_AVAILABLE as VAD_AVAILABLE
 
 from voice_mode.server import mcp
 from voice_mode.conversation_logger import get_conversation_logger
+from voice_mode.audio_encoder import encode_wav, encode_audio_bytes, AudioEncoderError
+from voice_mode.streaming_stt import SegmentedTranscriber, SegmentTranscriptionError
+from voice_mode.audio_buffer import RecordingBuffer
+from voice_mode.capture import get_capture_stream
+from voice_mode.barge_in import BargeInMonitor
 from voice_mode.config import (
     audio_operation_lock,
     SAMPLE_RATE,
@@ -46,11 +45,17 @@ from voice_mode.config import (
     SAVE_TRANSCRIPTIONS,
     DISABLE_SILENCE_DETECTION,
     VAD_AGGRESSIVENESS,
+    VAD_ENGINE,
+    PERSISTENT_CAPTURE,
+    BARGE_IN_ENABLED,
     SILENCE_THRESHOLD_MS,
     MIN_RECORDING_DURATION,
     VAD_CHUNK_DURATION_MS,
     INITIAL_SILENCE_GRACE_PERIOD,
-    DEFAULT_LISTEN_DURATION
+    DEFAULT_LISTEN_DURATION,
+    STREAMING_STT_ENABLED,
+    STREAMING_STT_SEGMENT_PAUSE_MS,
+    STREAMING_STT_MIN_SEGMENT_S
 )
 import voice_mode.config
 from voice_mode.providers import (
@@ -68,7 +73,8 @@ from voice_mode.core import (
     save_debug_file,
     get_debug_filename,
     play_chime_start,
-    play_chime_end
+    play_chime_end,
+    chime_duration
 )
 from voice_mode.tools.statistics import track_voice_interaction
 from voice_mode.utils import (
@@ -86,9 +92,34 @@ logger = logging.getLogger("voice-mode")
 # Log silence detection config at module load time
 logger.info(f"Module loaded with DISABLE_SILENCE_DETECTION={DISABLE_SILENCE_DETECTION}")
 
+# Recording buffers are preallocated for this many seconds and grow beyond it
+RECORDING_PREALLOCATE_S = 30
+# Stop recording if the input stream delivers no audio for this long
+RECORDING_STALL_TIMEOUT_S = 2.0
+# After a barge-in, recording starts this long before the detected speech onset
+BARGE_IN_LEAD_IN_S = 0.15
+# Output latency allowance: the VAD ignores the listening chime for this much longer
+CHIME_ECHO_MARGIN_S = 0.1
+
 # Track last session end time for measuring AI thinking time
 last_session_end_time = None
 
+# Debug/audio saves running in worker threads, kept referenced until done
+_background_saves = set()
+
+
+def _log_save_result(task: asyncio.Task) -> None:
+    _background_saves.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Failed to save audio file: {task.exception()}")
+
+
+def save_debug_file_in_background(*args) -> None:
+    """Run ``save_debug_file(*args)`` in a worker thread without waiting for it."""
+    task = asyncio.create_task(asyncio.to_thread(save_debug_file, *args))
+    _background_saves.add(task)
+    task.add_done_callback(_log_save_result)
+
 # Initialize OpenAI clients - now using provider registry for endpoint discovery
 openai_clients = get_openai_clients(OPENAI_API_KEY or "dummy-key-for-local", None, None)
 
@@ -229,6 +260,80 @@ async def get_stt_config(provider: Optional[str] = None):
 
 
 
+async def get_tts_hedge_configs(
+    primary_url: str,
+    voice: Optional[str] = None,
+    model: Optional[str] = None,
+    instructions: Optional[str] = None
+) -> list:
+    """Get configs for alternative TTS endpoints to race against the primary.
+    
+    Returns:
+        List of TTS config dicts (empty unless hedging is enabled)
+    """
+    from voice_mode.provider_discovery import provider_registry
+    from voice_mode.config import TTS_BASE_URLS, TTS_HEDGE_ENABLED, TTS_HEDGE_MAX_ENDPOINTS
+    
+    configs = []
+    if not TTS_HEDGE_ENABLED:
+        return configs
+    
+    for url in provider_registry.rank_endpoints("tts", TTS_BASE_URLS):
+        if len(configs) >= TTS_HEDGE_MAX_ENDPOINTS - 1:
+            break
+        endpoint_info = provider_registry.registry["tts"].get(url)
+        if url == primary_url or not endpoint_info or not endpoint_info.healthy:
+            continue
+        # A specifically requested voice must be available on the alternative
+        if voice and voice not in endpoint_info.voices:
+            continue
+        
+        try:
+            client, selected_voice, selected_model, _ = await get_tts_client_and_voice(
+                voice=voice,
+                model=model if model in endpoint_info.models else None,
+                base_url=url
+            )
+        except ValueError as e:
+            logger.debug(f"Skipping hedge endpoint {url}: {e}")
+            continue
+        
+        configs.append({
+            'client': client,
+            'base_url': url,
+            'model': selected_model,
+            'voice': selected_voice,
+            'instructions': instructions,
+            'provider': url
+        })
+    
+    return configs
+
+
+async def _report_tts_attempts(tts_metrics: Optional[dict], tried_urls: set) -> set:
+    """Note the endpoints a TTS call contacted and record failed hedged attempts.
+    
+    Endpoints that were only configured as hedges but never started stay
+    available for sequential failover. Hedge losers that were cancelled get
+    a censored latency sample (they took at least that long), so the
+    'fastest' ranking does not only learn from winners.
+    
+    Returns:
+        Base URLs whose failure has been recorded
+    """
+    from voice_mode.provider_discovery import provider_registry
+    
+    if not tts_metrics:
+        return set()
+    tried_urls.update(tts_metrics.get('attempted_urls', ()))
+    failures = tts_metrics.get('hedge_failures', {})
+    for url, error in failures.items():
+        await provider_registry.mark_unhealthy('tts', url, error)
+    for url, elapsed_ms in tts_metrics.get('hedge_cancelled_ms', {}).items():
+        provider_registry.record_censored_latency('tts', url, elapsed_ms)
+    return set(failures)
+
+
 async def text_to_speech_with_failover(
     message: str,
     voice: Optional[str] = None,
@@ -259,9 +364,11 @@ async def text_to_speech_with_failover(
                 tts_config = await get_tts_config(initial_provider, voice, model, instructions)
                 
                 # Handle both new client object and legacy client_key
+                hedge_configs = []
                 if 'client' in tts_config:
                     openai_clients['_temp_tts'] = tts_config['client']
                     client_key = '_temp_tts'
+                    hedge_configs = await get_tts_hedge_configs(tts_config['base_url'], voice, model, instructions)
                 else:
                     client_key = tts_config.get('client_key', 'tts')
                 
@@ -282,18 +389,31 @@ async def text_to_speech_with_failover(
                     client_key=client_key,
                     instructions=tts_config.get('instructions'),
                     audio_format=audio_format,
-                    conversation_id=conversation_id
+                    conversation_id=conversation_id,
+                    hedge_configs=hedge_configs
                 )
                 
                 # Clean up temporary client
                 if '_temp_tts' in openai_clients:
                     del openai_clients['_temp_tts']
                 
+                failures_recorded = await _report_tts_attempts(tts_metrics, tried_urls)
+                if not success and tts_metrics and tts_metrics.get('unplayed_text'):
+                    # Part of the message was spoken: the next endpoint continues from there
+                    message = tts_metrics['unplayed_text']
+                
                 if success:
+                    if tts_metrics and 'hedge_winner' in tts_metrics:
+                        tts_config = next(c for c in hedge_configs if c['base_url'] == tts_metrics['hedge_winner'])
+                    if tts_metrics and not tts_metrics.get('cache_hit'):
+                        provider_registry.record_success('tts', tts_config['base_url'])
+                        if 'ttfa' in tts_metrics:
+                            provider_registry.record_latency('tts', tts_config['base_url'], tts_metrics['ttfa'] * 1000)
                     return success, tts_metrics, tts_config
                 
                 # Mark endpoint as unhealthy
-                await provider_registry.mark_unhealthy('tts', tts_config['base_url'], 'TTS request failed')
+                if tts_config['base_url'] not in failures_recorded:
+                    await provider_registry.mark_unhealthy('tts', tts_config['base_url'], 'TTS request failed')
                 
             except Exception as e:
                 last_error = str(e)
@@ -303,7 +423,7 @@ async def text_to_speech_with_failover(
     # Try remaining endpoints in order
     from voice_mode.config import TTS_BASE_URLS
     
-    for base_url in TTS_BASE_URLS:
+    for base_url in provider_registry.rank_endpoints("tts", TTS_BASE_URLS):
         if base_url in tried_urls:
             continue
             
@@ -318,9 +438,11 @@ async def text_to_speech_with_failover(
                 continue
             
             # Handle both new client object and legacy client_key
+            hedge_configs = []
             if 'client' in tts_config:
                 openai_clients['_temp_tts'] = tts_config['client']
                 client_key = '_temp_tts'
+                hedge_configs = await get_tts_hedge_configs(tts_config['base_url'], voice, model, instructions)
             else:
                 client_key = tts_config.get('client_key', 'tts')
             
@@ -341,17 +463,29 @@ async def text_to_speech_with_failover(
                 client_key=client_key,
                 instructions=tts_config.get('instructions'),
                 audio_format=audio_format,
-                conversation_id=conversation_id
+                conversation_id=conversation_id,
+                hedge_configs=hedge_configs
             )
             
             # Clean up temporary client
             if '_temp_tts' in openai_clients:
                 del openai_clients['_temp_tts']
             
+            failures_recorded = await _report_tts_attempts(tts_metrics, tried_urls)
+            if not success and tts_metrics and tts_metrics.get('unplayed_text'):
+                # Part of the message was spoken: the next endpoint continues from there
+                message = tts_metrics['unplayed_text']
+            
             if success:
-                logger.info(f"TTS succeeded with failover to: {base_url}")
+                if tts_metrics and 'hedge_winner' in tts_metrics:
+                    tts_config = next(c for c in hedge_configs if c['base_url'] == tts_metrics['hedge_winner'])
+                if tts_metrics and not tts_metrics.get('cache_hit'):
+                    provider_registry.record_success('tts', tts_config['base_url'])
+                    if 'ttfa' in tts_metrics:
+                        provider_registry.record_latency('tts', tts_config['base_url'], tts_metrics['ttfa'] * 1000)
+                logger.info(f"TTS succeeded with failover to: {tts_config['base_url']}")
                 return success, tts_metrics, tts_config
-            else:
+            elif base_url not in failures_recorded:
                 # Mark endpoint as unhealthy
                 await provider_registry.mark_unhealthy('tts', base_url, 'TTS request failed')
                 
@@ -375,23 +509,34 @@ async def text_to_speech_with_failover(
     return False, None, error_config
 
 
-async def speech_to_text(audio_data: np.ndarray, save_audio: bool = False, audio_dir: Optional[Path] = None, transport: str = "local") -> Optional[str]:
+async def speech_to_text(audio_data: np.ndarray, save_audio: bool = False, audio_dir: Optional[Path] = None, transport: str = "local", log_result: bool = True, raise_on_failure: bool = False) -> Optional[str]:
     """Convert audio to text with automatic failover"""
     # Use the new failover implementation
-    return await speech_to_text_with_failover(audio_data, save_audio, audio_dir, transport)
+    return await speech_to_text_with_failover(audio_data, save_audio, audio_dir, transport, log_result, raise_on_failure)
 
 
 async def speech_to_text_with_failover(
     audio_data: np.ndarray, 
     save_audio: bool = False, 
     audio_dir: Optional[Path] = None,
-    transport: str = "local"
+    transport: str = "local",
+    log_result: bool = True,
+    raise_on_failure: bool = False
 ) -> Optional[str]:
     """
     Speech to text with automatic failover to next available endpoint.
     
+    Args:
+        log_result: Save/log the transcription (False for partial streaming
+            segments, where no speech is a valid result rather than a failure)
+        raise_on_failure: Raise instead of returning None when all endpoints fail
+    
     Returns:
-        Transcribed text or None if all endpoints fail
+        Transcribed text or None if all endpoints fail; "" for a partial
+        segment without speech
+    
+    Raises:
+        RuntimeError: If all endpoints fail and ``raise_on_failure`` is set
     """
     from voice_mode.provider_discovery import provider_registry
     from voice_mode.config import STT_BASE_URLS
@@ -401,7 +546,7 @@ async def speech_to_text_with_failover(
     last_error = None
     
     # Try configured endpoints in order
-    for base_url in STT_BASE_URLS:
+    for base_url in provider_registry.rank_endpoints("stt", STT_BASE_URLS):
         if base_url in tried_urls:
             continue
             
@@ -428,16 +573,21 @@ async def speech_to_text_with_failover(
             openai_clients = {'_temp_stt': client}
             
             # Call original speech_to_text with this config
+            stt_start = time.perf_counter()
             result = await _speech_to_text_internal(
                 audio_data, 
                 stt_config, 
                 openai_clients,
                 save_audio, 
-                audio_dir
+                audio_dir,
+                log_result
             )
             
-            if result:
+            # A partial segment may be a breath or a cough, which is not an endpoint failure
+            if result or (result == "" and not log_result):
                 logger.info(f"STT succeeded with {stt_config['provider']}")
+                provider_registry.record_success('stt', base_url)
+                provider_registry.record_latency('stt', base_url, (time.perf_counter() - stt_start) * 1000)
                 return result
             else:
                 # Mark endpoint as unhealthy if it returned None
@@ -451,6 +601,8 @@ async def speech_to_text_with_failover(
     
     # All endpoints failed
     logger.error(f"All STT endpoints failed. Last error: {last_error}")
+    if raise_on_failure:
+        raise RuntimeError(f"All STT endpoints failed. Last error: {last_error}")
     return None
 
 
@@ -459,65 +611,56 @@ async def _speech_to_text_internal(
     stt_config: dict,
     openai_clients: dict,
     save_audio: bool = False,
-    audio_dir: Optional[Path] = None
+    audio_dir: Optional[Path] = None,
+    log_result: bool = True
 ) -> Optional[str]:
-    """Internal speech to text implementation (extracted from original speech_to_text)"""
+    """Internal speech to text implementation (extracted from original speech_to_text)
+    
+    Returns:
+        Transcribed text, "" for a partial segment (``log_result=False``)
+        without speech, or None on failure
+    """
     logger.info(f"STT: Converting speech to text, audio data shape: {audio_data.shape}")
     
     if DEBUG:
         logger.debug(f"STT config - Model: {stt_config['model']}, Base URL: {stt_config['base_url']}")
         logger.debug(f"Audio stats - Min: {audio_data.min()}, Max: {audio_data.max()}, Mean: {audio_data.mean():.2f}")
     
-    wav_file = None
-    export_file = None
-    export_format = None
+    save_task = None
     try:
-        import tempfile
-        
         # Check if input is silent
         if np.abs(audio_data).max() < 0.001:
             logger.warning("Audio appears to be silent")
-            return None
+            return None if log_result else ""
         
         # Ensure audio is in the correct format
         if audio_data.dtype != np.int16:
             logger.debug(f"Converting audio from {audio_data.dtype} to int16")
             audio_data = (audio_data * 32767).astype(np.int16)
         
-        # Save as WAV file temporarily
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_file_obj:
-            wav_file = wav_file_obj.name
-            logger.debug(f"Writing audio to WAV file: {wav_file}")
-            write(wav_file, SAMPLE_RATE, audio_data)
+        # Build the WAV in memory once; it backs debug/saved copies and local uploads
+        wav_data = encode_wav(audio_data, SAMPLE_RATE)
         
-        # Save debug file for original recording
-        if DEBUG:
-            try:
-                with open(wav_file, 'rb') as f:
-                    debug_path = save_debug_file(f.read(), "stt-input", "wav", DEBUG_DIR, DEBUG)
+        # Write debug/saved copies in a worker thread while the upload proceeds
+        if DEBUG or (save_audio and audio_dir):
+            conversation_id = get_conversation_logger().conversation_id if save_audio and audio_dir else None
+            
+            def save_recordings():
+                if DEBUG:
+                    debug_path = save_debug_file(wav_data, "stt-input", "wav", DEBUG_DIR, DEBUG)
                     if debug_path:
                         logger.info(f"STT debug recording saved to: {debug_path}")
-            except Exception as e:
-                logger.error(f"Failed to save debug WAV: {e}")
-        
-        # Initialize audio_path for JSONL logging
-        audio_path = None
-        
-        # Save audio file if audio saving is enabled
-        if save_audio and audio_dir:
-            try:
-                with open(wav_file, 'rb') as f:
-                    # Get conversation ID from logger
-                    conversation_logger = get_conversation_logger()
-                    conversation_id = conversation_logger.conversation_id
-                    audio_path = save_debug_file(f.read(), "stt", "wav", audio_dir, True, conversation_id)
-                    if audio_path:
-                        logger.info(f"STT audio saved to: {audio_path}")
-            except Exception as e:
-                logger.error(f"Failed to save audio WAV: {e}")
+                if save_audio and audio_dir:
+                    saved_path = save_debug_file(wav_data, "stt", "wav", audio_dir, True, conversation_id)
+                    if saved_path:
+                        logger.info(f"STT audio saved to: {saved_path}")
+                        return Path(saved_path)
+                return None
+            
+            save_task = asyncio.create_task(asyncio.to_thread(save_recordings))
         
         # Import config for audio format
-        from ..config import STT_AUDIO_FORMAT, validate_audio_format, get_format_export_params
+        from ..config import STT_AUDIO_FORMAT, validate_audio_format
         
         # Determine provider from base URL (simple heuristic)
         provider = stt_config.get('provider', 'openai-whisper')
@@ -528,103 +671,93 @@ async def _speech_to_text_internal(
         # Validate format for provider
         export_format = validate_audio_format(STT_AUDIO_FORMAT, provider, "stt")
         
-        # Convert WAV to target format for upload
-        logger.debug(f"Converting WAV to {export_format.upper()} for upload...")
-        try:
-            audio = AudioSegment.from_wav(wav_file)
-            logger.debug(f"Audio loaded - Duration: {len(audio)}ms, Channels: {audio.channels}, Frame rate: {audio.frame_rate}")
-            
-            # Get export parameters for the format
-            export_params = get_format_export_params(export_format)
-            
-            with tempfile.NamedTemporaryFile(suffix=f'.{export_format}', delete=False) as export_file_obj:
-                export_file = export_file_obj.name
-                audio.export(export_file, **export_params)
-                upload_file = export_file
-                logger.debug(f"{export_format.upper()} created for STT upload: {upload_file}")
-        except Exception as e:
-            if "ffmpeg" in str(e).lower() or "avconv" in str(e).lower():
-                logger.error(f"Audio conversion failed - FFmpeg may not be installed: {e}")
-                from voice_mode.utils.ffmpeg_check import get_install_instructions
-                logger.error(f"\n{get_install_instructions()}")
-                raise RuntimeError("FFmpeg is required but not found. Please install FFmpeg and try again.") from e
-            else:
+        # Encode for upload (WAV is used as-is, compressed formats are piped through ffmpeg)
+        if export_format == "wav":
+            upload_data = wav_data
+        else:
+            logger.debug(f"Encoding audio to {export_format.upper()} for upload...")
+            try:
+                upload_data = await encode_audio_bytes(audio_data, SAMPLE_RATE, export_format)
+            except AudioEncoderError as e:
+                if "not found" in str(e):
+                    logger.error(f"Audio conversion failed - FFmpeg may not be installed: {e}")
+                    from voice_mode.utils.ffmpeg_check import get_install_instructions
+                    logger.error(f"\n{get_install_instructions()}")
                 raise
         
         # Save debug file for upload version
-        if DEBUG:
-            try:
-                with open(upload_file, 'rb') as f:
-                    debug_path = save_debug_file(f.read(), "stt-upload", export_format, DEBUG_DIR, DEBUG)
-                    if debug_path:
-                        logger.info(f"Upload audio saved to: {debug_path}")
-            except Exception as e:
-                logger.error(f"Failed to save debug {export_format.upper()}: {e}")
+        if DEBUG and export_format != "wav":
+            save_debug_file_in_background(upload_data, "stt-upload", export_format, DEBUG_DIR, DEBUG)
         
-        # Get file size for logging
-        file_size = os.path.getsize(upload_file)
-        logger.debug(f"Uploading {file_size} bytes to STT API...")
+        logger.debug(f"Uploading {len(upload_data)} bytes to STT API...")
         
         # Perform STT based on configuration
-        with open(upload_file, 'rb') as audio_file:
-            # Use client from config
-            if 'client' in stt_config:
-                stt_client = stt_config['client']
-            else:
-                # Legacy: get from openai_clients dict
-                client_key = stt_config.get('client_key', 'stt')
-                stt_client = openai_clients.get(client_key)
-                if not stt_client:
-                    # Fallback to temporary client
-                    stt_client = openai_clients['_temp_stt']
+        # Use client from config
+        if 'client' in stt_config:
+            stt_client = stt_config['client']
+        else:
+            # Legacy: get from openai_clients dict
+            client_key = stt_config.get('client_key', 'stt')
+            stt_client = openai_clients.get(client_key)
+            if not stt_client:
+                # Fallback to temporary client
+                stt_client = openai_clients['_temp_stt']
+        
+        transcription = await stt_client.audio.transcriptions.create(
+            model=stt_config['model'],
+            file=(f"audio.{export_format}", upload_data),
+            response_format="text"
+        )
+        
+        logger.debug(f"STT API response type: {type(transcription)}")
+        text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
+        
+        if text:
+            logger.info(f"✓ STT result: '{text}'")
             
-            transcription = await stt_client.audio.transcriptions.create(
-                model=stt_config['model'],
-                file=audio_file,
-                response_format="text"
-            )
+            # Partial segments are combined and logged by the caller
+            if not log_result:
+                return text
             
-            logger.debug(f"STT API response type: {type(transcription)}")
-            text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
+            # Saved recording path is needed for the JSONL entry
+            audio_path = await save_task if save_task else None
             
-            if text:
-                logger.info(f"✓ STT result: '{text}'")
-                
-                # Save transcription if enabled
-                if SAVE_TRANSCRIPTIONS:
-                    metadata = {
-                        "type": "stt",
-                        "model": stt_config.get('model', 'unknown'),
-                        "provider": stt_config.get('provider', 'unknown'),
-                        "timestamp": datetime.now().isoformat()
+            # Save transcription if enabled
+            if SAVE_TRANSCRIPTIONS:
+                metadata = {
+                    "type": "stt",
+                    "model": stt_config.get('model', 'unknown'),
+                    "provider": stt_config.get('provider', 'unknown'),
+                    "timestamp": datetime.now().isoformat()
+                }
+                save_transcription(text, prefix="stt", metadata=metadata)
+            
+            # Log to JSONL
+            try:
+                conversation_logger = get_conversation_logger()
+                conversation_logger.log_stt(
+                    text=text,
+                    audio_file=audio_path.name if audio_path else None,
+                    duration_ms=int(duration * 1000) if duration else None,
+                    model=stt_config.get('model'),
+                    provider=stt_config.get('provider', 'openai'),
+                    audio_format=export_format,  # Use actual format from conversion
+                    transport=transport,
+                    silence_detection={
+                        "enabled": not DISABLE_SILENCE_DETECTION,
+                        "vad_engine": VAD_ENGINE,
+                        "vad_aggressiveness": VAD_AGGRESSIVENESS,
+                        "silence_threshold_ms": SILENCE_THRESHOLD_MS
                     }
-                    save_transcription(text, prefix="stt", metadata=metadata)
-                
-                # Log to JSONL
-                try:
-                    conversation_logger = get_conversation_logger()
-                    conversation_logger.log_stt(
-                        text=text,
-                        audio_file=audio_path.name if audio_path else None,
-                        duration_ms=int(duration * 1000) if duration else None,
-                        model=stt_config.get('model'),
-                        provider=stt_config.get('provider', 'openai'),
-                        audio_format=export_format,  # Use actual format from conversion
-                        transport=transport,
-                        silence_detection={
-                            "enabled": not DISABLE_SILENCE_DETECTION,
-                            "vad_aggressiveness": VAD_AGGRESSIVENESS,
-                            "silence_threshold_ms": SILENCE_THRESHOLD_MS
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to log STT to JSONL: {e}")
+                )
+            except Exception as e:
+                logger.error(f"Failed to log STT to JSONL: {e}")
+            
+            return text
+        else:
+            logger.warning("STT returned empty text")
+            return None if log_result else ""
                 
-                return text
-            else:
-                logger.warning("STT returned empty text")
-                return None
-                    
     except Exception as e:
         logger.error(f"STT failed: {e}")
         logger.error(f"STT config when error occurred - Model: {stt_config.get('model', 'unknown')}, Base URL: {stt_config.get('base_url', 'unknown')}")
@@ -647,22 +780,6 @@ async def _speech_to_text_internal(
                 logger.error("   For local-only usage, ensure Whisper is running and configured.")
         
         return None
-    finally:
-        # Clean up temporary files
-        if wav_file and os.path.exists(wav_file):
-            try:
-                os.unlink(wav_file)
-                logger.debug(f"Cleaned up WAV file: {wav_file}")
-            except Exception as e:
-                logger.error(f"Failed to clean up WAV file: {e}")
-        
-        if export_file and os.path.exists(export_file):
-            try:
-                os.unlink(export_file)
-                export_format = export_format if 'export_format' in locals() else 'audio'
-                logger.debug(f"Cleaned up {export_format.upper()} file: {export_file}")
-            except Exception as e:
-                logger.error(f"Failed to clean up {export_format.upper() if 'export_format' in locals() else 'audio'} file: {e}")
 
 
 async def play_audio_feedback(
@@ -672,8 +789,9 @@ async def play_audio_feedback(
     style: str = "whisper", 
     feedback_type: Optional[str] = None,
     voice: str = "nova",
-    model: str = "gpt-4o-mini-tts"
-) -> None:
+    model: str = "gpt-4o-mini-tts",
+    wait: bool = True
+) -> float:
     """Play an audio feedback chime
     
     Args:
@@ -684,10 +802,14 @@ async def play_audio_feedback(
         feedback_type: Kept for compatibility, not used
         voice: Kept for compatibility, not used
         model: Kept for compatibility, not used
+        wait: Wait for the chime to finish; otherwise return once it has started
+        
+    Returns:
+        Seconds until the chime has finished playing (0.0 if waited for or not played)
     """
     # Use parameter override if provided, otherwise use global setting
     if enabled is False:
-        return
+        return 0.0
     
     # If enabled is None, use global setting
     if enabled is None:
@@ -695,17 +817,24 @@ async def play_audio_feedback(
     
     # Skip if disabled
     if not enabled:
-        return
+        return 0.0
     
     try:
         # Play appropriate chime
         if text == "listening":
-            await play_chime_start()
+            played = await play_chime_start(wait=wait)
+            kind = "start"
         elif text == "finished":
-            await play_chime_end()
+            played = await play_chime_end(wait=wait)
+            kind = "end"
+        else:
+            return 0.0
+        if played and not wait:
+            return chime_duration(kind)
     except Exception as e:
         logger.debug(f"Audio feedback failed: {e}")
         # Don't interrupt the main flow if feedback fails
+    return 0.0
 
 
 def record_audio(duration: float) -> np.ndarray:
@@ -781,26 +910,37 @@ def record_audio(duration: float) -> np.ndarray:
             sys.stderr = original_stderr
 
 
-def record_audio_with_silence_detection(max_duration: float, disable_silence_detection: bool = False, min_duration: float = 0.0) -> np.ndarray:
+def record_audio_with_silence_detection(
+    max_duration: float,
+    disable_silence_detection: bool = False,
+    min_duration: float = 0.0,
+    on_segment: Optional[Callable[[np.ndarray], None]] = None,
+    start_position: Optional[int] = None,
+    vad_start_position: Optional[int] = None
+) -> np.ndarray:
     """Record audio from microphone with automatic silence detection.
     
-    Uses WebRTC VAD to detect when the user stops speaking and automatically
-    stops recording after a configurable silence threshold.
+    Uses the configured VAD engine (see ``voice_mode.vad``) to detect when the
+    user stops speaking and automatically stops recording after a configurable
+    silence threshold.
     
     Args:
         max_duration: Maximum recording duration in seconds
         disable_silence_detection: If True, disables silence detection and uses fixed duration recording
         min_duration: Minimum recording duration before silence detection can stop (default: 0.0)
+        on_segment: Optional callback receiving each completed speech segment while
+            recording continues (used for streaming STT). Segments are contiguous and
+            together cover the recording; it is only called on the VAD path.
+        start_position: Persistent capture position to start the recording from
+            (e.g. when TTS finished); audio since then is taken from the pre-roll
+        vad_start_position: Capture position before which audio is kept but not
+            given to the VAD (e.g. the end of the listening chime)
         
     Returns:
         Numpy array of recorded audio samples
     """
     
-    logger.info(f"record_audio_with_silence_detection called - VAD_AVAILABLE={VAD_AVAILABLE}, DISABLE_SILENCE_DETECTION={DISABLE_SILENCE_DETECTION}, min_duration={min_duration}")
-    
-    if not VAD_AVAILABLE:
-        logger.warning("webrtcvad not available, falling back to fixed duration recording")
-        return record_audio(max_duration)
+    logger.info(f"record_audio_with_silence_detection called - VAD_ENGINE={VAD_ENGINE}, DISABLE_SILENCE_DETECTION={DISABLE_SILENCE_DETECTION}, min_duration={min_duration}")
     
     if DISABLE_SILENCE_DETECTION or disable_silence_detection:
         if disable_silence_detection:
@@ -812,29 +952,34 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
     logger.info(f"🎤 Recording with silence detection (max {max_duration}s)...")
     
     try:
-        # Initialize VAD
-        vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+        # Initialize VAD (falls back to another engine if the configured one is unavailable)
+        vad = create_vad(VAD_ENGINE, SAMPLE_RATE, VAD_AGGRESSIVENESS)
         
         # Calculate chunk size (must be 10, 20, or 30ms worth of samples)
         chunk_samples = int(SAMPLE_RATE * VAD_CHUNK_DURATION_MS / 1000)
         chunk_duration_s = VAD_CHUNK_DURATION_MS / 1000
         
-        # WebRTC VAD only supports 8000, 16000, or 32000 Hz
-        # We'll tell VAD we're using 16kHz even though we're recording at 24kHz
-        # This requires adjusting our chunk size to match what VAD expects
-        vad_sample_rate = 16000
-        vad_chunk_samples = int(vad_sample_rate * VAD_CHUNK_DURATION_MS / 1000)
-        
-        # Recording state
-        chunks = []
+        # Recording state. The callback appends into one preallocated buffer
+        # (grown by doubling if needed) and the loop below reads views of it.
+        chunk_len = chunk_samples * CHANNELS
+        recording = RecordingBuffer(
+            initial_frames=int(min(max_duration, RECORDING_PREALLOCATE_S) * SAMPLE_RATE) * CHANNELS + chunk_len,
+            max_frames=int(max_duration * SAMPLE_RATE) * CHANNELS + 4 * chunk_len
+        )
+        processed = 0  # Samples consumed by the VAD loop
         silence_duration_ms = 0
         recording_duration = 0
         speech_detected = False
         stop_recording = False
         
-        # Use a queue for thread-safe communication
-        import queue
-        audio_queue = queue.Queue()
+        # Streaming STT segment state (sample offsets into the recording)
+        segment_start = 0
+        segment_has_speech = False
+        min_segment_samples = int(STREAMING_STT_MIN_SEGMENT_S * SAMPLE_RATE) * CHANNELS
+        
+        # Signalled by the callback whenever new audio has been written
+        import threading
+        audio_ready = threading.Event()
         
         # Save stdio state
         import sys
@@ -842,54 +987,79 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
         original_stdout = sys.stdout
         original_stderr = sys.stderr
         
-        logger.debug(f"VAD config - Aggressiveness: {VAD_AGGRESSIVENESS}, "
+        logger.debug(f"VAD config - Engine: {vad.name}, Aggressiveness: {VAD_AGGRESSIVENESS}, "
                     f"Silence threshold: {SILENCE_THRESHOLD_MS}ms, "
                     f"Min duration: {MIN_RECORDING_DURATION}s, "
                     f"Initial grace period: {INITIAL_SILENCE_GRACE_PERIOD}s")
         
+        def on_audio(samples):
+            # Copy straight into the recording buffer
+            recording.write(samples)
+            audio_ready.set()
+        
         def audio_callback(indata, frames, time, status):
             """Callback for continuous audio stream"""
             if status:
                 logger.warning(f"Audio stream status: {status}")
-            # Put the audio data in the queue for processing
-            audio_queue.put(indata.copy())
+            on_audio(indata)
         
-        try:
-            # Create continuous input stream
+        @contextmanager
+        def input_stream():
+            """Create continuous input stream; it has no pre-roll, so no start position."""
             with sd.InputStream(samplerate=SAMPLE_RATE,
-                               channels=CHANNELS,
-                               dtype=np.int16,
-                               callback=audio_callback,
-                               blocksize=chunk_samples):
+                                channels=CHANNELS,
+                                dtype=np.int16,
+                                callback=audio_callback,
+                                blocksize=chunk_samples):
+                yield None
+        
+        try:
+            if PERSISTENT_CAPTURE:
+                # Attach to the shared stream; audio since start_position comes from the pre-roll
+                stream_context = get_capture_stream().recording(on_audio, since=start_position)
+            else:
+                stream_context = input_stream()
+            
+            with stream_context as first_position:
+                # Samples before this offset (the listening chime) skip the VAD
+                vad_skip = 0
+                if first_position is not None and vad_start_position is not None:
+                    vad_skip = max(0, vad_start_position - first_position)
+                    logger.debug(f"Recording starts with {recording.frames} samples of pre-roll "
+                                 f"({vad_skip} before the VAD starts)")
                 
                 logger.debug("Started continuous audio stream")
+                last_audio_time = time.monotonic()
                 
                 while recording_duration < max_duration and not stop_recording:
                     try:
-                        # Get audio chunk from queue with timeout
-                        chunk = audio_queue.get(timeout=0.1)
+                        # Wait for the next complete chunk
+                        if recording.frames - processed < chunk_len:
+                            if audio_ready.wait(timeout=0.1):
+                                audio_ready.clear()
+                                last_audio_time = time.monotonic()
+                            elif time.monotonic() - last_audio_time > RECORDING_STALL_TIMEOUT_S:
+                                logger.warning(f"No audio from input stream for {RECORDING_STALL_TIMEOUT_S}s, stopping recording")
+                                break
+                            continue
                         
-                        # Flatten for consistency
-                        chunk_flat = chunk.flatten()
-                        chunks.append(chunk_flat)
+                        chunk_flat = recording.view(processed, processed + chunk_len)
+                        processed += chunk_len
                         
-                        # For VAD, we need to provide exactly the right number of bytes
-                        # VAD expects 16kHz audio, so we'll take a subset of our 24kHz samples
-                        # This is a simple downsampling approach that works for VAD
-                        vad_chunk = chunk_flat[:vad_chunk_samples]
-                        chunk_bytes = vad_chunk.tobytes()
-                        
-                        # Check if chunk contains speech
-                        try:
-                            is_speech = vad.is_speech(chunk_bytes, vad_sample_rate)
-                        except Exception as vad_e:
-                            logger.warning(f"VAD error: {vad_e}, treating as speech")
-                            is_speech = True
+                        if processed <= vad_skip:
+                            is_speech = False
+                        else:
+                            try:
+                                is_speech = vad.is_speech(chunk_flat)
+                            except Exception as vad_e:
+                                logger.warning(f"VAD error: {vad_e}, treating as speech")
+                                is_speech = True
                         
                         if is_speech:
                             if not speech_detected:
                                 logger.debug("Speech detected, recording...")
                             speech_detected = True
+                            segment_has_speech = True
                             silence_duration_ms = 0
                         else:
                             silence_duration_ms += VAD_CHUNK_DURATION_MS
@@ -911,17 +1081,31 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                         if not speech_detected and recording_duration >= INITIAL_SILENCE_GRACE_PERIOD:
                             logger.info(f"No speech detected after {INITIAL_SILENCE_GRACE_PERIOD}s grace period, stopping recording")
                             stop_recording = True
+                        
+                        # Hand off a completed segment at a pause so it can be transcribed early
+                        if (on_segment and not stop_recording and segment_has_speech
+                                and silence_duration_ms >= STREAMING_STT_SEGMENT_PAUSE_MS
+                                and processed - segment_start >= min_segment_samples):
+                            on_segment(recording.view(segment_start, processed))
+                            segment_start = processed
+                            segment_has_speech = False
                             
-                    except queue.Empty:
-                        # No audio data available, continue waiting
-                        continue
                     except Exception as e:
                         logger.error(f"Error processing audio chunk: {e}")
                         break
             
-            # Concatenate all chunks
-            if chunks:
-                full_recording = np.concatenate(chunks)
+            # Hand off the final segment
+            if on_segment and segment_has_speech and processed > segment_start:
+                on_segment(recording.view(segment_start, processed))
+            
+            logger.info(vad.describe())
+            
+            if recording.dropped:
+                logger.warning(f"Recording buffer full, dropped {recording.dropped} samples")
+            
+            # The recording is a view of the processed part of the buffer
+            if processed:
+                full_recording = recording.view(0, processed)
                 logger.info(f"✓ Recorded {len(full_recording)} samples ({recording_duration:.1f}s)")
                 
                 if DEBUG:
@@ -1403,16 +1587,35 @@ async def converse(
             timings = {}
             try:
                 async with audio_operation_lock:
+                    # Open the microphone while speaking so listening can start the moment TTS ends
+                    capture_warmup = None
+                    barge_in = None
+                    if PERSISTENT_CAPTURE:
+                        if BARGE_IN_ENABLED:
+                            # Also listen for the user talking over the message
+                            barge_in = BargeInMonitor(get_capture_stream())
+                            capture_warmup = asyncio.create_task(asyncio.to_thread(barge_in.start))
+                        else:
+                            capture_warmup = asyncio.create_task(asyncio.to_thread(get_capture_stream().start))
+                    
                     # Speak the message
                     tts_start = time.perf_counter()
-                    tts_success, tts_metrics, tts_config = await text_to_speech_with_failover(
-                        message=message,
-                        voice=voice,
-                        model=tts_model,
-                        instructions=tts_instructions,
-                        audio_format=audio_format,
-                        initial_provider=tts_provider
-                    )
+                    try:
+                        tts_success, tts_metrics, tts_config = await text_to_speech_with_failover(
+                            message=message,
+                            voice=voice,
+                            model=tts_model,
+                            instructions=tts_instructions,
+                            audio_format=audio_format,
+                            initial_provider=tts_provider
+                        )
+                    finally:
+                        if barge_in:
+                            try:
+                                await capture_warmup
+                            except Exception:
+                                pass  # Reported below
+                            barge_in.stop()
                     
                     # Add TTS sub-metrics
                     if tts_metrics:
@@ -1461,11 +1664,40 @@ async def converse(
                             result = "Error: Could not speak message. All TTS providers failed. Check that local services are running or set OPENAI_API_KEY for cloud fallback."
                         return result
                     
-                    # Brief pause before listening
-                    await asyncio.sleep(0.5)
+                    # With persistent capture the recording starts right here, from the
+                    # pre-roll, so speech during the chime is kept
+                    listen_start_position = None
+                    if capture_warmup:
+                        try:
+                            await capture_warmup
+                            listen_start_position = get_capture_stream().position
+                        except Exception as e:
+                            logger.warning(f"Persistent capture unavailable: {e}")
                     
-                    # Play "listening" feedback sound
-                    await play_audio_feedback("listening", openai_clients, audio_feedback, audio_feedback_style or "whisper")
+                    if barge_in and barge_in.triggered and listen_start_position is not None:
+                        # The user is already talking: record from just before the
+                        # speech onset, without the pause or the "listening" chime
+                        capture = get_capture_stream()
+                        lead_in = int(capture.samplerate * BARGE_IN_LEAD_IN_S) * capture.channels
+                        listen_start_position = max(0, barge_in.onset_position - lead_in)
+                        vad_start_position = listen_start_position
+                        logger.info("Barge-in: TTS interrupted, recording from the speech onset")
+                    else:
+                        if listen_start_position is None:
+                            # Brief pause before listening
+                            await asyncio.sleep(0.5)
+                        
+                        # Play "listening" feedback sound. With persistent capture the recording
+                        # starts while it plays and the VAD skips it, so there is no need to wait
+                        chime_remaining = await play_audio_feedback(
+                            "listening", openai_clients, audio_feedback, audio_feedback_style or "whisper",
+                            wait=listen_start_position is None
+                        )
+                        vad_start_position = None
+                        if listen_start_position is not None:
+                            capture = get_capture_stream()
+                            vad_skip_s = chime_remaining + CHIME_ECHO_MARGIN_S if chime_remaining else 0.0
+                            vad_start_position = capture.position + int(capture.samplerate * vad_skip_s) * capture.channels
                     
                     # Record response
                     logger.info(f"🎤 Listening for {listen_duration} seconds...")
@@ -1474,10 +1706,20 @@ async def converse(
                     if event_logger:
                         event_logger.log_event(event_logger.RECORDING_START)
                     
+                    # Streaming STT transcribes completed segments while recording continues
+                    segment_transcriber = None
+                    if STREAMING_STT_ENABLED:
+                        segment_transcriber = SegmentedTranscriber(
+                            lambda segment: speech_to_text(segment, False, None, transport,
+                                                           log_result=False, raise_on_failure=True)
+                        )
+                    
                     record_start = time.perf_counter()
                     logger.debug(f"About to call record_audio_with_silence_detection with duration={listen_duration}, disable_silence_detection={disable_silence_detection}, min_duration={min_listen_duration}")
                     audio_data = await asyncio.get_event_loop().run_in_executor(
-                        None, record_audio_with_silence_detection, listen_duration, disable_silence_detection, min_listen_duration
+                        None, record_audio_with_silence_detection, listen_duration, disable_silence_detection, min_listen_duration,
+                        segment_transcriber.submit if segment_transcriber else None,
+                        listen_start_position, vad_start_position
                     )
                     timings['record'] = time.perf_counter() - record_start
                     
@@ -1488,14 +1730,16 @@ async def converse(
                             "samples": len(audio_data)
                         })
                     
-                    # Play "finished" feedback sound
-                    await play_audio_feedback("finished", openai_clients, audio_feedback, audio_feedback_style or "whisper")
+                    # Play "finished" feedback sound while the recording is transcribed
+                    await play_audio_feedback("finished", openai_clients, audio_feedback, audio_feedback_style or "whisper", wait=False)
                     
                     # Mark the end of recording - this is when user expects response to start
                     user_done_time = time.perf_counter()
                     logger.info(f"Recording finished at {user_done_time - tts_start:.1f}s from start")
                     
                     if len(audio_data) == 0:
+                        if segment_transcriber:
+                            segment_transcriber.cancel()
                         result = "Error: Could not record audio"
                         return result
                     
@@ -1505,7 +1749,21 @@ async def converse(
                         event_logger.log_event(event_logger.STT_START)
                     
                     stt_start = time.perf_counter()
-                    response_text = await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
+                    response_text = None
+                    if segment_transcriber and segment_transcriber.segment_count:
+                        # Only the final segment should still be in flight
+                        try:
+                            response_text = await segment_transcriber.finish()
+                        except SegmentTranscriptionError as e:
+                            # Partial text would drop words: transcribe the whole recording
+                            logger.warning(f"Streaming STT incomplete, transcribing the full recording: {e}")
+                        if response_text and SAVE_AUDIO:
+                            conversation_id = get_conversation_logger().conversation_id
+                            save_debug_file_in_background(
+                                encode_wav(audio_data, SAMPLE_RATE), "stt", "wav", AUDIO_DIR, True, conversation_id
+                            )
+                    if not response_text:
+                        response_text = await speech_to_text(audio_data, SAVE_AUDIO, AUDIO_DIR if SAVE_AUDIO else None, transport)
                     timings['stt'] = time.perf_counter() - stt_start
                     
                     # Log STT complete
@@ -1535,6 +1793,7 @@ async def converse(
                             timing=stt_timing_str,
                             silence_detection={
                                 "enabled": not (DISABLE_SILENCE_DETECTION or disable_silence_detection),
+                                "vad_engine": VAD_ENGINE,
                                 "vad_aggressiveness": VAD_AGGRESSIVENESS,
                                 "silence_threshold_ms": SILENCE_THRESHOLD_MS
                             }
@@ -1557,6 +1816,8 @@ async def converse(
                     tts_timing_parts.append(f"gen {timings['tts_gen']:.1f}s")
                 if 'tts_play' in timings:
                     tts_timing_parts.append(f"play {timings['tts_play']:.1f}s")
+                if barge_in and barge_in.triggered:
+                    tts_timing_parts.append("interrupted")
                 
                 # STT timings
                 if 'record' in timings:
@@ -1676,6 +1937,15 @@ async def converse(
 
 
 
+def _format_latency(latency: dict) -> str:
+    """Describe an endpoint's latency stats for ``voice_registry``."""
+    text = f"EWMA {latency['ewma_ms']:.0f}ms"
+    # Endpoints only seen losing hedged races have a lower bound but no samples
+    if latency['p50_ms'] is None:
+        return f"{text} (no completed samples)"
+    return f"{text}, p50 {latency['p50_ms']:.0f}ms, p95 {latency['p95_ms']:.0f}ms ({latency['samples']} samples)"
+
+
 @mcp.tool()
 async def voice_registry() -> str:
     """Get the current voice provider registry showing all discovered endpoints.
@@ -1685,6 +1955,8 @@ async def voice_registry() -> str:
     - Available models
     - Available voices (TTS only)
     - Response times
+    - Measured request latency (EWMA, p50, p95)
+    - Circuit breaker state
     - Last health check time
     
     This allows the LLM to see what voice services are currently available.
@@ -1711,9 +1983,15 @@ async def voice_registry() -> str:
             lines.append(f"   Voices: {', '.join(info['voices']) if info['voices'] else 'none detected'}")
             if info["response_time_ms"]:
                 lines.append(f"   Response Time: {info['response_time_ms']:.0f}ms")
+            if info["circuit"]["state"] != "closed":
+                lines.append(f"   Circuit: {info['circuit']['state']}")
+            if info["latency"]:
+                lines.append(f"   Latency: {_format_latency(info['latency'])}")
         else:
             if info.get("error"):
                 lines.append(f"   Error: {info['error']}")
+            if info["circuit"]["retry_in_s"] is not None:
+                lines.append(f"   Circuit: open, next probe in {info['circuit']['retry_in_s']:.0f}s")
         
         lines.append(f"   Last Check: {info['last_check']}")
     
@@ -1729,9 +2007,15 @@ async def voice_registry() -> str:
             lines.append(f"   Models: {', '.join(info['models']) if info['models'] else 'none detected'}")
             if info["response_time_ms"]:
                 lines.append(f"   Response Time: {info['response_time_ms']:.0f}ms")
+            if info["circuit"]["state"] != "closed":
+                lines.append(f"   Circuit: {info['circuit']['state']}")
+            if info["latency"]:
+                lines.append(f"   Latency: {_format_latency(info['latency'])}")
         else:
             if info.get("error"):
                 lines.append(f"   Error: {info['error']}")
+            if info["circuit"]["retry_in_s"] is not None:
+                lines.append(f"   Circuit: open, next probe in {info['circuit']['retry_in_s']:.0f}s")
         
         lines.append(f"   Last Check: {info['last_check']}")
     
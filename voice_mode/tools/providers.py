@@ -24,7 +24,9 @@ async def refresh_provider_registry(
     Args:
         service_type: Optional - 'tts' or 'stt' to refresh only one type
         base_url: Optional - specific endpoint URL to refresh
-        optimistic: If True, mark all endpoints as healthy without checking (default: True)
+        optimistic: If True, mark endpoints as healthy without checking (default: True).
+            Endpoints whose circuit breaker is open stay out of rotation until a
+            background probe succeeds; use optimistic=False to check them now.
     
     Returns:
         Summary of refreshed endpoints and their status
@@ -57,8 +59,13 @@ async def refresh_provider_registry(
                 urls = [base_url]
             
             for url in urls:
-                if optimistic:
-                    # In optimistic mode, just mark everything as healthy
+                breaker = provider_registry.get_breaker(service, url)
+                if optimistic and not breaker.available:
+                    retry_in = breaker.to_dict()["retry_in_s"]
+                    results.append(f"\n  ❌ {url}")
+                    results.append(f"     Status: Circuit open, next probe in {retry_in:.0f}s (use optimistic=False to check now)")
+                elif optimistic:
+                    # In optimistic mode, mark everything not known to be failing as healthy
                     from voice_mode.provider_discovery import EndpointInfo
                     from datetime import datetime
                     
@@ -134,6 +141,9 @@ async def get_provider_details(base_url: str) -> str:
         
         results.append(f"\nService Type: {service_type}")
         results.append(f"Status: {'✅ Healthy' if endpoint_info.healthy else '❌ Unhealthy'}")
+        circuit = provider_registry.get_breaker(service_type.lower(), base_url).to_dict()
+        results.append(f"Circuit: {circuit['state']} ({circuit['consecutive_failures']} consecutive failures, "
+                       f"{circuit['failure_rate']:.0%} recent failure rate)")
         results.append(f"Last Health Check: {endpoint_info.last_health_check}")
         
         if endpoint_info.response_time_ms:
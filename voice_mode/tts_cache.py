@@ -0,0 +1,256 @@
+"""
+Content-addressed TTS audio cache for voice-mode.
+
+Agents repeat many short utterances ("Done.", "What would you like next?").
+Decoded PCM for each utterance is stored under a hash of everything that
+affects the audio - text, voice, model, instructions, format and provider
+type - in an in-memory LRU backed by WAV files under ``TTS_CACHE_DIR``. A hit
+is played straight from memory without any network request. Both tiers evict
+least recently used entries once they exceed their size limit.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+import numpy as np
+
+from .audio_decoder import parse_wav
+from .audio_encoder import encode_wav
+from .config import (
+    TTS_CACHE_ENABLED,
+    TTS_CACHE_DIR,
+    TTS_CACHE_MAX_MB,
+    TTS_CACHE_MEMORY_MB,
+    TTS_CACHE_MAX_CHARS,
+)
+
+logger = logging.getLogger("voicemode")
+
+
+def make_cache_key(
+    text: str,
+    voice: str,
+    model: str,
+    instructions: Optional[str],
+    audio_format: str,
+    provider: str
+) -> str:
+    """Hash everything that affects the synthesized audio.
+
+    Args:
+        text: Text being spoken
+        voice: TTS voice
+        model: TTS model
+        instructions: Optional speaking instructions
+        audio_format: Response format requested from the endpoint
+        provider: Endpoint type (e.g. 'kokoro', 'openai') rather than URL,
+            so replicas of the same service share entries
+
+    Returns:
+        Hex digest identifying the utterance
+    """
+    payload = json.dumps([text, voice, model, instructions or "", audio_format, provider])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier (memory + disk) LRU cache of decoded TTS audio.
+
+    Methods are thread-safe so disk reads and writes can run in worker threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, memory_max_bytes: int):
+        """Create a cache.
+
+        Args:
+            directory: Directory for cached WAV files (created on first write)
+            max_bytes: Size limit for the on-disk tier
+            memory_max_bytes: Size limit for the in-memory tier
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self._memory: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # Computed lazily by scanning the directory
+        self._lock = threading.Lock()
+        self._pending: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.wav"
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Look up cached audio.
+
+        Args:
+            key: Key from ``make_cache_key``
+
+        Returns:
+            Tuple of (int16 samples, sample_rate), or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        path = self._path(key)
+        try:
+            samples, sample_rate, _ = parse_wav(path.read_bytes())
+            os.utime(path)  # Mark as recently used for disk eviction
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember(key, samples, sample_rate)
+            self.hits += 1
+        return samples, sample_rate
+
+    def put(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Store decoded audio in both tiers.
+
+        Args:
+            key: Key from ``make_cache_key``
+            samples: int16 samples
+            sample_rate: Sample rate in Hz
+        """
+        if not len(samples):
+            return
+        samples = np.ascontiguousarray(samples, dtype=np.int16)
+        with self._lock:
+            if key in self._memory:
+                return
+            self._remember(key, samples, sample_rate)
+
+        path = self._path(key)
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            data = encode_wav(samples, sample_rate)
+            # Unique name so concurrent writers of the same key never share a temp file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{key}.", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry: {e}")
+            self._discard_tmp(tmp_path)
+            return
+
+        with self._lock:
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write TTS cache entry: {e}")
+                self._discard_tmp(tmp_path)
+                return
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.max_bytes:
+                self._evict_disk()
+
+    @staticmethod
+    def _discard_tmp(tmp_path: Optional[str]) -> None:
+        if tmp_path is None:
+            return
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    def put_in_background(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Store audio from a worker thread without delaying the caller."""
+        task = asyncio.create_task(asyncio.to_thread(self.put, key, samples, sample_rate))
+        # Keep a reference until done so the task is not garbage collected
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _remember(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Insert into the memory tier, evicting least recently used entries (lock held)."""
+        if samples.nbytes > self.memory_max_bytes:
+            return
+        self._memory[key] = (samples, sample_rate)
+        self._memory_bytes += samples.nbytes
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.wav"))
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files until the disk tier fits its limit (lock held)."""
+        entries = []
+        for path in self.directory.glob("*.wav"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._disk_bytes = total
+        logger.debug(f"TTS cache evicted {removed} files ({total} bytes remain)")
+
+    def clear(self) -> None:
+        """Remove all cached audio."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path in self.directory.glob("*.wav"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+
+
+_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """Get the shared TTS cache, or None if caching is disabled."""
+    global _cache
+    if not TTS_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = TTSCache(
+            TTS_CACHE_DIR,
+            max_bytes=int(TTS_CACHE_MAX_MB * 1024 * 1024),
+            memory_max_bytes=int(TTS_CACHE_MEMORY_MB * 1024 * 1024),
+        )
+    return _cache
+
+
+def is_cacheable(text: str) -> bool:
+    """Whether an utterance is short enough to be worth caching."""
+    return len(text) <= TTS_CACHE_MAX_CHARS
@@ -0,0 +1,141 @@
+"""
+Sentence-pipelined text-to-speech for voice-mode.
+
+Long replies are split on sentence and clause boundaries. Segments are
+synthesized concurrently (with bounded parallelism, in order of need) while
+earlier segments play, and the audio is written in order to a single output
+stream so there are no gaps or device restarts between sentences. Time to
+first audio becomes the cost of synthesizing the first sentence.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+
+import numpy as np
+
+logger = logging.getLogger("voicemode")
+
+# Sentence ends: terminal punctuation (optionally followed by closing quotes or
+# brackets) and whitespace, or a line break
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|(?<=[.!?…]["\')\]])\s+|\n+')
+# Clause boundaries used to split sentences that are still too long
+_CLAUSE_END = re.compile(r'(?<=[,;:—])\s+')
+
+
+@dataclass
+class PipelineMetrics:
+    """Timing for one pipelined utterance."""
+    ttfa: float = 0.0  # Until the first segment's audio was handed to the output
+    generation_time: float = 0.0  # Until every segment was synthesized
+    playback_time: float = 0.0  # Until the last segment was written
+    segments: int = 0
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Split a sentence longer than ``max_chars`` on clauses, then on words."""
+    pieces = []
+    current = ""
+    for part in _CLAUSE_END.split(sentence):
+        for word in part.split(" ") if len(part) > max_chars else [part]:
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) > max_chars and current:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text: str, max_chars: int = 250, min_chars: int = 20) -> List[str]:
+    """Split text into segments suitable for independent synthesis.
+
+    Args:
+        text: Text to speak
+        max_chars: Longest segment; longer sentences are split on clauses or words
+        min_chars: Shorter fragments are merged into the following segment so
+            prosody is not broken up (e.g. "Yes." or list numbering)
+
+    Returns:
+        Non-empty segments in speaking order
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) > max_chars:
+            sentences.extend(_split_long(sentence, max_chars))
+        else:
+            sentences.append(sentence)
+
+    segments: List[str] = []
+    pending = ""
+    for sentence in sentences:
+        pending = f"{pending} {sentence}" if pending else sentence
+        if len(pending) >= min_chars:
+            segments.append(pending)
+            pending = ""
+    if pending:
+        if segments and len(segments[-1]) + len(pending) < max_chars:
+            segments[-1] = f"{segments[-1]} {pending}"
+        else:
+            segments.append(pending)
+    return segments
+
+
+async def play_pipelined(
+    segments: List[str],
+    synthesize: Callable[[str], Awaitable[np.ndarray]],
+    write: Callable[[np.ndarray], None],
+    concurrency: int = 2
+) -> PipelineMetrics:
+    """Synthesize segments concurrently and write their audio in order.
+
+    Args:
+        segments: Text segments in speaking order
+        synthesize: Coroutine function returning int16 samples for one segment
+        write: Blocking writer for an open output stream (run in a worker thread)
+        concurrency: Maximum synthesis requests in flight
+
+    Returns:
+        Pipeline timing metrics
+
+    Raises:
+        Exception: The first synthesis or playback error; outstanding requests are cancelled
+    """
+    metrics = PipelineMetrics(segments=len(segments))
+    start_time = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int, segment: str) -> np.ndarray:
+        # The semaphore is FIFO, so segments are requested in speaking order
+        async with semaphore:
+            samples = await synthesize(segment)
+        elapsed = time.perf_counter() - start_time
+        metrics.generation_time = max(metrics.generation_time, elapsed)
+        logger.debug(f"TTS pipeline: segment {index + 1}/{len(segments)} ready after {elapsed:.3f}s")
+        return samples
+
+    tasks = [asyncio.create_task(run(i, segment)) for i, segment in enumerate(segments)]
+    try:
+        for index, task in enumerate(tasks):
+            samples = await task
+            if index == 0:
+                metrics.ttfa = time.perf_counter() - start_time
+                logger.info(f"TTS pipeline: first segment ready - TTFA: {metrics.ttfa:.3f}s")
+            # Blocks until the device has room, which paces us to real time
+            await asyncio.to_thread(write, samples)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    metrics.playback_time = time.perf_counter() - start_time
+    return metrics
@@ -6,6 +6,7 @@ from .event_logger import (
     initialize_event_logger,
     log_tts_start,
     log_tts_first_audio,
+    log_tts_audio_timing,
     log_recording_start,
     log_recording_end,
     log_stt_start,
@@ -20,6 +21,7 @@ __all__ = [
     "initialize_event_logger",
     "log_tts_start",
     "log_tts_first_audio",
+    "log_tts_audio_timing",
     "log_recording_start",
     "log_recording_end",
     "log_stt_start",
@@ -9,7 +9,7 @@ import json
 import time
 import threading
 import queue
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict, field
@@ -47,6 +47,8 @@ class EventLogger:
     TTS_FIRST_AUDIO = "TTS_FIRST_AUDIO"
     TTS_PLAYBACK_START = "TTS_PLAYBACK_START"
     TTS_PLAYBACK_END = "TTS_PLAYBACK_END"
+    TTS_AUDIO_START = "TTS_AUDIO_START"  # First sample reached the DAC
+    TTS_AUDIO_END = "TTS_AUDIO_END"  # Last sample left the DAC
     TTS_ERROR = "TTS_ERROR"
     
     # Recording Events
@@ -106,19 +108,26 @@ class EventLogger:
         
         logger.info(f"Event logger initialized, logging to {self.log_dir}")
     
-    def log_event(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+    def log_event(self, event_type: str, data: Optional[Dict[str, Any]] = None,
+                  perf_time: Optional[float] = None) -> None:
         """
         Log an event with automatic timestamp.
         
         Args:
             event_type: Type of event (use class constants)
             data: Optional event-specific data
+            perf_time: When the event happened, as a time.perf_counter() value
+                (for events measured after the fact); defaults to now
         """
         if not self.enabled:
             return
+        
+        timestamp = datetime.now(timezone.utc)
+        if perf_time is not None:
+            timestamp -= timedelta(seconds=time.perf_counter() - perf_time)
             
         event = VoiceEvent(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=timestamp.isoformat(),
             event_type=event_type,
             session_id=self.session_id,
             data=data or {}
@@ -200,6 +209,16 @@ class EventLogger:
             ttfa = parse_ts(events_by_type[self.TTS_FIRST_AUDIO][0])
             metrics["ttfa"] = (ttfa - tts_start).total_seconds()
         
+        # Time until the first sample was actually audible, and how long it played
+        if self.TTS_START in events_by_type and self.TTS_AUDIO_START in events_by_type:
+            tts_start = parse_ts(events_by_type[self.TTS_START][0])
+            audio_start = parse_ts(events_by_type[self.TTS_AUDIO_START][0])
+            metrics["ttfa_audio"] = (audio_start - tts_start).total_seconds()
+        if self.TTS_AUDIO_START in events_by_type and self.TTS_AUDIO_END in events_by_type:
+            audio_start = parse_ts(events_by_type[self.TTS_AUDIO_START][0])
+            audio_end = parse_ts(events_by_type[self.TTS_AUDIO_END][-1])
+            metrics["tts_playback"] = (audio_end - audio_start).total_seconds()
+        
         # Recording duration
         if self.RECORDING_START in events_by_type and self.RECORDING_END in events_by_type:
             rec_start = parse_ts(events_by_type[self.RECORDING_START][0])
@@ -320,6 +339,16 @@ def log_tts_first_audio() -> None:
         logger.log_event(EventLogger.TTS_FIRST_AUDIO)
 
 
+def log_tts_audio_timing(audio_start: Optional[float], audio_end: Optional[float]) -> None:
+    """Log when TTS audio reached and left the DAC (time.perf_counter() values)."""
+    logger = get_event_logger()
+    if logger:
+        if audio_start is not None:
+            logger.log_event(EventLogger.TTS_AUDIO_START, perf_time=audio_start)
+        if audio_end is not None:
+            logger.log_event(EventLogger.TTS_AUDIO_END, perf_time=audio_end)
+
+
 def log_recording_start() -> None:
     """Log recording start."""
     logger = get_event_logger()
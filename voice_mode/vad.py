@@ -0,0 +1,373 @@
+"""
+Voice activity detection engines for voice-mode.
+
+Silence detection classifies each recording chunk as speech or not. The
+engine is chosen with ``VOICEMODE_VAD_ENGINE``:
+
+- webrtc: WebRTC VAD on audio resampled to 16kHz (needs ``webrtcvad``)
+- energy: a NumPy detector combining frame energy against an adaptive noise
+  floor, zero-crossing rate and spectral flatness (no extra dependencies)
+- onnx: a Silero-compatible ONNX model run on CPU (needs ``onnxruntime`` and
+  ``VOICEMODE_VAD_ONNX_MODEL``)
+- auto: webrtc if installed, otherwise energy
+
+Every engine takes chunks at the recording sample rate, returns one decision
+per chunk and keeps per-frame timing statistics. If the configured engine is
+unavailable the next one is used, so silence detection never degrades to
+fixed-duration recording.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .config import (
+    SAMPLE_RATE,
+    VAD_AGGRESSIVENESS,
+    VAD_CHUNK_DURATION_MS,
+    VAD_ENGINE,
+    VAD_ONNX_MODEL,
+    VAD_ONNX_THRESHOLD,
+)
+from .resample import PolyphaseResampler
+
+# Optional webrtcvad for the webrtc engine
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    webrtcvad = None
+    WEBRTCVAD_AVAILABLE = False
+
+logger = logging.getLogger("voicemode")
+
+VAD_ENGINES = ("auto", "webrtc", "energy", "onnx")
+
+
+@dataclass
+class VADStats:
+    """Per-frame decisions and processing time of a detector."""
+    frames: int = 0
+    speech_frames: int = 0
+    total_time: float = 0.0  # Seconds spent classifying
+    max_frame_time: float = 0.0
+
+    @property
+    def mean_frame_time(self) -> float:
+        """Mean classification time per frame in seconds."""
+        return self.total_time / self.frames if self.frames else 0.0
+
+
+class VoiceActivityDetector(ABC):
+    """Base class for VAD engines.
+
+    Subclasses implement ``_classify``; ``is_speech`` wraps it with timing and
+    decision counting.
+    """
+
+    name = "base"
+
+    def __init__(self, input_rate: int = SAMPLE_RATE):
+        self.input_rate = input_rate
+        self.stats = VADStats()
+
+    def is_speech(self, chunk: np.ndarray) -> bool:
+        """Classify one chunk of int16 mono samples at ``input_rate``.
+
+        Args:
+            chunk: Samples for one chunk (normally ``VAD_CHUNK_DURATION_MS`` long)
+
+        Returns:
+            True if the chunk contains speech
+        """
+        start = time.perf_counter()
+        decision = bool(self._classify(np.asarray(chunk).reshape(-1)))
+        elapsed = time.perf_counter() - start
+
+        self.stats.frames += 1
+        self.stats.speech_frames += decision
+        self.stats.total_time += elapsed
+        self.stats.max_frame_time = max(self.stats.max_frame_time, elapsed)
+        return decision
+
+    @abstractmethod
+    def _classify(self, chunk: np.ndarray) -> bool:
+        """Decide whether one flattened chunk contains speech."""
+
+    def reset(self) -> None:
+        """Forget stream state and statistics before a new recording."""
+        self.stats = VADStats()
+
+    def describe(self) -> str:
+        """One-line summary of decisions and timing, for logs."""
+        return (f"{self.name} VAD: {self.stats.speech_frames}/{self.stats.frames} speech frames, "
+                f"{self.stats.mean_frame_time * 1e6:.0f}us mean, "
+                f"{self.stats.max_frame_time * 1e6:.0f}us max per frame")
+
+
+class _ResamplingDetector(VoiceActivityDetector):
+    """Detector whose model runs on fixed-size windows at its own sample rate.
+
+    Chunks are resampled with a streaming polyphase resampler; windows that
+    do not complete within a chunk carry over to the next one, and a chunk
+    with no complete window keeps the previous decision.
+    """
+
+    model_rate = 16000
+    window = 480
+
+    def __init__(self, input_rate: int = SAMPLE_RATE):
+        super().__init__(input_rate)
+        self._resampler = PolyphaseResampler(input_rate, self.model_rate) if input_rate != self.model_rate else None
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._last = False
+
+    def _classify(self, chunk: np.ndarray) -> bool:
+        if self._resampler is not None:
+            chunk = self._resampler.process_int16(chunk)
+        self._pending = np.concatenate((self._pending, chunk.astype(np.int16, copy=False)))
+        windows = len(self._pending) // self.window
+        if windows:
+            decisions = [self._classify_window(self._pending[i * self.window:(i + 1) * self.window])
+                         for i in range(windows)]
+            self._pending = self._pending[windows * self.window:]
+            self._last = any(decisions)
+        return self._last
+
+    @abstractmethod
+    def _classify_window(self, window: np.ndarray) -> bool:
+        """Decide whether one ``window``-sample window at ``model_rate`` contains speech."""
+
+    def reset(self) -> None:
+        super().reset()
+        if self._resampler is not None:
+            self._resampler.reset()
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._last = False
+
+
+class WebRTCVAD(_ResamplingDetector):
+    """WebRTC VAD on 16kHz frames of ``VAD_CHUNK_DURATION_MS``."""
+
+    name = "webrtc"
+
+    def __init__(self, input_rate: int = SAMPLE_RATE, aggressiveness: int = VAD_AGGRESSIVENESS,
+                 frame_ms: int = VAD_CHUNK_DURATION_MS):
+        """Create a WebRTC detector.
+
+        Args:
+            input_rate: Sample rate of the chunks passed to ``is_speech``
+            aggressiveness: 0-3, higher filters out more non-speech
+            frame_ms: WebRTC frame length (10, 20 or 30ms)
+
+        Raises:
+            ImportError: If webrtcvad is not installed
+        """
+        if not WEBRTCVAD_AVAILABLE:
+            raise ImportError("webrtcvad is not installed")
+        self.window = int(self.model_rate * frame_ms / 1000)
+        super().__init__(input_rate)
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def _classify_window(self, window: np.ndarray) -> bool:
+        return self._vad.is_speech(window.tobytes(), self.model_rate)
+
+
+class EnergyVAD(VoiceActivityDetector):
+    """Energy, zero-crossing and spectral-flatness detector with an adaptive noise floor.
+
+    Each chunk is split into 10ms sub-frames and all features are computed for
+    the whole chunk at once. A sub-frame is speech when its energy is well
+    above the tracked noise floor and it looks voiced: a peaky spectrum (low
+    flatness) or a zero-crossing rate below that of broadband noise. The
+    noise floor follows quiet sub-frames quickly downwards and slowly upwards,
+    so it adapts to fans or traffic without absorbing speech. A short
+    hangover bridges unvoiced consonants between voiced sub-frames.
+    """
+
+    name = "energy"
+
+    # Per aggressiveness level: dB above the noise floor, maximum spectral flatness
+    MARGINS_DB = (6.0, 9.0, 12.0, 15.0)
+    MAX_FLATNESS = (0.6, 0.5, 0.4, 0.3)
+    MAX_ZCR = 0.25  # Zero crossings per sample; white noise is ~0.5
+    MIN_ENERGY_DB = -60.0  # Absolute floor in dBFS; quieter is always silence
+    HANGOVER_MS = 90
+    SUBFRAME_MS = 10
+
+    def __init__(self, input_rate: int = SAMPLE_RATE, aggressiveness: int = VAD_AGGRESSIVENESS):
+        """Create an energy detector.
+
+        Args:
+            input_rate: Sample rate of the chunks passed to ``is_speech``
+            aggressiveness: 0-3, higher requires louder and more voiced frames
+        """
+        super().__init__(input_rate)
+        level = min(max(int(aggressiveness), 0), 3)
+        self.margin_db = self.MARGINS_DB[level]
+        self.max_flatness = self.MAX_FLATNESS[level]
+        self.subframe = int(input_rate * self.SUBFRAME_MS / 1000)
+        self.hangover = self.HANGOVER_MS // self.SUBFRAME_MS
+
+        # Spectral flatness is measured over the speech band only, on a
+        # 3-bin smoothed spectrum (the raw periodogram of white noise has a
+        # flatness of only ~0.56 because of its per-bin variance)
+        freqs = np.fft.rfftfreq(self.subframe, 1 / input_rate)[1:-1]
+        self._band = (freqs >= 100) & (freqs <= 4000)
+        self._window = np.hanning(self.subframe).astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        super().reset()
+        self.noise_floor_db: Optional[float] = None
+        self._hangover_left = 0
+
+    def features(self, chunk: np.ndarray):
+        """Compute per-sub-frame energy (dBFS), zero-crossing rate and spectral flatness.
+
+        Args:
+            chunk: int16 samples; a trailing partial sub-frame is ignored
+
+        Returns:
+            Tuple of (energy_db, zcr, flatness) arrays, one value per sub-frame
+        """
+        count = len(chunk) // self.subframe
+        frames = chunk[:count * self.subframe].astype(np.float32).reshape(count, self.subframe) / 32768.0
+
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.subframe
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        power = (power[:, :-2] + power[:, 1:-1] + power[:, 2:])[:, self._band] / 3 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy_db, zcr, flatness
+
+    def _classify(self, chunk: np.ndarray) -> bool:
+        energy_db, zcr, flatness = self.features(chunk)
+        if not len(energy_db):
+            return self._hangover_left > 0
+
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(np.min(energy_db))
+
+        decision = False
+        for energy, crossings, flat in zip(energy_db, zcr, flatness):
+            loud = energy > self.noise_floor_db + self.margin_db and energy > self.MIN_ENERGY_DB
+            voiced = flat < self.max_flatness or crossings < self.MAX_ZCR
+            if loud and voiced:
+                self._hangover_left = self.hangover
+                decision = True
+            elif self._hangover_left > 0:
+                self._hangover_left -= 1
+                decision = True
+
+            # Track the noise floor: fast down, slow up, very slow while speaking
+            if energy < self.noise_floor_db:
+                self.noise_floor_db += 0.5 * (energy - self.noise_floor_db)
+            else:
+                rate = 0.002 if loud and voiced else 0.05
+                self.noise_floor_db += rate * (energy - self.noise_floor_db)
+        return decision
+
+
+class OnnxVAD(_ResamplingDetector):
+    """Silero-compatible ONNX model run on CPU with onnxruntime.
+
+    The model takes 512-sample windows at 16kHz (preceded by 64 samples of
+    context) plus a recurrent state, and returns a speech probability.
+    """
+
+    name = "onnx"
+    window = 512
+    CONTEXT = 64
+
+    def __init__(self, model_path: str, input_rate: int = SAMPLE_RATE, threshold: float = VAD_ONNX_THRESHOLD):
+        """Load an ONNX VAD model.
+
+        Args:
+            model_path: Path to the .onnx model
+            input_rate: Sample rate of the chunks passed to ``is_speech``
+            threshold: Speech probability above which a window is speech
+
+        Raises:
+            ImportError: If onnxruntime is not installed
+            ValueError: If no model path is given
+        """
+        import onnxruntime
+
+        if not model_path:
+            raise ValueError("no ONNX VAD model configured (VOICEMODE_VAD_ONNX_MODEL)")
+        super().__init__(input_rate)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        self._session = onnxruntime.InferenceSession(model_path, sess_options=options,
+                                                     providers=["CPUExecutionProvider"])
+        self.threshold = threshold
+        self._reset_model_state()
+
+    def _reset_model_state(self) -> None:
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._context = np.zeros(self.CONTEXT, dtype=np.float32)
+
+    def reset(self) -> None:
+        super().reset()
+        if hasattr(self, "_session"):
+            self._reset_model_state()
+
+    def _classify_window(self, window: np.ndarray) -> bool:
+        samples = window.astype(np.float32) / 32768.0
+        model_input = np.concatenate((self._context, samples))[np.newaxis, :]
+        probability, self._state = self._session.run(None, {
+            "input": model_input,
+            "state": self._state,
+            "sr": np.array(self.model_rate, dtype=np.int64),
+        })
+        self._context = samples[-self.CONTEXT:]
+        return float(np.asarray(probability).reshape(-1)[0]) > self.threshold
+
+
+def create_vad(
+    engine: str = VAD_ENGINE,
+    input_rate: int = SAMPLE_RATE,
+    aggressiveness: int = VAD_AGGRESSIVENESS,
+    model_path: str = VAD_ONNX_MODEL
+) -> VoiceActivityDetector:
+    """Create the configured VAD engine, falling back if it is unavailable.
+
+    Fallback order is onnx, then webrtc, then energy, which needs nothing but
+    NumPy and so always succeeds.
+
+    Args:
+        engine: One of ``VAD_ENGINES``
+        input_rate: Sample rate of the chunks that will be classified
+        aggressiveness: 0-3, higher filters out more non-speech
+        model_path: ONNX model for the onnx engine
+
+    Returns:
+        A ready detector
+    """
+    engine = (engine or "auto").lower()
+    if engine not in VAD_ENGINES:
+        logger.warning(f"Unknown VAD engine '{engine}', using auto")
+        engine = "auto"
+
+    if engine == "onnx":
+        try:
+            return OnnxVAD(model_path, input_rate)
+        except Exception as e:
+            logger.warning(f"ONNX VAD unavailable ({e}), falling back")
+            engine = "auto"
+
+    if engine in ("auto", "webrtc"):
+        if WEBRTCVAD_AVAILABLE:
+            return WebRTCVAD(input_rate, aggressiveness)
+        if engine == "webrtc":
+            logger.warning("webrtcvad not installed, using the energy VAD")
+
+    return EnergyVAD(input_rate, aggressiveness)